@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+import time
+
+import numpy as np
+
+from tvb.basic.profile import TvbProfile
+TvbProfile.set_profile(TvbProfile.LIBRARY_PROFILE)
+
+import ANNarchy
+
+from tvb.contrib.scripts.utils.data_structures_utils import ensure_list
+
+from tvb_multiscale.tvb_annarchy.annarchy_models.devices import ANNarchySpikeSourceArray
+
+
+def legacy_add_spikes(device, spikes, current_time):
+    """The previous add_spikes, with per neuron numpy round-trips and lists, for comparison."""
+    old_spikes = device.device.get("spike_times")
+    new_spikes = []
+    for old_spike, new_spike in zip(old_spikes, spikes):
+        old_spike = np.array(old_spike)
+        old_spike = old_spike[old_spike >= current_time].tolist()
+        new_spikes.append(old_spike + ensure_list(new_spike))
+    device.device.set({"spike_times": new_spikes})
+
+
+def poisson_spikes(n_neurons, rate, start_time, window):
+    n_spikes = np.random.poisson(rate * window / 1000.0, n_neurons)
+    return [np.sort(np.random.uniform(start_time, start_time + window, n)) for n in n_spikes]
+
+
+def benchmark_add_spikes(add_spikes, n_neurons, rate=20.0, window=10.0, n_windows=20):
+    ANNarchy.clear()
+    ANNarchy.setup(dt=0.1)
+    population = ANNarchy.SpikeSourceArray([[] for _ in range(n_neurons)])
+    target = ANNarchy.Population(n_neurons, ANNarchy.Izhikevich)
+    ANNarchy.Projection(population, target, "exc").connect_one_to_one(weights=1.0)
+    ANNarchy.compile(silent=True)
+    device = ANNarchySpikeSourceArray(population, ANNarchy)
+    durations = []
+    for _ in range(n_windows):
+        current_time = ANNarchy.get_time()
+        spikes = poisson_spikes(n_neurons, rate, current_time + window, window)
+        tic = time.time()
+        add_spikes(device, spikes, current_time)
+        durations.append(time.time() - tic)
+        ANNarchy.simulate(window)
+    return np.median(durations)
+
+
+def main_benchmark(n_neurons=(100, 1000, 10000), rate=20.0, window=10.0, n_windows=20):
+    print("neurons  legacy (sec)  incremental (sec)  speedup")
+    for n_neuron in n_neurons:
+        legacy_duration = benchmark_add_spikes(legacy_add_spikes, n_neuron, rate, window, n_windows)
+        incremental_duration = benchmark_add_spikes(
+            lambda device, spikes, current_time: device.add_spikes(spikes), n_neuron, rate, window, n_windows)
+        print("%-7d  %12.4f  %17.4f  %7.1f"
+              % (n_neuron, legacy_duration, incremental_duration, legacy_duration / incremental_duration))
+
+
+if __name__ == "__main__":
+    main_benchmark()
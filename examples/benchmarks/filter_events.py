@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from tvb.contrib.scripts.utils.data_structures_utils import ensure_list, flatten_list
+
+from tvb_multiscale.core.utils.data_structures_utils import filter_events
+
+
+def legacy_filter_events(events, variables=None, times=None, exclude_times=[]):
+    """The previous, per event, implementation of filter_events, for comparison."""
+
+    def in_fun(values):
+        if len(values) == 2:
+            if values[0] is not None:
+                if values[1] is not None:
+                    return lambda x: x >= values[0] and x <= values[1]
+                else:
+                    return lambda x: x >= values[0]
+            else:
+                return lambda x: x <= values[1]
+        else:
+            return lambda x: x in values
+
+    if variables is None:
+        variables = events.keys()
+    output_events = OrderedDict()
+    if times is not None and len(times) > 0:
+        in_times = in_fun(flatten_list(times))
+    else:
+        in_times = lambda x: True
+    if exclude_times is not None and len(exclude_times) > 0:
+        not_in_exclude_times = lambda x: not in_fun(flatten_list(exclude_times))(x)
+    else:
+        not_in_exclude_times = lambda x: True
+    inds = np.logical_and(np.ones((len(events["times"]),)),
+                          [in_times(time) and not_in_exclude_times(time) for time in events["times"]])
+    for var in ensure_list(variables):
+        output_events[var] = events[var][inds]
+    return output_events
+
+
+def benchmark_filter(fun, events, n_reps=3, **filter_kwargs):
+    durations = []
+    for _ in range(n_reps):
+        tic = time.time()
+        output = fun(events, **filter_kwargs)
+        durations.append(time.time() - tic)
+    return np.min(durations), len(output["times"])
+
+
+def main_benchmark(n_events=(10 ** 5, 10 ** 7), max_legacy_events=10 ** 5, duration=10000.0, n_neurons=1000,
+                   n_reps=3):
+    cases = OrderedDict([("interval", {"times": [1000.0, 9000.0]}),
+                         ("transient exclusion", {"exclude_times": [None, 1000.0]}),
+                         ("3 intervals", {"times": [(0.0, 1000.0), (4000.0, 5000.0), (8000.0, 9000.0)]}),
+                         ("1000 times", {"times": np.arange(0.0, duration, duration / 1000).tolist()}),
+                         ("interval - 1000 times", {"times": [1000.0, 9000.0],
+                                                    "exclude_times": np.arange(0.0, duration, 10.0).tolist()})])
+    print("events     case                    legacy (sec)  sorted (sec)  unsorted (sec)  speedup  n_output")
+    for n_event in n_events:
+        times = np.round(np.random.uniform(0.0, duration, n_event), 1)
+        sorted_events = {"times": np.sort(times), "senders": np.random.randint(0, n_neurons, n_event)}
+        unsorted_events = {"times": times, "senders": sorted_events["senders"]}
+        for case, filter_kwargs in cases.items():
+            sorted_duration, n_output = benchmark_filter(filter_events, sorted_events, n_reps, **filter_kwargs)
+            unsorted_duration = benchmark_filter(filter_events, unsorted_events, n_reps, **filter_kwargs)[0]
+            if n_event <= max_legacy_events and case not in ["3 intervals", "1000 times"]:
+                legacy_duration = benchmark_filter(legacy_filter_events, sorted_events, 1, **filter_kwargs)[0]
+                speedup = "%7.1f" % (legacy_duration / sorted_duration)
+                legacy_duration = "%12.4f" % legacy_duration
+            else:
+                # The legacy implementation does not support multiple intervals,
+                # and it is O(n_events x n_times) for sets of times:
+                legacy_duration = "%12s" % "-"
+                speedup = "%7s" % "-"
+            print("%-10d %-22s  %s  %12.4f  %14.4f  %s  %d"
+                  % (n_event, case, legacy_duration, sorted_duration, unsorted_duration, speedup, n_output))
+
+
+if __name__ == "__main__":
+    main_benchmark()
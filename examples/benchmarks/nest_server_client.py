@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+import time
+
+import numpy as np
+import requests
+
+from tvb_multiscale.tvb_nest.nest_models.server_client.encoding import JSON_CONTENT_TYPE
+from tvb_multiscale.tvb_nest.nest_models.server_client.nest_server_stub import NESTServerStub
+from tvb_multiscale.tvb_nest.nest_models.server_client.nest_server_client import NESTServerClient
+
+
+def legacy_nest_server_request(url, headers, call, *args, **kwargs):
+    """The previous request, with a new connection per request, and JSON payloads, for comparison."""
+    kwargs.update({'args': args})
+    return requests.post(url + 'api/' + call, json=kwargs, headers=headers).json()
+
+
+def benchmark_nest_server_client(fun, n_reps=10, *args, **kwargs):
+    durations = []
+    for _ in range(n_reps):
+        tic = time.time()
+        fun(*args, **kwargs)
+        durations.append(time.time() - tic)
+    return np.median(durations)
+
+
+def legacy_get_events(nest_client, recorders):
+    return [legacy_nest_server_request(nest_client.url, {'Content-type': JSON_CONTENT_TYPE, 'Accept': 'text/plain'},
+                                       "GetStatus", nest_client._nodes(recorder), "events")[0]
+            for recorder in recorders]
+
+
+def get_events(nest_client, recorders):
+    return [nest_client.get(recorder, "events") for recorder in recorders]
+
+
+def batch_get_events(nest_client, recorders):
+    batch = nest_client.batch()
+    for recorder in recorders:
+        batch.get(recorder, "events")
+    return batch.execute()
+
+
+def main_benchmark(n_recorders=(1, 10, 100), n_neurons=100, rate=20.0, simulation_length=1000.0, n_reps=10):
+    with NESTServerStub() as server:
+        server.kernel.rate = rate
+        json_client = NESTServerClient(host=server.host, port=server.port)
+        binary_client = NESTServerClient(host=server.host, port=server.port, binary=True)
+        print("recorders  spikes    legacy (sec)  session (sec)  batch (sec)  binary batch (sec)  speedup")
+        for n_recorder in n_recorders:
+            recorders = []
+            for _ in range(n_recorder):
+                neurons = json_client.Create("iaf_psc_alpha", n_neurons)
+                recorder = json_client.Create("spike_recorder")
+                json_client.Connect(neurons, recorder)
+                recorders.append(recorder)
+            json_client.Run(simulation_length)
+            n_spikes = np.sum([len(events["times"]) for events in get_events(binary_client, recorders)])
+            legacy_duration = benchmark_nest_server_client(legacy_get_events, n_reps, json_client, recorders)
+            session_duration = benchmark_nest_server_client(get_events, n_reps, json_client, recorders)
+            batch_duration = benchmark_nest_server_client(batch_get_events, n_reps, json_client, recorders)
+            binary_duration = benchmark_nest_server_client(batch_get_events, n_reps, binary_client, recorders)
+            print("%-9d  %-8d  %12.4f  %13.4f  %11.4f  %18.4f  %7.1f"
+                  % (n_recorder, n_spikes, legacy_duration, session_duration, batch_duration, binary_duration,
+                     legacy_duration / binary_duration))
+
+
+if __name__ == "__main__":
+    main_benchmark()
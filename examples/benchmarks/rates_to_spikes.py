@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+import time
+
+import numpy as np
+
+from tvb.basic.profile import TvbProfile
+TvbProfile.set_profile(TvbProfile.LIBRARY_PROFILE)
+
+from tvb_multiscale.core.interfaces.base.transformers.models.elephant import \
+    RatesToSpikesElephantPoisson, RatesToSpikesElephantPoissonMultipleInteraction
+from tvb_multiscale.core.interfaces.base.transformers.models.poisson import \
+    RatesToSpikesPoisson, RatesToSpikesPoissonMultipleInteraction
+
+
+def benchmark_transformer(transformer, rates, n_reps=3):
+    transformer.input_buffer = rates
+    transformer.input_time = np.arange(1, rates.shape[1] + 1)
+    transformer.configure()
+    durations = []
+    for _ in range(n_reps):
+        tic = time.time()
+        spiketrains = transformer._compute(rates)
+        durations.append(time.time() - tic)
+    n_spikes = np.sum([np.sum([len(spiketrain) for spiketrain in proxy_spiketrains])
+                       for proxy_spiketrains in spiketrains])
+    return np.min(durations), n_spikes
+
+
+def main_benchmark(n_proxies=(1, 10, 68), n_neurons=(10, 100), n_steps=10, dt=0.1, rate=10.0,
+                   refractory_period=0.0, n_reps=1):
+    print("proxies neurons  elephant (sec)  numpy (sec)  speedup  elephant/numpy spikes")
+    for transformers in [(RatesToSpikesElephantPoisson, RatesToSpikesPoisson),
+                         (RatesToSpikesElephantPoissonMultipleInteraction, RatesToSpikesPoissonMultipleInteraction)]:
+        print(" vs ".join([transformer.__name__ for transformer in transformers]))
+        for n_proxy in n_proxies:
+            for n_neuron in n_neurons:
+                rates = rate * (1.0 + np.random.uniform(size=(n_proxy, n_steps)))
+                number_of_neurons = n_neuron * np.ones((n_proxy,), dtype="i")
+                results = []
+                for transformer, kwargs in zip(transformers,
+                                               # elephant's refractory_period has to be a quantities.Quantity:
+                                               [{},
+                                                {"refractory_period": refractory_period, "random_seed": 0}]):
+                    results.append(
+                        benchmark_transformer(transformer(dt=dt, number_of_neurons=number_of_neurons, **kwargs),
+                                              rates, n_reps))
+                print("%7d %7d  %14.4f  %11.4f  %7.1f  %d/%d"
+                      % (n_proxy, n_neuron, results[0][0], results[1][0], results[0][0] / results[1][0],
+                         results[0][1], results[1][1]))
+
+
+if __name__ == "__main__":
+    main_benchmark()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+import time
+
+import numpy as np
+
+import ray
+
+from tvb_multiscale.core.ray.client import create_ray_client
+
+
+class Served(object):
+
+    """A stand-in for a served simulator, with some configuration attributes and a cheap method."""
+
+    def __init__(self, n_attrs=10):
+        for i_attr in range(n_attrs):
+            setattr(self, "attr%d" % i_attr, np.arange(10.0) * i_attr)
+        self.n_steps = 0
+
+    def step(self, n_steps=1):
+        self.n_steps += n_steps
+        return self.n_steps
+
+
+def benchmark_ray_client(fun, n_reps=100, *args, **kwargs):
+    durations = []
+    for _ in range(n_reps):
+        tic = time.time()
+        fun(*args, **kwargs)
+        durations.append(time.time() - tic)
+    return np.median(durations)
+
+
+def per_attribute_get(client, attrs):
+    return [getattr(client, attr) for attr in attrs]
+
+
+def per_call_step(client, n_calls):
+    return [client.step(1) for _ in range(n_calls)]
+
+
+def pipelined_step(client, n_calls):
+    pipeline = client.pipeline()
+    for _ in range(n_calls):
+        pipeline.call("step", 1)
+    return pipeline.execute()
+
+
+def main_benchmark(n_attrs=(1, 10, 50), n_reps=100):
+    ray.init(num_cpus=2, include_dashboard=False)
+    try:
+        print("attrs  per-attribute (ms)  get_many (ms)  cached (ms)  "
+              "per-call (ms)  pipelined (ms)  speedup")
+        for n_attr in n_attrs:
+            client = create_ray_client(Served, n_attrs=n_attr)
+            attrs = ["attr%d" % i_attr for i_attr in range(n_attr)]
+            per_attribute_duration = benchmark_ray_client(per_attribute_get, n_reps, client, attrs)
+            get_many_duration = benchmark_ray_client(client.get_many, n_reps, *attrs)
+            client.cache_attributes(*attrs)
+            client.get_many(*attrs)
+            cached_duration = benchmark_ray_client(per_attribute_get, n_reps, client, attrs)
+            per_call_duration = benchmark_ray_client(per_call_step, n_reps, client, n_attr)
+            pipelined_duration = benchmark_ray_client(pipelined_step, n_reps, client, n_attr)
+            print("%-5d  %18.3f  %13.3f  %11.4f  %13.3f  %14.3f  %7.1f"
+                  % (n_attr, 1000 * per_attribute_duration, 1000 * get_many_duration, 1000 * cached_duration,
+                     1000 * per_call_duration, 1000 * pipelined_duration,
+                     per_attribute_duration / get_many_duration))
+            ray.kill(client.ray_server)
+    finally:
+        ray.shutdown()
+
+
+if __name__ == "__main__":
+    main_benchmark()
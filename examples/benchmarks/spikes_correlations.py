@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+import time
+
+import numpy as np
+from xarray import DataArray
+
+from tvb.basic.profile import TvbProfile
+TvbProfile.set_profile(TvbProfile.LIBRARY_PROFILE)
+
+from tvb_multiscale.core.data_analysis.spiking_network_analyser import SpikingNetworkAnalyser
+from tvb_multiscale.core.utils.data_structures_utils import cross_dimensions_and_coordinates_MultiIndex
+
+
+def legacy_spikes_correlations(spikes_trains, pop_labels, pop_reg_labels, all_regions_labels, binsize, duration):
+    """The previous computation, with elephant BinnedSpikeTrain instances
+       and a pandas.MultiIndex xarray.DataArray filled with .loc and unstacked, for comparison."""
+    from quantities import ms
+    from neo.core import SpikeTrain
+    from elephant.conversion import BinnedSpikeTrain
+    from elephant.spike_train_correlation import correlation_coefficient
+    binned_spikes_trains = BinnedSpikeTrain([SpikeTrain(spikes * ms, t_start=0.0 * ms, t_stop=duration * ms)
+                                             for spikes in spikes_trains],
+                                            bin_size=binsize * ms, t_start=0.0 * ms, t_stop=duration * ms)
+    corr = correlation_coefficient(binned_spikes_trains)
+    dims, coords = cross_dimensions_and_coordinates_MultiIndex(["Population", "Region"],
+                                                               pop_labels, all_regions_labels)
+    n_cross_dims = len(pop_labels) * len(all_regions_labels)
+    result = DataArray(np.nan * np.ones((n_cross_dims, n_cross_dims)), dims=dims, coords=coords)
+    result.loc[pop_reg_labels, pop_reg_labels] = corr
+    result = result.unstack(dims)
+    temp_dims = list(result.dims)
+    return result.transpose(*tuple(temp_dims[0::2] + temp_dims[1::2]))
+
+
+def benchmark_correlations(fun, n_reps=3, *args, **kwargs):
+    durations = []
+    for _ in range(n_reps):
+        tic = time.time()
+        fun(*args, **kwargs)
+        durations.append(time.time() - tic)
+    return np.min(durations)
+
+
+def main_benchmark(n_regions=(10, 50, 200), n_populations=2, rate=20.0, duration=10000.0, binsize=10.0,
+                   n_neurons=100, n_reps=3):
+    analyser = SpikingNetworkAnalyser(start_time=0.0, end_time=duration, period=binsize,
+                                      elephant=False, pyspike=False)
+    print("trains  spikes      legacy (sec)  native (sec)  speedup")
+    for n_region in n_regions:
+        pop_labels = ["pop%d" % i_pop for i_pop in range(n_populations)]
+        all_regions_labels = ["reg%d" % i_reg for i_reg in range(n_region)]
+        pop_reg_labels = [(pop_label, reg_label) for pop_label in pop_labels for reg_label in all_regions_labels]
+        n_spikes = int(rate * n_neurons * duration / 1000.0)
+        spikes_trains = [np.sort(np.random.uniform(0.0, duration, n_spikes)) for _ in pop_reg_labels]
+        legacy_duration = benchmark_correlations(legacy_spikes_correlations, 1,
+                                                 spikes_trains, pop_labels, pop_reg_labels, all_regions_labels,
+                                                 binsize, duration)
+        native_duration = benchmark_correlations(analyser._compute_spikes_correlations_from_spikes_trains, n_reps,
+                                                 spikes_trains, pop_labels, pop_reg_labels, all_regions_labels,
+                                                 bin_kwargs={"binsize": binsize})
+        print("%-7d %-10d  %12.4f  %12.4f  %7.1f"
+              % (len(spikes_trains), len(spikes_trains) * n_spikes,
+                 legacy_duration, native_duration, legacy_duration / native_duration))
+
+
+if __name__ == "__main__":
+    main_benchmark()
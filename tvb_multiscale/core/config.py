@@ -135,6 +135,10 @@ class Config(HasTraits):
 
     VERBOSITY = 1
 
+    # Per-phase timing of cosimulation runs (see tvb_multiscale.core.utils.profiling_utils):
+    PROFILING = False
+    PROFILING_BUFFER_SIZE = 100000
+
     DEFAULT_DT = 0.1
     TVB_TO_SPIKING_DT_RATIO = 2
     MIN_SPIKING_DT = 0.001
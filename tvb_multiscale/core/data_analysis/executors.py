@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+import numpy as np
+from pandas import Series
+from xarray import DataArray
+from six import string_types
+
+
+EXECUTORS = ("serial", "thread", "process")
+
+
+class SharedArray(object):
+
+    """SharedArray class to pass a numeric numpy array to a worker process via a multiprocessing.shared_memory block,
+       instead of pickling it."""
+
+    def __init__(self, array):
+        array = np.ascontiguousarray(array)
+        self.shape = array.shape
+        self.dtype = array.dtype.str
+        # multiprocessing.shared_memory is available only for python >= 3.8:
+        from multiprocessing import shared_memory
+        self.shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        self.name = self.shm.name
+        np.ndarray(array.shape, dtype=array.dtype, buffer=self.shm.buf)[()] = array
+
+    def __getstate__(self):
+        return {"shape": self.shape, "dtype": self.dtype, "name": self.name, "shm": None}
+
+    def get(self):
+        """Method to be called by the worker, to get a copy of the array, and detach from the shared memory block."""
+        from multiprocessing import shared_memory
+        try:
+            shm = shared_memory.SharedMemory(name=self.name, track=False)
+        except TypeError:
+            # python < 3.13: the resource tracker is the one of the parent process, which has registered the block:
+            shm = shared_memory.SharedMemory(name=self.name)
+        array = np.array(np.ndarray(self.shape, dtype=np.dtype(self.dtype), buffer=shm.buf))
+        shm.close()
+        return array
+
+    def unlink(self):
+        """Method to be called by the parent process, to release the shared memory block."""
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+
+class SharedDataArray(object):
+
+    """SharedDataArray class to pass a xarray.DataArray to a worker process, with its values in a SharedArray."""
+
+    def __init__(self, data_array):
+        self.values = SharedArray(data_array.values)
+        self.dims = data_array.dims
+        self.coords = data_array.coords
+        self.name = data_array.name
+        self.attrs = data_array.attrs
+
+    def get(self):
+        return DataArray(self.values.get(), dims=self.dims, coords=self.coords, name=self.name, attrs=self.attrs)
+
+    def unlink(self):
+        self.values.unlink()
+
+
+def _is_shareable(array, min_nbytes):
+    return array.dtype.kind in "biuf" and array.nbytes >= min_nbytes
+
+
+def data_to_shared_memory(data, shared_arrays, min_nbytes=0):
+    """Function to replace the numeric numpy arrays of (possibly nested dicts, pandas.Series
+       or xarray.DataArray instances of) data by SharedArray or SharedDataArray instances,
+       which are also appended to the shared_arrays list."""
+    if isinstance(data, np.ndarray) and _is_shareable(data, min_nbytes):
+        shared_arrays.append(SharedArray(data))
+        return shared_arrays[-1]
+    if isinstance(data, DataArray) and _is_shareable(data.values, min_nbytes):
+        shared_arrays.append(SharedDataArray(data))
+        return shared_arrays[-1]
+    if isinstance(data, Series) and data.dtype == object:
+        return Series(dict([(key, data_to_shared_memory(val, shared_arrays, min_nbytes))
+                            for key, val in data.items()]), name=data.name, dtype=object)
+    if isinstance(data, dict):
+        return data.__class__([(key, data_to_shared_memory(val, shared_arrays, min_nbytes))
+                               for key, val in data.items()])
+    return data
+
+
+def data_from_shared_memory(data):
+    """Function to substitute back the SharedArray and SharedDataArray instances of data by copies of their data."""
+    if isinstance(data, (SharedArray, SharedDataArray)):
+        return data.get()
+    if isinstance(data, Series) and data.dtype == object:
+        return Series(dict([(key, data_from_shared_memory(val)) for key, val in data.items()]),
+                      name=data.name, dtype=object)
+    if isinstance(data, dict):
+        return data.__class__([(key, data_from_shared_memory(val)) for key, val in data.items()])
+    return data
+
+
+_WORKER_ANALYSER = None
+
+
+def _initialize_worker(analyser):
+    global _WORKER_ANALYSER
+    _WORKER_ANALYSER = analyser
+
+
+def _compute_region_outputs_in_worker(data, population_size, computation_methods, computations_kwargs):
+    computation_methods = [getattr(_WORKER_ANALYSER, method) if isinstance(method, string_types) else method
+                           for method in computation_methods]
+    return _WORKER_ANALYSER._compute_region_outputs(data_from_shared_memory(data), population_size,
+                                                    computation_methods, computations_kwargs)
+
+
+class RegionsExecutor(object):
+
+    """RegionsExecutor class to execute the computations of a SpikingNetworkAnalyser on the data of every region
+       in a pool of threads or processes.
+       For a pool of processes, the analyser is passed to every worker once, upon its initialization,
+       the computations' methods of the analyser are passed by name,
+       and the numeric arrays of the data larger than min_shared_memory_nbytes via shared memory blocks,
+       which are released when the executor is shut down.
+    """
+
+    def __init__(self, analyser, executor="thread", max_workers=0, min_shared_memory_nbytes=2 ** 16):
+        if executor not in EXECUTORS[1:]:
+            raise ValueError("executor %s is not one of %s!" % (str(executor), str(EXECUTORS[1:])))
+        self.analyser = analyser
+        self.executor = executor
+        self.max_workers = max_workers or os.cpu_count()
+        self.min_shared_memory_nbytes = min_shared_memory_nbytes
+        self._shared_arrays = []
+        if executor == "thread":
+            self._pool = ThreadPoolExecutor(self.max_workers)
+        else:
+            self._pool = ProcessPoolExecutor(self.max_workers,
+                                             initializer=_initialize_worker, initargs=(analyser,))
+
+    def _method_to_worker(self, method):
+        # Methods of the analyser are passed by name, any other function has to be picklable:
+        name = getattr(method, "__name__", None)
+        try:
+            if name and getattr(self.analyser, name) == method:
+                return name
+        except Exception:
+            pass
+        try:
+            pickle.dumps(method)
+        except Exception as e:
+            raise ValueError("Computation method %s cannot be passed to a worker process!\n%s" % (str(method), str(e)))
+        return method
+
+    def submit(self, data, population_size, computation_methods, computations_kwargs):
+        """Method to submit the computations of a region's data, returning a concurrent.futures.Future."""
+        if self.executor == "thread":
+            return self._pool.submit(self.analyser._compute_region_outputs,
+                                     data, population_size, computation_methods, computations_kwargs)
+        return self._pool.submit(_compute_region_outputs_in_worker,
+                                 data_to_shared_memory(data, self._shared_arrays, self.min_shared_memory_nbytes),
+                                 population_size,
+                                 [self._method_to_worker(method) for method in computation_methods],
+                                 computations_kwargs)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True)
+        while len(self._shared_arrays):
+            self._shared_arrays.pop().unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
@@ -0,0 +1,316 @@
+# -*- coding: utf-8 -*-
+
+from collections import OrderedDict
+
+import numpy as np
+from pandas import Series
+from xarray import DataArray
+
+from tvb.basic.neotraits.api import Attr
+
+from tvb_multiscale.core.data_analysis.spiking_network_analyser import SpikingNetworkAnalyser
+from tvb_multiscale.core.utils.data_structures_utils import get_ordered_dimensions
+
+
+class OnlineSpikingNetworkAnalyser(SpikingNetworkAnalyser):
+
+    """OnlineSpikingNetworkAnalyser class
+       - subscribes to the spikes' recording and continuous time data recording devices of a SpikingNetwork,
+       - reads only their new events, upon every call of the update() method,
+         e.g., at every synchronization step of a cosimulation,
+         via its own read cursors, i.e., without consuming the new events of the devices,
+         which are left for the other readers, e.g., the interfaces of a cosimulation,
+       - updates running accumulators of
+         the spikes' counts per sampling period bin, for the populations' rates' time series,
+         the total spikes' counts, for the populations' mean rates,
+         the Welford sums of the completed bins, for the covariances and correlation coefficients among populations,
+         and the sums of the continuous time variables, for the populations' mean fields,
+       - optionally drains the devices' events' buffers from the events already consumed,
+         both by the analyser and by the other readers of the new events of the devices,
+         so that the memory stays flat during long simulations,
+         at the cost of losing the devices' events' history,
+       - and returns the results at any time, in the same structures as the SpikingNetworkAnalyser does
+         at the end of a simulation.
+       The bin size is the sampling period, and bins start from start_time + transient.
+    """
+
+    drain_devices = Attr(field_type=bool, default=False, required=True,
+                         label="Flag to drain the devices' events",
+                         doc="""If drain_devices is True, the events consumed by the analyser,
+                                and returned as new events by the devices,
+                                are discarded from the devices' events' buffers,
+                                which, then, do not hold the devices' events' history anymore.
+                                Default = False.""")
+
+    time = 0.0
+
+    _spikes_devices = []
+    _continuous_devices = []
+    _spikes_cursors = None
+    _continuous_cursors = None
+    _counts = None
+    _n_bins = 0
+    _n_spikes = None
+    _n_welford_bins = 0
+    _welford_mean = None
+    _welford_M2 = None
+    _continuous_sums = []
+    _continuous_counts = None
+    _variables = []
+
+    def __init__(self, spikeNet=None, elephant=False, pyspike=False, **kwargs):
+        super(OnlineSpikingNetworkAnalyser, self).__init__(spikeNet=spikeNet, elephant=elephant,
+                                                           pyspike=pyspike, **kwargs)
+        self._spikes_devices = []
+        self._continuous_devices = []
+        self.reset()
+
+    def reset(self):
+        """Method to reset all accumulators and the time, without unsubscribing from the devices."""
+        n_trains = len(self._spikes_devices)
+        self.time = self.t_start
+        self._spikes_cursors = [0] * n_trains
+        self._continuous_cursors = [0] * len(self._continuous_devices)
+        self._counts = np.zeros((n_trains, 0))
+        self._n_bins = 0
+        self._n_spikes = np.zeros((n_trains, ))
+        self._n_welford_bins = 0
+        self._welford_mean = np.zeros((n_trains, ))
+        self._welford_M2 = np.zeros((n_trains, n_trains))
+        self._continuous_sums = [None] * len(self._continuous_devices)
+        self._continuous_counts = np.zeros((len(self._continuous_devices), ))
+        self._variables = [None] * len(self._continuous_devices)
+
+    @property
+    def t_start(self):
+        return (self.start_time or 0.0) + self.transient
+
+    @staticmethod
+    def _devices_list(devices):
+        # Flatten a Series of populations' DeviceSets to a list of ((Population, Region), device) tuples:
+        devices_list = []
+        for pop_label, pop_devices in devices.items():
+            for reg_label, device in pop_devices.items():
+                devices_list.append(((pop_label, reg_label), device))
+        return devices_list
+
+    def subscribe(self, spikes_devices=None, continuous_devices=None, populations_devices=None, regions=None):
+        """Method to subscribe to the devices the new events of which will be read upon every update.
+           Arguments:
+            - spikes_devices: a Series of populations' spikes' recording DeviceSets.
+                              Default = None, in which case they are taken from the SpikingNetwork.
+            - continuous_devices: a Series of populations' continuous time data recording DeviceSets.
+                                  Default = None, in which case they are taken from the SpikingNetwork.
+            - populations_devices: a list of selected populations' DeviceSets labels (strings),
+                                   for devices taken from the SpikingNetwork. By default all.
+            - regions: a list of selected regions labels (strings),
+                       for devices taken from the SpikingNetwork. By default all.
+        """
+        if spikes_devices is None:
+            spikes_devices = Series(dtype="object") if self.spikeNet is None else \
+                self.spikeNet.get_spikes_devices(populations_devices=populations_devices, regions=regions)
+        if continuous_devices is None:
+            continuous_devices = Series(dtype="object") if self.spikeNet is None else \
+                self.spikeNet.get_continuous_time_devices(populations_devices=populations_devices, regions=regions)
+        self._spikes_devices = self._devices_list(spikes_devices)
+        self._continuous_devices = self._devices_list(continuous_devices)
+        self.reset()
+
+    def _read_new_events(self, device, cursors, i_dev):
+        """Method to read the events of a device after the analyser's own cursor, and advance the latter,
+           without moving the read cursor of the device's new events."""
+        events_buffer = device._update_events_buffer()
+        if events_buffer.number_of_events:
+            events = events_buffer.get(cursors[i_dev])
+            cursors[i_dev] = events_buffer.number_of_events
+            if self.drain_devices:
+                events_buffer.drain(cursors[i_dev])
+            return events
+        # Devices that do not hold their events in an events' buffer:
+        events = device.events
+        n_events = len(events["times"])
+        events = dict([(key, np.asarray(val)[cursors[i_dev]:]) for key, val in events.items()])
+        cursors[i_dev] = n_events
+        return events
+
+    def _select_times(self, times):
+        inds = times >= self.t_start
+        if self.end_time is not None:
+            inds = np.logical_and(inds, times <= self.end_time)
+        return inds
+
+    def _update_spikes(self):
+        for i_train, (_, device) in enumerate(self._spikes_devices):
+            times = np.asarray(self._read_new_events(device, self._spikes_cursors, i_train)["times"], dtype="f8")
+            times = times[self._select_times(times)]
+            if times.size == 0:
+                continue
+            bins = np.floor((times - self.t_start) / self.period + 1e-8).astype("i8")
+            first_bin = bins.min()
+            counts = np.bincount(bins - first_bin)
+            self._allocate_bins(first_bin + counts.size)
+            self._counts[i_train, first_bin:first_bin + counts.size] += counts
+            self._n_spikes[i_train] += times.size
+
+    def _allocate_bins(self, n_bins):
+        if n_bins > self._counts.shape[1]:
+            # Grow the capacity of the counts' array by doubling:
+            capacity = max(self._counts.shape[1], 1)
+            while capacity < n_bins:
+                capacity *= 2
+            counts = np.zeros((self._counts.shape[0], capacity))
+            counts[:, :self._n_bins] = self._counts[:, :self._n_bins]
+            self._counts = counts
+        self._n_bins = max(self._n_bins, n_bins)
+
+    def _update_welford(self):
+        """Method to add the bins completed up to the current time to the Welford sums,
+           merging them as a batch (Chan et al.'s parallel algorithm)."""
+        n_complete_bins = int(np.floor((self.time - self.t_start) / self.period + 1e-8))
+        if n_complete_bins <= self._n_welford_bins:
+            return
+        self._allocate_bins(n_complete_bins)
+        batch = self._counts[:, self._n_welford_bins:n_complete_bins]
+        n_batch = batch.shape[1]
+        batch_mean = batch.mean(axis=1)
+        batch = batch - batch_mean[:, None]
+        n = self._n_welford_bins + n_batch
+        delta = batch_mean - self._welford_mean
+        self._welford_M2 += batch @ batch.T + np.outer(delta, delta) * self._n_welford_bins * n_batch / n
+        self._welford_mean += delta * n_batch / n
+        self._n_welford_bins = n
+
+    def _update_continuous(self):
+        for i_dev, (_, device) in enumerate(self._continuous_devices):
+            events = self._read_new_events(device, self._continuous_cursors, i_dev)
+            times = np.asarray(events["times"], dtype="f8")
+            inds = self._select_times(times)
+            if self._variables[i_dev] is None:
+                self._variables[i_dev] = [var for var in events.keys() if var not in ["times", "senders"]]
+                self._continuous_sums[i_dev] = np.zeros((len(self._variables[i_dev]),))
+            if not np.any(inds):
+                continue
+            for i_var, var in enumerate(self._variables[i_dev]):
+                self._continuous_sums[i_dev][i_var] += np.sum(np.asarray(events[var])[inds])
+            self._continuous_counts[i_dev] += np.sum(inds)
+
+    def update(self, time=None):
+        """Method to read the new events of all subscribed devices and update the accumulators.
+           Arguments:
+            - time: the current time (float, ms) of the simulation,
+                    up to which the spikes' counts' bins are complete.
+                    Default = None, in which case the time of the last complete bin of the events read is used.
+        """
+        self._update_spikes()
+        self._update_continuous()
+        if time is None:
+            time = self.t_start + max(self._n_bins - 1, 0) * self.period
+        self.time = max(self.time, time)
+        self._update_welford()
+
+    def online_simulate(self, simulate_fun):
+        """Method to wrap a function simulating the spiking network for a simulation length (ms),
+           e.g., the simulate_spiking_simulator of a CoSimulatorSerial, so that it updates the analyser upon return."""
+        analyser = self
+
+        def simulate(simulation_length, *args, **kwargs):
+            output = simulate_fun(simulation_length, *args, **kwargs)
+            analyser.update(analyser.time + simulation_length)
+            return output
+
+        return simulate
+
+    def _pops_regs_labels(self, devices):
+        pop_labels = []
+        reg_labels = []
+        for (pop_label, reg_label), _ in devices:
+            if pop_label not in pop_labels:
+                pop_labels.append(pop_label)
+            if reg_label not in reg_labels:
+                reg_labels.append(reg_label)
+        pop_inds = np.array([pop_labels.index(pop_label) for (pop_label, _), _ in devices], dtype="i8")
+        reg_inds = np.array([reg_labels.index(reg_label) for (_, reg_label), _ in devices], dtype="i8")
+        return pop_labels, reg_labels, pop_inds, reg_inds
+
+    @property
+    def _number_of_neurons(self):
+        return np.array([float(device.number_of_neurons) for _, device in self._spikes_devices])
+
+    def get_mean_rates(self):
+        """Method to return the populations' mean spikes' rates (Hz) up to the current time,
+           in a xarray.DataArray of dimensions (Population, Region)."""
+        pop_labels, reg_labels, pop_inds, reg_inds = self._pops_regs_labels(self._spikes_devices)
+        duration = self.time - self.t_start
+        if self.end_time is not None:
+            duration = min(duration, self.end_time - self.t_start)
+        result = np.full((len(pop_labels), len(reg_labels)), np.nan)
+        if duration > 0.0:
+            result[pop_inds, reg_inds] = 1000.0 * self._n_spikes / duration / self._number_of_neurons
+        return DataArray(result, name="Mean Populations' Spikes' Rates", dims=["Population", "Region"],
+                         coords={"Population": pop_labels, "Region": reg_labels})
+
+    def get_mean_rates_time_series(self):
+        """Method to return the populations' mean spikes' rates' (Hz) time series, per sampling period bin,
+           in a xarray.DataArray of dimensions (Time, Population, Region)."""
+        pop_labels, reg_labels, pop_inds, reg_inds = self._pops_regs_labels(self._spikes_devices)
+        result = np.full((self._n_bins, len(pop_labels), len(reg_labels)), np.nan)
+        result[:, pop_inds, reg_inds] = \
+            (1000.0 / self.period) * self._counts[:, :self._n_bins].T / self._number_of_neurons[None, :]
+        return DataArray(result, name="Mean Populations' Spikes' Rates' Time Series",
+                         dims=["Time", "Population", "Region"],
+                         coords={"Time": self.t_start + self.period * np.arange(self._n_bins),
+                                 "Population": pop_labels, "Region": reg_labels})
+
+    def get_spikes_correlations(self, method="correlation_coefficient"):
+        """Method to return the correlation coefficients, or covariances, if method="covariance",
+           of the populations' spikes' counts of the bins completed up to the current time,
+           in a xarray.DataArray of dimensions (Population_i, Population_j, Region_i, Region_j).
+        """
+        pop_labels, reg_labels, pop_inds, reg_inds = self._pops_regs_labels(self._spikes_devices)
+        result = self._welford_M2 / max(self._n_welford_bins - 1, 1)
+        if method == "covariance":
+            name = "Populations' Covariance"
+        else:
+            name = "Populations' Correlation Coefficient"
+            variances = np.diag(result).copy()
+            # Spikes' trains of zero variance result in NaN values, as for numpy.corrcoef:
+            variances[variances <= 0.0] = np.nan
+            std = np.sqrt(variances)
+            result = result / np.outer(std, std)
+        output = np.full((len(pop_labels), len(pop_labels), len(reg_labels), len(reg_labels)), np.nan)
+        output[pop_inds[:, None], pop_inds[None, :], reg_inds[:, None], reg_inds[None, :]] = result
+        dims = ["Population_i", "Population_j", "Region_i", "Region_j"]
+        return DataArray(output, name=name, dims=dims,
+                         coords={dims[0]: pop_labels, dims[1]: pop_labels, dims[2]: reg_labels, dims[3]: reg_labels})
+
+    def get_mean_field(self):
+        """Method to return the populations' mean fields (mean across time and neurons)
+           of the continuous time variables up to the current time,
+           in a xarray.DataArray of dimensions (Variable, Region, Population)."""
+        pop_labels, reg_labels, pop_inds, reg_inds = self._pops_regs_labels(self._continuous_devices)
+        variables = []
+        for device_variables in self._variables:
+            for var in device_variables or []:
+                if var not in variables:
+                    variables.append(var)
+        result = np.full((len(pop_labels), len(reg_labels), len(variables)), np.nan)
+        for i_dev, device_variables in enumerate(self._variables):
+            if device_variables and self._continuous_counts[i_dev]:
+                vars_inds = [variables.index(var) for var in device_variables]
+                result[pop_inds[i_dev], reg_inds[i_dev], vars_inds] = \
+                    self._continuous_sums[i_dev] / self._continuous_counts[i_dev]
+        result = DataArray(result, name="Populations' Mean Field", dims=["Population", "Region", "Variable"],
+                           coords={"Population": pop_labels, "Region": reg_labels, "Variable": variables})
+        return result.transpose(*get_ordered_dimensions(list(result.dims),
+                                                        ["Time", "Variable", "Region", "Population", "Neuron"]))
+
+    def get_results(self):
+        """Method to return all results up to the current time in an OrderedDict."""
+        results = OrderedDict()
+        if len(self._spikes_devices):
+            results["mean_rate"] = self.get_mean_rates()
+            results["mean_rate_time_series"] = self.get_mean_rates_time_series()
+            results["spikes_correlation_coefficient"] = self.get_spikes_correlations()
+        if len(self._continuous_devices):
+            results["mean_field"] = self.get_mean_field()
+        return results
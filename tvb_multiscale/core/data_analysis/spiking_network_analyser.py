@@ -4,13 +4,16 @@ from six import string_types
 from collections import OrderedDict
 
 import numpy as np
+from scipy.sparse import csr_matrix
 from pandas import Series
 from xarray import DataArray
 
+from tvb.basic.neotraits.api import Attr, Int
+
 from tvb_multiscale.core.data_analysis.spiking_network_analyser_base import \
     SpikingNetworkAnalyserBase, _get_safely_list_item
-from tvb_multiscale.core.utils.data_structures_utils import \
-    cross_dimensions_and_coordinates_MultiIndex, get_ordered_dimensions
+from tvb_multiscale.core.data_analysis.executors import EXECUTORS, RegionsExecutor
+from tvb_multiscale.core.utils.data_structures_utils import get_ordered_dimensions
 
 from tvb.contrib.scripts.utils.data_structures_utils import \
     ensure_list, concatenate_heterogeneous_DataArrays
@@ -19,12 +22,34 @@ from tvb.contrib.scripts.datatypes.time_series_xarray import TimeSeries, TimeSer
 
 class SpikingNetworkAnalyser(SpikingNetworkAnalyserBase):
 
+    executor = Attr(field_type=str, default="serial", required=True, choices=EXECUTORS,
+                    label="Executor of the regions' computations",
+                    doc="""The executor of the computations of every population's region, 
+                           either "serial" (Default), in the main process, 
+                           or in a pool of "thread" or "process" workers. 
+                           For "process" workers, the data are passed via shared memory blocks.""")
+
+    max_workers = Int(default=0, required=True,
+                      label="Number of workers",
+                      doc="""The number of workers of a "thread" or "process" executor. 
+                             Default = 0, for as many workers as CPUs.""")
+
     elephant_analyser = None
     pyspike_analyser = None
 
+    # If True, the spikes' correlations are computed natively, on sparse binned spikes' counts,
+    # instead of using elephant BinnedSpikeTrain instances:
+    native_correlations = False
+
+    _native_correlations_methods = ["spikes_correlation_coefficient", "spikes_covariance"]
+
+    # Fraction of nonzero bins above which binned spikes' counts are computed and multiplied as dense arrays:
+    _dense_binned_spikes_counts_ratio = 0.1
+
     def __init__(self, elephant=True, pyspike=True, **kwargs):
         super(SpikingNetworkAnalyser, self).__init__(**kwargs)
         self.configure()
+        self.native_correlations = not elephant
         if elephant:
             from tvb_multiscale.tvb_elephant.spiking_network_analyser \
                 import SpikingNetworkAnalyser as SpikingNetworkAnalyserElephant
@@ -35,7 +60,10 @@ class SpikingNetworkAnalyser(SpikingNetworkAnalyserBase):
             self.pyspike_analyser = SpikingNetworkAnalyserPySpike().from_instance(self, **kwargs)
 
     def __getattr__(self, attr):
-        if hasattr(SpikingNetworkAnalyser, attr):
+        if attr.startswith("__") and attr.endswith("__"):
+            # Special attributes, e.g., looked up upon (un)pickling, are not delegated:
+            raise AttributeError(attr)
+        if hasattr(type(self), attr):
             return SpikingNetworkAnalyserBase.__getattr__(self, attr)
         else:
             try:
@@ -72,7 +100,7 @@ class SpikingNetworkAnalyser(SpikingNetworkAnalyserBase):
             setattr(self.pyspike_analyser, attr, val)
 
     def __setattr__(self, attr, val):
-        if hasattr(SpikingNetworkAnalyser, attr):
+        if hasattr(type(self), attr):
             # If it is a common attribute:
             SpikingNetworkAnalyserBase.__setattr__(self, attr, val)
             if attr != "gid":
@@ -104,7 +132,7 @@ class SpikingNetworkAnalyser(SpikingNetworkAnalyserBase):
 
     def _regions_generator(self, reg_device_or_data, population_sizes=[],
                            computation_methods=[lambda x, **kwargs: x], computations_kwargs=[{}],
-                           data_method=lambda x, **kwargs: x, data_kwargs={}):
+                           data_method=lambda x, **kwargs: x, data_kwargs={}, executor=None):
         """A generator method to loop over the regions devices of a populations' DeviceSet or the respective data,
            in order to apply a list of computations methods.
            Arguments:
@@ -126,6 +154,9 @@ class SpikingNetworkAnalyser(SpikingNetworkAnalyserBase):
                            to load data from recording Device or a file (TODO).
                            Default = lambda x, **kwargs, assuming that reg_device_or_data already comprises of the data.
             - data_kwargs={}: a dictionary of potential keyword arguments to be passed to the data_method.
+            - executor=None: a RegionsExecutor instance, to which the computations are submitted,
+                             in which case concurrent.futures.Future instances of the outputs are yielded.
+                             Default = None, for computing the outputs serially.
 
         """
         computation_methods = ensure_list(computation_methods)
@@ -138,37 +169,56 @@ class SpikingNetworkAnalyser(SpikingNetworkAnalyserBase):
             # ...get the number of neurons...
             population_size = data.get("number_of_neurons",
                                        self._get_safely_population_size(i_reg, population_sizes))
-            # ...initialize an outputs' OrderedDict...
-            outputs = OrderedDict()
-            # ...we have to return the data as well...
-            if self.return_data:
-                # ...populate the outputs' dict with the name of the data...
-                outputs["data_name"] = data["data_name"]
-                # ...and the data itself...
-                outputs[outputs["data_name"]] = data[data["data_name"]]
-            # ...now loop for every computation method to be applied...:
-            for i_comput, computation_method in enumerate(computation_methods):
-                # ...set the data for this computation...
-                this_data = data[data["data_name"]]
-                # ...but this is a method applied on spikes...
-                if computation_method.__name__.find("rate") > -1:
-                    # ...check whether a Spikes Train (Elephant/neo) has already being computed,
-                    # to not repeat this computation...
-                    this_data = outputs.get(self.spikes_train_name, this_data)
-                if computation_method.__name__.find("spikes_co") > -1:
-                    # ...check whether a BinnedSpikesTrain (Elephant/neo) has already being computed,
-                    # to not repeat this computation...
-                    this_data = outputs.get(self.binned_spikes_trains_name, this_data)
-                elif computation_method.__name__.find("spikes") > -1:
-                    # ...check whether a collection of SpikesTrain (PySpike) has already being computed,
-                    # to not repeat this computation...
-                    this_data = outputs.get(self.spikes_trains_name, this_data)
-                # ...and eventually call the computation and collect the results:
-                outputs.update(computation_method(this_data, number_of_neurons=population_size,
-                                                  **self._get_safely_computation_kwargs(i_comput, computations_kwargs)))
+            if executor is None:
+                # ...compute the outputs' dictionary...
+                outputs = self._compute_region_outputs(data, population_size,
+                                                       computation_methods, computations_kwargs)
+            else:
+                # ...or submit their computation, to be collected later on, by calling the result() method:
+                outputs = executor.submit(data, population_size, computation_methods, computations_kwargs)
             # ...finally yield the region label and the the outputs dictionary:
             yield reg_label, outputs
 
+    def _compute_region_outputs(self, data, population_size, computation_methods, computations_kwargs):
+        """A method to apply a list of computations methods to the data of a region.
+           Arguments:
+            - data: a dictionary of data loaded from a region recording Device
+            - population_size: the number of neurons of the region's population
+            - computations_methods: a list of SpikingNetworkAnalyserBase class' "compute_" methods
+            - computations_kwargs: a list of keyword arguments dictionaries
+           Returns:
+            - the outputs' OrderedDict
+        """
+        # ...initialize an outputs' OrderedDict...
+        outputs = OrderedDict()
+        # ...we have to return the data as well...
+        if self.return_data:
+            # ...populate the outputs' dict with the name of the data...
+            outputs["data_name"] = data["data_name"]
+            # ...and the data itself...
+            outputs[outputs["data_name"]] = data[data["data_name"]]
+        # ...now loop for every computation method to be applied...:
+        for i_comput, computation_method in enumerate(computation_methods):
+            # ...set the data for this computation...
+            this_data = data[data["data_name"]]
+            # ...but this is a method applied on spikes...
+            if computation_method.__name__.find("rate") > -1:
+                # ...check whether a Spikes Train (Elephant/neo) has already being computed,
+                # to not repeat this computation...
+                this_data = outputs.get(self.spikes_train_name, this_data)
+            if computation_method.__name__.find("spikes_co") > -1:
+                # ...check whether a BinnedSpikesTrain (Elephant/neo) has already being computed,
+                # to not repeat this computation...
+                this_data = outputs.get(self.binned_spikes_trains_name, this_data)
+            elif computation_method.__name__.find("spikes") > -1:
+                # ...check whether a collection of SpikesTrain (PySpike) has already being computed,
+                # to not repeat this computation...
+                this_data = outputs.get(self.spikes_trains_name, this_data)
+            # ...and eventually call the computation and collect the results:
+            outputs.update(computation_method(this_data, number_of_neurons=population_size,
+                                              **self._get_safely_computation_kwargs(i_comput, computations_kwargs)))
+        return outputs
+
     def _populations_generator(self, pop_device_or_data, populations_sizes=[],
                                computation_methods=[lambda x, **kwargs: x], computation_kwargs=[{}],
                                data_method=lambda x, **kwargs: x, data_kwargs={}):
@@ -197,18 +247,48 @@ class SpikingNetworkAnalyser(SpikingNetworkAnalyserBase):
             - data_kwargs={}: a dictionary of potential keyword arguments to be passed to the data_method.
 
         """
+        if self.executor != "serial":
+            with RegionsExecutor(self, self.executor, self.max_workers) as executor:
+                for pop_label, pop_results in \
+                        self._populations_results(pop_device_or_data, populations_sizes,
+                                                  computation_methods, computation_kwargs,
+                                                  data_method, data_kwargs, executor):
+                    yield pop_label, pop_results
+        else:
+            for pop_label, pop_results in \
+                    self._populations_results(pop_device_or_data, populations_sizes,
+                                              computation_methods, computation_kwargs,
+                                              data_method, data_kwargs):
+                yield pop_label, pop_results
+
+    def _populations_results(self, pop_device_or_data, populations_sizes=[],
+                             computation_methods=[lambda x, **kwargs: x], computation_kwargs=[{}],
+                             data_method=lambda x, **kwargs: x, data_kwargs={}, executor=None):
+        """A generator method to collect the results of the computations of the _regions_generator() method,
+           for a set of populations' DeviceSets or the respective data.
+           If an executor is given, the computations of all populations' regions are submitted first,
+           and their results are then collected in the same order as for the serial computation.
+        """
         # Initialize the name of the data for this set of computations:
         data_name = None
         populations_sizes = ensure_list(populations_sizes)
+        regions_outputs = []
         # For every populations' DeviceSet or the respective data stored in a pandas.Series:
         for i_pop, (pop_label, pop_data) in enumerate(pop_device_or_data.items()):
+            regions_outputs.append(
+                self._regions_generator(pop_data, _get_safely_list_item(i_pop, populations_sizes, 1),
+                                        computation_methods, computation_kwargs,
+                                        data_method, data_kwargs, executor))
+            if executor is not None:
+                # Submit the computations of all regions:
+                regions_outputs[-1] = list(regions_outputs[-1])
+        for pop_label, pop_regions_outputs in zip(pop_device_or_data.keys(), regions_outputs):
             # ...initialize the results' OrderedDict...
             pop_results = OrderedDict()
             # ...for every region Device or data...
-            for reg_label, reg_results in \
-                    self._regions_generator(pop_data, _get_safely_list_item(i_pop, populations_sizes, 1),
-                                            computation_methods, computation_kwargs,
-                                            data_method, data_kwargs):
+            for reg_label, reg_results in pop_regions_outputs:
+                if executor is not None:
+                    reg_results = reg_results.result()
                 # ...get the data_name if it exists....
                 data_name = reg_results.pop("data_name", data_name)
                 # ...if this is the first population's DeviceSet...
@@ -224,7 +304,7 @@ class SpikingNetworkAnalyser(SpikingNetworkAnalyserBase):
                 # ...loop for every result...
                 for res_type, res in pop_results.items():
                     # ...and if it is a pandas.Series of xarray.DataArray instances...
-                    if isinstance(res[0], DataArray):
+                    if isinstance(res.iloc[0], DataArray):
                         # ...concatenate them:
                         pop_results[res_type] = \
                             concatenate_heterogeneous_DataArrays(res, "Region",
@@ -371,14 +451,14 @@ class SpikingNetworkAnalyser(SpikingNetworkAnalyserBase):
         for res_name, result in results.items():
             homogeneous = False
             # ...if it is not empty and if it consists of xarray.DataArray instances...
-            if len(result) and isinstance(result[0], DataArray):
+            if len(result) and isinstance(result.iloc[0], DataArray):
                 # these are the desired dimensions for a homogeneous result:
                 transpose_dims = \
-                    get_ordered_dimensions(list(result[0].dims) + ["Population"], dims_order)
+                    get_ordered_dimensions(list(result.iloc[0].dims) + ["Population"], dims_order)
                 # ...if the output type for time series data is TVB TimeSeries instances...
                 if self.time_series_output_type.upper() == "TVB" \
-                        and result[0].ndim <= 3 \
-                            and "Time" in result[0].dims:
+                        and result.iloc[0].ndim <= 3 \
+                            and "Time" in result.iloc[0].dims:
                     # ...put them in a TVB TimeSeries instance...:
                     results[res_name] = \
                         self.convert_to_TVB_TimeSeries(result, concat_dim_name="Population",
@@ -402,6 +482,121 @@ class SpikingNetworkAnalyser(SpikingNetworkAnalyserBase):
                             results[res_name][pop_label] = pop_res.transpose(*transpose_dims)
         return results
 
+    def _compute_spikes_train(self, spikes):
+        """Method to compute the Spikes Train of a population's region spikes,
+           to be used for the spikes' correlations' computations.
+           Arguments:
+            - spikes: an array of spikes' times, or a dict or pandas.Series with a key "times"
+           Returns:
+            - the array of spikes' times, if native_correlations is True,
+              or a neo.core.SpikeTrain computed by the elephant analyser, otherwise.
+        """
+        spikes = self._get_spikes_times_from_spikes_events(spikes)
+        if self.native_correlations:
+            return spikes
+        return self.compute_spikes_train(spikes)
+
+    def _get_spikes_trains_times(self, spikes_trains):
+        """Method to get the arrays of spikes' times, in ms, and the common start and stop times
+           of a sequence of Spikes Trains or of spikes' times arrays.
+           As for elephant, neo.core.SpikeTrain instances contribute with their own start and stop times,
+           whereas, for spikes' times arrays, the analyser's start_time and end_time, if any, are used.
+        """
+        spikes_times = []
+        t_starts = []
+        t_stops = []
+        for spikes_train in spikes_trains:
+            if hasattr(spikes_train, "t_start") and hasattr(spikes_train, "rescale"):
+                # This is a neo.core.SpikeTrain
+                spikes_times.append(np.asarray(spikes_train.rescale("ms").magnitude, dtype="f8"))
+                t_starts.append(float(spikes_train.t_start.rescale("ms").magnitude))
+                t_stops.append(float(spikes_train.t_stop.rescale("ms").magnitude))
+            else:
+                spikes_times.append(np.asarray(self._get_spikes_times_from_spikes_events(spikes_train), dtype="f8"))
+        if len(t_starts) < len(spikes_times):
+            all_spikes_times = np.concatenate(spikes_times) if len(spikes_times) else np.array([])
+            t_start, t_stop = self._assert_start_end_times_from_spikes_times(all_spikes_times)
+            if self.end_time is None:
+                # Include the last spike in the last bin:
+                t_stop += self._fmin_resolution
+            t_starts.append(t_start)
+            t_stops.append(t_stop)
+        return spikes_times, np.max(t_starts), np.min(t_stops)
+
+    def compute_binned_spikes_counts(self, spikes_trains, binsize=None, num_bins=None):
+        """Method to compute the binned spikes' counts of a sequence (array, list, tuple)
+           of Spikes Trains or of spikes' times arrays, without elephant,
+           as a (spikes' trains x bins) scipy.sparse.csr_matrix,
+           built at once from the concatenated spikes' times.
+           Arguments:
+            - spikes_trains: a sequence (array, list, tuple) of Spikes Trains or of spikes' times arrays
+            - binsize: the size (float, in ms) of the bin to be used. Default=None.
+            - num_bins: the number (integer > 0) of bins to be used. Default=None.
+            If none of binsize or num_bins if given, a bin size equal to the sampling period is used.
+           Returns:
+            - the scipy.sparse.csr_matrix of spikes' counts.
+        """
+        spikes_times, t_start, t_stop = self._get_spikes_trains_times(spikes_trains)
+        duration = t_stop - t_start
+        if binsize is not None:
+            binsize = float(binsize)
+            num_bins = int(np.floor(duration / binsize + 1e-8))
+        elif num_bins is not None:
+            num_bins = int(num_bins)
+            binsize = duration / num_bins
+        else:
+            binsize = self.period
+            num_bins = int(np.floor(duration / binsize + 1e-8))
+        num_bins = max(num_bins, 1)
+        n_spikes = np.array([len(spikes) for spikes in spikes_times], dtype="i8")
+        if n_spikes.sum():
+            spikes_times = np.concatenate(spikes_times)
+        else:
+            spikes_times = np.array([], dtype="f8")
+        shape = (len(n_spikes), num_bins)
+        bins_inds = np.floor((spikes_times - t_start) / binsize + 1e-8).astype("i8")
+        inds = np.logical_and(bins_inds >= 0, bins_inds < num_bins)
+        bins_inds += np.repeat(np.arange(0, shape[0] * num_bins, num_bins, dtype="i8"), n_spikes)
+        bins_inds = bins_inds[inds]
+        if bins_inds.size >= self._dense_binned_spikes_counts_ratio * shape[0] * num_bins:
+            # For many spikes per bin, count them at once in a dense array...
+            return csr_matrix(np.bincount(bins_inds, minlength=shape[0] * num_bins).astype("f8").reshape(shape))
+        # ...or, otherwise, duplicate (train, bin) entries are summed up, resulting in the spikes' counts:
+        return csr_matrix((np.ones(bins_inds.shape, dtype="f8"), np.divmod(bins_inds, num_bins)), shape=shape)
+
+    def _compute_native_spikes_correlation(self, binned_spikes_counts, res_name, binary=False, **kwargs):
+        """Method to compute the covariance, or the correlation coefficient, of all pairs of binned spikes' trains,
+           with a single sparse matrix product, as for elephant covariance and correlation_coefficient functions.
+           Arguments:
+            - binned_spikes_counts: the (spikes' trains x bins) scipy.sparse.csr_matrix of spikes' counts
+            - res_name: "spikes_covariance" or "spikes_correlation_coefficient"
+            - binary: if True, the bins are clipped to 1 for any number of spikes. Default=False.
+           Returns:
+            - the (spikes' trains x spikes' trains) numpy.array of the result
+        """
+        if binary:
+            binned_spikes_counts = binned_spikes_counts.copy()
+            binned_spikes_counts.data = np.minimum(binned_spikes_counts.data, 1.0)
+        num_bins = binned_spikes_counts.shape[1]
+        means = np.asarray(binned_spikes_counts.mean(axis=1)).ravel()
+        if binned_spikes_counts.nnz > self._dense_binned_spikes_counts_ratio * np.prod(binned_spikes_counts.shape):
+            # A dense matrix product is faster for a large fraction of nonzero bins...
+            dense_counts = binned_spikes_counts.toarray()
+            result = dense_counts @ dense_counts.T
+        else:
+            # ...otherwise a sparse one is used:
+            result = (binned_spikes_counts @ binned_spikes_counts.T).toarray()
+        sum_squares = np.diag(result).copy()
+        result -= num_bins * np.outer(means, means)
+        if res_name == "spikes_covariance":
+            return result / max(num_bins - 1, 1)
+        variances = np.diag(result).copy()
+        # Variances below the round off error of the subtraction of the means are zero,
+        # and spikes' trains of zero variance result in NaN values, as for numpy.corrcoef:
+        variances[variances <= 1e-12 * sum_squares] = np.nan
+        std = np.sqrt(variances)
+        return result / np.outer(std, std)
+
     def _compute_spikes_correlations_from_spikes_trains(self, spikes_trains,
                                                         pop_labels, pop_reg_labels, all_regions_labels,
                                                         computations_methods=[], computations_kwargs=[],
@@ -417,8 +612,11 @@ class SpikingNetworkAnalyser(SpikingNetworkAnalyserBase):
             - all_reg_labels: a list of all regions' labels
             - computations_methods: a list of SpikingNetworkAnalyserBase class' "compute_" methods,
                                     to perform the desired computations.
-                                    Default: [lambda x, **kwargs: x],
-                                    i.e., comprising a method that just returns the input data.
+                                    Default: [compute_spikes_correlation_coefficient].
+                                    If native_correlations is True, the correlation_coefficient and covariance
+                                    are computed natively on the binned spikes' counts,
+                                    and they may also be given by their results' names,
+                                    i.e., "spikes_correlation_coefficient" and "spikes_covariance".
             - computations_kwargs: a list of keyword arguments dictionaries.
                                    It len(computations_kwargs) >= len(computations_methods) to be computed,
                                    each method to be computed will get its own kwargs dict.
@@ -431,53 +629,68 @@ class SpikingNetworkAnalyser(SpikingNetworkAnalyserBase):
             - results_names=[]: a list of names (strings) to be given to the pandas.Series or xarray.DataArray instances
                                 of the results of each measure.
         """
-        n_spikes_trains = len(spikes_trains)
-        spikes_trains = self.compute_binned_spikes_trains(spikes_trains, **bin_kwargs)
         computations_methods = ensure_list(computations_methods)
         computations_kwargs = ensure_list(computations_kwargs)
         results_names = ensure_list(results_names)
         if len(computations_methods) == 0:
             # This is the default method to be computed and its default name:
-            computations_methods = [self.compute_spikes_correlation_coefficient]
+            if self.native_correlations:
+                computations_methods = [self._native_correlations_methods[0]]
+            else:
+                computations_methods = [self.compute_spikes_correlation_coefficient]
             results_names = ["Populations' Correlation Coefficient"]
+        if self.native_correlations:
+            binned_spikes_counts = self.compute_binned_spikes_counts(spikes_trains, **bin_kwargs)
+        else:
+            spikes_trains = self.compute_binned_spikes_trains(spikes_trains, **bin_kwargs)
         # Prepare the results...
         if self.force_homogeneous_results:
-            # ...either in a (Population_i, Population_j, Region_i, Region_j) xarray.DataArray:
-            dims, coords = cross_dimensions_and_coordinates_MultiIndex(["Population", "Region"],
-                                                                       pop_labels, all_regions_labels)
-            n_cross_dims = len(pop_labels) * len(all_regions_labels)
-            dummy = np.nan * np.ones((n_cross_dims, n_cross_dims))
+            # ...either in a (Population_i, Population_j, Region_i, Region_j) xarray.DataArray,
+            # filled by direct indexing of every (Population, Region) pair:
+            pop_inds = np.array([pop_labels.index(pop_label) for pop_label, _ in pop_reg_labels])
+            reg_inds = np.array([all_regions_labels.index(reg_label) for _, reg_label in pop_reg_labels])
+            inds = (pop_inds[:, None], pop_inds[None, :], reg_inds[:, None], reg_inds[None, :])
+            shape = (len(pop_labels), len(pop_labels), len(all_regions_labels), len(all_regions_labels))
+            dims = ["Population_i", "Population_j", "Region_i", "Region_j"]
+            coords = {dims[0]: list(pop_labels), dims[1]: list(pop_labels),
+                      dims[2]: list(all_regions_labels), dims[3]: list(all_regions_labels)}
         else:
             # ...or in a (Population_i-Region_i, Population_j-Region_j) xarray.DataArray (product pandas.MultiIndex):
-            dummy = np.nan * np.ones((n_spikes_trains, n_spikes_trains))
             dims = ["Population_i-Region_i", "Population_j-Region_j"]
             coords = {dims[0]: pop_reg_labels, dims[1]: pop_reg_labels}
         results = OrderedDict()
         # Loop over all the different correlation computations' methods...:
         for i_comput, computation_method in enumerate(computations_methods):
-            # ...prepare the DataArray:
-            res_name = self._get_comput_res_type(computation_method)
+            computation_kwargs = self._get_safely_computation_kwargs(i_comput, computations_kwargs)
+            # ...compute....
+            if self.native_correlations and \
+                    (computation_method in self._native_correlations_methods or
+                     self._get_comput_res_type(computation_method) in self._native_correlations_methods):
+                if isinstance(computation_method, string_types):
+                    res_name = computation_method
+                else:
+                    res_name = self._get_comput_res_type(computation_method)
+                corr = self._compute_native_spikes_correlation(binned_spikes_counts, res_name, **computation_kwargs)
+            else:
+                res_name = self._get_comput_res_type(computation_method)
+                if self.native_correlations and isinstance(spikes_trains, (list, tuple)):
+                    # Any other method falls back to elephant BinnedSpikeTrain instances:
+                    spikes_trains = self.compute_binned_spikes_trains(spikes_trains, **bin_kwargs)
+                corr = computation_method(spikes_trains, **computation_kwargs)
+                # ...unpack the results...
+                spikes_trains = corr.get(self.binned_spikes_trains_name, spikes_trains)
+                corr = corr[res_name]
             try:
                 output_res_name = results_names[i_comput]
             except:
                 output_res_name = res_name
-            results[res_name] = DataArray(dummy, name=output_res_name, dims=dims, coords=coords)
-            # ...compute....
-            corr = computation_method(spikes_trains,
-                                      self._get_safely_computation_kwargs(i_comput, computations_kwargs))
-            # ...unpack the results...
-            spikes_trains = corr.get(self.binned_spikes_trains_name, spikes_trains)
-            corr = corr[res_name]
             if self.force_homogeneous_results:
-                # ...reshape the result for the case of a (Population_i, Population_j, Region_i, Region_j) output:
-                results[res_name].loc[pop_reg_labels, pop_reg_labels] = corr
-                # ...unstack the product pandas.MultiIndex:
-                results[res_name] = results[res_name].unstack(dims)
-                temp_dims = list(results[res_name].dims)
-                # ...put population's variables in front of regions:
-                results[res_name] = results[res_name].transpose(*tuple(temp_dims[0::2] + temp_dims[1::2]))
+                # ...set the result for the case of a (Population_i, Population_j, Region_i, Region_j) output:
+                res = np.full(shape, np.nan)
+                res[inds] = corr
+                results[res_name] = DataArray(res, name=output_res_name, dims=dims, coords=coords)
             else:
-                results[res_name] = DataArray(corr, name=results[res_name].name, dims=dims, coords=coords)
+                results[res_name] = DataArray(corr, name=output_res_name, dims=dims, coords=coords)
         return results
 
     def compute_rate(self, spikes, number_of_neurons=1, duration=None, **kwargs):
@@ -1,18 +1,25 @@
 # -*- coding: utf-8 -*-
 
+import os
+import time
+import hashlib
 from abc import ABCMeta, abstractmethod
 from enum import Enum
 
 import numpy as np
 
-from tvb.basic.neotraits.api import Attr, Int
+from tvb.basic.neotraits.api import Attr, Int, Float, NArray
 from tvb.contrib.scripts.utils.log_error_utils import warning
 
+from tvb_multiscale.core.config import initialize_logger
 from tvb_multiscale.core.neotraits import HasTraits
 from tvb_multiscale.core.interfaces.base.transformers.models.base import Transformer
 from tvb_multiscale.core.utils.data_structures_utils import combine_enums
 
 
+LOG = initialize_logger(__name__)
+
+
 class Sender(HasTraits):
     __metaclass__ = ABCMeta
 
@@ -312,72 +319,532 @@ class NPZReader(ReaderFromFile):
         return data
 
 
-# TODO: import mpi wrapper funs() and logger
-class MPIWriter(RemoteSender):
+class SharedMemoryCommunicator(HasTraits):
+    __metaclass__ = ABCMeta
 
     """
-       MPIWriter class to write data (time and values) to a .MPI port.
+       SharedMemoryCommunicator base class for the exchange of data (time steps and values)
+       between processes of the same node, via a ring buffer in a multiprocessing.shared_memory segment.
+       The segment comprises of:
+        - a control header: layout (number of slots, dimensions, maximum shape and dtype of the values)
+          and the sequence numbers of the last written and last released slots,
+        - number_of_slots slots, each with a header (sequence number, start and end time steps, shape)
+          and a data block of the maximum values' shape.
+       The layout is fixed by the SharedMemoryWriter upon creation of the segment,
+       and read by the SharedMemoryReader upon attaching to it.
+    """
+
+    number_of_slots = Int(
+        label="Number of slots",
+        default=2,
+        required=True,
+        doc="""Number of slots of the ring buffer, i.e., 
+               the number of synchronization windows the writer can get ahead of the reader. Default: 2.""")
+
+    timeout = Float(
+        label="Timeout",
+        default=60.0,
+        required=True,
+        doc="""Time (in sec) to wait for a free slot to write to, or for new data to read. Default: 60.0.""")
+
+    poll_interval = Float(
+        label="Poll interval",
+        default=1e-5,
+        required=True,
+        doc="""Time (in sec) to sleep between checks of the sequence numbers of the ring buffer. Default: 1e-5.""")
+
+    # Control header fields:
+    _MAX_NDIM = 4
+    _NSLOTS = 0
+    _NDIM = 1
+    _SHAPE = 2
+    _DTYPE = _SHAPE + _MAX_NDIM
+    _WRITE_SEQ = _DTYPE + 1
+    _READ_SEQ = _WRITE_SEQ + 1
+    _HEADER_SIZE = 8 * (_READ_SEQ + 1)
+    # Slot header fields:
+    _SLOT_SEQ = 0
+    _SLOT_TIME = 1
+    _SLOT_NDIM = 3
+    _SLOT_SHAPE = 4
+    _SLOT_HEADER_SIZE = 8 * (_SLOT_SHAPE + _MAX_NDIM)
+
+    _shm = None
+    _header = None
+    _slots_headers = None
+    _slots = None
+
+    @staticmethod
+    def _shm_name(path):
+        # Shared memory names cannot be (long) file paths:
+        return "tvbmsc_" + hashlib.md5(path.encode()).hexdigest()[:16]
+
+    def _slot_size(self, shape, itemsize):
+        return self._SLOT_HEADER_SIZE + int(np.prod(shape)) * itemsize
+
+    def _map(self):
+        """Method to set the numpy views to the control header, the slots' headers and data blocks."""
+        self._header = np.ndarray((self._HEADER_SIZE // 8,), dtype="i8", buffer=self._shm.buf)
+        n_slots = int(self._header[self._NSLOTS])
+        shape = tuple(self._header[self._SHAPE:self._SHAPE + self._header[self._NDIM]].tolist())
+        dtype = np.dtype(chr(self._header[self._DTYPE]))
+        slot_size = self._slot_size(shape, dtype.itemsize)
+        self._slots_headers = []
+        self._slots = []
+        for iS in range(n_slots):
+            offset = self._HEADER_SIZE + iS * slot_size
+            self._slots_headers.append(
+                np.ndarray((self._SLOT_HEADER_SIZE // 8,), dtype="i8", buffer=self._shm.buf, offset=offset))
+            self._slots.append(
+                np.ndarray((int(np.prod(shape)),), dtype=dtype, buffer=self._shm.buf,
+                           offset=offset + self._SLOT_HEADER_SIZE))
+        self.number_of_slots = n_slots
+
+    def _wait(self, condition):
+        tic = time.time()
+        while not condition():
+            if time.time() - tic > self.timeout:
+                return False
+            time.sleep(self.poll_interval)
+        return True
+
+    def close(self, unlink=False):
+        """Method to release the numpy views and close (and optionally unlink) the shared memory segment."""
+        if self._shm is not None:
+            self._header = None
+            self._slots_headers = None
+            self._slots = None
+            self._shm.close()
+            if unlink:
+                try:
+                    self._shm.unlink()
+                except FileNotFoundError:
+                    pass
+            self._shm = None
+
+
+class SharedMemoryWriter(RemoteSender, SharedMemoryCommunicator):
+
+    """
+       SharedMemoryWriter class to write data (time steps and values)
+       to a ring buffer in a multiprocessing.shared_memory segment, without serialization or disk I/O.
+       Values have to be numeric arrays (e.g., of shape (proxy, time) or (proxy, time, voi))
+       that fit within the maximum shape of the segment.
        It comprises of:
-           - a target attribute, i.e., MPI port to write data to,
+           - a target attribute, i.e., the path (or label) the name of the shared memory segment is computed from,
            - a method to write data to the target.
     """
 
-    pass
+    target = Attr(field_type=str, required=True, label="Target path",
+                  doc="""Path (or label) the name of the shared memory segment is computed from.""")
+
+    shape = NArray(
+        dtype=int,
+        label="Shape",
+        doc="""Maximum shape of the values' data, e.g., (proxy, time, voi). 
+               If not given, the shape of the first data sent is used.""",
+        required=False,
+        default=None)
+
+    dtype = Attr(field_type=str, required=True, default="f8", label="Data type",
+                 doc="""Numpy data type of the values' data. Default: 'f8'.""")
 
-    # from mpi4py import MPI
+    def configure(self):
+        super(SharedMemoryWriter, self).configure()
+        if self.shape is not None and self.shape.size:
+            self._create(self.shape)
+
+    def _create(self, shape):
+        # multiprocessing.shared_memory is available only for python >= 3.8:
+        from multiprocessing import shared_memory
+        shape = tuple(np.array(shape).astype("i").tolist())
+        if len(shape) > self._MAX_NDIM:
+            raise ValueError("%s supports data of up to %d dimensions, not %s!"
+                             % (self.__class__.__name__, self._MAX_NDIM, str(shape)))
+        dtype = np.dtype(self.dtype)
+        name = self._shm_name(self.target)
+        size = self._HEADER_SIZE + self.number_of_slots * self._slot_size(shape, dtype.itemsize)
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            # A segment left over by a previous run:
+            shared_memory.SharedMemory(name=name).unlink()
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        header = np.ndarray((self._HEADER_SIZE // 8,), dtype="i8", buffer=self._shm.buf)
+        header[:] = 0
+        header[self._NDIM] = len(shape)
+        header[self._SHAPE:self._SHAPE + len(shape)] = shape
+        header[self._DTYPE] = ord(dtype.char)
+        # The number of slots is written last, to signal readers that the layout is ready:
+        header[self._NSLOTS] = self.number_of_slots
+        self.shape = np.array(shape)
+        self._map()
+
+    def send(self, data):
+        values = np.asarray(data[1])
+        if self._shm is None:
+            self._create(values.shape)
+        if values.ndim != self.shape.size or np.any(np.array(values.shape) > self.shape):
+            raise ValueError("Data of shape %s do not fit into the shared memory layout of maximum shape %s!"
+                             % (str(values.shape), str(tuple(self.shape))))
+        # Wait for the reader to release the oldest slot, if the ring buffer is full:
+        if not self._wait(lambda: self._header[self._WRITE_SEQ] - self._header[self._READ_SEQ]
+                                  < self.number_of_slots):
+            warning("Timeout while waiting for a free slot of shared memory %s!" % self.target, logger=LOG)
+            return None
+        seq = int(self._header[self._WRITE_SEQ])
+        slot = seq % self.number_of_slots
+        self._slots[slot][:values.size] = values.ravel()
+        slot_header = self._slots_headers[slot]
+        slot_header[self._SLOT_TIME:self._SLOT_TIME + 2] = np.array(data[0]).flatten()[[0, -1]]
+        slot_header[self._SLOT_NDIM] = values.ndim
+        slot_header[self._SLOT_SHAPE:self._SLOT_SHAPE + values.ndim] = values.shape
+        slot_header[self._SLOT_SEQ] = seq
+        # Publish the slot only after it has been completely written:
+        self._header[self._WRITE_SEQ] = seq + 1
+        return 1
+
+    def close(self, unlink=True):
+        super(SharedMemoryWriter, self).close(unlink)
+
+
+class SharedMemoryReader(RemoteReceiver, SharedMemoryCommunicator):
+
+    """
+        SharedMemoryReader class to read data (time steps and values)
+        from a ring buffer in a multiprocessing.shared_memory segment.
+        Values are returned as read-only views into the shared memory, without any copy,
+        which remain valid until the next call to receive(), when their slot is released to the writer.
+        It comprises of:
+            - a source attribute, i.e., the path (or label) the name of the shared memory segment is computed from,
+            - a method to read data from the source.
+    """
+
+    source = Attr(field_type=str, default="", required=True, label="Source path",
+                  doc="""Path (or label) the name of the shared memory segment is computed from.""")
+
+    copy = Attr(field_type=bool, default=False, required=True, label="Copy",
+                doc="""If True, the values read are copied out of the shared memory. Default: False.""")
+
+    _holding_slot = False
+
+    def configure(self):
+        super(SharedMemoryReader, self).configure()
+        self._attach()
+
+    def _attach(self):
+        # multiprocessing.shared_memory is available only for python >= 3.8:
+        from multiprocessing import shared_memory, resource_tracker
+        try:
+            try:
+                self._shm = shared_memory.SharedMemory(name=self._shm_name(self.source), track=False)
+            except TypeError:
+                # python < 3.13: do not let the resource tracker of the reader's process unlink the segment:
+                self._shm = shared_memory.SharedMemory(name=self._shm_name(self.source))
+                resource_tracker.unregister(self._shm._name, "shared_memory")
+        except (FileNotFoundError, ValueError):
+            # The writer has not created (or sized) the segment yet:
+            self._shm = None
+            return False
+        if self._shm.size < self._HEADER_SIZE or \
+                np.ndarray((1,), dtype="i8", buffer=self._shm.buf)[self._NSLOTS] == 0:
+            # The writer has not set the layout of the segment yet:
+            self._shm.close()
+            self._shm = None
+            return False
+        self._map()
+        return True
+
+    def _release_slot(self):
+        if self._holding_slot:
+            self._header[self._READ_SEQ] += 1
+            self._holding_slot = False
+
+    def receive(self):
+        if self._shm is None and not self._wait(self._attach):
+            warning("Shared memory %s not found!" % self.source, logger=LOG)
+            return None
+        self._release_slot()
+        seq = int(self._header[self._READ_SEQ])
+        if not self._wait(lambda: self._header[self._WRITE_SEQ] > seq):
+            warning("Timeout while waiting for new data in shared memory %s!" % self.source, logger=LOG)
+            return None
+        slot = seq % self.number_of_slots
+        slot_header = self._slots_headers[slot]
+        shape = tuple(slot_header[self._SLOT_SHAPE:self._SLOT_SHAPE + slot_header[self._SLOT_NDIM]].tolist())
+        values = self._slots[slot][:int(np.prod(shape))].reshape(shape)
+        times = slot_header[self._SLOT_TIME:self._SLOT_TIME + 2].astype("i")
+        if self.copy:
+            values = values.copy()
+            self._holding_slot = True
+            self._release_slot()
+        else:
+            values.flags.writeable = False
+            self._holding_slot = True
+        return [times, values]
 
-    target = Attr(field_type=str, required=True, label="Path to target file",
+    def close(self, unlink=False):
+        if self._shm is not None:
+            self._release_slot()
+        super(SharedMemoryReader, self).close(unlink)
+
+
+class MPICommunicator(HasTraits):
+    __metaclass__ = ABCMeta
+
+    """
+       MPICommunicator base class for the exchange of data (time steps and values) between MPI processes,
+       via non-blocking point-to-point communication (mpi4py Isend/Irecv) of contiguous buffers.
+       Each message comprises of:
+        - a typed header of int64 fields (start and end time steps, number of dimensions, shape, dtype),
+        - the data block of the values, sent as raw bytes.
+       Object arrays (e.g., ragged spikes' trains) are pickled instead (header dtype field equal to 0).
+       The peer process is either a rank of the comm communicator (default MPI.COMM_WORLD),
+       or, if rank is negative, the one that published an MPI port name to the target/source file.
+    """
+
+    comm = Attr(
+        label="MPI communicator",
+        field_type=object,
+        default=None,
+        required=False,
+        doc="""mpi4py communicator to communicate via. Default: None, for MPI.COMM_WORLD,
+               or for a communicator connected to the MPI port published in the port file, if rank < 0.""")
+
+    rank = Int(
+        label="Peer rank",
+        default=-1,
+        required=True,
+        doc="""Rank of the peer MPI process in comm. Default: -1, for connecting via the MPI port file.""")
+
+    tag = Int(
+        label="MPI tag",
+        default=0,
+        required=True,
+        doc="""MPI tag of the headers' messages. The data messages are tagged with tag + 1. Default: 0.""")
+
+    # Header fields:
+    _MAX_NDIM = 4
+    _TIME = 0
+    _NDIM = 2
+    _SHAPE = 3
+    _DTYPE = _SHAPE + _MAX_NDIM
+    _HEADER_LENGTH = _DTYPE + 1
+    # Header number of dimensions, signaling the end of the communication:
+    _END = -1
+
+    _MPI = None
+    _port = None
+    _port_comm = None
+
+    def _configure_mpi(self, port_filepath, accept):
+        from mpi4py import MPI
+        self._MPI = MPI
+        if self.rank < 0:
+            # Connect to the peer process via an MPI port, published in a file by the accepting side:
+            if accept:
+                self._port = MPI.Open_port()
+                with open(port_filepath + ".tmp", "w") as port_file:
+                    port_file.write(self._port)
+                # Publish the port name atomically:
+                os.replace(port_filepath + ".tmp", port_filepath)
+                self._port_comm = MPI.COMM_SELF.Accept(self._port)
+            else:
+                while not os.path.isfile(port_filepath):
+                    time.sleep(0.01)
+                with open(port_filepath, "r") as port_file:
+                    self._port_comm = MPI.COMM_SELF.Connect(port_file.read().strip())
+            self.comm = self._port_comm
+            self.rank = 0
+        elif self.comm is None:
+            self.comm = MPI.COMM_WORLD
+
+    def _new_header(self):
+        return np.zeros((self._HEADER_LENGTH,), dtype="i8")
+
+    @staticmethod
+    def _bytes_buffer(buffer, nbytes):
+        """Method to return a contiguous bytes' buffer of at least nbytes, reusing the input one if large enough."""
+        if buffer is None or buffer.size < nbytes:
+            return np.empty((max(nbytes, 1),), dtype="u1")
+        return buffer
+
+    def _end_mpi(self, port_filepath=None):
+        if self._port_comm is not None:
+            self._port_comm.Disconnect()
+            self._port_comm = None
+            self.comm = None
+            self.rank = -1
+        if self._port is not None:
+            self._MPI.Close_port(self._port)
+            self._port = None
+            if port_filepath is not None and os.path.isfile(port_filepath):
+                os.remove(port_filepath)
+
+
+class MPIWriter(RemoteSender, MPICommunicator):
+
+    """
+       MPIWriter class to write data (time and values) to an MPI process.
+       It comprises of:
+           - a target attribute, i.e., the path to the MPI port file, if the peer rank is not given,
+           - a method to write data to the target.
+       The data are copied to one of number_of_buffers preallocated contiguous buffers,
+       and sent without waiting for the completion of the communication,
+       which, therefore, overlaps with the computation of the next synchronization time window.
+       A buffer is reused only after its previous send has been completed.
+    """
+
+    target = Attr(field_type=str, default="", required=True, label="Path to target file",
                   doc="""Full path to MPI port configuration file.""")
 
-    # _comm = Attr(field_type=MPI.COMM_WORLD, required=False, label="MPI port", doc="""MPI port object.""")
+    number_of_buffers = Int(
+        label="Number of buffers",
+        default=2,
+        required=True,
+        doc="""Number of send buffers, i.e., the number of sends that may be pending at the same time. Default: 2.""")
 
-    # logger = Attr(field_type=???, required = True, label = "Logger", doc = """Logger for MPIWriter.""")
+    _headers = None
+    _buffers = None
+    _requests = None
+    _iB = 0
 
     def configure(self):
         super(MPIWriter, self).configure()
-        # self._comm = init_mpi(self.target, self.logger)
+        self._configure_mpi(self.target, accept=False)
+        self._headers = [self._new_header() for _ in range(self.number_of_buffers)]
+        self._buffers = [None] * self.number_of_buffers
+        self._requests = [[] for _ in range(self.number_of_buffers)]
+        self._iB = 0
+
+    def _isend(self, header, buffer=None, obj=None):
+        iB = self._iB
+        self._iB = (self._iB + 1) % self.number_of_buffers
+        requests = [self.comm.Isend([header, self._MPI.INT64_T], dest=self.rank, tag=self.tag)]
+        if buffer is not None:
+            requests.append(self.comm.Isend([buffer, self._MPI.BYTE], dest=self.rank, tag=self.tag + 1))
+        elif obj is not None:
+            requests.append(self.comm.isend(obj, dest=self.rank, tag=self.tag + 1))
+        self._requests[iB] = requests
+
+    def _wait_buffer(self):
+        """Method to wait for the completion of the previous send of the next buffer to use."""
+        if len(self._requests[self._iB]):
+            self._MPI.Request.Waitall(self._requests[self._iB])
+            self._requests[self._iB] = []
+        return self._headers[self._iB]
 
     def send(self, data):
-         pass
-        # send_mpi(self._comm, data[0], data[1], data[2], self.logger)
+        values = np.asarray(data[1])
+        header = self._wait_buffer()
+        header[:] = 0
+        header[self._TIME:self._TIME + 2] = np.array(data[0]).flatten()[[0, -1]]
+        if values.dtype == object:
+            # Ragged data, e.g., spikes' trains, are pickled:
+            header[self._NDIM] = values.ndim
+            self._isend(header, obj=values)
+            return 1
+        if values.ndim > self._MAX_NDIM:
+            raise ValueError("%s supports data of up to %d dimensions, not %s!"
+                             % (self.__class__.__name__, self._MAX_NDIM, str(values.shape)))
+        header[self._NDIM] = values.ndim
+        header[self._SHAPE:self._SHAPE + values.ndim] = values.shape
+        header[self._DTYPE] = ord(values.dtype.char)
+        buffer = self._bytes_buffer(self._buffers[self._iB], values.nbytes)
+        self._buffers[self._iB] = buffer
+        buffer = buffer[:values.nbytes]
+        buffer.view(values.dtype)[:] = values.flatten()
+        self._isend(header, buffer)
+        return 1
+
+    def flush(self):
+        """Method to wait for the completion of all pending sends."""
+        for iB in range(self.number_of_buffers):
+            if len(self._requests[iB]):
+                self._MPI.Request.Waitall(self._requests[iB])
+                self._requests[iB] = []
 
     def end_mpi(self):
-        pass
-        # end_mpi(self._comm, self.target, True, self.logger)
+        """Method to signal the end of the communication to the reader and disconnect from the MPI port, if any."""
+        header = self._wait_buffer()
+        header[:] = 0
+        header[self._NDIM] = self._END
+        self._isend(header)
+        self.flush()
+        self._end_mpi()
 
 
-class MPIReader(RemoteReceiver):
+class MPIReader(RemoteReceiver, MPICommunicator):
 
     """
-        MPIReader class to read data (time and values) from a mpmi port.
+        MPIReader class to read data (time and values) from an MPI process.
         It comprises of:
-            - a source attribute, i.e., the mpi port to read data from,
-            - an abstract method to read data from the source.
+            - a source attribute, i.e., the path to the MPI port file, if the peer rank is not given,
+            - a method to read data from the source.
+        The receive of the next header is posted right after the previous data have been received,
+        so that the MPIWriter's sends can complete while this process computes.
+        The values returned are read-only views into a preallocated receive buffer,
+        which remain valid until the next receive, unless copy is True.
     """
 
-    pass
-
-    # from mpi4py import MPI
-
     source = Attr(field_type=str, default="", required=True,
                   label="Path to source file", doc="""Full path to MPI port configuration file.""")
 
-    # _comm = Attr(field_type=MPI.COMM_WORLD, required=False,
-    #              label="MPI port", doc="""MPI port object.""")
+    copy = Attr(
+        field_type=bool,
+        label="Copy",
+        default=False,
+        required=True,
+        doc="""If True, the values received are copies of the receive buffer. Default: False.""")
 
-    # logger = Attr(field_type=???, required=True, label="Logger", doc="""Logger for MPIReader.""")
+    _header = None
+    _header_request = None
+    _buffer = None
 
     def configure(self):
         super(MPIReader, self).configure()
-        # self._comm = init_mpi(self.source, self.logger)
+        self._configure_mpi(self.source, accept=True)
+        self._header = self._new_header()
+        self._post_header()
+
+    def _post_header(self):
+        self._header_request = self.comm.Irecv([self._header, self._MPI.INT64_T], source=self.rank, tag=self.tag)
 
     def receive(self):
-        pass
-        # return receive_mpi(self._comm, self.logger)
+        if self._header_request is None:
+            return None
+        self._header_request.Wait()
+        self._header_request = None
+        header = self._header
+        ndim = int(header[self._NDIM])
+        if ndim == self._END:
+            return None
+        times = header[self._TIME:self._TIME + 2].astype("i")
+        if header[self._DTYPE] == 0:
+            values = self.comm.recv(source=self.rank, tag=self.tag + 1)
+        else:
+            shape = tuple(header[self._SHAPE:self._SHAPE + ndim].tolist())
+            dtype = np.dtype(chr(header[self._DTYPE]))
+            nbytes = int(np.prod(shape)) * dtype.itemsize
+            self._buffer = self._bytes_buffer(self._buffer, nbytes)
+            self.comm.Recv([self._buffer[:nbytes], self._MPI.BYTE], source=self.rank, tag=self.tag + 1)
+            values = self._buffer[:nbytes].view(dtype).reshape(shape)
+            if self.copy:
+                values = values.copy()
+            else:
+                values.flags.writeable = False
+        # Post the receive of the next header before returning the data:
+        times = times.copy()
+        self._post_header()
+        return [times, values]
 
     def end_mpi(self):
-        pass
-        # end_mpi(self._comm, self.source, False, self.logger)
+        """Method to cancel any pending receive and disconnect from the MPI port, if any."""
+        if self._header_request is not None:
+            self._header_request.Cancel()
+            self._header_request.Wait()
+            self._header_request = None
+        self._end_mpi(self.source)
 
 
 class WritersToFile(Enum):
@@ -388,6 +855,14 @@ class ReadersFromFile(Enum):
     READER_FROM_NUMPY = NPZReader
 
 
+class WritersToSharedMemory(Enum):
+    WRITER_TO_SHARED_MEMORY = SharedMemoryWriter
+
+
+class ReadersFromSharedMemory(Enum):
+    READER_FROM_SHARED_MEMORY = SharedMemoryReader
+
+
 class WritersToMPI(Enum):
     WRITER_TO_MPI = MPIWriter
 
@@ -404,7 +879,7 @@ class GettersFromMemory(Enum):
     GET_FROM_TRANSFORMER = GetFromTransformer
 
 
-RemoteSenders = combine_enums("RemoteSenders", WritersToFile, WritersToMPI)
-RemoteReceivers = combine_enums("RemoteReceivers", ReadersFromFile, ReadersFromMPI)
+RemoteSenders = combine_enums("RemoteSenders", WritersToFile, WritersToSharedMemory, WritersToMPI)
+RemoteReceivers = combine_enums("RemoteReceivers", ReadersFromFile, ReadersFromSharedMemory, ReadersFromMPI)
 Senders = combine_enums("Senders", SettersToMemory, RemoteSenders)
 Receivers = combine_enums("Receivers", GettersFromMemory, RemoteReceivers)
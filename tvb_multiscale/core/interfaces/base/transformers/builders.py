@@ -17,6 +17,10 @@ from tvb_multiscale.core.interfaces.base.transformers.models.elephant import \
     ElephantSpikesRate, ElephantSpikesHistogramRate, ElephantSpikesHistogram,  \
     RatesToSpikesElephantPoisson, RatesToSpikesElephantPoissonMultipleInteraction, \
     RatesToSpikesElephantPoissonSingleInteraction
+from tvb_multiscale.core.interfaces.base.transformers.models.poisson import \
+    RatesToSpikesPoisson, RatesToSpikesPoissonSingleInteraction, RatesToSpikesPoissonMultipleInteraction
+from tvb_multiscale.core.interfaces.base.transformers.models.histogram import \
+    SpikesHistogram, SpikesHistogramRate, SpikesRate
 from tvb_multiscale.core.interfaces.tvb.interfaces import TVBtoSpikeNetModels, SpikeNetToTVBModels
 from tvb_multiscale.core.interfaces.base.builders import InterfaceBuilder, RemoteInterfaceBuilder
 from tvb_multiscale.core.interfaces.base.transformers.interfaces import TransformerInterface, TransformerInterfaces, \
@@ -32,6 +36,9 @@ class DefaultTVBtoSpikeNetTransformers(Enum):
     SPIKES = RatesToSpikesElephantPoisson
     SPIKES_SINGLE_INTERACTION = RatesToSpikesElephantPoissonSingleInteraction
     SPIKES_MULTIPLE_INTERACTION = RatesToSpikesElephantPoissonMultipleInteraction
+    SPIKES_POISSON = RatesToSpikesPoisson
+    SPIKES_POISSON_SINGLE_INTERACTION = RatesToSpikesPoissonSingleInteraction
+    SPIKES_POISSON_MULTIPLE_INTERACTION = RatesToSpikesPoissonMultipleInteraction
     CURRENT = LinearCurrent
 
 
@@ -40,6 +47,9 @@ class DefaultSpikeNetToTVBTransformers(Enum):
     SPIKES_TO_RATE = ElephantSpikesRate
     SPIKES_TO_HIST = ElephantSpikesHistogram
     SPIKES_TO_HIST_RATE = ElephantSpikesHistogramRate
+    SPIKES_TO_RATE_NUMPY = SpikesRate
+    SPIKES_TO_HIST_NUMPY = SpikesHistogram
+    SPIKES_TO_HIST_RATE_NUMPY = SpikesHistogramRate
     POTENTIAL = LinearPotential
 
 
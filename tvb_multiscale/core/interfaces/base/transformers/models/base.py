@@ -8,6 +8,7 @@ import numpy as np
 from tvb.basic.neotraits.api import Float, NArray, Attr
 
 from tvb_multiscale.core.neotraits import HasTraits
+from tvb_multiscale.core.utils.profiling_utils import profile
 
 
 class Transformer(HasTraits):
@@ -67,6 +68,7 @@ class Transformer(HasTraits):
            It sets the output buffer property"""
         self.output_buffer = np.array(self._compute(self.input_buffer, *args, **kwargs))
 
+    @profile(category="transformers", nbytes="output")
     def __call__(self, data=None, time=None):
         if data is not None:
             self.input_buffer = data
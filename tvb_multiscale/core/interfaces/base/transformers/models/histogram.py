@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+
+from enum import Enum
+
+import numpy as np
+
+from tvb.basic.neotraits._attr import Attr, Float, NArray
+
+from tvb_multiscale.core.interfaces.base.transformers.models.base import SpikesToRates
+
+
+class SpikesHistogram(SpikesToRates):
+
+    """
+        SpikesHistogram Transformer class, a pure numpy alternative to ElephantSpikesHistogram.
+        The spikes of all proxy nodes are binned at once, with a single bincount over (proxy, time step),
+        without wrapping them in neo.SpikeTrain instances.
+        Spike times are assumed to be in ms, as the time step dt.
+    """
+
+    _time_eps = np.finfo(np.float32).resolution
+
+    @property
+    def _t_start(self):
+        return self.dt * (self.input_time[0] - 1) + self.time_shift
+
+    @property
+    def _t_stop(self):
+        return self.dt * self.input_time[-1] + self.time_shift
+
+    def _compute_histogram(self, spikes):
+        """Method to compute the spikes' counts of shape (proxy, time step) of all proxy nodes at once."""
+        n_proxies = len(spikes)
+        n_steps = len(self.input_time)
+        spikes = [np.asarray(proxy_spikes, dtype="f8").flatten() for proxy_spikes in spikes]
+        proxies = np.repeat(np.arange(n_proxies), [proxy_spikes.size for proxy_spikes in spikes])
+        if proxies.size == 0:
+            return np.zeros((n_proxies, n_steps))
+        times = (np.concatenate(spikes) - self._t_start + self._time_eps) / self.dt
+        # As for elephant.statistics.time_histogram, time bins are [t_start - eps + i * dt, t_start - eps + (i+1) * dt):
+        inds = np.logical_and(times >= 0.0, times < n_steps)
+        return np.bincount(proxies[inds] * n_steps + times[inds].astype("i"),
+                           minlength=n_proxies * n_steps).reshape((n_proxies, n_steps)).astype("f8")
+
+    def _compute_rates(self, spikes, *args, **kwargs):
+        """Method for the computation of spike trains data transformation
+           to spikes' counts for all proxy nodes at once."""
+        return self._compute_histogram(spikes)
+
+    def _compute(self, input_buffer, *args, **kwargs):
+        """Method for the computation on the input buffer spikes' trains' data
+           for the output buffer data of instantaneous mean spiking rates to result, for all proxy nodes at once."""
+        return self._scale_factor[:, None] * self._compute_rates(input_buffer, *args, **kwargs) + \
+               self._translation_factor[:, None]
+
+
+class SpikesHistogramRate(SpikesHistogram):
+
+    """
+        SpikesHistogramRate Transformer class, a pure numpy alternative to ElephantSpikesHistogramRate.
+        The time histogram of the spikes is divided by the bin width, to result in rates in Hz.
+    """
+
+    def _compute_rates(self, spikes, *args, **kwargs):
+        """Method for the computation of spike trains data transformation
+           to spikes' rates (in Hz) for all proxy nodes at once."""
+        return self._compute_histogram(spikes) / (self.dt / 1000)
+
+
+class SpikesRate(SpikesHistogramRate):
+
+    """
+        SpikesRate Transformer class, a pure numpy alternative to ElephantSpikesRate.
+        The time histogram rates are smoothed with a kernel, by direct convolution for small kernels,
+        or via a precomputed kernel FFT for larger ones.
+        The part of the convolution that exceeds the current synchronization window
+        is carried over and added to the rates of the next window, so that smoothing stays continuous.
+        For a centered kernel (default, as in elephant.statistics.instantaneous_rate),
+        the contributions of the spikes of a window to the times of the previous window are lost.
+        For a causal kernel (center_kernel = False), the rates computed window by window
+        are identical to the ones computed at once for the whole time series.
+    """
+
+    kernel = NArray(
+        label="Convolution kernel",
+        doc="""Array of the convolution kernel weights sampled every dt, centered at its middle element,
+               normalized to unit sum upon configuration.
+               Default: a Gaussian kernel of standard deviation sigma, cut at kernel_cutoff * sigma.""",
+        required=False,
+        default=None
+    )
+
+    sigma = Float(
+        label="Kernel sigma",
+        doc="""Standard deviation (in ms) of the default Gaussian kernel. Default: None, for sigma = dt.""",
+        required=False,
+        default=None
+    )
+
+    kernel_cutoff = Float(
+        label="Kernel cutoff",
+        doc="""Half width of the default Gaussian kernel, in multiples of sigma. Default: 5.0.""",
+        required=True,
+        default=5.0
+    )
+
+    center_kernel = Attr(
+        field_type=bool,
+        label="Center kernel",
+        doc="""If True, the kernel is centered at the spikes' times, otherwise it starts at them. Default: True.""",
+        required=True,
+        default=True
+    )
+
+    max_direct_kernel_size = Attr(
+        field_type=int,
+        label="Maximum direct convolution kernel size",
+        doc="""Kernels of up to this size are convolved directly, larger ones via FFT. Default: 64.""",
+        required=True,
+        default=64
+    )
+
+    _tail = None
+    _tail_time = None
+    _kernel_fft = None
+
+    def _gaussian_kernel(self):
+        sigma = self.sigma or self.dt
+        half_width = int(np.ceil(self.kernel_cutoff * sigma / self.dt))
+        kernel = np.exp(-0.5 * (np.arange(-half_width, half_width + 1) * self.dt / sigma) ** 2)
+        return kernel
+
+    def configure(self):
+        if self.kernel is None or self.kernel.size == 0:
+            self.kernel = self._gaussian_kernel()
+        kernel = np.array(self.kernel, dtype="f8").flatten()
+        if kernel.size % 2 == 0:
+            # Make sure the kernel is centered at its middle element:
+            kernel = np.concatenate([kernel, [0.0]])
+        self.kernel = kernel / np.sum(kernel)
+        self.reset()
+        super(SpikesRate, self).configure()
+
+    def reset(self):
+        """Method to discard the carried over convolution tail and the cached kernel FFTs."""
+        self._tail = None
+        self._tail_time = None
+        self._kernel_fft = {}
+
+    @property
+    def _kernel_shift(self):
+        if self.center_kernel:
+            return (self.kernel.size - 1) // 2
+        return 0
+
+    def _convolve(self, rates):
+        """Method to compute the full convolution of the rates of shape (proxy, time) with the kernel."""
+        n_proxies, n_steps = rates.shape
+        n_kernel = self.kernel.size
+        n_full = n_steps + n_kernel - 1
+        if n_kernel <= self.max_direct_kernel_size:
+            output = np.zeros((n_proxies, n_full))
+            for iK, weight in enumerate(self.kernel):
+                output[:, iK:iK + n_steps] += weight * rates
+            return output
+        kernel_fft = self._kernel_fft.get(n_full, None)
+        if kernel_fft is None:
+            kernel_fft = np.fft.rfft(self.kernel, n_full)
+            self._kernel_fft[n_full] = kernel_fft
+        return np.fft.irfft(np.fft.rfft(rates, n_full, axis=1) * kernel_fft, n_full, axis=1)
+
+    def _compute_rates(self, spikes, *args, **kwargs):
+        """Method for the computation of spike trains data transformation
+           to instantaneous spiking rates (in Hz) for all proxy nodes at once,
+           via convolution of their time histogram rates with the kernel."""
+        rates = super(SpikesRate, self)._compute_rates(spikes)
+        n_proxies, n_steps = rates.shape
+        # Drop the first elements of a centered kernel's convolution, which correspond to times before this window:
+        rates = self._convolve(rates)[:, self._kernel_shift:]
+        if self._tail is not None and self._tail.shape[0] == n_proxies and self._tail_time == self.input_time[0]:
+            n_tail = min(n_steps, self._tail.shape[1])
+            rates[:, :n_tail] += self._tail[:, :n_tail]
+            rates[:, n_steps:n_steps + self._tail.shape[1] - n_tail] += self._tail[:, n_tail:]
+        self._tail = rates[:, n_steps:].copy()
+        self._tail_time = self.input_time[-1] + 1
+        return rates[:, :n_steps]
+
+    def info(self, recursive=0):
+        info = super(SpikesRate, self).info(recursive=recursive)
+        info['kernel'] = self.kernel
+        return info
+
+
+class HistogramSpikesToRatesTransformers(Enum):
+    SPIKES_HISTOGRAM = SpikesHistogram
+    SPIKES_HISTOGRAM_RATE = SpikesHistogramRate
+    SPIKES_RATE = SpikesRate
@@ -21,6 +21,10 @@ class Integration(Transformer):
     from tvb.simulator.integrators import Integrator, IntegratorStochastic
     _stochastic_integrator = IntegratorStochastic
 
+    # Set to True for dfuns that are elementwise linear in the state and in the input buffer,
+    # i.e., dfun(X, input_buffer) = lambda * X + beta * input_buffer, without any boundaries applied to the state:
+    _linear_dfun = False
+
     dt = Float(label="Time step",
                doc="Time step of simulation",
                required=True,
@@ -44,6 +48,24 @@ class Integration(Transformer):
                 methods. It is used to compute the time courses of the model state
                 variables.""")
 
+    linear_integration = Attr(
+        field_type=bool,
+        label="Linear integration",
+        default=True,
+        required=True,
+        doc="""If True (default), and the dfun is linear, and the integrator deterministic, 
+               the whole input buffer is integrated at once, 
+               by solving the linear recursion X_{n+1} = a * X_n + b * input_buffer_n of the integrator scheme.""")
+
+    exponential_euler = Attr(
+        field_type=bool,
+        label="Exponential Euler",
+        default=False,
+        required=True,
+        doc="""If True, linear integration follows the exact solution of the linear dfun, 
+               for an input buffer that is constant within each time step, instead of the integrator scheme.
+               Default = False.""")
+
     @property
     def _state(self):
         return self._assert_size("state", dim=1)
@@ -80,15 +102,57 @@ class Integration(Transformer):
     def transpose_output(self, buffer):
         return np.transpose(buffer, (2, 0, 1))
 
+    @property
+    def _is_linear(self):
+        return self.linear_integration and self._linear_dfun and \
+               not isinstance(self.integrator, self._stochastic_integrator) and \
+               self.integrator.state_variable_boundaries is None and \
+               self.integrator.clamped_state_variable_values is None
+
+    def _linear_coefficients(self):
+        """Method to compute the coefficients a and b of the recursion X_{n+1} = a * X_n + b * input_buffer_n,
+           by evaluating either the dfun or the integrator scheme for unit state and input buffer."""
+        ones = np.ones(self._state.shape)
+        zeros = np.zeros(self._state.shape)
+        if self.exponential_euler:
+            rate = self.dfun(ones, 0.0, zeros)
+            gain = self.dfun(zeros, 0.0, ones)
+            a = np.exp(rate * self.dt)
+            nonzero_rate = np.where(rate == 0.0, 1.0, rate)
+            b = np.where(rate == 0.0, self.dt, (a - 1.0) / nonzero_rate) * gain
+        else:
+            a = self.integrator.scheme(ones, self.dfun, 0.0, zeros, 0.0)
+            b = self.integrator.scheme(zeros, self.dfun, 0.0, ones, 0.0)
+        return a, b
+
+    def linear_integrate(self, input_buffer):
+        """Method to integrate at once the whole input buffer of shape (time, voi, proxy) for linear dfuns,
+           via a parallel (Hillis-Steele) scan of the linear recursion X_{n+1} = a * X_n + b * input_buffer_n."""
+        a, b = self._linear_coefficients()
+        n_steps = input_buffer.shape[0]
+        output_buffer = b * input_buffer  # (time, voi, proxy)
+        shift = 1
+        a_shift = a
+        while shift < n_steps:
+            output_buffer[shift:] = output_buffer[shift:] + a_shift * output_buffer[:-shift]
+            shift *= 2
+            a_shift = a_shift * a_shift
+        output_buffer += np.power(a, np.arange(1, n_steps + 1)[:, None, None]) * self._state
+        if n_steps:
+            self.state = output_buffer[-1].copy()
+        return output_buffer
+
     def loop_integrate(self, input_buffer):
-        output_buffer = []
         if input_buffer.ndim < 3:
             input_buffer = input_buffer[:, :, None]  # (proxy, time, voi)
         input_buffer = self.transpose_input(input_buffer)  # (proxy, time, voi) -> (time, voi, proxy)
-        for iT in range(input_buffer.shape[0]):
-            self.compute_next_step(input_buffer[iT])  # (voi, proxy)
-            output_buffer.append(self._state)  # (voi, proxy)
-        output_buffer = np.array(output_buffer)  # (time, voi, proxy)
+        if self._is_linear:
+            output_buffer = self.linear_integrate(input_buffer)
+        else:
+            output_buffer = np.empty(input_buffer.shape[:1] + self._state.shape)  # (time, voi, proxy)
+            for iT in range(input_buffer.shape[0]):
+                self.compute_next_step(input_buffer[iT])  # (voi, proxy)
+                output_buffer[iT] = self._state  # (voi, proxy)
         return self.transpose_output(output_buffer)   # (time, voi, proxy) -> (proxy, time, voi)
 
     def _compute(self, input_buffer, *args, **kwargs):
@@ -114,6 +178,8 @@ class LinearIntegration(Integration):
         Integration.configure(self)
         self._tau
 
+    _linear_dfun = True
+
     def dfun(self, X, coupling=0.0, local_coupling=0.0, stimulus=0.0, **kwargs):
         return (-X + local_coupling) / self.tau
 
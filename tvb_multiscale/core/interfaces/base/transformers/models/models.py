@@ -7,6 +7,8 @@ from tvb_multiscale.core.interfaces.base.transformers.models.base import \
 from tvb_multiscale.core.interfaces.base.transformers.models.integration import IntegrationTransformers
 from tvb_multiscale.core.interfaces.base.transformers.models.elephant import \
     ElephantRatesToSpikesTransformers, ElephantSpikesToRatesTransformers
+from tvb_multiscale.core.interfaces.base.transformers.models.poisson import PoissonRatesToSpikesTransformers
+from tvb_multiscale.core.interfaces.base.transformers.models.histogram import HistogramSpikesToRatesTransformers
 from tvb_multiscale.core.utils.data_structures_utils import combine_enums
 
 
@@ -15,10 +17,12 @@ class BasicTransformers(Enum):
     LINEAR = Linear
 
 
-RatesToSpikesTransformers = combine_enums("RatesToSpikesTransformers", ElephantRatesToSpikesTransformers)
+RatesToSpikesTransformers = combine_enums("RatesToSpikesTransformers",
+                                          ElephantRatesToSpikesTransformers, PoissonRatesToSpikesTransformers)
 
 
-SpikesToRatesTransformers = combine_enums("SpikesToRatesTransformers", ElephantSpikesToRatesTransformers)
+SpikesToRatesTransformers = combine_enums("SpikesToRatesTransformers",
+                                          ElephantSpikesToRatesTransformers, HistogramSpikesToRatesTransformers)
 
 
 class LinearTransformers(Enum):
@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+
+from abc import ABCMeta, abstractmethod, ABC
+from enum import Enum
+
+import numpy as np
+
+from tvb.basic.neotraits._attr import Attr, Float, NArray
+
+from tvb_multiscale.core.interfaces.base.transformers.models.base import RatesToSpikes
+
+
+class RatesToSpikesPoisson(RatesToSpikes):
+    """
+        RatesToSpikesPoisson Transformer class,
+        implementing a batched, pure numpy, generator of inhomogeneous Poisson spike trains.
+        Rates are assumed to be in Hz and the time step dt (and therefore the spike times) in ms.
+        All spike trains of all proxy nodes are drawn with one call:
+        - without a refractory period, spike counts are drawn on a (spike train, time step) grid,
+          given that the rate is piecewise constant within each time step,
+          and spike times are distributed uniformly within each time step,
+        - with a refractory period, a dead-time Poisson process is generated by time rescaling,
+          iterating over spike order, simultaneously for all spike trains.
+          As in elephant, the rate is corrected to rate / (1 - rate * refractory_period),
+          so that the mean rate of the resulting spike trains is preserved.
+        This class can be used to produce independent spike trains per proxy node,
+        as a faster alternative to RatesToSpikesElephantPoisson.
+    """
+
+    output_buffer = Attr(
+        field_type=np.ndarray,
+        doc="""Array of spiketrains storing temporarily the generated spikes.""",
+        default=np.array([], dtype=object)
+    )
+
+    refractory_period = Float(label="Refractory period",
+                              doc="The time period (in ms) after one spike no other spike is emitted. Default: 0.0.",
+                              required=False,
+                              default=0.0)
+
+    random_seed = Attr(field_type=int,
+                       label="Random seed",
+                       doc="""Seed of the random number generator. Default: None, for a random seed.""",
+                       required=False,
+                       default=None)
+
+    _rng = None
+
+    def configure(self):
+        super(RatesToSpikesPoisson, self).configure()
+        self.reset_random_generator()
+
+    def reset_random_generator(self, random_seed=None):
+        if random_seed is not None:
+            self.random_seed = random_seed
+        self._rng = np.random.RandomState(self.random_seed)
+
+    @property
+    def rng(self):
+        if self._rng is None:
+            self.reset_random_generator()
+        return self._rng
+
+    @property
+    def _t_start(self):
+        return self.dt * (self.input_time[0] - 1) + self.time_shift
+
+    @property
+    def _t_stop(self):
+        return self.dt * self.input_time[-1] + self.time_shift
+
+    @staticmethod
+    def _rates(rates, refractory_period=0.0):
+        # Rates in Hz -> rates in spikes/ms, without negative values
+        rates = np.maximum(rates, 0.0) * 1e-3
+        if refractory_period:
+            if np.any(rates * refractory_period >= 1.0):
+                raise ValueError("Rate (%g Hz) too high for the refractory period (%g ms)!"
+                                 % (1000 * np.max(rates), refractory_period))
+            rates = rates / (1.0 - rates * refractory_period)
+        return rates
+
+    def _compute_grid_spike_times(self, rates, trains_proxies):
+        """Method to draw spike counts for each spike train and time step,
+           and distribute the spikes uniformly within each time step."""
+        counts = self.rng.poisson(rates[trains_proxies] * self.dt)  # (spike train, time step)
+        trains, steps = np.nonzero(counts)
+        counts = counts[trains, steps]
+        trains = np.repeat(trains, counts)
+        steps = np.repeat(steps, counts)
+        return trains, self._t_start + (steps + self.rng.uniform(size=steps.size)) * self.dt
+
+    def _compute_rescaled_spike_times(self, rates, trains_proxies, refractory_period):
+        """Method to generate spike trains with a refractory period, by time rescaling,
+           iterating over the order of the spikes, but simultaneously for all spike trains."""
+        n_proxies, n_steps = rates.shape
+        # Cumulative rate integrals at the edges of the time steps, (proxy, time step + 1):
+        integrals = np.concatenate([np.zeros((n_proxies, 1)), np.cumsum(rates * self.dt, axis=1)], axis=1)
+        # Offset the integrals of each proxy so that they can all be inverted with a single searchsorted call:
+        offsets = np.cumsum(np.concatenate([[0.0], integrals[:-1, -1] + 1.0]))
+        flat_integrals = (integrals + offsets[:, None]).flatten()
+        t_start = self._t_start
+        trains = []
+        times = []
+        active = np.arange(len(trains_proxies))
+        proxies = trains_proxies
+        integral = np.zeros(active.shape)
+        while active.size:
+            integral = integral + self.rng.exponential(size=active.size)
+            spiking = integral < integrals[proxies, -1]
+            active, proxies, integral = active[spiking], proxies[spiking], integral[spiking]
+            # Invert the cumulative rate integral:
+            steps = np.searchsorted(flat_integrals, integral + offsets[proxies], side="right") - 1 \
+                    - proxies * (n_steps + 1)
+            this_times = t_start + steps * self.dt + \
+                         (integral - integrals[proxies, steps]) / rates[proxies, steps]
+            trains.append(active)
+            times.append(this_times)
+            # Move past the refractory period and compute the cumulative rate integral up to there:
+            this_times = this_times + refractory_period
+            steps = np.floor((this_times - t_start) / self.dt).astype("i")
+            spiking = steps < n_steps
+            active, proxies, steps, this_times = active[spiking], proxies[spiking], steps[spiking], this_times[spiking]
+            integral = integrals[proxies, steps] + rates[proxies, steps] * (this_times - t_start - steps * self.dt)
+        if len(trains):
+            return np.concatenate(trains), np.concatenate(times)
+        return np.array([], dtype="i"), np.array([])
+
+    def _compute_spike_times(self, rates, number_of_spiketrains, refractory_period=None):
+        """Method to generate independent Poisson spike trains for all proxy nodes in one call.
+           Arguments:
+            - rates: array of rates of shape (proxy, time) in Hz,
+            - number_of_spiketrains: array of the number of spike trains per proxy,
+            - refractory_period: float in ms, default = None, for the refractory_period attribute.
+           Returns:
+            - spike trains' indices, sorted, grouped by proxy,
+            - spike times, sorted in time within each spike train.
+        """
+        if refractory_period is None:
+            refractory_period = self.refractory_period
+        rates = self._rates(np.atleast_2d(rates), refractory_period)
+        trains_proxies = np.repeat(np.arange(rates.shape[0]), number_of_spiketrains)
+        if refractory_period:
+            trains, times = self._compute_rescaled_spike_times(rates, trains_proxies, refractory_period)
+        else:
+            trains, times = self._compute_grid_spike_times(rates, trains_proxies)
+        inds = np.lexsort((times, trains))
+        return trains[inds], times[inds]
+
+    @staticmethod
+    def _split_spiketrains(trains, times, number_of_spiketrains):
+        """Method to split the sorted spikes' times to a list of spike trains per proxy node."""
+        n_trains = np.cumsum(number_of_spiketrains)
+        spiketrains = np.split(times, np.searchsorted(trains, np.arange(1, n_trains[-1] if n_trains.size else 0)))
+        output_buffer = np.empty((len(number_of_spiketrains),), dtype=object)
+        for iP, (start, stop) in enumerate(zip(np.concatenate([[0], n_trains[:-1]]), n_trains)):
+            output_buffer[iP] = spiketrains[start:stop]
+        return output_buffer
+
+    def _compute_spiketrains(self, rates, proxy_count, *args, **kwargs):
+        """Method for the computation of rates data transformation to independent spike trains of a single proxy."""
+        number_of_spiketrains = self._number_of_neurons[proxy_count:proxy_count+1]
+        return self._split_spiketrains(*self._compute_spike_times(rates, number_of_spiketrains),
+                                       number_of_spiketrains)[0]
+
+    def _compute_all_spike_times(self, rates, number_of_spiketrains):
+        return self._compute_spike_times(rates, number_of_spiketrains)
+
+    def _compute(self, input_buffer, *args, **kwargs):
+        """Method for the computation on the input buffer rates' data
+           for the output buffer data of spike trains to result, for all proxy nodes at once."""
+        input_buffer = np.array(input_buffer)
+        if input_buffer.ndim < 2:
+            input_buffer = input_buffer[:, None]
+        rates = self._scale_factor[:, None] * input_buffer + self._translation_factor[:, None]
+        number_of_spiketrains = self._number_of_neurons
+        return self._split_spiketrains(*self._compute_all_spike_times(rates, number_of_spiketrains),
+                                       number_of_spiketrains)
+
+
+class RatesToSpikesPoissonInteraction(RatesToSpikesPoisson, ABC):
+    __metaclass__ = ABCMeta
+
+    """
+        RatesToSpikesPoissonInteraction Transformer abstract class,
+        implementing a batched, pure numpy, generator of interacting Poisson spike trains per proxy node.
+        The algorithm implemented is based on
+        Kuhn, Alexandre, Ad Aertsen, and Stefan Rotter.
+        “Higher-Order Statistics of Input Ensembles and the Response of Simple Model Neurons.”
+        Neural Computation 15, no. 1 (January 2003): 67–101. https://doi.org/10.1162/089976603321043702.
+        DOI: 10.1162/089976603321043702.
+        It follows the parametrization of RatesToSpikesElephantPoissonInteraction.
+    """
+
+    correlation_factor = NArray(
+                            label="Correlation factor",
+                            doc="Correlation factor per proxy, array of floats in the interval (0, 1], "
+                                "default = 1.0 / number_of_neurons.",
+                            required=True,
+                            default=np.array([0.0]).astype('f')
+                        )
+
+    @property
+    def _correlation_factor(self):
+        return self._assert_size("correlation_factor")
+
+    def configure(self):
+        super(RatesToSpikesPoissonInteraction, self).configure()
+        correlation_factor = self._correlation_factor.copy()
+        inds = np.where(correlation_factor <= 0.0)
+        correlation_factor[inds] = 1.0 / self._number_of_neurons[inds]
+        self.correlation_factor = correlation_factor.copy()
+
+    @staticmethod
+    def _repeat_shared_spikes(shared_trains, shared_times, number_of_spiketrains):
+        """Method to repeat the shared spike train of each proxy for all of the proxy's spike trains.
+           It returns the indices of the target spike trains and of the repeated shared spikes."""
+        n_proxies = len(number_of_spiketrains)
+        trains_proxies = np.repeat(np.arange(n_proxies), number_of_spiketrains)
+        shared_starts = np.searchsorted(shared_trains, np.arange(n_proxies + 1))
+        shared_counts = np.diff(shared_starts)[trains_proxies]
+        trains = np.repeat(np.arange(trains_proxies.size), shared_counts)
+        inds = np.arange(trains.size) - np.repeat(np.cumsum(shared_counts) - shared_counts, shared_counts)
+        inds += np.repeat(shared_starts[:-1][trains_proxies], shared_counts)
+        return trains, inds
+
+    @abstractmethod
+    def _compute_interaction_spike_times(self, rates, number_of_spiketrains, correlation_factor):
+        pass
+
+    def _compute_spiketrains(self, rates, proxy_count, *args, **kwargs):
+        """Method for the computation of rates data transformation to interacting spike trains of a single proxy."""
+        number_of_spiketrains = self._number_of_neurons[proxy_count:proxy_count+1]
+        spike_times = self._compute_interaction_spike_times(
+            np.atleast_2d(rates), number_of_spiketrains, self._correlation_factor[proxy_count:proxy_count+1])
+        return self._split_spiketrains(*spike_times, number_of_spiketrains)[0]
+
+    def _compute_all_spike_times(self, rates, number_of_spiketrains):
+        return self._compute_interaction_spike_times(rates, number_of_spiketrains, self._correlation_factor)
+
+
+class RatesToSpikesPoissonSingleInteraction(RatesToSpikesPoissonInteraction):
+    """
+        RatesToSpikesPoissonSingleInteraction Transformer class,
+        implementing a batched, pure numpy, generator of interacting Poisson spike trains per proxy node,
+        with single interaction, i.e., each spike train is the superposition of
+        a spike train shared among all spike trains of the proxy node, of rate correlation_factor * rate,
+        and of an independent spike train of rate (1 - correlation_factor) * rate.
+        The single interaction algorithm implemented is based on
+        Kuhn, Alexandre, Ad Aertsen, and Stefan Rotter.
+        “Higher-Order Statistics of Input Ensembles and the Response of Simple Model Neurons.”
+        Neural Computation 15, no. 1 (January 2003): 67–101. https://doi.org/10.1162/089976603321043702.
+        DOI: 10.1162/089976603321043702.
+    """
+
+    def _compute_interaction_spike_times(self, rates, number_of_spiketrains, correlation_factor):
+        correlation_factor = correlation_factor[:, None]
+        shared_trains, shared_times = \
+            self._compute_spike_times(rates * correlation_factor, np.ones(rates.shape[:1], dtype="i"))
+        trains, times = self._compute_spike_times(rates * (1 - correlation_factor), number_of_spiketrains)
+        shared_trains, inds = self._repeat_shared_spikes(shared_trains, shared_times, number_of_spiketrains)
+        trains = np.concatenate([trains, shared_trains])
+        times = np.concatenate([times, shared_times[inds]])
+        inds = np.lexsort((times, trains))
+        return trains[inds], times[inds]
+
+
+class RatesToSpikesPoissonMultipleInteraction(RatesToSpikesPoissonInteraction):
+    """
+        RatesToSpikesPoissonMultipleInteraction Transformer class,
+        implementing a batched, pure numpy, generator of interacting Poisson spike trains per proxy node,
+        with multiple interaction, i.e., each spike train copies each spike of a mother spike train
+        with probability equal to correlation_factor.
+        The mother spike train is generated without a refractory period.
+        The multiple interaction algorithm implemented is based on
+        Kuhn, Alexandre, Ad Aertsen, and Stefan Rotter.
+        “Higher-Order Statistics of Input Ensembles and the Response of Simple Model Neurons.”
+        Neural Computation 15, no. 1 (January 2003): 67–101. https://doi.org/10.1162/089976603321043702.
+        DOI: 10.1162/089976603321043702.
+    """
+
+    def _compute_interaction_spike_times(self, rates, number_of_spiketrains, correlation_factor):
+        rates = np.maximum(rates * number_of_spiketrains[:, None], 1e-12)  # avoid rates equal to zeros
+        shared_trains, shared_times = \
+            self._compute_spike_times(rates * correlation_factor[:, None], np.ones(rates.shape[:1], dtype="i"), 0.0)
+        trains, inds = self._repeat_shared_spikes(shared_trains, shared_times, number_of_spiketrains)
+        trains_proxies = np.repeat(np.arange(rates.shape[0]), number_of_spiketrains)
+        select = self.rng.uniform(size=trains.size) < correlation_factor[trains_proxies[trains]]
+        # Repeated shared spikes are already sorted by spike train and time:
+        return trains[select], shared_times[inds[select]]
+
+
+class PoissonRatesToSpikesTransformers(Enum):
+    POISSON = RatesToSpikesPoisson
+    POISSON_SINGLE_INTERACTION = RatesToSpikesPoissonSingleInteraction
+    POISSON_MULTIPLE_INTERACTION = RatesToSpikesPoissonMultipleInteraction
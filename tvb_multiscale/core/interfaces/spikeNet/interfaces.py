@@ -9,6 +9,7 @@ from tvb.basic.neotraits.api import Attr, Float, List, NArray
 from tvb.contrib.scripts.utils.data_structures_utils import extract_integer_intervals, list_of_dicts_to_dict_of_lists
 
 from tvb_multiscale.core.neotraits import HasTraits
+from tvb_multiscale.core.utils.profiling_utils import profile
 from tvb_multiscale.core.interfaces.base.interfaces import \
     BaseInterface, SenderInterface, ReceiverInterface, BaseInterfaces
 from tvb_multiscale.core.interfaces.base.transformers.interfaces import TransformerInterface, \
@@ -130,6 +131,7 @@ class SpikeNetOutputInterface(SpikeNetInterface):
     def proxy_gids(self):
         return self._get_proxy_gids(self.proxy.source)
 
+    @profile(category="spikeNet", nbytes="output")
     def get_proxy_data(self):
         data = self.proxy()
         if data is not None:
@@ -9,6 +9,7 @@ from tvb.basic.neotraits.api import Attr, Float, Int, NArray, List
 from tvb.contrib.scripts.utils.data_structures_utils import extract_integer_intervals
 
 from tvb_multiscale.core.neotraits import HasTraits
+from tvb_multiscale.core.utils.profiling_utils import profile
 from tvb_multiscale.core.interfaces.base.interfaces import BaseInterface, SenderInterface, ReceiverInterface, \
     BaseInterfaces
 from tvb_multiscale.core.interfaces.base.transformers.interfaces import TransformerInterface, TransformerInterfaces, \
@@ -414,6 +415,7 @@ class TVBOutputInterfaces(BaseInterfaces, TVBInterfaces):
             times += self.min_idelay
         return times
 
+    @profile(category="interfaces", nbytes="input")
     def __call__(self, data):
         outputs = []
         for ii, interface in enumerate(self.interfaces):
@@ -469,56 +471,130 @@ class TVBInputInterfaces(BaseInterfaces, TVBInterfaces):
 
     interfaces = List(of=TVBInputInterface)
 
+    # The cosimulation updates' values are placed in a buffer of good_cosim_update_values_shape,
+    # allocated once, at time step slots time_step % synchronization_n_step,
+    # using the scatter indices of each interface, precomputed upon setting the local indices.
+    # A validity bitmap of shape (time step slots, interfaces) marks the data received per interface,
+    # instead of filling the buffer with NaNs and scanning it for them:
+    _cosim_updates = None
+    _cosim_updates_output = None
+    _time_steps = None
+    _steps_range = None
+    _valid = None
+    _scatter_inds = []
+    _full_coverage = False
+    _start_step = None
+    _end_step = None
+
+    @staticmethod
+    def _scatter_index(inds):
+        """Method to convert indices to a slice, if they form a contiguous increasing range."""
+        inds = np.array(inds).astype("i").flatten()
+        if inds.size and np.all(np.diff(inds) == 1):
+            return slice(int(inds[0]), int(inds[-1]) + 1)
+        return inds
+
     def set_local_indices(self, simulator_voi, simulator_proxy_inds):
         """Method to get the correct indices of voi and proxy_inds,
            adjusted to the contents, shape etc of the cosim_updates,
            based on TVB CoSimulators' vois and proxy_inds,
            for each cosimulation"""
+        coverage = np.zeros((len(simulator_voi), len(simulator_proxy_inds)), dtype="bool")
+        self._scatter_inds = []
         for interface in self.interfaces:
             interface.set_local_indices(simulator_voi, simulator_proxy_inds)
-
-    def _set_data_from_interface(self, cosim_updates, interface, data, good_cosim_update_values_shape):
-        # Convert start and end input_time step to a vector of integer input_time steps:
-        time_steps = np.arange(data[0][0], data[0][1] + 1).astype("i")
-        cosim_updates[
-            (time_steps % good_cosim_update_values_shape[0])[:, None, None],
-             interface.voi_loc[None, :, None],  # indices specific to cosim_updates needed here
-             interface.proxy_inds_loc[None, None, :],  # indices specific to cosim_updates needed here
-             0] = np.copy(data[1])  # !!! assuming only 1 mode!!!
-        return cosim_updates, time_steps
-
-    def _get_from_interface(self, input_data, interface, cosim_updates, all_time_steps, good_cosim_update_values_shape):
-        if input_data is not None:
-            cosim_updates, time_steps = \
-                self._set_data_from_interface(cosim_updates, interface, input_data, good_cosim_update_values_shape)
-            all_time_steps += time_steps.tolist()
-            return cosim_updates, all_time_steps
-        else:
-            return cosim_updates, all_time_steps
+            voi_inds = self._scatter_index(interface.voi_loc)
+            proxy_inds = self._scatter_index(interface.proxy_inds_loc)
+            if not isinstance(voi_inds, slice) and not isinstance(proxy_inds, slice):
+                voi_inds = voi_inds[:, None]
+                proxy_inds = proxy_inds[None, :]
+            self._scatter_inds.append((voi_inds, proxy_inds))
+            coverage[voi_inds, proxy_inds] = True
+        self._full_coverage = bool(np.all(coverage))
 
     def _prepare_cosim_update(self, good_cosim_update_values_shape):
-        cosim_updates = np.empty(good_cosim_update_values_shape).astype(float)
-        cosim_updates[:] = np.NAN
-        all_time_steps = []
-        return cosim_updates, all_time_steps
-
-    def get_inputs(self, cosim_updates, all_time_steps, good_cosim_update_values_shape):
-        if len(all_time_steps):
-            all_time_steps = np.unique(all_time_steps)
-            return [all_time_steps, cosim_updates[all_time_steps % good_cosim_update_values_shape[0]]]
+        good_cosim_update_values_shape = tuple(np.array(good_cosim_update_values_shape).astype("i").tolist())
+        if self._cosim_updates is None or self._cosim_updates.shape != good_cosim_update_values_shape:
+            self._cosim_updates = np.empty(good_cosim_update_values_shape)
+            self._cosim_updates_output = np.empty(good_cosim_update_values_shape)
+            self._time_steps = np.empty((good_cosim_update_values_shape[0],), dtype="i")
+            self._steps_range = np.arange(good_cosim_update_values_shape[0], dtype="i")
+            self._valid = np.zeros((good_cosim_update_values_shape[0], self.number_of_interfaces), dtype="bool")
+        self._valid[:] = False
+        self._start_step = None
+        self._end_step = None
+
+    def _set_data_from_interface(self, interface_index, data):
+        """Method to place the data received from an interface to the cosim_updates buffer,
+           at the time step slots of the time steps from data[0][0] to data[0][1]."""
+        start_step, end_step = int(data[0][0]), int(data[0][1])
+        n_slots = self._cosim_updates.shape[0]
+        n_steps = end_step - start_step + 1
+        if n_steps > n_slots:
+            raise ValueError("Cosimulation updates of %d time steps exceed the %d time steps of the buffer!"
+                             % (n_steps, n_slots))
+        voi_inds, proxy_inds = self._scatter_inds[interface_index]
+        values = data[1][..., None]  # !!! assuming only 1 mode!!!
+        start_slot = start_step % n_slots
+        n_first = min(n_steps, n_slots - start_slot)
+        self._cosim_updates[start_slot:start_slot + n_first, voi_inds, proxy_inds, :] = values[:n_first]
+        self._valid[start_slot:start_slot + n_first, interface_index] = True
+        if n_first < n_steps:
+            # The time steps wrap around the end of the buffer:
+            self._cosim_updates[:n_steps - n_first, voi_inds, proxy_inds, :] = values[n_first:]
+            self._valid[:n_steps - n_first, interface_index] = True
+        if self._start_step is None:
+            self._start_step, self._end_step = start_step, end_step
         else:
-            return [all_time_steps, cosim_updates]
+            self._start_step = min(self._start_step, start_step)
+            self._end_step = max(self._end_step, end_step)
+
+    def _get_from_interface(self, interface_index, input_data):
+        if input_data is not None:
+            self._set_data_from_interface(interface_index, input_data)
 
+    @property
+    def any_updates_received(self):
+        """True if any cosimulation updates have been received since the last preparation of the buffer."""
+        return self._start_step is not None
+
+    @property
+    def all_updates_received(self):
+        """True if the cosimulation updates received since the last preparation of the buffer
+           cover all voi and proxy nodes of TVB, for all their time steps."""
+        if self._start_step is None or not self._full_coverage:
+            return False
+        n_slots = self._valid.shape[0]
+        n_steps = min(self._end_step - self._start_step + 1, n_slots)
+        start_slot = self._start_step % n_slots
+        n_first = min(n_steps, n_slots - start_slot)
+        return bool(self._valid[start_slot:start_slot + n_first].all() and self._valid[:n_steps - n_first].all())
+
+    def get_inputs(self):
+        """Method to return the cosimulation updates received, as [time steps, values], ordered in time.
+           The output arrays are buffers, which are reused, i.e., overwritten, by the next call."""
+        if self._start_step is None:
+            return [self._time_steps[:0], self._cosim_updates_output[:0]]
+        n_slots = self._cosim_updates.shape[0]
+        n_steps = min(self._end_step - self._start_step + 1, n_slots)
+        start_slot = self._start_step % n_slots
+        n_first = min(n_steps, n_slots - start_slot)
+        np.add(self._steps_range[:n_steps], self._start_step, out=self._time_steps[:n_steps])
+        if start_slot == 0:
+            return [self._time_steps[:n_steps], self._cosim_updates[:n_steps]]
+        self._cosim_updates_output[:n_first] = self._cosim_updates[start_slot:start_slot + n_first]
+        self._cosim_updates_output[n_first:n_steps] = self._cosim_updates[:n_steps - n_first]
+        return [self._time_steps[:n_steps], self._cosim_updates_output[:n_steps]]
+
+    @profile(category="interfaces", nbytes="output")
     def __call__(self, input_datas, good_cosim_update_values_shape):
-        cosim_updates, all_time_steps = self._prepare_cosim_update(good_cosim_update_values_shape)
+        self._prepare_cosim_update(good_cosim_update_values_shape)
         for ii, (interface, input_data) in enumerate(zip(self.interfaces, input_datas)):
-            if len(input_data) > 2:
+            if input_data is not None and len(input_data) > 2:
                 assert input_data[2] == ii
                 input_data = input_data[:2]
-            cosim_updates, all_time_steps = \
-                self._get_from_interface(interface(input_data), interface, cosim_updates,
-                                         all_time_steps, good_cosim_update_values_shape)
-        return self.get_inputs(cosim_updates, all_time_steps, good_cosim_update_values_shape)
+            self._get_from_interface(ii, interface(input_data))
+        return self.get_inputs()
 
     def info(self, recursive=0):
         info = BaseInterfaces.info(self, recursive=recursive)
@@ -548,17 +624,12 @@ class TVBReceiverInterfaces(TVBInputInterfaces):
 
     interfaces = List(of=TVBReceiverInterface)
 
-    def _get_from_interface(self, interface, cosim_updates, all_time_steps, good_cosim_update_values_shape):
-        data = interface()  # [start_and_time_steps, values]
-        return super(TVBReceiverInterfaces, self)._get_from_interface(
-            data, interface, cosim_updates, all_time_steps, good_cosim_update_values_shape)
-
+    @profile(category="interfaces", nbytes="output")
     def __call__(self, good_cosim_update_values_shape):
-        cosim_updates, all_time_steps = self._prepare_cosim_update(good_cosim_update_values_shape)
-        for interface in self.interfaces:
-            cosim_updates, all_time_steps = \
-                self._get_from_interface(interface, cosim_updates, all_time_steps, good_cosim_update_values_shape)
-        return self.get_inputs(cosim_updates, all_time_steps, good_cosim_update_values_shape)
+        self._prepare_cosim_update(good_cosim_update_values_shape)
+        for ii, interface in enumerate(self.interfaces):
+            self._get_from_interface(ii, interface())  # [start_and_time_steps, values]
+        return self.get_inputs()
 
 
 class TVBReceiverTransformerInterfaces(TVBReceiverInterfaces):
@@ -4,6 +4,8 @@ import ray
 
 import numpy as np
 
+from tvb.contrib.scripts.utils.data_structures_utils import ensure_list
+
 from tvb_multiscale.core.neotraits import HasTraits, Attr
 from tvb_multiscale.core.ray.client import RayClient
 from tvb_multiscale.core.interfaces.base.io import Sender, Receiver
@@ -61,6 +63,56 @@ class RayReceiverInterface(HasTraits):
             return self.receiving_ref_obj
 
 
+class RayObjectStoreInterface(HasTraits):
+
+    """RayObjectStoreInterface class to exchange data with remote Ray actors via the Ray object store:
+       the data arrays are put to the object store once, as contiguous numpy buffers,
+       and only their ObjectRefs are passed to the actors' methods' calls.
+       Ray resolves the ObjectRefs passed as arguments to zero-copy read-only numpy views
+       of the object store's shared memory, and so does ray.get for the arrays of the remote results,
+       which, therefore, should never be modified in place by the receivers.
+    """
+
+    # Staging buffers, reused for non contiguous arrays of the same shape and dtype across synchronization steps:
+    _put_buffers = None
+
+    def _contiguous_buffer(self, key, array):
+        # Contiguous numeric arrays are put as they are, zero-copy,
+        # whereas any other data, e.g., the lists or object arrays of the spikes' arrays per proxy,
+        # are serialized by ray.put anyway, and, therefore, they are not staged:
+        if not isinstance(array, np.ndarray) or array.dtype.hasobject or array.flags.c_contiguous:
+            return array
+        if self._put_buffers is None:
+            self._put_buffers = {}
+        buffer = self._put_buffers.get(key, None)
+        if buffer is None or buffer.shape != array.shape or buffer.dtype != array.dtype:
+            buffer = np.empty(array.shape, dtype=array.dtype)
+            self._put_buffers[key] = buffer
+        np.copyto(buffer, array)
+        return buffer
+
+    def put_data(self, data):
+        """Method to put [times, values] data to the Ray object store, and return [times_ref, values_ref]."""
+        return [ray.put(self._contiguous_buffer(ii, d)) for ii, d in enumerate(data)]
+
+    def _get_transformer_output(self):
+        """Method to read the output time and buffer of the transformer,
+           in a single actor round-trip, if the transformer is remote."""
+        if isinstance(self.transformer, RayClient):
+            output = self.transformer.get_many("output_time", "output_buffer")
+            return [output["output_time"], output["output_buffer"]]
+        return [self.transformer.output_time, self.transformer.output_buffer]
+
+    @staticmethod
+    def prefetch_refs(refs):
+        """Function to start fetching the objects of the input ObjectRefs to the local object store,
+           without blocking, so that a later ray.get finds them locally."""
+        refs = [ref for ref in ensure_list(refs) if isinstance(ref, ray._raylet.ObjectRef)]
+        if len(refs):
+            ray.wait(refs, num_returns=len(refs), timeout=0, fetch_local=True)
+        return refs
+
+
 class RayTVBSenderInterface(TVBSenderInterface, RaySenderInterface):
 
     """RayTVBSenderInterface sends TVB data to a remote TVBtoSpikeNetTransformerInterface"""
@@ -182,10 +234,11 @@ class RayTVBReceiverTransformerInterface(TVBReceiverTransformerInterface, RayRec
 #             #print("\nWTF?: %s" % str(data))
 
 
-class RayTVBtoSpikeNetInterface(TVBtoSpikeNetInterface, RaySenderInterface):
+class RayTVBtoSpikeNetInterface(TVBtoSpikeNetInterface, RaySenderInterface, RayObjectStoreInterface):
 
     """RayTVBtoSpikeNetInterface transforms TVB data via an optionally remote Transformer
-        and sends them to a remote spikeNet simulator"""
+        and sends them to a remote spikeNet simulator.
+        The data are passed to a remote Transformer via the Ray object store."""
 
     transformer_ref_obj = None
     ray_transformer_flag = False
@@ -224,7 +277,17 @@ class RayTVBtoSpikeNetInterface(TVBtoSpikeNetInterface, RaySenderInterface):
             self._data = None
         return super(RayTVBtoSpikeNetInterface, self)._send_data(block=block)
 
+    def prefetch(self):
+        """Method to start fetching the output of a running remote transformer, without blocking."""
+        return self.prefetch_refs(self.transformer_ref_obj)
+
+    def send_data(self, data=None):
+        if data is None:
+            data = self._get_transformer_output()
+        return super(RayTVBtoSpikeNetInterface, self).send_data(data)
+
     def _from_transforming_to_sending(self, block=False):
+        # Zero-copy read-only views of the transformer's output:
         self._data = ray.get(self.transformer_ref_obj)
         self.transformer_ref_obj = None
         return self._send_data(self._data, block=block)
@@ -248,7 +311,8 @@ class RayTVBtoSpikeNetInterface(TVBtoSpikeNetInterface, RaySenderInterface):
             # This is the case when the interface has to start the process by transforming TVB data...
             data = self.reshape_data(data)
             if self.ray_transformer_flag:
-                self.transformer_ref_obj = self.transformer(data=data[1], time=data[0])
+                time_ref, data_ref = self.put_data(data)
+                self.transformer_ref_obj = self.transformer(data=data_ref, time=time_ref)
                 if block:
                     return self._from_transforming_to_sending(block)
                 return self.transformer_ref_obj
@@ -259,10 +323,11 @@ class RayTVBtoSpikeNetInterface(TVBtoSpikeNetInterface, RaySenderInterface):
             return self._send_data(block=block)
 
 
-class RaySpikeNetToTVBInterface(SpikeNetToTVBInterface, RayReceiverInterface):
+class RaySpikeNetToTVBInterface(SpikeNetToTVBInterface, RayReceiverInterface, RayObjectStoreInterface):
 
     """RaySpikeNetToTVBInterface transforms receives data from a remote spikeNet simulator
-        and transforms them via an optionally remote Transformer"""
+        and transforms them via an optionally remote Transformer.
+        The data are passed to a remote Transformer via the Ray object store."""
 
     transformer_ref_obj = None
     ray_transformer_flag = False
@@ -283,7 +348,17 @@ class RaySpikeNetToTVBInterface(SpikeNetToTVBInterface, RayReceiverInterface):
             self.ray_transformer_flag = True
         super(RaySpikeNetToTVBInterface, self).configure()
 
+    def prefetch(self):
+        """Method to start fetching the output of a running remote transformer, without blocking."""
+        return self.prefetch_refs(self.transformer_ref_obj)
+
+    def reshape_data(self, data=None):
+        if data is None:
+            data = self._get_transformer_output()
+        return super(RaySpikeNetToTVBInterface, self).reshape_data(data)
+
     def _get_transformed_data_block(self):
+        # Zero-copy read-only views of the transformer's output, which reshape_data only transposes:
         data = self.reshape_data(
             ray.get(self.transformer_ref_obj))
         self.transformer_ref_obj = None
@@ -297,7 +372,8 @@ class RaySpikeNetToTVBInterface(SpikeNetToTVBInterface, RayReceiverInterface):
             else:
                 return self.transformer_ref_obj
         elif data is not None:
-            self.transformer_ref_obj = self.transformer(data=data[1], time=data[0])
+            time_ref, data_ref = self.put_data(data)
+            self.transformer_ref_obj = self.transformer(data=data_ref, time=time_ref)
             if block:
                 # ...run it with blocking:
                 return self._get_transformed_data_block()
@@ -358,6 +434,12 @@ class RayTVBOutputInterfaces(TVBOutputInterfaces):
             return len(running) == 0
         return None
 
+    def prefetch(self):
+        """Method to start fetching the outputs of the interfaces' running remote transformers, without blocking."""
+        for interface in self.interfaces:
+            if hasattr(interface, "prefetch"):
+                interface.prefetch()
+
     def __call__(self, data=None, block=False):
         if data is None:
             for ii, (interface, running_task_ref) in enumerate(zip(self.interfaces, self.running_tasks_refs)):
@@ -383,8 +465,6 @@ class RayTVBInputInterfaces(TVBInputInterfaces):
        and receives data from them."""
 
     running_tasks_refs = []
-    cosim_updates = np.array([])
-    all_time_steps = []
 
     @property
     def is_running(self):
@@ -398,13 +478,19 @@ class RayTVBInputInterfaces(TVBInputInterfaces):
             return len(running) == 0
         return None
 
+    def prefetch(self):
+        """Method to start fetching the outputs of the interfaces' running remote transformers, without blocking."""
+        for interface in self.interfaces:
+            if hasattr(interface, "prefetch"):
+                interface.prefetch()
+
     def __call__(self, good_cosim_update_values_shape=None, block=False):
         if not self.is_running:
             # print("\nInitializing cosim_updates for this syncrun...")
             # Initialize at first call for this instance of synchronization:
-            self.cosim_updates, self.all_time_steps = self._prepare_cosim_update(good_cosim_update_values_shape)
+            self._prepare_cosim_update(good_cosim_update_values_shape)
             self.running_tasks_refs = [1] * self.number_of_interfaces
-        for ii, (interface, running_task_ref) in enumerate(zip(self.interfaces, self.running_tasks_refs)):
+        for ii, interface in enumerate(self.interfaces):
             if self.running_tasks_refs[ii] is not None:
                 # print("\nNot running...Get data...")
                 # Get data or reference to a remote task of receiving annd/or transforming data:
@@ -414,22 +500,16 @@ class RayTVBInputInterfaces(TVBInputInterfaces):
                     # It is data, place them to cosim_updates
                     data = self.running_tasks_refs[ii].copy()
                     # print("\nIt must be data: %s..." % str(type(data)))
-                    self.cosim_updates, time_steps = \
-                        self._set_data_from_interface(self.cosim_updates, interface,
-                                                      data, good_cosim_update_values_shape)
-                    self.all_time_steps += time_steps.tolist()
+                    self._set_data_from_interface(ii, data)
                     self.running_tasks_refs[ii] = None
-        self.running_tasks_refs = [ref_obj for ref_obj in self.running_tasks_refs if ref_obj is not None]
-        if len(self.running_tasks_refs) == 0:
+        if np.all([ref_obj is None for ref_obj in self.running_tasks_refs]):
             # print("\nAll interfaces finished. Returning data!")
             # Return cosim_updates data:
-            inputs = self.get_inputs(self.cosim_updates, self.all_time_steps, good_cosim_update_values_shape)
-            self.cosim_updates = np.array([])
-            self.all_time_steps = []
-            return inputs
+            self.running_tasks_refs = []
+            return self.get_inputs()
         else:
             # print("\nStill some interfaces running....!")
-            return self.running_tasks_refs
+            return [ref_obj for ref_obj in self.running_tasks_refs if ref_obj is not None]
 
 
 class RayTVBtoSpikeNetInterfaces(RayTVBOutputInterfaces, SpikeNetInputInterfaces):
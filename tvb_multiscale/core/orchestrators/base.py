@@ -8,6 +8,7 @@ from tvb.basic.neotraits.api import Attr
 from tvb_multiscale.core.neotraits import HasTraits
 from tvb_multiscale.core.config import Config, CONFIGURED, initialize_logger
 from tvb_multiscale.core.utils.file_utils import load_pickled_dict
+from tvb_multiscale.core.utils.profiling_utils import PROFILER
 from tvb_multiscale.core.tvb.cosimulator.cosimulator_serialization import serial_tvb_simulator_to_connectivity
 from tvb_multiscale.core.interfaces.base.builders import InterfaceBuilder
 
@@ -70,6 +71,8 @@ class App(HasTraits):
             self.logger = initialize_logger(__name__, config=self.config)
         super(App, self).configure()
         self.configure_tvb_serial_cosim_path()
+        if getattr(self.config, "PROFILING", False):
+            PROFILER.enable(getattr(self.config, "PROFILING_BUFFER_SIZE", None))
 
     @property
     def verbosity(self):
@@ -110,8 +113,24 @@ class App(HasTraits):
     def reset(self):
         self._logprint("Resetting %s %s..." % (self._app_or_orchestrator, self.__class__.__name__))
 
+    def export_profiling(self, filepath=None):
+        """Method to export the profiling records to a file (.csv, .json or Chrome trace, by default),
+           in the results' folder, if profiling is enabled.
+           The records are discarded afterwards, so that they are exported only once per process."""
+        if PROFILER.enabled and PROFILER.number_of_records:
+            if filepath is None:
+                filepath = os.path.join(self.config.out.FOLDER_RES,
+                                        "%s_profiling_trace.json" % self.__class__.__name__)
+            self._logprint("Exporting profiling records of %s %s to %s..."
+                           % (self._app_or_orchestrator, self.__class__.__name__, filepath))
+            filepath = PROFILER.export(filepath)
+            PROFILER.reset()
+            return filepath
+        return None
+
     def stop(self):
         self._logprint("Stopping %s %s..." % (self._app_or_orchestrator, self.__class__.__name__))
+        self.export_profiling()
 
     def _add_attrs_to_info(self, info):
         for attr in self._attrs_to_info:
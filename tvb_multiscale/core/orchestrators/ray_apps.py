@@ -4,6 +4,7 @@ import ray
 
 from tvb.basic.neotraits._attr import Attr
 
+from tvb_multiscale.core.utils.profiling_utils import profile
 from tvb_multiscale.core.ray.client import RayClient
 from tvb_multiscale.core.tvb.cosimulator.cosimulator_ray import CoSimulatorParallelRay
 from tvb_multiscale.core.tvb.cosimulator.cosimulator_builder import CoSimulatorRayBuilder
@@ -38,6 +39,16 @@ class SpikeNetRayApp(SpikeNetApp):
         ray.init(ignore_reinit_error=True)
         super(SpikeNetRayApp, self).start()
 
+    @profile(category="apps")
+    def run_for_synchronization_time(self, cosim_updates, cosimulation=True):
+        # The whole synchronization step takes a single actor round-trip:
+        with self.spiking_network.pipeline() as pipeline:
+            if cosimulation: pipeline.call("input_interfaces", cosim_updates)
+            pipeline.call("Run", self.synchronization_time)
+            if cosimulation: pipeline.call("output_interfaces")
+        if cosimulation:
+            return pipeline.results[-1]
+
     def stop(self):
         ray.kill(self.spiking_cosimulator_server)
         super(SpikeNetRayApp, self).stop()
@@ -3,6 +3,7 @@
 from tvb.basic.neotraits.api import Attr
 
 from tvb_multiscale.core.orchestrators.base import Orchestrator
+from tvb_multiscale.core.utils.profiling_utils import profile
 from tvb_multiscale.core.orchestrators.spikeNet_app import SpikeNetSerialApp
 from tvb_multiscale.core.orchestrators.tvb_app import TVBSerialApp
 
@@ -77,6 +78,7 @@ class SerialOrchestrator(Orchestrator):
         self.spikeNet_app.synchronization_time = self.tvb_cosimulator.synchronization_time
         self.spikeNet_app.configure_simulation()
 
+    @profile(category="apps")
     def simulate(self, simulation_length=None):
         if simulation_length is not None:
             self.tvb_app.cosimulator.simulation_length = simulation_length
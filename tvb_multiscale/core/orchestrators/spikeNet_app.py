@@ -5,6 +5,7 @@ from types import FunctionType
 from tvb.basic.neotraits.api import Attr, Float, Int
 
 from tvb_multiscale.core.orchestrators.base import NonTVBApp
+from tvb_multiscale.core.utils.profiling_utils import profile
 from tvb_multiscale.core.spiking_models.network import SpikingNetwork
 from tvb_multiscale.core.spiking_models.builders.base import SpikingNetworkBuilder
 from tvb_multiscale.core.interfaces.spikeNet.builders import SpikeNetInterfaceBuilder, SpikeNetRemoteInterfaceBuilder
@@ -102,6 +103,7 @@ class SpikeNetApp(NonTVBApp):
         super(SpikeNetApp, self).configure_simulation()
         self.spiking_network.configure()
 
+    @profile(category="apps")
     def simulate(self, simulation_length):
         super(SpikeNetApp, self).simulate(simulation_length)
         return self.spiking_network.Run(simulation_length)
@@ -182,6 +184,7 @@ class SpikeNetParallelApp(SpikeNetApp):
             self._logprint("Setting %s synchronization_time from interfaces = %g" %
                            (self.__class__.__name__, self.synchronization_time))
 
+    @profile(category="apps")
     def run_for_synchronization_time(self, cosim_updates, cosimulation=True):
         if cosimulation: self.spiking_network.input_interfaces(cosim_updates)
         self.spiking_network.Run(self.synchronization_time)
@@ -206,6 +209,7 @@ class SpikeNetRemoteParallelApp(SpikeNetParallelApp):
 
     _default_interface_builder_type = SpikeNetRemoteInterfaceBuilder
 
+    @profile(category="apps")
     def run_for_synchronization_time(self, cosimulation=True):
         if cosimulation: self.spiking_network.input_interfaces()
         self.spiking_network.Run(self.synchronization_time)
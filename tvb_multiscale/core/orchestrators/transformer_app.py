@@ -3,6 +3,7 @@
 from tvb.basic.neotraits.api import Attr
 
 from tvb_multiscale.core.orchestrators.base import NonTVBApp
+from tvb_multiscale.core.utils.profiling_utils import profile
 from tvb_multiscale.core.interfaces.base.transformers.builders import \
     TransformerInterfaceBuilder, RemoteTransformerInterfaceBuilder, \
     TVBtoSpikeNetTransformerInterfaceBuilder, SpikeNetToTVBTransformerInterfaceBuilder, \
@@ -53,6 +54,7 @@ class TransformerApp(NonTVBApp):
         self.tvb_to_spikeNet_interfaces.configure()
         self.spikeNet_to_tvb_interfaces.configure()
 
+    @profile(category="apps")
     def run_for_synchronization_time(self, tvb_to_spikeNet_cosim_updates, spikeNet_to_tvb_cosim_updates):
         return self.tvb_to_spikeNet_interfaces(tvb_to_spikeNet_cosim_updates), \
                self.spikeNet_to_tvb_interfaces(spikeNet_to_tvb_cosim_updates)
@@ -90,6 +92,7 @@ class TVBtoSpikeNetTransformerApp(NonTVBApp):
         super(TVBtoSpikeNetTransformerApp, self).configure_simulation()
         self.tvb_to_spikeNet_interfaces.configure()
 
+    @profile(category="apps")
     def run_for_synchronization_time(self, cosim_updates):
         return self.tvb_to_spikeNet_interfaces(cosim_updates)
 
@@ -126,6 +129,7 @@ class SpikeNetToTVBTransformerApp(NonTVBApp):
         super(SpikeNetToTVBTransformerApp, self).configure_simulation()
         self.spikeNet_to_tvb_interfaces.configure()
 
+    @profile(category="apps")
     def run_for_synchronization_time(self, cosim_updates):
         return self.spikeNet_to_tvb_interfaces(cosim_updates)
 
@@ -157,6 +161,7 @@ class RemoteTransformerApp(TransformerApp):
 
     _default_interface_builder_type = RemoteTransformerInterfaceBuilder
 
+    @profile(category="apps")
     def run_for_synchronization_time(self):
         return self.tvb_to_spikeNet_interfaces(), self.spikeNet_to_tvb_interfaces()
 
@@ -181,6 +186,7 @@ class TVBtoSpikeNetRemoteTransformerApp(TVBtoSpikeNetTransformerApp):
 
     _default_interface_builder_type = TVBtoSpikeNetRemoteTransformerInterfaceBuilder
 
+    @profile(category="apps")
     def run_for_synchronization_time(self):
         return self.tvb_to_spikeNet_interfaces()
 
@@ -205,5 +211,6 @@ class SpikeNetToTVBRemoteTransformerApp(SpikeNetToTVBTransformerApp):
 
     _default_interface_builder_type = SpikeNetToTVBRemoteTransformerInterfaceBuilder
 
+    @profile(category="apps")
     def run_for_synchronization_time(self):
         return self.spikeNet_to_tvb_interfaces()
@@ -9,6 +9,7 @@ from tvb.basic.neotraits.api import Attr
 
 from tvb_multiscale.core.orchestrators.base import CoSimulatorApp
 from tvb_multiscale.core.utils.file_utils import dump_pickled_dict
+from tvb_multiscale.core.utils.profiling_utils import profile
 from tvb_multiscale.core.tvb.cosimulator.cosimulator import CoSimulator
 from tvb_multiscale.core.tvb.cosimulator.cosimulator_serial import CoSimulatorSerial
 from tvb_multiscale.core.tvb.cosimulator.cosimulator_parallel import CoSimulatorParallel, CoSimulatorRemoteParallel
@@ -191,6 +192,7 @@ class TVBApp(CoSimulatorApp):
         if self.verbosity:
             self._logprint(str(self.cosimulator))
 
+    @profile(category="apps")
     def simulate(self, simulation_length=None):
         if simulation_length is not None:
             self.cosimulator.simulation_length = simulation_length
@@ -326,6 +328,7 @@ class TVBParallelApp(TVBApp):
         # # Send TVB's initial condition to spikeNet!:
         # return self.get_tvb_init_cosim_coupling()
 
+    @profile(category="apps")
     def run_for_synchronization_time(self, cosim_updates=None, cosimulation=True):
         return self.cosimulator.run_for_synchronization_time(
             self._ts, self._xs, self._wall_time_start, cosim_updates, cosimulation=cosimulation)
@@ -390,5 +393,6 @@ class TVBRemoteParallelApp(TVBParallelApp):
     _cosimulator_builder_type = CoSimulatorRemoteParallelBuilder
     _default_interface_builder_type = TVBRemoteInterfaceBuilder
 
+    @profile(category="apps")
     def run_for_synchronization_time(self, cosimulation=True):
         return self.cosimulator.run_for_synchronization_time(self._ts, self._xs, self._wall_time_start, cosimulation)
@@ -4,32 +4,158 @@ from types import FunctionType, MethodType
 
 import ray
 
-from tvb_multiscale.core.ray.server import create_ray_server
+from tvb_multiscale.core.ray.server import create_ray_server, RAY_SERVER_BATCH_METHODS
 
 
 class RayClient(object):
 
-    _own_attributes = ["ray", "ray_server"]
+    """RayClient class to access the attributes and methods of an instance served by a Ray actor.
+       Every single attribute access is an actor round-trip.
+       To save round-trips:
+        - get_many and set_many get or set several attributes at once,
+        - call_many, or a RayClientPipeline returned by pipeline(), execute several calls at once,
+        - the attributes listed in cached_attributes, or added via cache_attributes,
+          are read only once, and cached on the client side, until they are invalidated via invalidate_cache.
+    """
+
+    _own_attributes = ["ray", "ray_server", "cached_attributes", "_attributes_cache"]
+
+    cached_attributes = []
+    # Instances get their own cache upon __init__ or __setstate__:
+    _attributes_cache = {}
 
     def __init__(self, ray_server, ray_module=ray):
         self.ray = ray_module
         self.ray_server = ray_server
+        self.cached_attributes = list(self.cached_attributes)
+        self._attributes_cache = {}
         super(RayClient, self).__init__()
 
+    @property
+    def _batch_server(self):
+        return "_call_many" in getattr(self.ray_server, "_ray_method_signatures", {})
+
     def __getattr__(self, attr):
-        return ray.get(self.ray_server.__getattribute__.remote(attr))
+        if attr in self._own_attributes:
+            raise AttributeError(attr)
+        if attr in self._attributes_cache:
+            return self._attributes_cache[attr]
+        value = ray.get(self.ray_server.__getattribute__.remote(attr))
+        if attr in self.cached_attributes:
+            self._attributes_cache[attr] = value
+        return value
 
     def __setattr__(self, attr, value):
         if attr in self._own_attributes:
             super(RayClient, self).__setattr__(attr, value)
         else:
             ray.get(self.ray_server.__setattr__.remote(attr, value))
+            if attr in self.cached_attributes:
+                self._attributes_cache[attr] = value
+
+    def cache_attributes(self, *attrs):
+        """Method to add attributes, which are not expected to change remotely, to the client side cache."""
+        for attr in attrs:
+            if attr not in self.cached_attributes:
+                self.cached_attributes.append(attr)
+
+    def invalidate_cache(self, *attrs):
+        """Method to remove the cached values of the input attributes, or of all attributes, if none is given,
+           so that they are read again from the server upon their next access."""
+        if len(attrs) == 0:
+            self._attributes_cache.clear()
+        for attr in attrs:
+            self._attributes_cache.pop(attr, None)
+
+    def call_many(self, calls, block=True):
+        """Method to execute a sequence of (method or attribute name, args, kwargs) calls
+           in a single actor round-trip, and return the list of their results,
+           or, if block is False, an object reference to it.
+           An attribute is read instead, if args and kwargs are None."""
+        calls = [(name, args, kwargs) for name, args, kwargs in calls]
+        if self._batch_server:
+            results = self.ray_server._call_many.remote(calls)
+            return ray.get(results) if block else results
+        # A server without batch methods: submit all calls at once, and wait for all of them together:
+        results = [self.ray_server.__getattribute__.remote(name) if args is None and kwargs is None
+                   else getattr(self.ray_server, name).remote(*(args or ()), **(kwargs or {}))
+                   for name, args, kwargs in calls]
+        return ray.get(results) if block else results
+
+    def get_many(self, *attrs):
+        """Method to get several attributes at once, in a single actor round-trip,
+           except for the cached ones, if any. Returns a dictionary of the attributes' values."""
+        values = dict([(attr, self._attributes_cache[attr]) for attr in attrs if attr in self._attributes_cache])
+        remote_attrs = [attr for attr in attrs if attr not in values]
+        if len(remote_attrs):
+            if self._batch_server:
+                remote_values = ray.get(self.ray_server._get_many.remote(remote_attrs))
+            else:
+                remote_values = ray.get([self.ray_server.__getattribute__.remote(attr) for attr in remote_attrs])
+            for attr, value in zip(remote_attrs, remote_values):
+                values[attr] = value
+                if attr in self.cached_attributes:
+                    self._attributes_cache[attr] = value
+        return dict([(attr, values[attr]) for attr in attrs])
+
+    def set_many(self, **attrs_values):
+        """Method to set several attributes at once, in a single actor round-trip."""
+        if self._batch_server:
+            ray.get(self.ray_server._set_many.remote(list(attrs_values.items())))
+        else:
+            ray.get([self.ray_server.__setattr__.remote(attr, value) for attr, value in attrs_values.items()])
+        for attr, value in attrs_values.items():
+            if attr in self.cached_attributes:
+                self._attributes_cache[attr] = value
+
+    def pipeline(self):
+        """Method to return a RayClientPipeline, to queue calls, to be executed in a single actor round-trip."""
+        return RayClientPipeline(self)
 
     def __getstate__(self):
-        return {"ray_server": self.ray_server}
+        return {"ray_server": self.ray_server, "cached_attributes": self.cached_attributes}
 
     def __setstate__(self, d):
         self.ray_server = d.get("ray_server", None)
+        self.cached_attributes = list(d.get("cached_attributes", self.cached_attributes))
+        self._attributes_cache = {}
+
+
+class RayClientPipeline(object):
+
+    """RayClientPipeline class to queue attributes' reads and methods' calls of a RayClient,
+       and execute them all in a single actor round-trip, upon execute(), or upon exiting a with block:
+
+           with ray_client.pipeline() as pipeline:
+               pipeline.get("is_running")
+               pipeline.call("run", simulation_length)
+           is_running, _ = pipeline.results
+    """
+
+    def __init__(self, ray_client):
+        self.ray_client = ray_client
+        self.calls = []
+        self.results = None
+
+    def get(self, attr):
+        self.calls.append((attr, None, None))
+        return self
+
+    def call(self, method, *args, **kwargs):
+        self.calls.append((method, args, kwargs))
+        return self
+
+    def execute(self, block=True):
+        calls, self.calls = self.calls, []
+        self.results = self.ray_client.call_many(calls, block=block) if len(calls) else []
+        return self.results
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *args):
+        if exc_type is None:
+            self.execute()
 
 
 def create_ray_client_function(name, parallel=False):
@@ -48,7 +174,8 @@ def create_ray_client_type_methods(ray_server, target_server_class, non_blocking
     # ...and add methods and properties derived from the target_server_class instance and its ray_server:
     for server_method in ray_server.__dict__['_ray_method_signatures']:
         if hasattr(target_server_class, server_method) and \
-                server_method not in ["__init__", "__getattribute__", "__getattr__", "__setattr__"]:
+                server_method not in ["__init__", "__getattribute__", "__getattr__", "__setattr__"] + \
+                RAY_SERVER_BATCH_METHODS:
             if server_method in non_blocking_methods:
                 parallel = True
             else:
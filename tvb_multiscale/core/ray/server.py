@@ -1,13 +1,43 @@
 # -*- coding: utf-8 -*-
 
+from types import new_class
 
 import ray
 
 
+class RayServerBatch(object):
+
+    """RayServerBatch class adds to a Ray server methods to get, set attributes or call methods
+       of the served instance in batches, i.e., in a single actor round-trip for the whole batch."""
+
+    def _get_many(self, attrs):
+        return [getattr(self, attr) for attr in attrs]
+
+    def _set_many(self, attrs_values):
+        for attr, value in attrs_values:
+            setattr(self, attr, value)
+
+    def _call_many(self, calls):
+        """Execute a sequence of (method or attribute name, args, kwargs) calls in order and return their results.
+           An attribute is read instead, if args and kwargs are None."""
+        results = []
+        for name, args, kwargs in calls:
+            if args is None and kwargs is None:
+                results.append(getattr(self, name))
+            else:
+                results.append(getattr(self, name)(*args, **kwargs))
+        return results
+
+
+RAY_SERVER_BATCH_METHODS = ["_get_many", "_set_many", "_call_many"]
+
+
 def rayfy(input_class):
-    return ray.remote(input_class)
+    # Serve an input_class subclass with the batch methods of RayServerBatch,
+    # which is not importable by name, and, therefore, it is pickled by value to the Ray workers:
+    return ray.remote(new_class(input_class.__name__, (input_class, RayServerBatch),
+                                exec_body=lambda ns: ns.update({"__module__": __name__})))
 
 
 def create_ray_server(input_class, *args, **kwargs):
     return rayfy(input_class).remote(*args, **kwargs)
-
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 import os
+import time
 from abc import ABCMeta, abstractmethod
 from six import string_types
 from collections import OrderedDict
@@ -19,6 +20,8 @@ from tvb_multiscale.core.tvb.cosimulator.cosimulator_serialization import \
     serialize_tvb_cosimulator
 from tvb_multiscale.core.spiking_models.brain import SpikingBrain
 from tvb_multiscale.core.spiking_models.devices import DeviceSets
+from tvb_multiscale.core.spiking_models.builders.cache import \
+    configuration_hash, rows_to_table, save_tables, load_tables
 
 
 LOG = initialize_logger(__name__, config=CONFIGURED)
@@ -61,6 +64,7 @@ class SpikingNetworkBuilder(object):
     nodes_connections = []
     output_devices = []  # Use these to observe Spiking Simulator behavior
     input_devices = []   # use these for possible external stimulation devices
+    build_cache_dir = None  # a folder to cache the resolved populations and connections of the spiking brain
 
     # Internal configurations and outputs:
     monitor_period = 1.0
@@ -73,6 +77,8 @@ class SpikingNetworkBuilder(object):
     _input_devices = []
     _spiking_brain = SpikingBrain(name="brain regions")
     _models = []
+    _spiking_nodes_lookup = np.array([], dtype="i")
+    _build_stats = None
 
     def __init__(self, tvb_serial_sim={}, spiking_nodes_inds=[], spiking_simulator=None, config=None, logger=None):
         self.logger = logger
@@ -131,6 +137,44 @@ class SpikingNetworkBuilder(object):
         self.monitor_period = self.tvb_serial_sim["monitor.period"]
 
         self.spiking_nodes_inds = np.unique(self.spiking_nodes_inds)
+        self._update_spiking_nodes_lookup()
+
+    def _update_spiking_nodes_lookup(self):
+        # Lookup table from regions' indices to the indices of the spiking region nodes, -1 for non spiking regions:
+        spiking_nodes_inds = np.array(self.spiking_nodes_inds, dtype="i").ravel()
+        self._spiking_nodes_lookup = -np.ones((np.max(spiking_nodes_inds, initial=-1) + 1,), dtype="i")
+        self._spiking_nodes_lookup[spiking_nodes_inds] = np.arange(len(spiking_nodes_inds))
+
+    def _spiking_nodes_positions(self, nodes_inds):
+        """Method to return the indices of the spiking region nodes of the input regions' indices."""
+        if len(self._spiking_nodes_lookup) != np.max(self.spiking_nodes_inds, initial=-1) + 1:
+            self._update_spiking_nodes_lookup()
+        nodes_inds = np.array(nodes_inds, dtype="i")
+        positions = -np.ones(nodes_inds.shape, dtype="i")
+        inside = np.logical_and(nodes_inds >= 0, nodes_inds < len(self._spiking_nodes_lookup))
+        positions[inside] = self._spiking_nodes_lookup[nodes_inds[inside]]
+        if np.any(positions < 0):
+            raise_value_error("Regions %s are not spiking region nodes!" % str(nodes_inds[positions < 0]))
+        return positions
+
+    @property
+    def build_stats(self):
+        """Dictionary of the wall-clock time (in sec), and, for connections,
+           the number of the connected populations' pairs and of the spiking simulator's calls,
+           per phase of the last build of the spiking network."""
+        return deepcopy(self._build_stats or {})
+
+    def _add_build_stats(self, phase, **stats):
+        if self._build_stats is None:
+            self._build_stats = OrderedDict()
+        phase_stats = self._build_stats.setdefault(phase, OrderedDict())
+        for stat, val in stats.items():
+            phase_stats[stat] = phase_stats.get(stat, 0) + val
+
+    def _log_build_stats(self):
+        LOG.info("Spiking network build statistics:\n%s" %
+                 "\n".join(["%s: %s" % (phase, ", ".join(["%s=%g" % (stat, val) for stat, val in phase_stats.items()]))
+                            for phase, phase_stats in (self._build_stats or {}).items()]))
 
     @abstractmethod
     def build_spiking_population(self, label, model, brain_region, size, params):
@@ -198,6 +242,32 @@ class SpikingNetworkBuilder(object):
         """
         pass
 
+    def connect_populations_pairs(self, sources, src_inds_fun, targets, trg_inds_fun, conn_spec,
+                                  synapse_model, weights, delays, receptor_types):
+        """Method to connect pairs of SpikingPopulation instances, with the same connectivity pattern and synapse model,
+           but possibly different weight, delay and receptor type per pair.
+           This default implementation connects every pair with connect_two_populations.
+           Spiking simulator specific builders may override it with bulk connections.
+           Arguments:
+            sources: a sequence of the source SpikingPopulation instances, one per pair
+            src_inds_fun: a function that selects a subset of the source populations' neurons
+            targets: a sequence of the target SpikingPopulation instances, one per pair
+            trg_inds_fun: a function that selects a subset of the target populations' neurons
+            conn_spec: a dict of parameters of the connectivity pattern among the neurons of the two populations,
+                         excluding weight and delay ones
+            synapse_model: the name (string) of the synapse model
+            weights: a sequence of the weights of the synapses, one per pair
+            delays: a sequence of the delays of the synapses, one per pair
+            receptor_types: a sequence of the receptor types of the synapses, one per pair
+           Returns:
+            the number of calls to the spiking simulator for connecting
+        """
+        for src_pop, trg_pop, weight, delay, receptor_type in zip(sources, targets, weights, delays, receptor_types):
+            LOG.info("%s -> %s populations ..." % (src_pop.label, trg_pop.label))
+            self.connect_two_populations(src_pop, src_inds_fun, trg_pop, trg_inds_fun, conn_spec,
+                                         self.set_synapse(synapse_model, weight, delay, receptor_type))
+        return len(sources)
+
     @abstractmethod
     def build_and_connect_devices(self, devices):
         """A method to build and connect to the network all devices in the input configuration dict."""
@@ -586,7 +656,7 @@ class SpikingNetworkBuilder(object):
             _devices[-1]["syn_spec"] = syn_spec
             _devices[-1]["conn_spec"] = conn_spec
             _devices[-1]["neurons_fun"] = neurons
-            _devices[-1]["nodes"] = [np.where(self.spiking_nodes_inds == trg_node)[0][0] for trg_node in spiking_nodes]
+            _devices[-1]["nodes"] = self._spiking_nodes_positions(spiking_nodes).tolist()
         return _devices
 
     def _configure_output_devices(self):
@@ -610,95 +680,250 @@ class SpikingNetworkBuilder(object):
         LOG.info("Configuring input devices, if any...")
         self._configure_input_devices()
 
+    def resolve_populations(self):
+        """Method to resolve the specifications of all spiking populations of all brain region nodes.
+           Returns:
+            a table (OrderedDict of columns) with one row per population to be built
+        """
+        rows = []
+        # For every Spiking node
+        for i_node, node_id in enumerate(self.spiking_nodes_inds):
+            # ...and every population in it...
+            for population in self._populations:
+                # ...if this population exists in this node...
+                if node_id in population["nodes"]:
+                    rows.append((i_node, population["label"], population["model"],
+                                 int(np.round(population["scale"](node_id) * self.population_order)),
+                                 population["params"](node_id)))
+        return rows_to_table(rows, ["i_node", "label", "model", "size", "params"])
+
     def build_spiking_region_nodes(self, *args, **kwargs):
-        """Method to build all spiking populations with each brain region node."""
+        """Method to build all spiking populations with each brain region node,
+           following the table of populations, which is resolved here, unless given as populations_table."""
+        populations = kwargs.pop("populations_table", None)
+        if populations is None:
+            populations = self.resolve_populations()
         # For every Spiking node
-        for node_id, node_label in zip(self.spiking_nodes_inds, self.spiking_nodes_labels):
+        for i_node, node_label in enumerate(self.spiking_nodes_labels):
             LOG.info("Generating spiking region node: %s..." % node_label)
             self._spiking_brain[node_label] = self.build_spiking_region_node(node_label)
             # ...and every population in it...
-            for iP, population in enumerate(self._populations):
-                # ...if this population exists in this node...
-                if node_id in population["nodes"]:
-                    LOG.info("Generating population: %s..." % population["label"])
-                    # ...generate this population in this node...
-                    size = int(np.round(population["scale"](node_id) * self.population_order))
-                    self._spiking_brain[node_label][population["label"]] = \
-                        self.build_spiking_population(population["label"], population["model"], node_label, size,
-                                                      params=population["params"](node_id),
-                                                      *args, **kwargs)
-
-    def connect_within_node_spiking_populations(self):
-        """Method to connect all populations withing each Spiking brain region node."""
+            for i_pop in np.where(populations["i_node"] == i_node)[0]:
+                label = str(populations["label"][i_pop])
+                LOG.info("Generating population: %s..." % label)
+                # ...generate this population in this node...
+                self._spiking_brain[node_label][label] = \
+                    self.build_spiking_population(label, str(populations["model"][i_pop]), node_label,
+                                                  int(populations["size"][i_pop]),
+                                                  params=populations["params"][i_pop],
+                                                  *args, **kwargs)
+
+    def resolve_within_node_connections(self):
+        """Method to resolve the synapse parameters of the connections of populations within each brain region node.
+           Returns:
+            a table (OrderedDict of columns) with one row per pair of populations to be connected
+        """
+        rows = []
         # For every different type of connections between distinct Spiking nodes' populations
         for i_conn, conn in enumerate(ensure_list(self._populations_connections)):
-            LOG.info("Connecting %s -> %s populations \nfor spiking region nodes\n%s..." %
-                             (str(conn["source"]), str(conn["target"]), str(conn["nodes"])))
             # ...and for every brain region node where this connection will be created:
-            for node_index in conn["nodes"]:
-                i_node = np.where(self.spiking_nodes_inds == node_index)[0][0]
-                # ...create a synapse parameters dictionary, from the configured inputs:
-                syn_spec = self.set_synapse(conn["synapse_model"],
-                                            conn['weight'](node_index),
-                                            self._assert_delay(conn['delay'](node_index)),
-                                            conn['receptor_type'](node_index),
-                                            conn["params"](node_index)
-                                            )
-                # ...and for every combination of source...
+            for node_index, i_node in zip(conn["nodes"], self._spiking_nodes_positions(conn["nodes"])):
+                # ...resolve the synapse parameters, from the configured inputs:
+                synapse = (conn['weight'](node_index),
+                           self._assert_delay(conn['delay'](node_index)),
+                           conn['receptor_type'](node_index),
+                           conn["params"](node_index))
+                # ...for every combination of source and target populations of this connection:
                 for pop_src in ensure_list(conn["source"]):
-                    # ...and target populations of this connection...
                     for pop_trg in ensure_list(conn["target"]):
-                        # ...connect the two populations:
-                        self.connect_two_populations(
-                            self._spiking_brain[i_node][pop_src], conn["source_neurons"],
-                            self._spiking_brain[i_node][pop_trg], conn["target_neurons"],
-                            conn["conn_spec"], syn_spec
-                        )
-
-    def connect_spiking_region_nodes(self):
-        """Method to connect all Spiking brain region nodes among them."""
+                        rows.append((i_conn, i_node, pop_src, pop_trg) + synapse)
+        return rows_to_table(rows, ["i_conn", "i_node", "source", "target",
+                                    "weight", "delay", "receptor_type", "params"])
+
+    def connect_within_node_spiking_populations(self, connections_table=None):
+        """Method to connect all populations withing each Spiking brain region node,
+           following the table of connections, which is resolved here, unless given as connections_table."""
+        if connections_table is None:
+            connections_table = self.resolve_within_node_connections()
+        for i_row, (i_conn, i_node) in enumerate(zip(connections_table["i_conn"], connections_table["i_node"])):
+            conn = self._populations_connections[i_conn]
+            pop_src = connections_table["source"][i_row]
+            pop_trg = connections_table["target"][i_row]
+            LOG.info("Connecting %s -> %s populations for spiking region node %s..." %
+                     (pop_src, pop_trg, self.spiking_nodes_labels[i_node]))
+            # ...create a synapse parameters dictionary...
+            syn_spec = self.set_synapse(conn["synapse_model"],
+                                        connections_table["weight"][i_row],
+                                        connections_table["delay"][i_row],
+                                        connections_table["receptor_type"][i_row],
+                                        connections_table["params"][i_row])
+            # ...and connect the two populations:
+            self.connect_two_populations(
+                self._spiking_brain[i_node][pop_src], conn["source_neurons"],
+                self._spiking_brain[i_node][pop_trg], conn["target_neurons"],
+                conn["conn_spec"], syn_spec
+            )
+            self._add_build_stats("connect_within_node_spiking_populations",
+                                  populations_pairs=1, connect_calls=1)
+
+    def _nodes_connection_property_grid(self, property, source_nodes, target_nodes):
+        """Method to evaluate a property function of (source_node, target_node) for all pairs of source and target
+           region nodes' indices, at once, with numpy broadcasting, if the function allows it, or else pair by pair.
+           Arguments:
+            property: the function of (source_node, target_node)
+            source_nodes: an array of the source nodes' indices
+            target_nodes: an array of the target nodes' indices
+           Returns:
+            an array of shape (number of source nodes, number of target nodes)
+        """
+        shape = (len(source_nodes), len(target_nodes))
+        if shape[0] * shape[1]:
+            try:
+                grid = np.asarray(property(source_nodes[:, None], target_nodes[None, :]))
+                if grid.dtype.kind in "biuf":
+                    grid = np.broadcast_to(grid, shape)
+                    # Confirm that the function is elementwise, at the corners of the grid:
+                    if np.all([np.array_equal(grid[i, j], property(source_nodes[i], target_nodes[j]))
+                               for i, j in [(0, 0), (0, -1), (-1, 0), (-1, -1)]]):
+                        return grid
+            except Exception:
+                pass
+        grid = np.empty(shape, dtype="O")
+        for i_src, source_node in enumerate(source_nodes):
+            for i_trg, target_node in enumerate(target_nodes):
+                grid[i_src, i_trg] = property(source_node, target_node)
+        return grid
+
+    def resolve_spiking_region_nodes_connections(self):
+        """Method to resolve the synapse parameters of the connections among distinct brain region nodes.
+           Weights, delays and receptor types are evaluated for all pairs of source and target nodes at once.
+           Returns:
+            a table (OrderedDict of columns) with one row per pair of populations to be connected
+        """
+        columns = ["i_conn", "source", "target", "i_source_node", "i_target_node",
+                   "weight", "delay", "receptor_type"]
+        groups = []
         # For every different type of connections between distinct Spiking region nodes' populations
         for i_conn, conn in enumerate(ensure_list(self._nodes_connections)):
-            # ...form the connection for every distinct pair of Spiking nodes
-            for source_index in conn["source_nodes"]:
-                # ...get the source spiking brain region indice:
-                i_source_node = np.where(self.spiking_nodes_inds == source_index)[0][0]
-                for target_index in conn["target_nodes"]:
-                    # ...get the target spiking brain region indice:
-                    i_target_node = np.where(self.spiking_nodes_inds == target_index)[0][0]
-                    # ...create a synapse parameters dictionary, from the configured inputs:
-                    syn_spec = self.set_synapse(conn["synapse_model"],
-                                                conn["weight"](source_index, target_index),
-                                                conn["delay"](source_index, target_index),
-                                                conn["receptor_type"](source_index, target_index)
-                                                )
-                    if source_index != target_index:
-                        LOG.info("Connecting for %s -> %s spiking region nodes ..." %
-                                         (str(source_index), str(target_index)))
-                        # ...and as long as this is not a within node connection...
-                        for conn_src in ensure_list(conn["source"]):
-                            # ...and for every combination of source...
-                            src_pop = self._spiking_brain[i_source_node][conn_src]
-                            for conn_trg in ensure_list(conn["target"]):
-                                # ...and target population...
-                                trg_pop = self._spiking_brain[i_target_node][conn_trg]
-                                LOG.info("%s -> %s populations ..." %
-                                                 (src_pop.label, trg_pop.label))
-                                self.connect_two_populations(src_pop, conn["source_neurons"],
-                                                             trg_pop, conn["target_neurons"],
-                                                             conn['conn_spec'], syn_spec)
+            source_nodes = np.array(ensure_list(conn["source_nodes"]))
+            target_nodes = np.array(ensure_list(conn["target_nodes"]))
+            # ...get the source and target spiking brain region indices:
+            i_source_nodes = self._spiking_nodes_positions(source_nodes)
+            i_target_nodes = self._spiking_nodes_positions(target_nodes)
+            # ...evaluate the synapse parameters for all pairs of Spiking nodes:
+            weights, delays, receptor_types = \
+                [self._nodes_connection_property_grid(conn[prop], source_nodes, target_nodes)
+                 for prop in ["weight", "delay", "receptor_type"]]
+            # ...and form the connection for every distinct pair of Spiking nodes,
+            # as long as this is not a within node connection...
+            i_src, i_trg = np.where(source_nodes[:, None] != target_nodes[None, :])
+            n_pairs = len(i_src)
+            # ...for every combination of source and target populations:
+            for conn_src in ensure_list(conn["source"]):
+                for conn_trg in ensure_list(conn["target"]):
+                    groups.append([np.repeat(i_conn, n_pairs), np.repeat(conn_src, n_pairs),
+                                   np.repeat(conn_trg, n_pairs), i_source_nodes[i_src], i_target_nodes[i_trg],
+                                   weights[i_src, i_trg], delays[i_src, i_trg], receptor_types[i_src, i_trg]])
+        if len(groups) == 0:
+            return rows_to_table([], columns)
+        return OrderedDict([(column, np.concatenate([group[i_col] for group in groups]))
+                            for i_col, column in enumerate(columns)])
+
+    def connect_spiking_region_nodes(self, connections_table=None):
+        """Method to connect all Spiking brain region nodes among them,
+           following the table of connections, which is resolved here, unless given as connections_table.
+           All pairs of populations of the same connection and labels
+           are connected with one call to connect_populations_pairs.
+        """
+        if connections_table is None:
+            connections_table = self.resolve_spiking_region_nodes_connections()
+        groups = OrderedDict()
+        for i_row, group in enumerate(zip(connections_table["i_conn"],
+                                          connections_table["source"], connections_table["target"])):
+            groups.setdefault(group, []).append(i_row)
+        for (i_conn, conn_src, conn_trg), rows in groups.items():
+            conn = self._nodes_connections[i_conn]
+            LOG.info("Connecting %s -> %s populations for %d pairs of spiking region nodes ..." %
+                     (conn_src, conn_trg, len(rows)))
+            src_pops = [self._spiking_brain[i_node][conn_src] for i_node in connections_table["i_source_node"][rows]]
+            trg_pops = [self._spiking_brain[i_node][conn_trg] for i_node in connections_table["i_target_node"][rows]]
+            connect_calls = \
+                self.connect_populations_pairs(src_pops, conn["source_neurons"],
+                                               trg_pops, conn["target_neurons"],
+                                               conn['conn_spec'], conn["synapse_model"],
+                                               connections_table["weight"][rows], connections_table["delay"][rows],
+                                               connections_table["receptor_type"][rows])
+            self._add_build_stats("connect_spiking_region_nodes",
+                                  populations_pairs=len(rows), connect_calls=connect_calls)
+
+    @property
+    def build_cache_key(self):
+        """The hash of the configuration of the builder and of the TVB connectivity,
+           which determine the resolved populations and connections of the spiking brain.
+           Next to the populations' and connections' configurations (functions hashed by their code),
+           the hash includes the builder's public attributes of numeric, string, array or dictionary values,
+           e.g., parameters that the configured functions might depend upon,
+           but not the devices, or any other TVB cosimulator's attribute than the connectivity."""
+        attributes = OrderedDict([(attr, val) for attr, val in sorted(vars(self).items())
+                                  if attr[0] != "_" and attr not in ["build_cache_dir", "tvb_serial_sim"]
+                                  and isinstance(val, (bool, int, float, string_types,
+                                                       np.generic, np.ndarray, dict))])
+        return configuration_hash(self.__class__.__module__, self.__class__.__qualname__, attributes,
+                                  self.populations, self.populations_connections, self.nodes_connections,
+                                  self.tvb_weights, self.tvb_delays, list(self.region_labels),
+                                  self.spiking_nodes_inds, self.population_order, self.spiking_dt)
+
+    def resolve_spiking_brain(self):
+        """Method to resolve the tables of the populations and connections of the spiking brain.
+           If build_cache_dir is set, the tables are loaded from, or else saved to, a file named after build_cache_key.
+           Returns:
+            a dictionary of the "populations", "within_node_connections" and "nodes_connections" tables
+        """
+        cache_path = None
+        if self.build_cache_dir:
+            cache_path = os.path.join(self.build_cache_dir, "%s.npz" % self.build_cache_key)
+            if os.path.isfile(cache_path):
+                try:
+                    tables = load_tables(cache_path)
+                    LOG.info("Loaded the resolved spiking brain from the build cache file %s!" % cache_path)
+                    self._add_build_stats("build_cache", hits=1)
+                    return tables
+                except Exception as e:
+                    LOG.warning("Failed to load the build cache file %s!:\n%s" % (cache_path, str(e)))
+        tables = OrderedDict([("populations", self.resolve_populations()),
+                              ("within_node_connections", self.resolve_within_node_connections()),
+                              ("nodes_connections", self.resolve_spiking_region_nodes_connections())])
+        if cache_path is not None:
+            self._add_build_stats("build_cache", misses=1)
+            try:
+                save_tables(cache_path, tables)
+                LOG.info("Saved the resolved spiking brain to the build cache file %s!" % cache_path)
+            except Exception as e:
+                LOG.warning("Failed to save the resolved spiking brain to the build cache file %s!:\n%s"
+                            % (cache_path, str(e)))
+        return tables
 
     def build_spiking_brain(self):
         """Method to build and connect all Spiking brain region nodes,
            first withing, and then, among them.
         """
+        LOG.info("Resolving spiking brain regions' populations and connections...")
+        tic = time.time()
+        tables = self.resolve_spiking_brain()
+        self._add_build_stats("resolve_spiking_brain", time=time.time() - tic)
         LOG.info("Generating spiking brain regions...")
-        self.build_spiking_region_nodes()
+        tic = time.time()
+        self.build_spiking_region_nodes(populations_table=tables["populations"])
+        self._add_build_stats("build_spiking_region_nodes", time=time.time() - tic)
         LOG.info("Connecting populations within spiking brain regions...")
-        self.connect_within_node_spiking_populations()
+        tic = time.time()
+        self.connect_within_node_spiking_populations(tables["within_node_connections"])
+        self._add_build_stats("connect_within_node_spiking_populations", time=time.time() - tic)
         # Connect Spiking nodes among each other
         LOG.info("Connecting populations among spiking brain regions...")
-        self.connect_spiking_region_nodes()
+        tic = time.time()
+        self.connect_spiking_region_nodes(tables["nodes_connections"])
+        self._add_build_stats("connect_spiking_region_nodes", time=time.time() - tic)
 
     def _build_and_connect_devices(self, devices, label):
         """Method to build and connect input or output devices, organized by
@@ -735,7 +960,10 @@ class SpikingNetworkBuilder(object):
         """This method will run the whole workflow of building the spiking network, which will be returned."""
         # Configure all inputs/configurations for building
         LOG.info("Configuring spiking network builder...")
+        self._build_stats = OrderedDict()
+        tic = time.time()
         self._configure()
+        self._add_build_stats("configure", time=time.time() - tic)
         # Build and connect the brain network
         LOG.info("Generating spiking brain...")
         self.build_spiking_brain()
@@ -744,11 +972,14 @@ class SpikingNetworkBuilder(object):
         # that do not correspond to TVB state variables or parameters
         # you wish to transmit from the Spiking simulator to TVB!!
         LOG.info("Generating and connecting output devices, if any...")
+        tic = time.time()
         self._output_devices = self.build_and_connect_output_devices()
         # Build and connect possible Spiking input devices
         # !!Use it only for stimuli, if any, not for transmitting data from TVB to the Spiking simulator!!
         LOG.info("Generating and connecting input devices, if any...")
         self._input_devices = self.build_and_connect_input_devices()
+        self._add_build_stats("build_and_connect_devices", time=time.time() - tic)
+        self._log_build_stats()
         return self.build_spiking_network()
 
 
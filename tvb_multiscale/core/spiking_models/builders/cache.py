@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+
+"""
+Content-addressed cache of the resolved specifications of a spiking network,
+i.e., of the tables of populations and connections a SpikingNetworkBuilder resolves from its configuration.
+The tables are dictionaries of equal length columns (numpy arrays),
+stored compressed in a .npz file named after the hash of the configuration of the builder.
+Columns of objects, e.g., of parameters' dictionaries, are stored as JSON strings, instead of being pickled,
+so that loading a cache file, possibly written by anyone with access to a shared cache folder, never executes code.
+"""
+
+import os
+import json
+import hashlib
+from collections import OrderedDict
+from functools import partial
+from types import CodeType, FunctionType, MethodType
+
+import numpy as np
+from six import string_types
+
+
+def _update_hash_with_code(hasher, code):
+    hasher.update(code.co_code)
+    hasher.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            _update_hash_with_code(hasher, const)
+        else:
+            hasher.update(repr(const).encode())
+
+
+def update_hash(hasher, value, _seen=None):
+    """Function to update a hashlib hasher with the content of a (nested) configuration value.
+       Numbers, strings, numpy arrays and containers of them are hashed by their values.
+       Functions are hashed by their code, default arguments and closures' values,
+       but not by any global or instance state they might read when called.
+       Any other object is hashed only by its class."""
+    _seen = set() if _seen is None else _seen
+    if isinstance(value, (type(None), bool, int, float, complex, str, bytes, np.generic)):
+        hasher.update(("%s:%r" % (type(value).__name__, value)).encode())
+        return
+    if id(value) in _seen:
+        # Avoid infinite recursion, e.g., for functions referencing the builder itself:
+        hasher.update(b"<recursion>")
+        return
+    _seen.add(id(value))
+    if isinstance(value, np.ndarray):
+        hasher.update(("ndarray:%s:%s" % (value.dtype.str, str(value.shape))).encode())
+        if value.dtype.kind == "O":
+            for val in value.ravel():
+                update_hash(hasher, val, _seen)
+        else:
+            hasher.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        hasher.update(b"dict")
+        for key in sorted(value.keys(), key=str):
+            update_hash(hasher, key, _seen)
+            update_hash(hasher, value[key], _seen)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        hasher.update(type(value).__name__.encode())
+        for val in (sorted(value, key=repr) if isinstance(value, (set, frozenset)) else value):
+            update_hash(hasher, val, _seen)
+    elif isinstance(value, partial):
+        hasher.update(b"partial")
+        for val in [value.func, value.args, value.keywords]:
+            update_hash(hasher, val, _seen)
+    elif isinstance(value, MethodType):
+        hasher.update(("method:%s" % value.__func__.__qualname__).encode())
+        update_hash(hasher, value.__func__, _seen)
+    elif isinstance(value, FunctionType):
+        hasher.update(("function:%s" % value.__qualname__).encode())
+        _update_hash_with_code(hasher, value.__code__)
+        update_hash(hasher, value.__defaults__, _seen)
+        update_hash(hasher, value.__kwdefaults__, _seen)
+        for cell in value.__closure__ or ():
+            try:
+                update_hash(hasher, cell.cell_contents, _seen)
+            except ValueError:
+                # Empty cell
+                hasher.update(b"<empty>")
+    else:
+        hasher.update(("object:%s.%s" % (type(value).__module__, type(value).__qualname__)).encode())
+
+
+def configuration_hash(*values):
+    """Function to return the sha256 hex digest of the content of the input configuration values."""
+    hasher = hashlib.sha256()
+    for value in values:
+        update_hash(hasher, value)
+    return hasher.hexdigest()
+
+
+def rows_to_table(rows, columns):
+    """Function to convert a list of rows, i.e., of tuples of values, to a table,
+       i.e., to an OrderedDict of columns as numpy arrays, of object dtype if not numeric or string."""
+    table = OrderedDict()
+    for i_col, column in enumerate(columns):
+        values = [row[i_col] for row in rows]
+        try:
+            array = np.array(values)
+            if array.ndim != 1 or array.dtype.kind not in "biufU":
+                raise ValueError
+        except ValueError:
+            array = np.empty((len(values),), dtype="O")
+            array[:] = values
+        table[column] = array
+    return table
+
+
+# The suffix of the keys of the columns of objects, which are stored as JSON strings:
+JSON_SUFFIX = ".json"
+
+
+def _to_json(value):
+    """Function to convert a value to a JSON serializable one, tagging the types JSON does not preserve.
+       Only None, numbers, strings, numeric or string numpy arrays and containers of them are supported."""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or isinstance(value, (bool, int, float, string_types)):
+        return value
+    if isinstance(value, np.ndarray) and value.dtype.kind in "biufU":
+        return {"ndarray": value.tolist(), "dtype": value.dtype.str}
+    if isinstance(value, list):
+        return [_to_json(val) for val in value]
+    if isinstance(value, tuple):
+        return {"tuple": [_to_json(val) for val in value]}
+    if isinstance(value, dict):
+        return {"dict": [[_to_json(key), _to_json(val)] for key, val in value.items()]}
+    raise TypeError("A value of type %s cannot be stored in a cache file!" % type(value).__name__)
+
+
+def _from_json(value):
+    """Function to convert back a value converted by _to_json."""
+    if isinstance(value, list):
+        return [_from_json(val) for val in value]
+    if isinstance(value, dict):
+        if "ndarray" in value:
+            return np.array(value["ndarray"], dtype=value["dtype"])
+        if "tuple" in value:
+            return tuple(_from_json(val) for val in value["tuple"])
+        return dict([(_from_json(key), _from_json(val)) for key, val in value["dict"]])
+    return value
+
+
+def save_tables(path, tables):
+    """Function to save a dictionary of tables in a compressed .npz file.
+       Columns of objects are stored as arrays of JSON strings.
+       Returns the path, or raises an exception, e.g., if a value of the tables cannot be converted to JSON."""
+    arrays = OrderedDict()
+    for table_name, table in tables.items():
+        for column, array in table.items():
+            if array.dtype.kind == "O":
+                arrays["%s/%s%s" % (table_name, column, JSON_SUFFIX)] = \
+                    np.array([json.dumps(_to_json(value)) for value in array], dtype="U")
+            else:
+                arrays["%s/%s" % (table_name, column)] = array
+    dirpath = os.path.dirname(path)
+    if dirpath and not os.path.isdir(dirpath):
+        os.makedirs(dirpath)
+    # Write to a temporary file first, so that a concurrent build never reads a partially written cache file:
+    tmp_path = "%s.%d.tmp.npz" % (path[:-4], os.getpid())
+    try:
+        np.savez_compressed(tmp_path, **arrays)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.isfile(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+def load_tables(path):
+    """Function to load a dictionary of tables from a .npz file, written by save_tables, without unpickling."""
+    tables = OrderedDict()
+    with np.load(path, allow_pickle=False) as npz:
+        for key in npz.files:
+            table_name, column = key.split("/")
+            array = npz[key]
+            if column.endswith(JSON_SUFFIX):
+                column = column[:-len(JSON_SUFFIX)]
+                values = array
+                array = np.empty((len(values),), dtype="O")
+                for i_value, value in enumerate(values):
+                    array[i_value] = _from_json(json.loads(value))
+            tables.setdefault(table_name, OrderedDict())[column] = array
+    return tables
@@ -12,6 +12,14 @@ Set different entries in the SpikingNetwork builder for populations that differ
 "label", "model" or "nodes"
 """
 
+import numpy as np
+
+
+def _item(value):
+    # Python scalars for scalar nodes' indices, arrays for arrays of nodes' indices,
+    # so that the functions below can be evaluated for all pairs of nodes at once:
+    return value.item() if np.ndim(value) == 0 else value
+
 
 def set_neural_population_params(node):
     return {}
@@ -71,11 +79,11 @@ def set_between_nodes_connection_weight(source_node, target_node, tvb_weights):
 
 
 def tvb_weight(source_node, target_node, tvb_weights):
-    return tvb_weights[target_node, source_node].item()
+    return _item(tvb_weights[target_node, source_node])
 
 
 def scale_tvb_weight(source_node, target_node, tvb_weights, scale=1.0):
-    return scale * tvb_weights[target_node, source_node].item()
+    return _item(scale * tvb_weights[target_node, source_node])
 
 
 def set_between_nodes_connection_delay(source_node, target_node, tvb_delays):
@@ -84,15 +92,15 @@ def set_between_nodes_connection_delay(source_node, target_node, tvb_delays):
 
 
 def tvb_delay(source_node, target_node, tvb_delays):
-    return tvb_delays[target_node, source_node].item()
+    return _item(tvb_delays[target_node, source_node])
 
 
 def scale_tvb_delay(source_node, target_node, tvb_delays, scale=1.0):
-    return (scale * tvb_delays[target_node, source_node]).item()
+    return _item(scale * tvb_delays[target_node, source_node])
 
 
 def add_to_tvb_delay(source_node, target_node, tvb_delays, add=1.0):
-    return (add + tvb_delays[target_node, source_node]).item()
+    return _item(add + tvb_delays[target_node, source_node])
 
 
 """
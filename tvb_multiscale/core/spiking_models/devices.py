@@ -1,5 +1,8 @@
 # -*- coding: utf-8 -*-
 
+import os
+import uuid
+import tempfile
 from abc import ABCMeta, abstractmethod
 from copy import deepcopy
 from collections import OrderedDict
@@ -148,10 +151,259 @@ class InputDevice(Device):
 InputDeviceDict = {}
 
 
+class EventsBuffer(object):
+
+    """EventsBuffer class to hold the events of an OutputDevice in an append-only columnar cache,
+       i.e., one numpy array per event attribute (e.g., times, senders, recorded variables).
+       The arrays' capacity grows by doubling, so that appending new events costs O(number of new events),
+       amortized, instead of merging all events recorded so far.
+       A read cursor marks the events that have already been returned as new events.
+       Returned events are read-only views of the buffer, whenever they are held in memory.
+       Optionally, when more than max_events_in_memory events are held in memory,
+       the oldest ones are spilled to .npz files in spill_folder, and loaded back only when requested.
+       Events already returned as new events can also be drained, i.e., discarded,
+       e.g., by online analysers which have consumed them, so that the buffer's memory stays flat.
+    """
+
+    def __init__(self, keys=("times", "senders"), max_events_in_memory=0, spill_folder="", initial_capacity=1024):
+        self._keys = list(keys)
+        self.max_events_in_memory = int(max_events_in_memory)
+        self.spill_folder = spill_folder
+        self.initial_capacity = int(initial_capacity)
+        self._spilled = []
+        self.reset()
+
+    def reset(self):
+        """Method to discard all events, including the ones spilled to files, and reset the read cursor."""
+        for filepath, _ in self._spilled:
+            if os.path.isfile(filepath):
+                os.remove(filepath)
+        self._spilled = []
+        self._n_drained = 0
+        self._n_spilled = 0
+        self._n_in_memory = 0
+        self._arrays = OrderedDict([(key, np.empty((0,))) for key in self._keys])
+        self.cursor = 0
+
+    def __getstate__(self):
+        d = dict(self.__dict__)
+        # Pickle only the filled part of the arrays:
+        d["_arrays"] = OrderedDict([(key, array[:self._n_in_memory].copy()) for key, array in self._arrays.items()])
+        return d
+
+    def __setstate__(self, d):
+        d.setdefault("_n_drained", 0)
+        self.__dict__.update(d)
+
+    def keys(self):
+        return list(self._arrays.keys())
+
+    @property
+    def capacity(self):
+        if len(self._arrays):
+            return len(list(self._arrays.values())[0])
+        return 0
+
+    @property
+    def number_of_events(self):
+        return self._n_drained + self._n_spilled + self._n_in_memory
+
+    @property
+    def number_of_drained_events(self):
+        return self._n_drained
+
+    @property
+    def number_of_new_events(self):
+        return self.number_of_events - self.cursor
+
+    def __len__(self):
+        return self.number_of_events
+
+    def _reallocate(self, capacity, dtypes):
+        # New arrays are allocated, so that views returned before remain valid:
+        for key, array in self._arrays.items():
+            new_array = np.empty((capacity,) + array.shape[1:], dtype=dtypes[key])
+            new_array[:self._n_in_memory] = array[:self._n_in_memory]
+            self._arrays[key] = new_array
+
+    def append(self, events):
+        """Method to append a dictionary of new events to the buffer.
+           Arguments:
+            events: dictionary of events, with the same keys for all calls, apart from the first one.
+           Returns:
+            the number (int) of appended events
+        """
+        if not events:
+            return 0
+        events = OrderedDict([(key, np.asarray(val)) for key, val in events.items()])
+        n_new_events = len(events.get("times", []))
+        if n_new_events == 0:
+            return 0
+        for key, val in events.items():
+            if len(val) != n_new_events:
+                raise ValueError("The number of %s events (%d) is not equal to the number of times (%d)!"
+                                 % (key, len(val), n_new_events))
+        if self.number_of_events == 0:
+            # The first events determine the keys, shapes and types of the buffer's arrays:
+            self._arrays = OrderedDict([(key, np.empty((0,) + val.shape[1:], dtype=val.dtype))
+                                        for key, val in events.items()])
+        elif set(events.keys()) != set(self._arrays.keys()):
+            raise ValueError("The keys of the new events %s are not equal to the ones of the buffer %s!"
+                             % (str(list(events.keys())), str(self.keys())))
+        n_events = self._n_in_memory + n_new_events
+        dtypes = dict([(key, np.result_type(array, events[key])) for key, array in self._arrays.items()])
+        if n_events > self.capacity or \
+                np.any([dtype != self._arrays[key].dtype for key, dtype in dtypes.items()]):
+            capacity = max(self.capacity, self.initial_capacity)
+            while capacity < n_events:
+                capacity *= 2
+            self._reallocate(capacity, dtypes)
+        for key, array in self._arrays.items():
+            array[self._n_in_memory:n_events] = events[key]
+        self._n_in_memory = n_events
+        if 0 < self.max_events_in_memory < self._n_in_memory:
+            self._spill(self._n_in_memory - self.max_events_in_memory // 2)
+        return n_new_events
+
+    def _spill(self, n_events):
+        """Method to write the n_events oldest events held in memory to a file, and drop them from memory."""
+        if not self.spill_folder:
+            self.spill_folder = tempfile.mkdtemp(prefix="events_")
+        os.makedirs(self.spill_folder, exist_ok=True)
+        filepath = os.path.join(self.spill_folder, "events_%s.npz" % uuid.uuid4().hex)
+        np.savez(filepath, **dict([(key, array[:n_events]) for key, array in self._arrays.items()]))
+        self._spilled.append((filepath, n_events))
+        self._n_spilled += n_events
+        self._n_in_memory -= n_events
+        for key, array in self._arrays.items():
+            self._arrays[key] = array[n_events:n_events + self._n_in_memory].copy()
+
+    def _view(self, array, start, stop):
+        view = array[start:stop]
+        view.flags.writeable = False
+        return view
+
+    def get(self, start=0, stop=None):
+        """Method to return the events from index start up to stop, in a dictionary of arrays.
+           Events held in memory are returned as read-only views,
+           whereas requesting spilled events results in loading and merging them to new arrays."""
+        n_events = self.number_of_events
+        n_before_memory = self._n_drained + self._n_spilled
+        # Drained events are not available anymore:
+        stop = n_events if stop is None else min(max(stop, self._n_drained), n_events)
+        start = min(max(start, self._n_drained), stop)
+        if start >= n_before_memory:
+            return OrderedDict([(key, self._view(array, start - n_before_memory, stop - n_before_memory))
+                                for key, array in self._arrays.items()])
+        chunks = []
+        chunk_start = self._n_drained
+        for filepath, n_chunk_events in self._spilled:
+            chunk_stop = chunk_start + n_chunk_events
+            if chunk_stop > start and chunk_start < stop:
+                with np.load(filepath) as chunk:
+                    chunks.append(dict([(key, chunk[key][max(start - chunk_start, 0):min(stop, chunk_stop) - chunk_start])
+                                        for key in self._arrays.keys()]))
+            chunk_start = chunk_stop
+        if stop > n_before_memory:
+            chunks.append(dict([(key, array[:stop - n_before_memory]) for key, array in self._arrays.items()]))
+        return OrderedDict([(key, np.concatenate([chunk[key] for chunk in chunks]))
+                            for key in self._arrays.keys()])
+
+    @property
+    def events(self):
+        """All events of the buffer, without moving its read cursor."""
+        return self.get(0)
+
+    def new_events(self):
+        """Method to return the events after the read cursor, and advance it to the end of the buffer."""
+        events = self.get(self.cursor)
+        self.cursor = self.number_of_events
+        return events
+
+    def drain(self, stop=None):
+        """Method to discard the events before the read cursor, i.e., the ones already returned as new events,
+           or before stop, if it is earlier, e.g., the index up to which another reader has read the events,
+           from memory and from the spill files, without changing the number of events and the read cursor.
+           Returns:
+            the number (int) of events drained
+        """
+        cursor = self.cursor if stop is None else min(stop, self.cursor)
+        n_drained = self._n_drained
+        # Delete the spill files of events entirely before the cursor:
+        while len(self._spilled) and self._n_drained + self._spilled[0][1] <= cursor:
+            filepath, n_chunk_events = self._spilled.pop(0)
+            if os.path.isfile(filepath):
+                os.remove(filepath)
+            self._n_drained += n_chunk_events
+            self._n_spilled -= n_chunk_events
+        if len(self._spilled) == 0:
+            # Drop the events held in memory before the cursor, into new arrays,
+            # so that views returned before remain valid:
+            n_events = cursor - self._n_drained
+            if n_events > 0:
+                self._n_in_memory -= n_events
+                for key, array in self._arrays.items():
+                    self._arrays[key] = array[n_events:n_events + self._n_in_memory].copy()
+                self._n_drained += n_events
+        return self._n_drained - n_drained
+
+
 class OutputDevice(Device):
 
     """OutputDevice class to wrap around an output (recording/measuring/monitoring) device"""
 
+    max_events_in_memory = Int(field_type=int, default=0, required=True,
+                               label="Maximum number of events in memory",
+                               doc="""Maximum number of events held in memory by the events' buffer
+                                      before the oldest ones are spilled to files. Default = 0, for no limit.""")
+
+    events_spill_folder = Attr(field_type=str, default="", required=True,
+                               label="Events' spill folder",
+                               doc="""Folder where the events' buffer spills the oldest events to.
+                                      Default = "", for a temporary folder.""")
+
+    _events_buffer = None
+
+    def __init__(self, device=None, **kwargs):
+        Device.__init__(self, device, **kwargs)
+        self.max_events_in_memory = int(kwargs.get("max_events_in_memory", self.max_events_in_memory))
+        self.events_spill_folder = str(kwargs.get("events_spill_folder", self.events_spill_folder))
+
+    def __getstate__(self):
+        d = super(OutputDevice, self).__getstate__()
+        d["max_events_in_memory"] = self.max_events_in_memory
+        d["events_spill_folder"] = self.events_spill_folder
+        d["_events_buffer"] = self._events_buffer
+        return d
+
+    def __setstate__(self, d):
+        super(OutputDevice, self).__setstate__(d)
+        self.max_events_in_memory = d.get("max_events_in_memory", 0)
+        self.events_spill_folder = d.get("events_spill_folder", "")
+        self._events_buffer = d.get("_events_buffer", None)
+
+    @property
+    def events_buffer(self):
+        """The append-only buffer of the events read so far from the device."""
+        if self._events_buffer is None:
+            self._events_buffer = EventsBuffer(max_events_in_memory=self.max_events_in_memory,
+                                               spill_folder=self.events_spill_folder)
+        return self._events_buffer
+
+    def _update_events_buffer(self):
+        """Method to append the events recorded since its last call to the events' buffer, and return the buffer.
+           Spiking simulator specific devices that use the events' buffer
+           should read only the new events from the device here."""
+        return self.events_buffer
+
+    def _get_buffered_events(self, new=False):
+        """Method to update the events' buffer and return either all of its events,
+           or only the ones not returned before as new events, if new is True."""
+        events_buffer = self._update_events_buffer()
+        if new:
+            return events_buffer.new_events()
+        return events_buffer.events
+
     def GetConnections(self, **kwars):
         """Method to get connections of the device from neurons.
            Returns:
@@ -203,9 +455,9 @@ class OutputDevice(Device):
             if events_inds is not None:
                 if hasattr(events_inds, "__len__") or isinstance(events_inds, slice):
                     # events_inds are numerical or boolean indices, or a slice:
-                    select_fun = lambda x, events_inds: np.array(x)[events_inds]
+                    select_fun = lambda x, events_inds: np.asarray(x)[events_inds]
                 else: # events_inds is a scalar to start indexing from:
-                    select_fun = lambda x, events_inds: np.array(x)[events_inds:]
+                    select_fun = lambda x, events_inds: np.asarray(x)[events_inds:]
                 for var in variables:
                     events[var] = select_fun(events[var], events_inds)
             if len(filter_kwargs) > 0:
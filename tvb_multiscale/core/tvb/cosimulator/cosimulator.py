@@ -52,6 +52,7 @@ from tvb.contrib.cosimulation.cosimulator import CoSimulator as CoSimulatorBase
 from tvb.contrib.cosimulation.cosim_monitors import RawCosim, CosimMonitorFromCoupling
 
 from tvb_multiscale.core.neotraits import HasTraits
+from tvb_multiscale.core.utils.profiling_utils import PROFILER, profile
 from tvb_multiscale.core.tvb.cosimulator.models.wilson_cowan_constraint import WilsonCowan
 from tvb_multiscale.core.interfaces.tvb.interfaces import TVBOutputInterfaces
 from tvb_multiscale.core.interfaces.tvb.interfaces import TVBInputInterfaces
@@ -405,21 +406,32 @@ class CoSimulator(CoSimulatorBase, HasTraits):
         self.current_state = state
         self.current_step = self.current_step + n_steps
 
+    def _check_cosim_updates(self, cosim_updates):
+        """Method to check, via the validity bitmap of the input interfaces, instead of scanning for NaN values,
+           whether cosimulation updates have been received for all voi and proxy nodes, and all time steps."""
+        if not self.input_interfaces.any_updates_received:
+            self.log.warning("No cosimulator updates at time step %d!" % self.current_step)
+            return None
+        if not self.input_interfaces.all_updates_received:
+            msg = "Missing values detected in cosimulator updates at time step %d!" % self.current_step
+            self.log.error(msg)
+            raise Exception(msg)
+        return cosim_updates
+
+    @profile(category="interfaces")
     def get_cosim_updates(self, cosimulation=True):
+        PROFILER.step = int(self.current_step)
         cosim_updates = None
         if cosimulation and self.input_interfaces:
             # Get the update data from the other cosimulator
-            cosim_updates = self.input_interfaces(self.good_cosim_update_values_shape)
-            isnans = numpy.isnan(cosim_updates[-1])
-            if numpy.all(isnans):
-                cosim_updates = None
-                self.log.warning("No or all NaN valued cosimulator updates at time step %d!" % self.current_step)
-            elif numpy.any(isnans):
-                msg = "NaN values detected in cosimulator updates at time step %d!" % self.current_step
-                self.log.error(msg)
-                raise Exception(msg)
+            cosim_updates = self._check_cosim_updates(self.input_interfaces(self.good_cosim_update_values_shape))
         return cosim_updates
 
+    @profile(category="cosim_monitors", nbytes="output")
+    def loop_cosim_monitor_output(self, n_steps=None, relative_start_step=0):
+        return super(CoSimulator, self).loop_cosim_monitor_output(n_steps, relative_start_step)
+
+    @profile(category="interfaces")
     def send_cosim_coupling(self, cosimulation=True):
         outputs = []
         if cosimulation and self.output_interfaces and self.n_tvb_steps_ran_since_last_synch > 0:
@@ -430,9 +442,11 @@ class CoSimulator(CoSimulatorBase, HasTraits):
                                                                           self.relative_output_interfaces_time_steps))
         return outputs
 
+    @profile(category="tvb")
     def run_for_synchronization_time(self, ts, xs, wall_time_start, cosim_updates=None, cosimulation=True, **kwds):
         # Loop of integration for synchronization_time
         current_step = int(self.current_step)
+        PROFILER.step = current_step
         for data in self(cosim_updates=cosim_updates, **kwds):
             for tl, xl, t_x in zip(ts, xs, data):
                 if t_x is not None:
@@ -37,8 +37,6 @@ It inherits the Simulator class.
 
 """
 
-import numpy
-
 from tvb.basic.neotraits.api import Int
 from tvb_multiscale.core.tvb.cosimulator.cosimulator import CoSimulator
 
@@ -68,15 +66,8 @@ class CoSimulatorParallel(CoSimulatorRemoteParallel):
     def get_cosim_updates(self, cosim_updates=None, cosimulation=True):
         if cosimulation and self.input_interfaces and cosim_updates is not None:
             # Get the update data from the other cosimulator
-            cosim_updates = self.input_interfaces(cosim_updates, self.good_cosim_update_values_shape)
-            isnans = numpy.isnan(cosim_updates[-1])
-            if numpy.all(isnans):
-                cosim_updates = None
-                self.log.warning("No or all NaN valued cosimulator updates at time step %d!" % self.current_step)
-            elif numpy.any(isnans):
-                msg = "NaN values detected in cosimulator updates at time step %d!" % self.current_step
-                self.log.error(msg)
-                raise Exception(msg)
+            cosim_updates = self._check_cosim_updates(
+                self.input_interfaces(cosim_updates, self.good_cosim_update_values_shape))
         return cosim_updates
 
     def run_for_synchronization_time(self, ts, xs, wall_time_start, cosim_updates=None, cosimulation=True):
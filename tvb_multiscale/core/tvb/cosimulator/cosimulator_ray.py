@@ -84,7 +84,7 @@ class CoSimulatorParallelRay(CoSimulatorParallel):
                         cosim_updates = self.input_interfaces(self.good_cosim_update_values_shape, block=block)
                         break
         if cosim_updates is not None and isinstance(cosim_updates[-1], np.ndarray) \
-                and np.all(np.isnan(cosim_updates[-1])):
+                and not self.input_interfaces.any_updates_received:
             cosim_updates = None
         return cosim_updates
 
@@ -114,6 +114,9 @@ class CoSimulatorParallelRay(CoSimulatorParallel):
                     self.n_tvb_steps_ran_since_last_synch * self.integrator.dt,
                     self.send_cosim_coupling(self._cosimulation_flag, tvb_to_spikeNet_locks, block=True)
                 )  # tvb_to_spikeNet_locks are used in order to block spikeNet simulator from starting to integrate
+            # Start fetching the outputs of any remote transformers of spikeNet data, while spikeNet integrates:
+            if hasattr(self.input_interfaces, "prefetch"):
+                self.input_interfaces.prefetch()
         else:
             cosim_updates = None
 
@@ -39,27 +39,135 @@ It inherits the Simulator class.
 
 import time, sys
 from threading import Thread
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 
+from tvb.basic.neotraits.api import Attr
+
+from tvb_multiscale.core.utils.profiling_utils import PROFILER
 from tvb_multiscale.core.tvb.cosimulator.cosimulator import CoSimulator
 
 
 class CoSimulatorSerial(CoSimulator):
 
+    pipelined = Attr(
+        field_type=bool,
+        label="Pipelined cosimulation",
+        default=False,
+        required=True,
+        doc="""If True, the spiking simulator is run on a worker thread, 
+               concurrently with the TVB integration of the same synchronization time window.
+               This is possible because both depend only on the data exchanged at the end of the previous window:
+               the spiking simulator's inputs have been set by the previous send_cosim_coupling,
+               and the cosimulation updates of TVB are received before the spiking simulator starts.
+               The results are identical to the ones of the default, sequential, mode.
+               The spiking simulator should release the GIL (e.g., NEST does) for any speedup.""")
+
     simulate_spiking_simulator = None
 
+    _phase_times = None
+    _executor = None
+    _h5_stream_writer = None
+    _h5_stream_devices = None
+    _h5_stream_cursors = None
+
+    @property
+    def phase_times(self):
+        """Dictionary of the wall-clock times (in sec) spent in each phase of the last cosimulation run."""
+        return dict(self._phase_times or {})
+
+    def _reset_phase_times(self):
+        self._phase_times = {"get_cosim_updates": 0.0, "tvb": 0.0, "spiking_simulator": 0.0,
+                             "wait_spiking_simulator": 0.0, "send_cosim_coupling": 0.0}
+
+    def _add_phase_time(self, phase, tic):
+        toc = time.perf_counter()
+        if self._phase_times is not None:
+            self._phase_times[phase] += toc - tic
+        return toc
+
+    def _log_phase_times(self):
+        self.log.info("Wall-clock times per cosimulation phase (sec):\n%s" %
+                      "\n".join(["%s: %g" % (phase, phase_time) for phase, phase_time in self._phase_times.items()]))
+
+    def _simulate_spiking_simulator(self, n_steps):
+        tic = time.perf_counter()
+        self.log.info("Simulating the spiking network for %d time steps..." % n_steps)
+        self.simulate_spiking_simulator(
+            np.around(n_steps * self.integrator.dt, decimals=self._number_of_dt_decimals).item())
+        toc = self._add_phase_time("spiking_simulator", tic)
+        # A single timing of this phase for both the phase times and the PROFILER:
+        if PROFILER.enabled:
+            PROFILER.record("CoSimulatorSerial.simulate_spiking_simulator", "spikeNet", tic, toc)
+
+    def _run_tvb_for_synchronization_time(self, ts, xs, wall_time_start, cosim_updates, **kwds):
+        tic = time.perf_counter()
+        n_steps = super(CoSimulatorSerial, self).run_for_synchronization_time(
+            ts, xs, wall_time_start, cosim_updates, cosimulation=False, **kwds)
+        self._add_phase_time("tvb", tic)
+        return n_steps
+
+    def _run_for_synchronization_time_pipelined(self, ts, xs, wall_time_start, cosimulation=True, **kwds):
+        tic = time.perf_counter()
+        # Receive the cosimulation updates before the spiking simulator advances...
+        cosim_updates = self.get_cosim_updates(cosimulation)
+        n_steps = self._prepare_cosimulation_call(cosim_updates=cosim_updates)
+        tic = self._add_phase_time("get_cosim_updates", tic)
+        # ...and run it on the worker thread, while TVB integrates the same time window:
+        spiking_simulator = None
+        if self.simulate_spiking_simulator is not None:
+            spiking_simulator = self._executor.submit(self._simulate_spiking_simulator, n_steps)
+        self.n_tvb_steps_ran_since_last_synch = \
+            self._run_tvb_for_synchronization_time(ts, xs, wall_time_start, cosim_updates,
+                                                   n_steps=n_steps, skip_prepare_cosim=True, **kwds)
+        if spiking_simulator is not None:
+            tic = time.perf_counter()
+            # Raise any exception of the spiking simulator here:
+            spiking_simulator.result()
+            self._add_phase_time("wait_spiking_simulator", tic)
+        return self._send_cosim_coupling(cosimulation), self.n_tvb_steps_ran_since_last_synch
+
+    def _send_cosim_coupling(self, cosimulation=True):
+        tic = time.perf_counter()
+        outputs = self.send_cosim_coupling(cosimulation)
+        self._add_phase_time("send_cosim_coupling", tic)
+        return outputs
+
     def run_for_synchronization_time(self, ts, xs, wall_time_start, cosimulation=True, **kwds):
+        if self.pipelined and self._executor is not None:
+            return self._run_for_synchronization_time_pipelined(ts, xs, wall_time_start, cosimulation, **kwds)
+        tic = time.perf_counter()
+        cosim_updates = self.get_cosim_updates(cosimulation)
+        self._add_phase_time("get_cosim_updates", tic)
         self.n_tvb_steps_ran_since_last_synch = \
-            super(CoSimulatorSerial, self).run_for_synchronization_time(
-                ts, xs, wall_time_start, self.get_cosim_updates(cosimulation), cosimulation=False, **kwds)
+            self._run_tvb_for_synchronization_time(ts, xs, wall_time_start, cosim_updates, **kwds)
         if self.simulate_spiking_simulator is not None:
-            self.log.info("Simulating the spiking network for %d time steps..." %
-                          self.n_tvb_steps_ran_since_last_synch)
-            self.simulate_spiking_simulator(
-                np.around(self.n_tvb_steps_ran_since_last_synch * self.integrator.dt,
-                          decimals=self._number_of_dt_decimals).item())
-        return self.send_cosim_coupling(cosimulation), self.n_tvb_steps_ran_since_last_synch
+            self._simulate_spiking_simulator(self.n_tvb_steps_ran_since_last_synch)
+        return self._send_cosim_coupling(cosimulation), self.n_tvb_steps_ran_since_last_synch
+
+    def _stream_outputs(self, ts, xs):
+        """Append the monitors' outputs gathered so far to the H5StreamWriter, if any,
+           and empty the ts, xs lists, so that memory does not grow with the simulation length,
+           as well as the events recorded so far by the output devices of h5_stream_devices, if any."""
+        if self._h5_stream_writer is not None:
+            self._h5_stream_writer.append_monitors_outputs(
+                ts, xs, monitors_names=[monitor.__class__.__name__ for monitor in self.monitors])
+            for tl, xl in zip(ts, xs):
+                del tl[:]
+                del xl[:]
+            self._stream_events()
+
+    def _stream_events(self):
+        """Append the events of the output devices of h5_stream_devices to the H5StreamWriter,
+           after the streams' own cursors, so that the devices' read cursors of new events are not moved."""
+        for name, device in (self._h5_stream_devices or {}).items():
+            events_buffer = device._update_events_buffer()
+            cursor = self._h5_stream_cursors.get(name, 0)
+            if events_buffer.number_of_events > cursor:
+                self._h5_stream_writer.append_events("%s/%s" % (self._h5_stream_writer.EVENTS_GROUP, name),
+                                                     events_buffer.get(cursor))
+                self._h5_stream_cursors[name] = events_buffer.number_of_events
 
     def run_cosimulation(self, ts, xs, wall_time_start, advance_simulation_for_delayed_monitors_output=True, **kwds):
         """Convenience method to run cosimulation for serial cosimulation."""
@@ -72,21 +180,41 @@ class CoSimulatorSerial(CoSimulator):
             self.n_tvb_steps_ran_since_last_synch = synchronization_n_step
         simulated_steps = 0
         remaining_steps = int(np.round(simulation_length / self.integrator.dt))
-        # Send TVB's initial condition to spikeNet!:
-        self.send_cosim_coupling(True)
-        self._tic = time.time()
-        while remaining_steps > 0:
-            self.synchronization_n_step = np.minimum(remaining_steps, synchronization_n_step)
-            self.n_tvb_steps_ran_since_last_synch = \
-                self.run_for_synchronization_time(ts, xs, wall_time_start, cosimulation=True, **kwds)[-1]
-            simulated_steps += self.n_tvb_steps_ran_since_last_synch
-            remaining_steps -= self.n_tvb_steps_ran_since_last_synch
-            self._log_print_progress_message(simulated_steps, simulation_length)
+        self._reset_phase_times()
+        if self.pipelined:
+            # A single worker thread for the spiking simulator, kept for the whole cosimulation:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="spiking_simulator")
+        try:
+            # Send TVB's initial condition to spikeNet!:
+            PROFILER.step = int(self.current_step)
+            self._send_cosim_coupling(True)
+            self._tic = time.time()
+            while remaining_steps > 0:
+                self.synchronization_n_step = np.minimum(remaining_steps, synchronization_n_step)
+                self.n_tvb_steps_ran_since_last_synch = \
+                    self.run_for_synchronization_time(ts, xs, wall_time_start, cosimulation=True, **kwds)[-1]
+                simulated_steps += self.n_tvb_steps_ran_since_last_synch
+                remaining_steps -= self.n_tvb_steps_ran_since_last_synch
+                self._stream_outputs(ts, xs)
+                self._log_print_progress_message(simulated_steps, simulation_length)
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+        self._log_phase_times()
         self.synchronization_n_step = int(synchronization_n_step)  # restore the configured value
         self.simulation_length = simulation_length                 # restore the actually implemented value
 
     def run(self, **kwds):
-        """Convenience method to call the CoSimulator with **kwds and collect output data."""
+        """Convenience method to call the CoSimulator with **kwds and collect output data.
+           If a H5StreamWriter is given as h5_stream_writer, the output data are appended to its file
+           at every synchronization step, instead of being gathered in memory,
+           and a list of (time, data) h5py.Dataset tuples, to be sliced lazily, is returned instead.
+           The events of the output devices of a dictionary h5_stream_devices, e.g., of the spikeNet's spike recorders,
+           are then also appended to the file at every synchronization step, in the groups events/<name>."""
+        self._h5_stream_writer = kwds.pop("h5_stream_writer", None)
+        self._h5_stream_devices = kwds.pop("h5_stream_devices", None)
+        self._h5_stream_cursors = {}
         ts, xs = [], []
         for _ in self.monitors:
             ts.append([])
@@ -100,6 +228,11 @@ class CoSimulatorSerial(CoSimulator):
                                   **kwds)
         else:
             self.run_for_synchronization_time(ts, xs, wall_time_start, cosimulation=False, **kwds)
+        if self._h5_stream_writer is not None:
+            self._stream_outputs(ts, xs)
+            self._h5_stream_devices = None
+            h5_stream_writer, self._h5_stream_writer = self._h5_stream_writer, None
+            return h5_stream_writer.monitors_outputs()
         for i in range(len(ts)):
             ts[i] = np.array(ts[i])
             xs[i] = np.array(xs[i])
@@ -5,6 +5,7 @@ from tvb.basic.readers import H5Reader as H5ReaderBase
 
 from .base import Base
 from .h5_writer import H5Writer
+from .h5_stream_writer import H5StreamWriter
 
 
 class H5GroupHandlers(object):
@@ -109,3 +110,43 @@ class H5Reader(H5ReaderBase, Base):
             self._log_success_or_warn(e, "List of Dictionaries")
         self._close_file(close_file)
         return list_of_dicts
+
+    def _assert_stream_file(self, path=None):
+        # Keep the file open for lazy reading, unless a different file is requested:
+        if self.hfd5_source is None or (path is not None and path != self.h5_path):
+            self._assert_file(path, "Streams")
+        return self.hfd5_source
+
+    def read_stream(self, name, path=None):
+        """Method to return a stream, written by a H5StreamWriter, as a h5py.Dataset,
+           whose slices are read from the file lazily, as long as the file is open.
+        :param name: the path of the dataset in the file
+        :return: h5py.Dataset
+        """
+        return self._assert_stream_file(path)[name]
+
+    def read_stream_slice(self, name, start=None, stop=None, step=None, path=None):
+        """Method to read only the [start:stop:step] slice, along the first dimension, of a stream.
+        :return: numpy.ndarray
+        """
+        return self.read_stream(name, path)[start:stop:step]
+
+    def read_monitor_outputs(self, i_monitor, start=None, stop=None, path=None):
+        """Method to read the [start:stop] slice of the time points and data of a monitor's stream.
+        :return: tuple of numpy.ndarrays (time, data)
+        """
+        name = "%s/%d" % (H5StreamWriter.MONITORS_GROUP, i_monitor)
+        return self.read_stream_slice(name + "/time", start, stop, path=path), \
+               self.read_stream_slice(name + "/data", start, stop, path=path)
+
+    def read_events(self, name, start=None, stop=None, path=None):
+        """Method to read the [start:stop] slice of events' streams, e.g., of spikes, written by a H5StreamWriter.
+        :return: dict of numpy.ndarrays, one per event attribute
+        """
+        group = self._assert_stream_file(path)[name]
+        return dict([(key, group[key][start:stop]) for key in group.keys()])
+
+    def close(self):
+        """Method to close the file, kept open for the lazy reading of streams."""
+        if self.hfd5_source is not None:
+            self._close_file()
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+
+import h5py
+import numpy
+
+from tvb.basic.logger.builder import get_logger
+from tvb.contrib.scripts.utils.file_utils import change_filename_or_overwrite
+from .base import Base
+
+
+class H5StreamWriter(Base):
+
+    """H5StreamWriter class to write results to a HDF5 file incrementally, during a long (co)simulation.
+       Every stream is a resizable, chunked and optionally compressed dataset,
+       which grows along its first (time or event) dimension, every time data are appended to it.
+       Monitors' outputs are written in the groups monitors/<i_monitor>, with datasets "time" and "data",
+       and events (e.g., spikes) in groups of one dimensional datasets, one per event attribute,
+       e.g., in the groups events/<name> for the events of the output devices streamed by CoSimulatorSerial.run.
+       The datasets can be read back lazily, slice by slice, via H5Reader.read_stream* methods.
+    """
+
+    H5_TYPE_ATTRIBUTE = "Type"
+    MONITORS_GROUP = "monitors"
+    EVENTS_GROUP = "events"
+
+    write_mode = 'w'
+    force_overwrite = True
+
+    hfd5_target = None
+
+    def __init__(self, h5_path="", write_mode="w", compression="gzip", compression_opts=4, shuffle=True,
+                 chunk_nbytes=2 ** 20, flush=True):
+        self.logger = get_logger(__name__)
+        self.h5_path = h5_path
+        self.write_mode = write_mode
+        self.compression = compression
+        self.compression_opts = compression_opts if compression == "gzip" else None
+        self.shuffle = shuffle and compression is not None
+        self.chunk_nbytes = chunk_nbytes
+        self.flush_after_append = flush
+
+    @property
+    def _hdf_file(self):
+        return self.hfd5_target
+
+    def _set_hdf_file(self, hfile):
+        self.hfd5_target = hfile
+
+    @property
+    def _fmode(self):
+        return self.write_mode
+
+    @property
+    def _mode(self):
+        return "stream"
+
+    @property
+    def _mode_past(self):
+        return "streamed"
+
+    @property
+    def _to_from(self):
+        return "to"
+
+    def _open_file(self, type_name=""):
+        if self.write_mode == "w":
+            self.h5_path = change_filename_or_overwrite(self.h5_path, self.force_overwrite)
+        super(H5StreamWriter, self)._open_file(type_name)
+
+    def open(self, path=None):
+        """Method to open the file, if it is not open already."""
+        if self.hfd5_target is None or path is not None:
+            self._assert_file(path, "Streams")
+            # Any reopening of the same file has to append to it:
+            self.write_mode = "a"
+        return self.hfd5_target
+
+    def close(self):
+        if self.hfd5_target is not None:
+            self._close_file()
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def flush(self):
+        if self.hfd5_target is not None:
+            self.hfd5_target.flush()
+
+    def _chunks(self, shape_tail, dtype):
+        # Chunks of (approximately) chunk_nbytes, with as many rows as they fit:
+        row_nbytes = max(int(numpy.prod(shape_tail)) * numpy.dtype(dtype).itemsize, 1)
+        return (max(int(self.chunk_nbytes // row_nbytes), 1), ) + tuple(shape_tail)
+
+    def create_stream(self, name, shape_tail=(), dtype="f8", **attrs):
+        """Method to create an empty, resizable along its first dimension, chunked and optionally compressed dataset.
+           :param name: the path of the dataset in the file
+           :param shape_tail: the shape of every row of the dataset, i.e., of every time point or event
+           :param dtype: the data type of the dataset
+           :param attrs: attributes to be written to the dataset
+           :return: the h5py.Dataset
+        """
+        shape_tail = tuple(int(s) for s in shape_tail)
+        dataset = self.open().create_dataset(name, shape=(0, ) + shape_tail, maxshape=(None, ) + shape_tail,
+                                             dtype=dtype, chunks=self._chunks(shape_tail, dtype),
+                                             compression=self.compression, compression_opts=self.compression_opts,
+                                             shuffle=self.shuffle)
+        for key, val in attrs.items():
+            dataset.attrs.create(key, val)
+        return dataset
+
+    def append(self, name, data):
+        """Method to append data along the first dimension of a stream, which is created if it doesn't exist.
+           :param name: the path of the dataset in the file
+           :param data: an array of shape (number_of_rows, ) + shape_tail of the stream
+           :return: the new length of the stream
+        """
+        data = numpy.asarray(data)
+        if data.ndim == 0:
+            data = data[None]
+        if name in self.open():
+            dataset = self.hfd5_target[name]
+        else:
+            dataset = self.create_stream(name, data.shape[1:], data.dtype)
+        n_old = dataset.shape[0]
+        n_data = data.shape[0]
+        if n_data:
+            dataset.resize(n_old + n_data, axis=0)
+            dataset[n_old:] = data
+            if self.flush_after_append:
+                self.hfd5_target.flush()
+        return n_old + n_data
+
+    def append_monitors_outputs(self, ts, xs, monitors_names=None):
+        """Method to append the outputs of the monitors of a synchronization time window,
+           i.e., for every monitor, a sequence of time points and a sequence of data of the same length,
+           as gathered by CoSimulator.run_for_synchronization_time.
+        """
+        for i_monitor, (t, x) in enumerate(zip(ts, xs)):
+            if len(t) == 0:
+                continue
+            group_name = "%s/%d" % (self.MONITORS_GROUP, i_monitor)
+            if group_name not in self.open():
+                group = self.hfd5_target.require_group(group_name)
+                group.attrs.create(self.H5_TYPE_ATTRIBUTE, "Monitor")
+                if monitors_names is not None:
+                    group.attrs.create("Monitor", str(monitors_names[i_monitor]))
+            self.append(group_name + "/time", numpy.array(t))
+            self.append(group_name + "/data", numpy.array(x))
+
+    def append_events(self, name, events):
+        """Method to append events, e.g., spikes, to the one dimensional streams of the group name,
+           one per event attribute (e.g., times and senders).
+           :param name: the path of the group of the events in the file
+           :param events: a dictionary of equal length arrays of events' attributes
+           :return: the new number of events
+        """
+        if name not in self.open():
+            group = self.hfd5_target.require_group(name)
+            group.attrs.create(self.H5_TYPE_ATTRIBUTE, "Events")
+        flush_after_append = self.flush_after_append
+        self.flush_after_append = False
+        n_events = 0
+        try:
+            for key, vals in events.items():
+                n_events = self.append("%s/%s" % (name, key), numpy.asarray(vals).ravel())
+        finally:
+            self.flush_after_append = flush_after_append
+        if flush_after_append:
+            self.hfd5_target.flush()
+        return n_events
+
+    def stream_length(self, name):
+        if self.hfd5_target is None or name not in self.hfd5_target:
+            return 0
+        return self.hfd5_target[name].shape[0]
+
+    def monitors_outputs(self):
+        """Method to return a list of (time, data) h5py.Dataset tuples for every streamed monitor,
+           to be sliced lazily, as long as the file is open."""
+        group = self.open().get(self.MONITORS_GROUP, {})
+        return [(group[i_monitor]["time"], group[i_monitor]["data"]) for i_monitor in sorted(group.keys(), key=int)]
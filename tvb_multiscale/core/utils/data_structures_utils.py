@@ -55,37 +55,59 @@ def flatten_neurons_inds_in_DataArray(data_array, neurons_dim_label="Neuron"):
     return data_array
 
 
-def filter_events(events, variables=None, times=None, exclude_times=[]):
+def _time_intervals(values):
+    """Function to return an array of shape (number of intervals, 2) of [start, end] time intervals,
+       if values is an interval (start, end), where None stands for an open bound,
+       or a sequence of such intervals, or None, if values is a sequence of times."""
+    if len(values) == 2 and not np.any([hasattr(value, "__len__") for value in values]):
+        intervals = [values]
+    elif np.all([hasattr(value, "__len__") and len(value) == 2 for value in values]):
+        intervals = values
+    else:
+        return None
+    return np.array([[-np.inf if start is None else start, np.inf if end is None else end]
+                     for start, end in intervals], dtype="f8")
+
+
+def _times_mask(events_times, values, sorted_times=False):
+    """Function to return a boolean mask of the events' times that are
+       within an interval, or within any of a sequence of intervals, or equal to any of a sequence of times.
+       For sorted events' times, intervals are computed as searchsorted windows."""
+    intervals = _time_intervals(values)
+    if intervals is None:
+        return np.isin(events_times, np.array(values))
+    if sorted_times:
+        mask = np.zeros(events_times.shape, dtype="bool")
+        for start, end in zip(np.searchsorted(events_times, intervals[:, 0], side="left"),
+                              np.searchsorted(events_times, intervals[:, 1], side="right")):
+            mask[start:end] = True
+        return mask
+    mask = np.logical_and(events_times >= intervals[0, 0], events_times <= intervals[0, 1])
+    for start, end in intervals[1:]:
+        mask |= np.logical_and(events_times >= start, events_times <= end)
+    return mask
+
+
+def filter_events(events, variables=None, times=None, exclude_times=[], sorted_times=None):
     """This method will select/exclude part of the measured events, depending on user inputs
         Arguments:
             events: dictionary of events
             variables: sequence (list, tuple, array) of variables to be included in the output,
                        assumed to correspond to keys of the events dict.
                        Default=None, corresponds to all keys of events.
-            times: sequence (list, tuple, array) of times the events of which should be included in the output.
-                     Default = None, corresponds to all events' times.
-            exclude_times: sequence (list, tuple, array) of times
-                             the events of which should be excluded from the output. Default = [].
+            times: sequence (list, tuple, array) of times the events of which should be included in the output,
+                   or an interval (start, end) of times, with None for an open bound,
+                   or a sequence of such intervals. Default = None, corresponds to all events' times.
+            exclude_times: sequence (list, tuple, array) of times the events of which
+                           should be excluded from the output, or an interval, or a sequence of intervals,
+                           as for times. Default = [].
+            sorted_times: boolean flag of whether the events' times are sorted,
+                          in which case time intervals are selected via binary search.
+                          Default = None, for checking it.
         Returns:
               the filtered dictionary (of arrays per attribute) of events
     """
 
-    def in_fun(values):
-        # Function to return a boolean about whether a value is
-        # within a sequence or an interval (len(values) == 2) of values:
-        if len(values) == 2:
-            if values[0] is not None:
-                if values[1] is not None:
-                    return lambda x: x >= values[0] and x <= values[1]
-                else:
-                    return lambda x: x >= values[0]
-            elif values[1] is not None:
-                return lambda x: x <= values[0]
-            else:
-                return lambda x: x
-        else:
-            return lambda x: x in values
-
     # The variables to return:
     if variables is None:
         variables = events.keys()
@@ -93,25 +115,39 @@ def filter_events(events, variables=None, times=None, exclude_times=[]):
     # The events:
     output_events = OrderedDict()
 
-    events_times = np.array(events["times"])
+    events_times = np.asarray(events["times"])
 
     n_events = len(events["times"])
     if n_events > 0:
         # As long as there are events:
-        # If we (un)select times...
         if times is not None and len(times) > 0:
-            in_times = in_fun(flatten_list(times))
+            times = flatten_list(times)
         else:
-            in_times = lambda x: True
+            times = None
         if exclude_times is not None and len(exclude_times) > 0:
-            not_in_exclude_times = lambda x: not in_fun(flatten_list(exclude_times))(x)
+            exclude_times = flatten_list(exclude_times)
+        else:
+            exclude_times = None
+        if times is None and exclude_times is None:
+            inds = slice(None)
         else:
-            not_in_exclude_times = lambda x: True
-        inds = np.logical_and(np.ones((n_events,)),
-                              [in_times(time) and not_in_exclude_times(time)
-                               for time in events_times])
+            if sorted_times is None:
+                sorted_times = bool(np.all(events_times[1:] >= events_times[:-1]))
+            intervals = None if times is None else _time_intervals(times)
+            if sorted_times and exclude_times is None and intervals is not None and len(intervals) == 1:
+                # A single interval of sorted times is selected as a slice, i.e., without copying the events:
+                inds = slice(np.searchsorted(events_times, intervals[0, 0], side="left"),
+                             np.searchsorted(events_times, intervals[0, 1], side="right"))
+            else:
+                # If we (un)select times...
+                if times is not None:
+                    inds = _times_mask(events_times, times, sorted_times)
+                else:
+                    inds = np.ones((n_events,), dtype="bool")
+                if exclude_times is not None:
+                    inds &= ~_times_mask(events_times, exclude_times, sorted_times)
         for var in ensure_list(variables):
-            output_events[var] = events[var][inds]
+            output_events[var] = np.asarray(events[var])[inds]
     else:
         for var in ensure_list(variables):
             output_events[var] = np.array([])
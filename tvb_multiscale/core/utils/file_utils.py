@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
 
+import io
 import sys
 import os
+import hashlib
 import importlib.util
+from contextlib import contextmanager
 import dill  # , pickle  TODO: decide whether to use one or the other, or make it a configuration choice
 from six import string_types
 import codecs
@@ -83,6 +86,61 @@ def read_data_from_ascii_to_dict(filepath, n_lines_to_skip=0, n_header_lines=0,
     return events
 
 
+NEST_ASCII_HEADER_LINES = 3
+
+NEST_ASCII_LABELS = {"sender": "senders", "time_ms": "times"}
+
+
+def _read_nest_ascii_header(file):
+    """This function reads the header of a NEST recording device ascii file, opened in binary mode,
+       the last line of which contains the labels of the data in columns, renamed according to NEST_ASCII_LABELS.
+       Returns:
+        the list of the labels, and the byte offset of the end of the header,
+        or None and 0, respectively, if the header has not been written completely yet.
+    """
+    file.seek(0)
+    lines = [file.readline() for _ in range(NEST_ASCII_HEADER_LINES)]
+    if not lines[-1].endswith(b"\n"):
+        return None, 0
+    keys = [NEST_ASCII_LABELS.get(key, key) for key in lines[-1].decode("ascii").strip().split("\t")]
+    return keys, file.tell()
+
+
+def read_nest_output_device_data_from_ascii_tail(filepath, offset=0):
+    """This function reads the rows of a NEST recording device ascii file after a byte offset,
+       into an events dictionary, parsing all of them at once, with numpy.loadtxt.
+       Only complete rows are read, i.e., up to the last newline character,
+       so that a row still being written will be read by the next call, starting from the returned offset.
+       Thereby, repeated calls during a simulation read only the newly appended rows, without truncating the file.
+       Arguments:
+        - filepath: absolute or relative path to the file (string).
+        - offset=0: the byte offset to start reading from. Offsets within the header (e.g., 0) skip the header.
+       Returns:
+        the events dictionary of the data read, and the byte offset of the end of the last row read
+    """
+    with open(filepath, "rb") as file:
+        keys, header_end = _read_nest_ascii_header(file)
+        if keys is None:
+            return {}, offset
+        offset = max(int(offset), header_end)
+        file.seek(offset)
+        data = file.read()
+    n_bytes = data.rfind(b"\n") + 1
+    data = data[:n_bytes]
+    if b"\x00" in data:
+        data = data.replace(b"\x00", b"")
+    if len(data.strip()):
+        values = np.loadtxt(io.BytesIO(data), delimiter="\t", ndmin=2, encoding="ascii")
+    else:
+        values = np.empty((0, len(keys)))
+    events = {}
+    for iK, key in enumerate(keys):
+        events[key] = np.ascontiguousarray(values[:, iK])
+    if "senders" in events:
+        events["senders"] = events["senders"].astype("i8")
+    return events, offset + n_bytes
+
+
 def read_nest_output_device_data_from_ascii_to_dict(filepath, n_lines_to_skip=0, empty_file=False):
     """This function reads data from a NEST recording device ascii file into an events dictionary.
        The following renaming happens to match the labels of the events when recording in "memory" in NEST:
@@ -94,34 +152,13 @@ def read_nest_output_device_data_from_ascii_to_dict(filepath, n_lines_to_skip=0,
        Returns:
         the events dictionary of the recorded data
     """
-    # TODO: Find a faster way to read and truncate the file without the buggy \x00 character...
-    events = {}
-    keys = []
-    filedata = ""
-    with open(filepath, "r+", encoding='ascii') as file:
-        for iL, line in enumerate(file):
-            if empty_file and iL < 3:
-                filedata += line
-            if iL == 2:
-                keys = line.replace("\n", "").replace('sender', 'senders').replace('time_ms', 'times').split("\t")
-                events = dict(zip(keys, [list() for _ in range(len(keys))]))
-            elif iL > 2 + n_lines_to_skip:
-                for key, val in zip(keys,
-                                    list([float(d) for d in line.replace('\x00', '').replace("\n", "").split("\t")])):
-                    events[key] += [val]
-    for key, val in events.items():
-        events[key] = np.array(val)
-    if np.any(np.isnan(events["senders"])):
-        print(events)
-        raise
+    events = read_nest_output_device_data_from_ascii_tail(filepath)[0]
+    if n_lines_to_skip:
+        for key, val in events.items():
+            events[key] = val[n_lines_to_skip:]
     if empty_file:
-        with open(filepath, "w", encoding='ascii') as file:
-            file.write(filedata)
-        # truncate_ascii_file_after_header(filepath, header=3)
+        truncate_ascii_file_after_header(filepath, header=NEST_ASCII_HEADER_LINES)
     return events
-    # return read_data_from_ascii_to_dict(filepath, n_lines_to_skip=n_lines_to_skip, n_header_lines=3,
-    #                                     renaming_labels_dict={"sender": "senders", "time_ms": "times"},
-    #                                     empty_file=empty_file)
 
 
 def dump_pickled_dict(d, filepath):
@@ -137,6 +174,41 @@ def load_pickled_dict(filepath):
     return d
 
 
+def directory_content_hash(path, *extra_keys, exclude=()):
+    """Function to return the sha256 hex digest of the relative paths and contents of all files
+       under directory path, apart from the ones with names in exclude, and of any extra keys (strings)."""
+    hasher = hashlib.sha256()
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for filename in sorted(files):
+            if filename in exclude:
+                continue
+            filepath = os.path.join(root, filename)
+            hasher.update(os.path.relpath(filepath, path).replace(os.sep, "/").encode())
+            with open(filepath, "rb") as file:
+                for chunk in iter(lambda: file.read(2**20), b""):
+                    hasher.update(chunk)
+    for key in extra_keys:
+        hasher.update(str(key).encode())
+    return hasher.hexdigest()
+
+
+@contextmanager
+def file_lock(filepath):
+    """Context manager to hold an exclusive lock of filepath, blocking until it is acquired,
+       so that processes sharing a file system, e.g., concurrent jobs, don't enter the locked block concurrently."""
+    import fcntl
+    dirpath = os.path.dirname(filepath)
+    if dirpath:
+        os.makedirs(dirpath, exist_ok=True)
+    with open(filepath, "a") as file:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield file
+        finally:
+            fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
 def load_module_from_file(filepath, module_name="module.name"):
     spec = importlib.util.spec_from_file_location(module_name, filepath)
     foo = importlib.util.module_from_spec(spec)
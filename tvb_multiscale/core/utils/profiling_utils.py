@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+
+import os
+import csv
+import json
+import threading
+from time import perf_counter
+from functools import wraps
+
+import numpy as np
+
+
+RECORD_DTYPE = np.dtype([("step", "i8"), ("name", "i4"), ("category", "i4"), ("thread", "i8"),
+                         ("start", "f8"), ("duration", "f8"), ("nbytes", "i8")])
+
+
+def data_nbytes(data):
+    """Function to compute the number of bytes of (possibly nested lists, tuples, dicts or object arrays of)
+       numpy arrays, as a measure of the amount of data exchanged."""
+    if isinstance(data, np.ndarray):
+        if data.dtype == object:
+            return int(np.sum([data_nbytes(d) for d in data.flat]))
+        return int(data.nbytes)
+    if isinstance(data, (list, tuple)):
+        return int(np.sum([data_nbytes(d) for d in data]))
+    if isinstance(data, dict):
+        return data_nbytes(list(data.values()))
+    if isinstance(data, (int, float, np.number)):
+        return 8
+    return 0
+
+
+class Profiler(object):
+
+    """Profiler class collecting the wall-clock times (and sizes of data) of profiled functions' calls,
+       per cosimulation synchronization step, into a ring buffer of fixed size,
+       which keeps only the last buffer_size records.
+       Profiling is disabled by default, in which case profiled functions only check the enabled flag.
+       The records can be exported to CSV, JSON or Chrome trace (chrome://tracing, Perfetto) files.
+    """
+
+    def __init__(self, buffer_size=100000):
+        self.enabled = False
+        self.step = 0
+        self._lock = threading.Lock()
+        self._names = {}
+        self._categories = {}
+        self._t0 = perf_counter()
+        self._allocate(buffer_size)
+
+    def _allocate(self, buffer_size):
+        self._buffer = np.zeros((int(buffer_size),), dtype=RECORD_DTYPE)
+        self._n_records = 0
+
+    @property
+    def buffer_size(self):
+        return self._buffer.size
+
+    def enable(self, buffer_size=None):
+        if buffer_size is not None and buffer_size != self.buffer_size:
+            self._allocate(buffer_size)
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        """Method to discard all records."""
+        with self._lock:
+            self._n_records = 0
+            self.step = 0
+            self._t0 = perf_counter()
+
+    @staticmethod
+    def _index(labels, label):
+        ind = labels.get(label, None)
+        if ind is None:
+            ind = len(labels)
+            labels[label] = ind
+        return ind
+
+    def record(self, name, category, tic, toc=None, nbytes=0):
+        """Method to record a call of name and category, which started at perf_counter() time tic."""
+        if toc is None:
+            toc = perf_counter()
+        with self._lock:
+            record = self._buffer[self._n_records % self._buffer.size]
+            record["step"] = self.step
+            record["name"] = self._index(self._names, name)
+            record["category"] = self._index(self._categories, category)
+            record["thread"] = threading.get_ident()
+            record["start"] = tic - self._t0
+            record["duration"] = toc - tic
+            record["nbytes"] = nbytes
+            self._n_records += 1
+
+    @property
+    def number_of_records(self):
+        return min(self._n_records, self._buffer.size)
+
+    @property
+    def records(self):
+        """The records in chronological order of recording, as a numpy structured array."""
+        with self._lock:
+            n_records = self._n_records
+            if n_records <= self._buffer.size:
+                return self._buffer[:n_records].copy()
+            ind = n_records % self._buffer.size
+            return np.concatenate([self._buffer[ind:], self._buffer[:ind]])
+
+    def _labels(self, labels):
+        output = np.empty((len(labels),), dtype=object)
+        for label, ind in labels.items():
+            output[ind] = label
+        return output
+
+    def to_dicts(self):
+        """Method to return the records as a list of dictionaries, with times in sec."""
+        records = self.records
+        names = self._labels(self._names)
+        categories = self._labels(self._categories)
+        return [{"step": int(record["step"]), "name": names[record["name"]],
+                 "category": categories[record["category"]], "thread": int(record["thread"]),
+                 "start": float(record["start"]), "duration": float(record["duration"]),
+                 "nbytes": int(record["nbytes"])}
+                for record in records]
+
+    def summary(self):
+        """Method to return a dictionary of total and mean duration (in sec), number of calls and total bytes,
+           per profiled name."""
+        records = self.records
+        names = self._labels(self._names)
+        summary = {}
+        for ind in np.unique(records["name"]):
+            name_records = records[records["name"] == ind]
+            summary[names[ind]] = {"calls": int(name_records.size),
+                                   "total": float(name_records["duration"].sum()),
+                                   "mean": float(name_records["duration"].mean()),
+                                   "max": float(name_records["duration"].max()),
+                                   "nbytes": int(name_records["nbytes"].sum())}
+        return summary
+
+    def to_csv(self, filepath):
+        records = self.to_dicts()
+        with open(filepath, "w", newline="") as csv_file:
+            writer = csv.DictWriter(csv_file, fieldnames=list(RECORD_DTYPE.names))
+            writer.writeheader()
+            writer.writerows(records)
+        return filepath
+
+    def to_json(self, filepath):
+        with open(filepath, "w") as json_file:
+            json.dump(self.to_dicts(), json_file)
+        return filepath
+
+    def to_chrome_trace(self, filepath):
+        """Method to write the records in the Chrome trace event format, as complete events with times in us."""
+        pid = os.getpid()
+        events = [{"name": record["name"], "cat": record["category"], "ph": "X",
+                   "ts": 1e6 * record["start"], "dur": 1e6 * record["duration"],
+                   "pid": pid, "tid": record["thread"],
+                   "args": {"step": record["step"], "nbytes": record["nbytes"]}}
+                  for record in self.to_dicts()]
+        with open(filepath, "w") as json_file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, json_file)
+        return filepath
+
+    def export(self, filepath):
+        """Method to export the records to a file, in a format depending on its extension:
+           .csv, .json or, otherwise, Chrome trace."""
+        extension = os.path.splitext(filepath)[-1].lower()
+        if extension == ".csv":
+            return self.to_csv(filepath)
+        elif extension == ".json":
+            return self.to_json(filepath)
+        return self.to_chrome_trace(filepath)
+
+
+PROFILER = Profiler()
+
+
+def profile(name=None, category="", nbytes=None):
+    """Decorator to record the wall-clock time of every call of a function to the PROFILER, when it is enabled.
+       Arguments:
+        - name: the name of the record. Default: the qualified name of the function.
+        - category: the category of the record, e.g., "tvb", "spikeNet", "interfaces", "transformers".
+        - nbytes: "input" or "output", to record the number of bytes of the first argument after self,
+                  or of the output of the function, respectively. Default: None, for no byte counts.
+    """
+    def decorator(fun):
+        label = name or fun.__qualname__
+
+        @wraps(fun)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return fun(*args, **kwargs)
+            tic = perf_counter()
+            output = fun(*args, **kwargs)
+            toc = perf_counter()
+            if nbytes == "output":
+                n_bytes = data_nbytes(output)
+            elif nbytes == "input":
+                n_bytes = data_nbytes(args[1] if len(args) > 1 else list(kwargs.values())[:1])
+            else:
+                n_bytes = 0
+            PROFILER.record(label, category, tic, toc, n_bytes)
+            return output
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+
+import os
+import multiprocessing
+
+from tvb.basic.profile import TvbProfile
+TvbProfile.set_profile(TvbProfile.LIBRARY_PROFILE)
+
+import numpy as np
+import pytest
+
+from tvb_multiscale.core.interfaces.base.io import \
+    SharedMemoryWriter, SharedMemoryReader, MPIWriter, MPIReader
+
+
+SHAPE = (3, 10, 2)  # (proxy, time, voi)
+N_WINDOWS = 20
+
+
+def window_data(iW):
+    return [np.array([iW * SHAPE[1] + 1, (iW + 1) * SHAPE[1]]),
+            iW + np.arange(np.prod(SHAPE)).reshape(SHAPE).astype("f8")]
+
+
+def write_windows(target):
+    writer = SharedMemoryWriter(target=target, shape=np.array(SHAPE), timeout=10.0)
+    writer.configure()
+    for iW in range(N_WINDOWS):
+        assert writer.send(window_data(iW)) == 1
+    # Wait for the reader to release all slots before unlinking the shared memory segment:
+    writer._wait(lambda: writer._header[writer._READ_SEQ] >= N_WINDOWS - 1)
+    writer.close()
+
+
+def test_shared_memory_communicators():
+    target = "test_shared_memory_communicators_%d" % os.getpid()
+    writer_process = multiprocessing.get_context("spawn").Process(target=write_windows, args=(target, ))
+    writer_process.start()
+    reader = SharedMemoryReader(source=target, timeout=10.0)
+    reader.configure()
+    try:
+        for iW in range(N_WINDOWS):
+            data = reader()
+            expected_data = window_data(iW)
+            assert np.array_equal(data[0], expected_data[0])
+            assert np.array_equal(data[1], expected_data[1])
+            assert not data[1].flags.writeable
+    finally:
+        reader.close()
+        writer_process.join(10.0)
+    assert writer_process.exitcode == 0
+
+
+def test_shared_memory_communicators_smaller_data():
+    target = "test_shared_memory_communicators_smaller_data_%d" % os.getpid()
+    writer = SharedMemoryWriter(target=target, number_of_slots=3, timeout=0.1)
+    reader = SharedMemoryReader(source=target, copy=True, timeout=0.1)
+    writer.configure()
+    data = window_data(0)
+    writer.send(data)
+    reader.configure()
+    try:
+        # Data of smaller shape fit within the layout of the segment...
+        for iT in range(1, 3):
+            assert writer.send([np.array([1, iT]), data[1][:, :iT]]) == 1
+        # ...but the ring buffer is full now:
+        assert writer.send(data) is None
+        assert np.array_equal(reader()[1], data[1])
+        for iT in range(1, 3):
+            received_data = reader()
+            assert np.array_equal(received_data[0], [1, iT])
+            assert np.array_equal(received_data[1], data[1][:, :iT])
+        # No new data to read:
+        assert reader() is None
+    finally:
+        reader.close()
+        writer.close()
+
+
+def mpi_echo(comm, rank, n_windows=N_WINDOWS, tag=0):
+    """Receive windows from rank and send them back doubled, until the end of the communication."""
+    reader = MPIReader(comm=comm, rank=rank, tag=tag)
+    writer = MPIWriter(comm=comm, rank=rank, tag=tag + 2)
+    reader.configure()
+    writer.configure()
+    for _ in range(n_windows):
+        data = reader()
+        writer.send([data[0], 2 * data[1]])
+    assert reader() is None
+    writer.end_mpi()
+    reader.end_mpi()
+
+
+def mpi_exchange(comm, ranks, n_windows=N_WINDOWS, tag=0):
+    """Send windows to all ranks, receiving the echoes of the previous window while the next one is sent."""
+    writers = [MPIWriter(comm=comm, rank=rank, tag=tag) for rank in ranks]
+    readers = [MPIReader(comm=comm, rank=rank, tag=tag + 2, copy=True) for rank in ranks]
+    for communicator in writers + readers:
+        communicator.configure()
+    for iW in range(n_windows + 1):
+        if iW < n_windows:
+            for writer in writers:
+                assert writer.send(window_data(iW)) == 1
+        if iW > 0:
+            expected_data = window_data(iW - 1)
+            for reader in readers:
+                data = reader()
+                assert np.array_equal(data[0], expected_data[0])
+                assert np.array_equal(data[1], 2 * expected_data[1])
+    for writer, reader in zip(writers, readers):
+        writer.end_mpi()
+        assert reader() is None
+        reader.end_mpi()
+
+
+def test_mpi_communicators():
+    MPI = pytest.importorskip("mpi4py.MPI")
+    comm = MPI.COMM_WORLD
+    if comm.Get_size() > 1:
+        pytest.skip("Run this module as a script under mpirun for the multi-process test.")
+    # Communicate with the same process:
+    writer = MPIWriter(comm=comm, rank=0)
+    reader = MPIReader(comm=comm, rank=0)
+    writer.configure()
+    reader.configure()
+    for iW in range(N_WINDOWS):
+        data = window_data(iW)
+        assert writer.send(data) == 1
+        received_data = reader()
+        assert np.array_equal(received_data[0], data[0])
+        assert np.array_equal(received_data[1], data[1])
+        assert received_data[1].dtype == data[1].dtype
+        assert not received_data[1].flags.writeable
+    spikes = np.empty((2,), dtype=object)
+    spikes[0] = np.array([0.1, 0.5])
+    spikes[1] = np.array([])
+    writer.send([np.array([1, 10]), spikes])
+    received_spikes = reader()[1]
+    for proxy_spikes, received_proxy_spikes in zip(spikes, received_spikes):
+        assert np.array_equal(proxy_spikes, received_proxy_spikes)
+    writer.end_mpi()
+    assert reader() is None
+    reader.end_mpi()
+
+
+if __name__ == "__main__":
+    # mpirun -n 3 python -m tvb_multiscale.tests.core.test_communicators
+    from mpi4py import MPI
+    comm = MPI.COMM_WORLD
+    if comm.Get_rank() == 0:
+        mpi_exchange(comm, list(range(1, comm.Get_size())))
+        print("MPI communicators' test passed for %d processes." % comm.Get_size())
+    else:
+        mpi_echo(comm, 0)
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+
+import os
+import csv
+import json
+import time
+import tempfile
+
+from tvb.basic.profile import TvbProfile
+TvbProfile.set_profile(TvbProfile.LIBRARY_PROFILE)
+
+import h5py
+import numpy as np
+
+from tvb.datatypes.connectivity import Connectivity
+from tvb.simulator.integrators import HeunDeterministic
+from tvb.simulator.monitors import Raw
+
+from tvb_multiscale.core.config import CONFIGURED
+from tvb_multiscale.core.tvb.cosimulator.cosimulator_serial import CoSimulatorSerial
+from tvb_multiscale.core.tvb.cosimulator.models.wilson_cowan_constraint import WilsonCowan
+from tvb_multiscale.core.interfaces.tvb.builders import TVBRemoteInterfaceBuilder
+from tvb_multiscale.core.interfaces.base.io import NPZWriter, NPZReader
+from tvb_multiscale.core.tvb.io.h5_stream_writer import H5StreamWriter
+from tvb_multiscale.core.spiking_models.devices import EventsBuffer
+from tvb_multiscale.core.utils.profiling_utils import PROFILER
+
+
+N_REGIONS = 4
+PROXY_INDS = np.array([0, 1])
+
+
+class EchoSpikeRecorder(object):
+
+    """A stand-in for a spike recorder, holding the spikes of an EchoSpikingSimulator in an events' buffer."""
+
+    def __init__(self):
+        self.events_buffer = EventsBuffer()
+
+    def _update_events_buffer(self):
+        return self.events_buffer
+
+
+class EchoSpikingSimulator(object):
+
+    """A stand-in for a spiking simulator, which reads TVB's output
+       and writes back a transformation of it as TVB's input, for every synchronization time window."""
+
+    def __init__(self, folder, dt, delay=0.01):
+        self.dt = dt
+        self.delay = delay
+        self.reader = NPZReader(source=os.path.join(folder, "TVBtoTrans.npz"))
+        self.writer = NPZWriter(target=os.path.join(folder, "TransToTVB.npz"))
+        self.reader.configure()
+        self.writer.configure()
+        self.current_step = 0
+        self.spike_recorder = EchoSpikeRecorder()
+
+    def __call__(self, simulation_length):
+        n_steps = int(np.round(simulation_length / self.dt))
+        tvb_data = self.reader()
+        time.sleep(self.delay)
+        values = np.tanh(tvb_data[1].mean(axis=1, keepdims=True)) * np.ones((len(PROXY_INDS), n_steps))
+        self.writer.send([np.array([self.current_step + 1, self.current_step + n_steps]), values])
+        # One spike per proxy node and time step:
+        self.spike_recorder.events_buffer.append(
+            {"times": np.repeat(self.current_step + np.arange(1, n_steps + 1), len(PROXY_INDS)) * self.dt,
+             "senders": np.tile(PROXY_INDS, n_steps)})
+        self.current_step += n_steps
+
+
+def build_cosimulator(folder):
+    connectivity = Connectivity.from_file(CONFIGURED.DEFAULT_CONNECTIVITY_ZIP)
+    connectivity.number_of_regions = N_REGIONS
+    for attr in ["region_labels", "centres", "areas", "orientations", "hemispheres", "cortical"]:
+        setattr(connectivity, attr, getattr(connectivity, attr)[:N_REGIONS])
+    connectivity.weights = connectivity.weights[:N_REGIONS][:, :N_REGIONS]
+    connectivity.tract_lengths = connectivity.tract_lengths[:N_REGIONS][:, :N_REGIONS]
+    np.fill_diagonal(connectivity.weights, 0.0)
+    connectivity.configure()
+    # The initial history beyond the given initial conditions is random:
+    np.random.seed(0)
+    simulator = CoSimulatorSerial(model=WilsonCowan(), integrator=HeunDeterministic(dt=0.1),
+                                  connectivity=connectivity, monitors=(Raw(period=0.1),),
+                                  initial_conditions=0.1 * np.ones((1, 2, N_REGIONS, 1)),
+                                  simulation_length=28.0)
+    simulator.configure()
+    interface_builder = TVBRemoteInterfaceBuilder(tvb_cosimulator=simulator, proxy_inds=PROXY_INDS)
+    interface_builder.output_interfaces = \
+        [{"voi": np.array(["E"]), "sender": NPZWriter,
+          "sender_params": {"target": os.path.join(folder, "TVBtoTrans.npz")}}]
+    interface_builder.input_interfaces = \
+        [{"voi": np.array(["E"]), "receiver": NPZReader,
+          "receiver_params": {"source": os.path.join(folder, "TransToTVB.npz")}}]
+    interface_builder.configure()
+    simulator = interface_builder.build()
+    simulator.simulate_spiking_simulator = EchoSpikingSimulator(folder, simulator.integrator.dt)
+    simulator.configure()
+    return simulator
+
+
+def test_pipelined_cosimulation():
+    results = []
+    for pipelined in [False, True]:
+        simulator = build_cosimulator(tempfile.mkdtemp())
+        simulator.PRINT_PROGRESSION_MESSAGE = False
+        simulator.pipelined = pipelined
+        results.append(simulator.run()[0])
+        phase_times = simulator.phase_times
+        assert phase_times["spiking_simulator"] > 0.0
+        assert phase_times["tvb"] > 0.0
+        assert (phase_times["wait_spiking_simulator"] > 0.0) == pipelined
+    assert np.array_equal(results[0][0], results[1][0])
+    assert np.array_equal(results[0][1], results[1][1], equal_nan=True)
+
+
+def test_h5_streaming():
+    simulator = build_cosimulator(tempfile.mkdtemp())
+    simulator.PRINT_PROGRESSION_MESSAGE = False
+    expected = simulator.run()[0]
+    folder = tempfile.mkdtemp()
+    h5_path = os.path.join(folder, "results.h5")
+    simulator = build_cosimulator(folder)
+    simulator.PRINT_PROGRESSION_MESSAGE = False
+    spike_recorder = simulator.simulate_spiking_simulator.spike_recorder
+    with H5StreamWriter(h5_path, chunk_nbytes=2 ** 10) as writer:
+        time, data = simulator.run(h5_stream_writer=writer, h5_stream_devices={"E": spike_recorder})[0]
+        # The results are h5py.Datasets, appended at every synchronization step, which are sliced lazily:
+        assert isinstance(data, h5py.Dataset)
+        assert data.maxshape[0] is None
+        assert data.compression == "gzip"
+        assert data.chunks[0] < data.shape[0]
+        assert np.array_equal(time[10:20], expected[0][10:20])
+        assert np.array_equal(data[-5:], expected[1][-5:], equal_nan=True)
+        # Spikes' events are appended to one dimensional streams:
+        for i_step in range(3):
+            writer.append_events("spikes/E/0", {"times": i_step + np.arange(5.0), "senders": np.arange(5)})
+    with h5py.File(h5_path, "r") as h5_file:
+        assert h5_file["monitors/0"].attrs["Monitor"] == "Raw"
+        assert np.array_equal(h5_file["monitors/0/data"][()], expected[1], equal_nan=True)
+        assert np.array_equal(h5_file["spikes/E/0/senders"][()], np.tile(np.arange(5), 3))
+        assert h5_file["spikes/E/0/times"][-1] == 6.0
+        # The events of the streamed devices are appended at every synchronization step,
+        # without moving the devices' read cursors of new events:
+        assert spike_recorder.events_buffer.cursor == 0
+        for key, events in spike_recorder.events_buffer.events.items():
+            assert np.array_equal(h5_file["events/E/%s" % key][()], events)
+
+
+def test_profiling():
+    PROFILER.reset()
+    simulator = build_cosimulator(tempfile.mkdtemp())
+    simulator.PRINT_PROGRESSION_MESSAGE = False
+    simulator.run()
+    # Nothing is recorded when profiling is disabled:
+    assert PROFILER.number_of_records == 0
+    folder = tempfile.mkdtemp()
+    simulator = build_cosimulator(folder)
+    simulator.PRINT_PROGRESSION_MESSAGE = False
+    PROFILER.enable()
+    try:
+        simulator.run()
+    finally:
+        PROFILER.disable()
+    summary = PROFILER.summary()
+    n_synchronizations = summary["CoSimulatorSerial.simulate_spiking_simulator"]["calls"]
+    assert n_synchronizations == 3
+    assert summary["CoSimulator.run_for_synchronization_time"]["calls"] == n_synchronizations
+    assert summary["TVBReceiverInterfaces.__call__"]["nbytes"] > 0
+    assert summary["TVBOutputInterfaces.__call__"]["calls"] == n_synchronizations + 1
+    records = PROFILER.records
+    assert np.all(np.diff(records["step"]) >= 0)
+    with open(PROFILER.export(os.path.join(folder, "profiling.csv"))) as csv_file:
+        assert len(list(csv.DictReader(csv_file))) == PROFILER.number_of_records
+    with open(PROFILER.export(os.path.join(folder, "profiling.json"))) as json_file:
+        assert len(json.load(json_file)) == PROFILER.number_of_records
+    with open(PROFILER.export(os.path.join(folder, "profiling_trace.json.trace"))) as json_file:
+        assert len(json.load(json_file)["traceEvents"]) == PROFILER.number_of_records
+    PROFILER.reset()
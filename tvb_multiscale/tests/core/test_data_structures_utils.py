@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from tvb_multiscale.core.utils.data_structures_utils import filter_events
+
+
+def reference_filter_events(events, times=None, exclude_times=[]):
+
+    def in_fun(values):
+        if len(values) == 2 and not hasattr(values[0], "__len__"):
+            values = [values]
+        if np.all([hasattr(value, "__len__") for value in values]):
+            return lambda x: np.any([(start is None or x >= start) and (end is None or x <= end)
+                                     for start, end in values])
+        return lambda x: x in values
+
+    in_times = in_fun(times) if times else lambda x: True
+    in_exclude_times = in_fun(exclude_times) if exclude_times else lambda x: False
+    inds = np.array([in_times(time) and not in_exclude_times(time) for time in events["times"]], dtype="bool")
+    return dict([(key, val[inds]) for key, val in events.items()])
+
+
+def test_filter_events():
+    times = np.round(np.random.uniform(0.0, 100.0, 1000), 1)
+    events = {"senders": np.random.randint(0, 10, times.size)}
+    for sort in [True, False]:
+        events["times"] = np.sort(times) if sort else times
+        for filter_kwargs in [{},
+                              {"times": [10.0, 20.0]},
+                              {"times": [None, 20.0]},
+                              {"times": (50.0, None)},
+                              {"times": [(10.0, 20.0), (30.0, 40.0)]},
+                              {"times": events["times"][:100].tolist() + [1000.0]},
+                              {"exclude_times": [10.0, 90.0]},
+                              {"times": [(None, 80.0)], "exclude_times": [(10.0, 20.0), (30.0, 40.0)]},
+                              {"times": [10.0, 60.0], "exclude_times": events["times"][::3].tolist()}]:
+            expected = reference_filter_events(events, **filter_kwargs)
+            for sorted_times in [None, sort]:
+                filtered = filter_events(events, sorted_times=sorted_times, **filter_kwargs)
+                assert list(filtered.keys()) == list(events.keys())
+                for key in events.keys():
+                    assert np.array_equal(filtered[key], expected[key])
+    assert len(filter_events(events, variables=["times"], times=[0.0, 100.0])["times"]) == times.size
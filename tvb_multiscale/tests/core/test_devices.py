@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+import os
+import pickle
+import tempfile
+
+import numpy as np
+
+from tvb_multiscale.core.spiking_models.devices import EventsBuffer
+
+
+def random_events(n_events, t_start=0.0):
+    return {"times": t_start + np.sort(np.random.uniform(0.0, 1.0, n_events)),
+            "senders": np.random.randint(0, 100, n_events)}
+
+
+def concatenate_events(events_list):
+    return dict([(key, np.concatenate([events[key] for events in events_list])) for key in ["times", "senders"]])
+
+
+def test_events_buffer():
+    events_list = [random_events(n_events, t_start)
+                   for t_start, n_events in enumerate([0, 10, 1000, 1, 5000])]
+    all_events = concatenate_events(events_list)
+    for max_events_in_memory in [0, 2000]:
+        spill_folder = tempfile.mkdtemp()
+        events_buffer = EventsBuffer(max_events_in_memory=max_events_in_memory, spill_folder=spill_folder,
+                                     initial_capacity=4)
+        assert len(events_buffer.events["times"]) == 0
+        n_events = 0
+        views = []
+        for events in events_list:
+            assert events_buffer.append(events) == len(events["times"])
+            n_events += len(events["times"])
+            assert events_buffer.number_of_new_events == len(events["times"])
+            new_events = events_buffer.new_events()
+            assert events_buffer.number_of_new_events == 0
+            for key in ["times", "senders"]:
+                assert np.array_equal(new_events[key], events[key])
+            views.append(new_events)
+        assert events_buffer.number_of_events == n_events
+        assert events_buffer.events["senders"].dtype.kind == "i"
+        # Views returned before remain valid, after the buffer's arrays are reallocated or spilled:
+        for events, view in zip(events_list, views):
+            assert np.array_equal(view["times"], events["times"])
+        for key in ["times", "senders"]:
+            assert np.array_equal(events_buffer.events[key], all_events[key])
+            assert np.array_equal(events_buffer.get(5, 2000)[key], all_events[key][5:2000])
+        if max_events_in_memory:
+            assert events_buffer._n_in_memory <= max_events_in_memory
+            assert len(os.listdir(spill_folder)) > 0
+        # Pickling keeps the events:
+        events_buffer = pickle.loads(pickle.dumps(events_buffer))
+        assert np.array_equal(events_buffer.events["times"], all_events["times"])
+        events_buffer.reset()
+        assert events_buffer.number_of_events == 0
+        assert len(os.listdir(spill_folder)) == 0
+
+
+def test_events_buffer_drain():
+    events_buffer = EventsBuffer(max_events_in_memory=500, spill_folder=tempfile.mkdtemp(), initial_capacity=4)
+    all_events = random_events(2000)
+    events_buffer.append(dict([(key, val[:1500]) for key, val in all_events.items()]))
+    new_events = events_buffer.new_events()
+    # The events already read are drained, the ones spilled to files included:
+    assert events_buffer.drain() == 1500
+    assert len(os.listdir(events_buffer.spill_folder)) == 0
+    events_buffer.append(dict([(key, val[1500:]) for key, val in all_events.items()]))
+    assert events_buffer.number_of_events == 2000
+    assert events_buffer.number_of_new_events == 500
+    assert np.array_equal(new_events["times"], all_events["times"][:1500])
+    assert np.array_equal(events_buffer.events["times"], all_events["times"][1500:])
+    assert np.array_equal(events_buffer.new_events()["senders"], all_events["senders"][1500:])
+    assert events_buffer.drain() == 500
+    assert events_buffer.number_of_events == 2000
+    assert len(events_buffer.events["times"]) == 0
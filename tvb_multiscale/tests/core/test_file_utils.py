@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+
+import numpy as np
+
+from tvb_multiscale.core.utils.file_utils import \
+    read_nest_output_device_data_from_ascii_tail, read_nest_output_device_data_from_ascii_to_dict
+
+
+HEADER = "# NEST version: 3.3\n# RecordingBackendASCII version: 2\nsender\ttime_ms\tV_m\n"
+
+
+def nest_rows(senders, times, v_m):
+    return "".join(["%d\t%.3f\t%.3f\n" % row for row in zip(senders, times, v_m)])
+
+
+def test_nest_ascii_tail_reading():
+    filepath = os.path.join(tempfile.mkdtemp(), "spike_recorder-1-0.dat")
+    n_rows = 1000
+    senders = np.random.randint(1, 100, n_rows)
+    times = np.round(np.sort(np.random.uniform(0.0, 100.0, n_rows)), 3)
+    v_m = np.round(np.random.normal(-65.0, 5.0, n_rows), 3)
+    rows = nest_rows(senders, times, v_m)
+    # Nothing is read before the header is complete:
+    with open(filepath, "w") as file:
+        file.write(HEADER[:10])
+    events, offset = read_nest_output_device_data_from_ascii_tail(filepath)
+    assert len(events) == 0 and offset == 0
+    with open(filepath, "w") as file:
+        file.write(HEADER)
+    events, offset = read_nest_output_device_data_from_ascii_tail(filepath, offset)
+    assert len(events["times"]) == 0
+    # Append rows in chunks, splitting a row across writes:
+    all_events = []
+    for chunk in [rows[:1000], rows[1000:1001], rows[1001:len(rows) // 2], rows[len(rows) // 2:]]:
+        with open(filepath, "a") as file:
+            file.write(chunk)
+        events, offset = read_nest_output_device_data_from_ascii_tail(filepath, offset)
+        assert sorted(events.keys()) == ["V_m", "senders", "times"]
+        all_events.append(events)
+    assert offset == os.path.getsize(filepath)
+    for key, expected in zip(["senders", "times", "V_m"], [senders, times, v_m]):
+        assert np.allclose(np.concatenate([events[key] for events in all_events]), expected)
+    events = read_nest_output_device_data_from_ascii_to_dict(filepath, n_lines_to_skip=10, empty_file=True)
+    assert np.array_equal(events["senders"], senders[10:])
+    with open(filepath) as file:
+        assert file.read() == HEADER
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+
+import h5py
+import numpy as np
+
+from tvb_multiscale.core.tvb.io.h5_stream_writer import H5StreamWriter
+from tvb_multiscale.core.tvb.io.h5_reader import H5Reader
+
+
+def test_h5_stream_round_trip():
+    h5_path = os.path.join(tempfile.mkdtemp(), "streams.h5")
+    n_times = 100
+    times = 0.1 * np.arange(1, n_times + 1)
+    data = np.random.normal(size=(n_times, 2, 3, 1))
+    spikes = {"times": np.sort(np.random.uniform(0.0, 10.0, n_times)),
+              "senders": np.random.randint(0, 3, n_times)}
+    with H5StreamWriter(h5_path, chunk_nbytes=2 ** 8) as writer:
+        for i_time in range(0, n_times, 10):
+            writer.append_monitors_outputs([times[i_time:i_time + 10]], [data[i_time:i_time + 10]],
+                                           monitors_names=["Raw"])
+            writer.append_events("events/E", dict([(key, val[i_time:i_time + 10]) for key, val in spikes.items()]))
+        assert writer.stream_length("monitors/0/data") == n_times
+        assert writer.stream_length("events/E/times") == n_times
+    reader = H5Reader(h5_path)
+    try:
+        stream = reader.read_stream("monitors/0/data")
+        assert isinstance(stream, h5py.Dataset)
+        assert stream.shape == data.shape
+        assert np.array_equal(stream[-5:], data[-5:])
+        assert np.array_equal(reader.read_stream_slice("monitors/0/data", 5, 50, 3), data[5:50:3])
+        time, monitor_data = reader.read_monitor_outputs(0, 20, 30)
+        assert np.array_equal(time, times[20:30])
+        assert np.array_equal(monitor_data, data[20:30])
+        events = reader.read_events("events/E", 15, 25)
+        assert sorted(events.keys()) == ["senders", "times"]
+        for key, val in spikes.items():
+            assert np.array_equal(events[key], val[15:25])
+        assert np.array_equal(reader.read_events("events/E")["times"], spikes["times"])
+    finally:
+        reader.close()
+    assert reader.hfd5_source is None
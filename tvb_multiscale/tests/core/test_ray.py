@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+import pickle
+
+from tvb_multiscale.core.ray import client
+from tvb_multiscale.core.ray.server import RayServerBatch, RAY_SERVER_BATCH_METHODS
+
+
+class Served(RayServerBatch):
+
+    def __init__(self):
+        self.a = 1
+        self.b = 2
+
+    def add(self, x, y=0):
+        return self.a + x + y
+
+
+class RemoteMethod(object):
+
+    def __init__(self, server, method):
+        self.server = server
+        self.method = method
+
+    def remote(self, *args, **kwargs):
+        # Every remote call is an actor round-trip, executed at once here:
+        self.server.round_trips += 1
+        return self.method(*args, **kwargs)
+
+
+class FakeRayServer(object):
+
+    """A stand-in of a Ray actor handle, serving a Served instance in the same process."""
+
+    def __init__(self):
+        self.served = Served()
+        self.round_trips = 0
+        self._ray_method_signatures = dict([(name, None) for name in ["add"] + RAY_SERVER_BATCH_METHODS])
+        # Set to the instance, to override the __getattribute__ and __setattr__ of the stand-in, when explicitly called:
+        for name in ["__getattribute__", "__setattr__"] + list(self._ray_method_signatures.keys()):
+            self.__dict__[name] = RemoteMethod(self, getattr(self.served, name))
+
+
+class FakeRay(object):
+
+    @staticmethod
+    def get(refs):
+        return refs
+
+
+def test_ray_server_batch():
+    served = Served()
+    assert served._get_many(["a", "b"]) == [1, 2]
+    served._set_many([("a", 3), ("b", 4)])
+    assert (served.a, served.b) == (3, 4)
+    assert served._call_many([("a", None, None), ("add", (1, ), {"y": 2}), ("add", (), {"x": 0})]) == [3, 6, 3]
+
+
+def test_ray_client_batch(monkeypatch):
+    monkeypatch.setattr(client, "ray", FakeRay)
+    ray_server = FakeRayServer()
+    ray_client = client.RayClient(ray_server, FakeRay)
+    assert ray_client.get_many("a", "b") == {"a": 1, "b": 2}
+    assert ray_server.round_trips == 1
+    ray_client.set_many(a=3, b=4)
+    assert ray_server.round_trips == 2
+    with ray_client.pipeline() as pipeline:
+        pipeline.get("a")
+        pipeline.call("add", 1, y=2)
+    assert pipeline.results == [3, 6]
+    assert ray_server.round_trips == 3
+    # Cached attributes are read only once:
+    ray_client.cache_attributes("b")
+    assert ray_client.b == 4 and ray_client.get_many("a", "b") == {"a": 3, "b": 4}
+    assert ray_server.round_trips == 5
+    ray_client.invalidate_cache("b")
+    assert ray_client.b == 4
+    assert ray_server.round_trips == 6
+    # A client without an attributes' cache, e.g., unpickled into a bare instance, fails only for missing attributes:
+    bare_client = client.RayClient.__new__(client.RayClient)
+    try:
+        bare_client.a
+        assert False, "A bare RayClient without a ray_server read an attribute!"
+    except AttributeError:
+        pass
+    ray_client = pickle.loads(pickle.dumps(client.RayClient(ray_server, FakeRay)))
+    assert ray_client.a == 3
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from tvb_multiscale.core.interfaces.tvb import ray_interfaces
+from tvb_multiscale.core.interfaces.tvb.ray_interfaces import RayObjectStoreInterface
+from tvb_multiscale.core.tvb.cosimulator.cosimulator_ray import CoSimulatorParallelRay
+
+
+class FakeObjectRef(object):
+
+    def __init__(self, obj):
+        self.obj = obj
+
+
+class FakeRaylet(object):
+
+    ObjectRef = FakeObjectRef
+
+
+class FakeRay(object):
+
+    """A mock of the ray module, recording the objects put to the object store and the waited for ObjectRefs."""
+
+    _raylet = FakeRaylet
+
+    def __init__(self):
+        self.put_objects = []
+        self.wait_calls = []
+
+    def put(self, obj):
+        self.put_objects.append(obj)
+        return FakeObjectRef(obj)
+
+    def wait(self, refs, **kwargs):
+        self.wait_calls.append((refs, kwargs))
+        return refs, []
+
+
+def test_put_data_and_prefetch_refs(monkeypatch):
+    fake_ray = FakeRay()
+    monkeypatch.setattr(ray_interfaces, "ray", fake_ray)
+    store = RayObjectStoreInterface()
+    # Contiguous arrays are put as they are:
+    times = np.arange(10)
+    values = np.random.normal(size=(10, 2, 4))
+    refs = store.put_data([times, values])
+    assert fake_ray.put_objects[0] is times and fake_ray.put_objects[1] is values
+    assert [ref.obj for ref in refs] == fake_ray.put_objects
+    # Non contiguous arrays are copied to staging buffers, reused for the same shape and dtype:
+    store.put_data([times, values[:, :, ::2]])
+    staged = fake_ray.put_objects[-1]
+    assert staged.flags.c_contiguous and np.array_equal(staged, values[:, :, ::2])
+    store.put_data([times, (2 * values)[:, :, ::2]])
+    assert fake_ray.put_objects[-1] is staged and np.array_equal(staged, 2 * values[:, :, ::2])
+    # The spikes' arrays per proxy are not staged, neither as a list, nor as an object array:
+    spikes = [np.array([1.0, 2.0]), np.array([3.0])]
+    spikes_array = np.empty((2, ), dtype=object)
+    spikes_array[:] = spikes
+    store.put_data([times, spikes, spikes_array])
+    assert fake_ray.put_objects[-2] is spikes and fake_ray.put_objects[-1] is spikes_array
+    # Only ObjectRefs are prefetched, without blocking:
+    assert store.prefetch_refs([refs[0], None, refs[1]]) == refs
+    assert fake_ray.wait_calls[-1] == (refs, {"num_returns": 2, "timeout": 0, "fetch_local": True})
+    assert store.prefetch_refs(None) == []
+    assert len(fake_ray.wait_calls) == 1
+
+
+class FakeInterfaces(object):
+
+    def __init__(self, calls, name):
+        self.calls = calls
+        self.name = name
+
+    def prefetch(self):
+        self.calls.append("%s.prefetch" % self.name)
+
+
+class FakeSpikingSimulator(object):
+
+    is_running = False
+
+    def __init__(self, calls):
+        self.calls = calls
+
+    def RunLock(self, simulation_length, locks):
+        self.calls.append("spiking_simulator.RunLock")
+
+
+class FakeLog(object):
+
+    def info(self, *args):
+        pass
+
+
+class FakeIntegrator(object):
+
+    dt = 0.1
+
+
+class FakeCoSimulatorParallelRay(object):
+
+    """A mock of the attributes and methods used by CoSimulatorParallelRay.run_for_synchronization_time."""
+
+    _cosimulation_flag = True
+    n_tvb_steps_ran_since_last_synch = 10
+    current_step = 0
+    integrator = FakeIntegrator()
+    log = FakeLog()
+
+    def __init__(self):
+        self.calls = []
+        self.spiking_simulator = FakeSpikingSimulator(self.calls)
+        self.input_interfaces = FakeInterfaces(self.calls, "input_interfaces")
+
+    def send_cosim_coupling(self, cosimulation=True, outputs=[], block=False):
+        self.calls.append("send_cosim_coupling(block=%s)" % block)
+        return ["tvb_to_spikeNet_lock"]
+
+    def get_cosim_updates(self, cosimulation=True, block=False, cosim_updates=None):
+        self.calls.append("get_cosim_updates(block=%s)" % block)
+        return cosim_updates
+
+    def __call__(self, cosim_updates=None, **kwargs):
+        self.calls.append("simulate_tvb")
+        for _ in range(self.n_tvb_steps_ran_since_last_synch):
+            self.current_step += 1
+            yield [(self.current_step * self.integrator.dt, np.zeros((1, 1, 1)))]
+
+
+def test_cosimulator_ray_prefetch():
+    cosimulator = FakeCoSimulatorParallelRay()
+    ts, xs = [[]], [[]]
+    locks, steps = CoSimulatorParallelRay.run_for_synchronization_time(cosimulator, ts, xs, 0.0)
+    assert locks == ["tvb_to_spikeNet_lock"] and steps == 10 and len(ts[0]) == 10
+    # The remote transformers' outputs are prefetched while spikeNet integrates,
+    # i.e., after submitting its run, and before blocking to get the cosimulation updates for TVB:
+    assert cosimulator.calls == ["send_cosim_coupling(block=False)", "get_cosim_updates(block=False)",
+                                 "send_cosim_coupling(block=True)", "spiking_simulator.RunLock",
+                                 "input_interfaces.prefetch", "get_cosim_updates(block=True)", "simulate_tvb"]
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+
+from tvb.basic.profile import TvbProfile
+TvbProfile.set_profile(TvbProfile.LIBRARY_PROFILE)
+
+import numpy as np
+from pandas import Series
+
+from tvb_multiscale.core.data_analysis.spiking_network_analyser import SpikingNetworkAnalyser
+from tvb_multiscale.core.data_analysis.executors import data_to_shared_memory, data_from_shared_memory
+from tvb_multiscale.core.data_analysis.online_spiking_network_analyser import OnlineSpikingNetworkAnalyser
+from tvb_multiscale.core.spiking_models.devices import EventsBuffer
+
+
+POPULATIONS_REGIONS = {"E": ["cx", "th", "str"], "I": ["cx", "str"]}
+DURATION = 1000.0
+BINSIZE = 10.0
+
+
+def random_spikes_data():
+    np.random.seed(0)
+    return Series(dict([(pop, Series(dict([(reg, {"times": np.sort(np.random.uniform(0.0, DURATION, 500))})
+                                           for reg in regions])))
+                        for pop, regions in POPULATIONS_REGIONS.items()]))
+
+
+def test_native_spikes_correlations():
+    from quantities import ms
+    from neo.core import SpikeTrain
+    from elephant.conversion import BinnedSpikeTrain
+    from elephant.spike_train_correlation import correlation_coefficient, covariance
+
+    spikes_data = random_spikes_data()
+    analyser = SpikingNetworkAnalyser(start_time=0.0, end_time=DURATION, period=BINSIZE,
+                                      elephant=False, pyspike=False)
+    assert analyser.native_correlations
+    spikes_trains = [spikes["times"] for pop_spikes in spikes_data.values for spikes in pop_spikes.values]
+    # Both dense (many spikes per bin) and sparse binned spikes' counts:
+    for binsize in [BINSIZE, BINSIZE / 100]:
+        binned_spikes_counts = analyser.compute_binned_spikes_counts(spikes_trains, binsize=binsize)
+        assert binned_spikes_counts.shape == (len(spikes_trains), int(np.round(DURATION / binsize)))
+        assert binned_spikes_counts.sum() == np.sum([len(spikes) for spikes in spikes_trains])
+        # Compare with elephant:
+        binned_spikes_trains = BinnedSpikeTrain([SpikeTrain(spikes * ms, t_start=0.0 * ms, t_stop=DURATION * ms)
+                                                 for spikes in spikes_trains],
+                                                bin_size=binsize * ms, t_start=0.0 * ms, t_stop=DURATION * ms)
+        assert np.array_equal(binned_spikes_counts.toarray(), binned_spikes_trains.to_array())
+        for res_name, fun in zip(["spikes_correlation_coefficient", "spikes_covariance"],
+                                 [correlation_coefficient, covariance]):
+            for binary in [False, True]:
+                assert np.allclose(analyser._compute_native_spikes_correlation(binned_spikes_counts, res_name,
+                                                                               binary=binary),
+                                   fun(binned_spikes_trains, binary=binary), equal_nan=True)
+
+    # Populations' and regions' results:
+    results = analyser.compute_spikes_correlations(
+        spikes_data, computations_methods=["spikes_correlation_coefficient", "spikes_covariance"],
+        bin_kwargs={"binsize": BINSIZE},
+        data_method=lambda spikes, **kwargs: {"spikes": spikes, "data_name": "spikes"})
+    expected = correlation_coefficient(
+        BinnedSpikeTrain([SpikeTrain(spikes * ms, t_start=0.0 * ms, t_stop=DURATION * ms) for spikes in spikes_trains],
+                         bin_size=BINSIZE * ms, t_start=0.0 * ms, t_stop=DURATION * ms))
+    corr = results["spikes_correlation_coefficient"]
+    assert corr.dims == ("Population_i", "Population_j", "Region_i", "Region_j")
+    assert list(corr.coords["Region_i"].values) == ["cx", "th", "str"]
+    assert np.allclose(corr.loc["E", "I", "th", "str"], expected[1, 4])
+    assert np.allclose(corr.loc["I", "I", "str", "cx"], expected[4, 3])
+    # Missing populations' regions are NaN:
+    assert np.all(np.isnan(corr.loc["I", :, "th", :]))
+    assert np.sum(np.isfinite(corr.values)) == len(spikes_trains) ** 2
+    assert results["spikes_covariance"].shape == corr.shape
+
+
+def test_executors():
+    spikes_data = random_spikes_data()
+    shared_arrays = []
+    shared_data = data_to_shared_memory(spikes_data["E"], shared_arrays, min_nbytes=1024)
+    assert len(shared_arrays) == len(POPULATIONS_REGIONS["E"])
+    for reg, spikes in data_from_shared_memory(shared_data).items():
+        assert np.array_equal(spikes["times"], spikes_data["E"][reg]["times"])
+    for shared_array in shared_arrays:
+        shared_array.unlink()
+    results = {}
+    for executor in ["serial", "thread", "process"]:
+        analyser = SpikingNetworkAnalyser(start_time=0.0, end_time=DURATION, period=BINSIZE,
+                                          elephant=False, pyspike=False, executor=executor, max_workers=2)
+        results[executor] = analyser.compute_spikes_measures(
+            spikes_data, [], [analyser.compute_mean_rate, analyser.compute_rate],
+            data_method=lambda spikes, **kwargs: {"spikes": spikes["times"], "data_name": "spikes",
+                                                  "number_of_neurons": 10})
+    for executor in ["thread", "process"]:
+        for res_name in ["mean_rate", "rate"]:
+            assert results[executor][res_name].identical(results["serial"][res_name])
+
+
+class EventsRecorder(object):
+
+    """A stand-in for a recording device, which records given events up to the simulation time."""
+
+    def __init__(self, events, number_of_neurons=10):
+        self.events_to_record = events
+        self.number_of_neurons = number_of_neurons
+        self.events_buffer = EventsBuffer()
+
+    def simulate(self, t_start, t_stop):
+        inds = np.logical_and(self.events_to_record["times"] >= t_start, self.events_to_record["times"] < t_stop)
+        self.events_buffer.append(dict([(key, val[inds]) for key, val in self.events_to_record.items()]))
+
+    def _update_events_buffer(self):
+        return self.events_buffer
+
+    @property
+    def events(self):
+        return self.events_buffer.events
+
+    def get_new_events(self):
+        return self.events_buffer.new_events()
+
+
+def test_online_analyser():
+    spikes_data = random_spikes_data()
+    spikes_devices = Series(dict([(pop, Series(dict([(reg, EventsRecorder(spikes)) for reg, spikes in pop_spikes.items()])))
+                                  for pop, pop_spikes in spikes_data.items()]))
+    voltages = {"times": np.repeat(np.arange(0.0, DURATION, 0.1), 2), "senders": np.tile([1, 2], 10000),
+                "V_m": np.random.normal(size=(20000,))}
+    continuous_devices = Series({"E": Series({"cx": EventsRecorder(voltages)})})
+    analyser = OnlineSpikingNetworkAnalyser(start_time=0.0, period=BINSIZE, drain_devices=True)
+    analyser.subscribe(spikes_devices, continuous_devices)
+    devices = [device for pop_devices in spikes_devices.values for device in pop_devices.values] + \
+              [continuous_devices["E"]["cx"]]
+    # Some of the devices' new events are also read by another reader, e.g., an interface:
+    interfaced_devices = devices[::2]
+    for t in np.arange(0.0, DURATION, 95.0):
+        t_stop = min(t + 95.0, DURATION)
+        for device in devices:
+            device.simulate(t, t_stop)
+        analyser.update(t_stop)
+        for device in interfaced_devices:
+            times = device.events_to_record["times"]
+            assert np.array_equal(device.get_new_events()["times"], times[(times >= t) & (times < t_stop)])
+    for device in devices:
+        assert device.events_buffer.number_of_events == len(device.events_to_record["times"])
+        if device in interfaced_devices:
+            # The events consumed by all readers, up to the last update of the analyser,
+            # have been drained from the devices' buffers:
+            times = device.events_to_record["times"]
+            assert np.array_equal(device.events_buffer.events["times"], times[times >= t])
+        else:
+            # The new events of the devices are not consumed by the analyser:
+            assert device.events_buffer.number_of_new_events == len(device.events_to_record["times"])
+            assert np.array_equal(device.events_buffer.events["times"], device.events_to_record["times"])
+
+    # Compare with the analysis of all the events:
+    spikes_trains = [spikes["times"] for pop_spikes in spikes_data.values for spikes in pop_spikes.values]
+    offline_analyser = SpikingNetworkAnalyser(start_time=0.0, end_time=DURATION, period=BINSIZE,
+                                              elephant=False, pyspike=False)
+    binned_spikes_counts = offline_analyser.compute_binned_spikes_counts(spikes_trains, binsize=BINSIZE)
+    results = analyser.get_results()
+    assert np.allclose(results["mean_rate"].loc["E", "th"], 1000.0 * len(spikes_data["E"]["th"]["times"]) / DURATION / 10)
+    assert np.isnan(results["mean_rate"].loc["I", "th"])
+    rates = results["mean_rate_time_series"]
+    assert rates.dims == ("Time", "Population", "Region")
+    assert np.allclose(rates.loc[:, "I", "str"].values, 100.0 * binned_spikes_counts[4].toarray().ravel() / 10)
+    for res_name, res in zip(["spikes_correlation_coefficient", "spikes_covariance"],
+                             [results["spikes_correlation_coefficient"], analyser.get_spikes_correlations("covariance")]):
+        expected = offline_analyser._compute_native_spikes_correlation(binned_spikes_counts, res_name)
+        assert np.allclose(res.loc["E", "I", "th", "str"], expected[1, 4])
+        assert np.allclose(res.loc["I", "E", "cx", "cx"], expected[3, 0])
+    assert np.allclose(results["mean_field"].loc["V_m", "cx", "E"], np.mean(voltages["V_m"]))
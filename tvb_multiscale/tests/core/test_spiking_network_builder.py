@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+
+from tvb.basic.profile import TvbProfile
+TvbProfile.set_profile(TvbProfile.LIBRARY_PROFILE)
+
+import os
+import tempfile
+from collections import OrderedDict
+
+import numpy as np
+
+from tvb_multiscale.core.spiking_models.builders.base import SpikingNetworkBuilder
+from tvb_multiscale.core.spiking_models.builders.templates import tvb_weight, scale_tvb_delay
+
+
+class Population(object):
+
+    def __init__(self, label):
+        self.label = label
+
+
+class Brain(OrderedDict):
+
+    """A stand-in for a SpikingBrain, indexed by region label or position."""
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            return list(self.values())[key]
+        return super(Brain, self).__getitem__(key)
+
+
+class RecordingBuilder(SpikingNetworkBuilder):
+
+    """A stand-in for a spiking simulator specific builder, which records the requested populations and connections."""
+
+    def __init__(self, spiking_nodes_inds, populations_labels, tvb_serial_sim=None):
+        super(RecordingBuilder, self).__init__(tvb_serial_sim=tvb_serial_sim, spiking_nodes_inds=spiking_nodes_inds)
+        self.spiking_nodes_inds = np.unique(spiking_nodes_inds)
+        self._spiking_brain = Brain([(node, OrderedDict([(pop, Population("%s%d" % (pop, node)))
+                                                         for pop in populations_labels]))
+                                     for node in self.spiking_nodes_inds])
+        self.built_populations = []
+        self.connections = []
+
+    def build_spiking_region_node(self, label="", input_node=None, *args, **kwargs):
+        return OrderedDict()
+
+    def build_spiking_population(self, label, model, brain_region, size, params):
+        self.built_populations.append((label, model, brain_region, size, params))
+        return Population("%s%s" % (label, brain_region))
+
+    def set_synapse(self, syn_model, weight, delay, receptor_type, params=dict()):
+        return {"synapse_model": syn_model, "weight": weight, "delay": delay, "receptor_type": receptor_type}
+
+    def connect_two_populations(self, source, src_inds_fun, target, trg_inds_fun, conn_params, synapse_params):
+        self.connections.append((source.label, target.label, synapse_params["weight"],
+                                 synapse_params["delay"], synapse_params["receptor_type"]))
+
+
+def test_connect_spiking_region_nodes():
+    np.random.seed(0)
+    n_regions = 10
+    tvb_weights = np.random.uniform(size=(n_regions, n_regions))
+    tvb_delays = np.random.uniform(1.0, 10.0, size=(n_regions, n_regions))
+    builder = RecordingBuilder([7, 2, 5, 3], ["E", "I"])
+    builder._nodes_connections = [
+        {"source": "E", "target": ["E", "I"], "synapse_model": "static_synapse", "conn_spec": {},
+         "source_nodes": np.array([2, 3, 5]), "target_nodes": np.array([3, 5, 7]),
+         "source_neurons": None, "target_neurons": None,
+         # Functions that can be evaluated for all pairs of nodes at once...
+         "weight": lambda source_node, target_node: tvb_weight(source_node, target_node, tvb_weights),
+         "delay": lambda source_node, target_node: scale_tvb_delay(source_node, target_node, tvb_delays, 2.0),
+         # ...or only pair by pair:
+         "receptor_type": lambda source_node, target_node: [1, 2] if source_node < target_node else 0}]
+    builder.connect_spiking_region_nodes()
+    expected = [("E%d" % source_node, "%s%d" % (pop, target_node),
+                 tvb_weights[target_node, source_node], 2.0 * tvb_delays[target_node, source_node],
+                 [1, 2] if source_node < target_node else 0)
+                for pop in ["E", "I"] for source_node in [2, 3, 5] for target_node in [3, 5, 7]
+                if source_node != target_node]
+    assert builder.connections == expected
+    stats = builder.build_stats["connect_spiking_region_nodes"]
+    assert stats["populations_pairs"] == stats["connect_calls"] == len(expected)
+    assert np.array_equal(builder._spiking_nodes_positions([2, 7, 5]), [0, 3, 2])
+    try:
+        builder._spiking_nodes_positions([4])
+        raise AssertionError("Region 4 is not a spiking region node!")
+    except ValueError:
+        pass
+
+
+N_WEIGHT_CALLS = [0]
+
+
+def test_build_cache():
+    np.random.seed(0)
+    n_regions = 6
+    tvb_serial_sim = {"connectivity.weights": np.random.uniform(size=(n_regions, n_regions)),
+                      "connectivity.delays": np.random.uniform(1.0, 10.0, size=(n_regions, n_regions)),
+                      "connectivity.region_labels": np.array(["r%d" % reg for reg in range(n_regions)]),
+                      "connectivity.number_of_regions": n_regions}
+    build_cache_dir = tempfile.mkdtemp()
+
+    def weight(source_node, target_node):
+        N_WEIGHT_CALLS[0] += 1
+        return tvb_weight(source_node, target_node, tvb_serial_sim["connectivity.weights"])
+
+    def build(scale=1.0, E_params={"V_th": -50.0}):
+        builder = RecordingBuilder([1, 2, 4], ["E", "I"], tvb_serial_sim)
+        builder.build_cache_dir = build_cache_dir
+        builder.scale = scale
+        builder.E_params = E_params
+        builder.populations = [{"label": "E", "model": "iaf"}, {"label": "I", "model": "iaf", "nodes": [2]}]
+        builder._populations = [{"label": "E", "model": "iaf", "nodes": builder.spiking_nodes_inds,
+                                 "scale": lambda node: scale * (node + 1), "params": lambda node: builder.E_params},
+                                {"label": "I", "model": "iaf", "nodes": np.array([2]),
+                                 "scale": lambda node: 0.5, "params": lambda node: {}}]
+        builder.populations_connections = [{"source": "E", "target": "I", "nodes": [2], "weight": 2.0}]
+        builder._populations_connections = [
+            {"source": "E", "target": ["E", "I"], "nodes": np.array([2]), "synapse_model": "static_synapse",
+             "conn_spec": {}, "source_neurons": None, "target_neurons": None,
+             "weight": lambda node: 2.0, "delay": lambda node: 1.0, "receptor_type": lambda node: 0,
+             "params": lambda node: {}}]
+        builder.nodes_connections = [{"source": "E", "target": "E", "weight": weight}]
+        builder._nodes_connections = [
+            {"source": "E", "target": "E", "synapse_model": "static_synapse", "conn_spec": {},
+             "source_nodes": builder.spiking_nodes_inds, "target_nodes": builder.spiking_nodes_inds,
+             "source_neurons": None, "target_neurons": None,
+             "weight": weight, "delay": lambda source_node, target_node: 3.0,
+             "receptor_type": lambda source_node, target_node: 0}]
+        builder._build_stats = OrderedDict()
+        builder.build_spiking_brain()
+        return builder
+
+    builder = build()
+    assert builder.build_stats["build_cache"]["misses"] == 1
+    assert len(os.listdir(build_cache_dir)) == 1
+    assert ("I", "iaf", "r2", 50, {}) in builder.built_populations
+    assert len(builder.connections) == 2 + 6
+    n_weight_calls = N_WEIGHT_CALLS[0]
+    # The same configuration replays the cached tables, without resolving them again:
+    cached_builder = build()
+    assert cached_builder.build_stats["build_cache"]["hits"] == 1
+    assert N_WEIGHT_CALLS[0] == n_weight_calls
+    assert cached_builder.built_populations == builder.built_populations
+    assert cached_builder.connections == builder.connections
+    # A different configuration is resolved and cached anew:
+    assert build(scale=2.0).build_stats["build_cache"]["misses"] == 1
+    assert len(os.listdir(build_cache_dir)) == 2
+    # ...and so is a configuration of different dictionary attributes, which the functions might read:
+    builder = build(E_params={"V_th": -55.0, "tau": (10.0, 20.0)})
+    assert builder.build_stats["build_cache"]["misses"] == 1
+    assert ("E", "iaf", "r1", 200, {"V_th": -55.0, "tau": (10.0, 20.0)}) in builder.built_populations
+    assert len(os.listdir(build_cache_dir)) == 3
+    # The cached tables are loaded without unpickling any objects:
+    cached_builder = build(E_params={"V_th": -55.0, "tau": (10.0, 20.0)})
+    assert cached_builder.build_stats["build_cache"]["hits"] == 1
+    assert cached_builder.built_populations == builder.built_populations
+    for filename in os.listdir(build_cache_dir):
+        with np.load(os.path.join(build_cache_dir, filename), allow_pickle=False) as npz:
+            assert np.all([npz[key].dtype.kind != "O" for key in npz.files])
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+
+from tvb.basic.profile import TvbProfile
+TvbProfile.set_profile(TvbProfile.LIBRARY_PROFILE)
+
+import numpy as np
+
+from tvb.simulator.integrators import EulerDeterministic, HeunDeterministic
+
+from tvb_multiscale.core.interfaces.base.transformers.models.elephant import RatesToSpikesElephantPoisson, \
+    ElephantSpikesHistogram, ElephantSpikesHistogramRate, ElephantSpikesRate
+from tvb_multiscale.core.interfaces.base.transformers.models.poisson import \
+    RatesToSpikesPoisson, RatesToSpikesPoissonSingleInteraction, RatesToSpikesPoissonMultipleInteraction
+from tvb_multiscale.core.interfaces.base.transformers.models.histogram import \
+    SpikesHistogram, SpikesHistogramRate, SpikesRate
+from tvb_multiscale.core.interfaces.base.transformers.models.integration import LinearIntegrationRate
+
+
+DT = 0.1
+N_STEPS = 100
+RATES = np.array([[50.0] * (N_STEPS // 2) + [150.0] * (N_STEPS // 2),
+                  [10.0] * N_STEPS,
+                  [0.0] * N_STEPS])
+NUMBER_OF_NEURONS = np.array([2000, 1000, 10])
+
+
+def compute_spiketrains(transformer_class, **kwargs):
+    transformer = transformer_class(dt=DT, number_of_neurons=NUMBER_OF_NEURONS, **kwargs)
+    transformer.input_buffer = RATES
+    transformer.configure()
+    return transformer(time=np.arange(1, N_STEPS + 1))[1]
+
+
+def mean_rates(spiketrains):
+    # spike counts in a window of N_STEPS * DT ms -> rates in Hz
+    return np.array([np.mean([len(spiketrain) for spiketrain in proxy_spiketrains])
+                     for proxy_spiketrains in spiketrains]) / (N_STEPS * DT / 1000)
+
+
+def test_poisson_reproducibility():
+    for transformer_class in [RatesToSpikesPoisson,
+                              RatesToSpikesPoissonSingleInteraction, RatesToSpikesPoissonMultipleInteraction]:
+        spiketrains1 = compute_spiketrains(transformer_class, random_seed=0)
+        spiketrains2 = compute_spiketrains(transformer_class, random_seed=0)
+        assert len(spiketrains1) == len(NUMBER_OF_NEURONS)
+        for proxy_spiketrains1, proxy_spiketrains2, n_neurons in \
+                zip(spiketrains1, spiketrains2, NUMBER_OF_NEURONS):
+            assert len(proxy_spiketrains1) == n_neurons
+            for spiketrain1, spiketrain2 in zip(proxy_spiketrains1, proxy_spiketrains2):
+                assert np.array_equal(spiketrain1, spiketrain2)
+
+
+def test_poisson_statistics():
+    expected_rates = RATES.mean(axis=1)
+    elephant_transformer = RatesToSpikesElephantPoisson(dt=DT, number_of_neurons=NUMBER_OF_NEURONS,
+                                                        input_buffer=RATES, input_time=np.arange(1, N_STEPS + 1))
+    elephant_transformer.configure()
+    elephant_rates = mean_rates(elephant_transformer._compute(RATES))
+    for refractory_period in [0.0, 2.0]:
+        for transformer_class in [RatesToSpikesPoisson, RatesToSpikesPoissonSingleInteraction]:
+            spiketrains = compute_spiketrains(transformer_class,
+                                              refractory_period=refractory_period, random_seed=0)
+            rates = mean_rates(spiketrains)
+            assert np.allclose(rates, expected_rates, rtol=0.2)
+            assert np.allclose(rates, elephant_rates, rtol=0.2, atol=1.0)
+            all_spikes = np.concatenate(spiketrains[0])
+            assert all_spikes.min() >= 0.0 and all_spikes.max() <= N_STEPS * DT
+            # The rate doubles in the second half of the window:
+            assert np.mean(all_spikes < N_STEPS * DT / 2) < 0.35
+            for spiketrain in spiketrains[0]:
+                assert np.all(np.diff(spiketrain) >= 0.0)
+            if refractory_period and transformer_class == RatesToSpikesPoisson:
+                assert np.all(np.concatenate([np.diff(spiketrain)
+                                              for spiketrain in spiketrains[0]]) >= refractory_period)
+
+
+def spikes_buffer(spikes):
+    buffer = np.empty((len(spikes),), dtype=object)
+    for iP, proxy_spikes in enumerate(spikes):
+        buffer[iP] = proxy_spikes
+    return buffer
+
+
+def test_spikes_to_rates_vs_elephant():
+    spikes = spikes_buffer([np.sort(np.random.uniform(0.0, N_STEPS * DT, 100)),
+                            np.array([]),
+                            np.array([0.0, 0.3, 0.3, N_STEPS * DT])])
+    for elephant_class, transformer_class in zip([ElephantSpikesHistogram, ElephantSpikesHistogramRate,
+                                                  ElephantSpikesRate],
+                                                 [SpikesHistogram, SpikesHistogramRate, SpikesRate]):
+        rates = []
+        for this_class in [elephant_class, transformer_class]:
+            transformer = this_class(dt=DT, input_buffer=spikes)
+            transformer.configure()
+            rates.append(transformer(time=np.arange(1, N_STEPS + 1))[1])
+        assert rates[1].shape == (len(spikes), N_STEPS)
+        assert np.allclose(rates[0], rates[1], rtol=1e-3, atol=1e-3)
+
+
+def test_spikes_rate_continuity():
+    spikes = [np.sort(np.random.uniform(0.0, N_STEPS * DT, 500)) for _ in range(2)]
+    n_windows = 10
+    window_steps = N_STEPS // n_windows
+    window = window_steps * DT
+    transformer = SpikesRate(dt=DT, sigma=5 * DT, center_kernel=False)
+    transformer.configure()
+    rates = []
+    for iW in range(n_windows):
+        window_spikes = [proxy_spikes[np.logical_and(proxy_spikes >= iW * window,
+                                                     proxy_spikes < (iW + 1) * window)]
+                         for proxy_spikes in spikes]
+        rates.append(transformer(data=spikes_buffer(window_spikes),
+                                 time=np.arange(iW * window_steps + 1, (iW + 1) * window_steps + 1))[1])
+    transformer = SpikesRate(dt=DT, sigma=5 * DT, center_kernel=False)
+    transformer.configure()
+    assert np.allclose(np.concatenate(rates, axis=1),
+                       transformer(data=spikes_buffer(spikes), time=np.arange(1, N_STEPS + 1))[1])
+
+
+def test_linear_integration():
+    rates = np.random.uniform(0.0, 100.0, (3, N_STEPS))
+    for integrator in [EulerDeterministic, HeunDeterministic]:
+        outputs = []
+        for linear_integration in [True, False]:
+            transformer = LinearIntegrationRate(dt=DT, integrator=integrator(dt=DT),
+                                                state=np.array([[1.0, 2.0, 3.0]]),
+                                                linear_integration=linear_integration)
+            transformer.configure()
+            # Integrate in two windows, to test for the continuation from the last state:
+            outputs.append(np.concatenate([transformer(data=rates, time=np.arange(1, N_STEPS + 1))[1],
+                                           transformer(data=rates, time=np.arange(N_STEPS + 1, 2 * N_STEPS + 1))[1]],
+                                          axis=1))
+        assert outputs[0].shape == (3, 2 * N_STEPS, 1)
+        assert np.allclose(outputs[0], outputs[1])
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+from tvb.basic.profile import TvbProfile
+TvbProfile.set_profile(TvbProfile.LIBRARY_PROFILE)
+
+import numpy as np
+
+from tvb_multiscale.core.interfaces.tvb.interfaces import TVBInputInterface, TVBInputInterfaces
+
+
+SIMULATOR_VOI = np.array([0, 1])
+SIMULATOR_PROXY_INDS = np.array([0, 1, 3])
+N_STEPS = 5
+GOOD_SHAPE = (N_STEPS, len(SIMULATOR_VOI), len(SIMULATOR_PROXY_INDS), 1)
+
+
+def build_interfaces():
+    interfaces = TVBInputInterfaces(
+        interfaces=[TVBInputInterface(voi=np.array([0]), voi_labels=np.array(["E"]), proxy_inds=np.array([3, 1])),
+                    TVBInputInterface(voi=np.array([1, 0]), voi_labels=np.array(["I", "E"]), proxy_inds=np.array([0])),
+                    TVBInputInterface(voi=np.array([1]), voi_labels=np.array(["I"]), proxy_inds=np.array([1, 3]))])
+    interfaces.configure()
+    interfaces.set_local_indices(SIMULATOR_VOI, SIMULATOR_PROXY_INDS)
+    return interfaces
+
+
+def test_cosim_updates():
+    interfaces = build_interfaces()
+    for start_step in [N_STEPS + 1, 2 * N_STEPS, 3 * N_STEPS + 3]:
+        time_steps = np.array([start_step, start_step + N_STEPS - 1])
+        # Data of shape (proxy, time, voi):
+        input_datas = [[time_steps.copy(), np.random.normal(size=(len(interface.proxy_inds),
+                                                                  N_STEPS, len(interface.voi)))]
+                       for interface in interfaces.interfaces]
+        expected = np.full(GOOD_SHAPE, np.nan)
+        for interface, (_, values) in zip(interfaces.interfaces, input_datas):
+            voi_inds = [list(SIMULATOR_VOI).index(voi) for voi in interface.voi]
+            proxy_inds = [list(SIMULATOR_PROXY_INDS).index(proxy) for proxy in interface.proxy_inds]
+            expected[:, np.array(voi_inds)[:, None], np.array(proxy_inds)[None, :], 0] = \
+                np.transpose(values, (1, 2, 0))
+        steps, cosim_updates = interfaces([[data[0], data[1].copy()] for data in input_datas], GOOD_SHAPE)
+        assert interfaces.any_updates_received and interfaces.all_updates_received
+        assert np.array_equal(steps, np.arange(start_step, start_step + N_STEPS))
+        assert np.array_equal(cosim_updates, expected)
+    # Missing data of an interface:
+    interfaces(input_datas[:1] + [None, input_datas[2]], GOOD_SHAPE)
+    assert interfaces.any_updates_received and not interfaces.all_updates_received
+    interfaces([None] * 3, GOOD_SHAPE)
+    assert not interfaces.any_updates_received
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+from ANNarchy import SpikeSourceArray
+
+from tvb_multiscale.tvb_annarchy.annarchy_models.devices import ANNarchySpikeSourceArray
+
+
+class FakeSpikeSourceArray(SpikeSourceArray):
+
+    """A SpikeSourceArray of spikes' times' lists, not created in an ANNarchy network, recording the set calls."""
+
+    def __init__(self, spike_times):
+        # Bypass the attributes' handling of ANNarchy populations:
+        self.__dict__.update({"name": "FakeSpikeSourceArray", "size": len(spike_times),
+                              "init_spike_times": [list(spikes) for spikes in spike_times],
+                              "spike_times": [list(spikes) for spikes in spike_times],
+                              "get_calls": 0, "set_calls": []})
+
+    def get(self, name):
+        self.get_calls += 1
+        return getattr(self, name)
+
+    def set(self, values_dict):
+        self.set_calls.append(values_dict)
+        self.__dict__.update(values_dict)
+
+    def reset(self):
+        self.spike_times = [list(spikes) for spikes in self.init_spike_times]
+
+
+class FakeANNarchy(object):
+
+    """A mock of the ANNarchy calls of the devices."""
+
+    def __init__(self, populations, time=0.0):
+        self.time = time
+        self.Global = type("Global", (object, ), {"_network": [{"populations": populations}]})
+
+    def get_time(self):
+        return self.time
+
+
+def test_spike_source_array_add_spikes():
+    device = FakeSpikeSourceArray([[0.5, 3.0], [2.0], []])
+    annarchy_instance = FakeANNarchy([device], time=1.0)
+    source = ANNarchySpikeSourceArray(device, annarchy_instance)
+    # A sequence of spikes' times is added to all neurons, and the past spikes are pruned:
+    source.add_spikes([1.5, 2.5])
+    assert device.spike_times == [[3.0, 1.5, 2.5], [2.0, 1.5, 2.5], [1.5, 2.5]]
+    source.add_spikes([[2.2], [], [1.2, 1.1]], sort=True)
+    assert device.spike_times == [[1.5, 2.2, 2.5, 3.0], [1.5, 2.0, 2.5], [1.1, 1.2, 1.5, 2.5]]
+    # The pending spikes are read from the device only once:
+    assert device.get_calls == 1
+    annarchy_instance.time = 2.1
+    source.add_spikes([[4.0], [], []])
+    assert device.spike_times == [[2.2, 2.5, 3.0, 4.0], [2.5], [2.5]]
+    # Spikes in the past, after the time shift, are not set:
+    n_calls = len(device.set_calls)
+    source.add_spikes([[0.5], [1.0], []], time_shift=1.0)
+    assert len(device.set_calls) == n_calls
+    source.add_spikes([], time_shift=1.0)
+    assert len(device.set_calls) == n_calls
+    source.add_spikes([[0.5], [1.5], []], time_shift=1.0)
+    assert device.spike_times == [[2.2, 2.5, 3.0, 4.0], [2.5, 2.5], [2.5]]
+    # Setting the spikes' times, or resetting, invalidates the pending spikes:
+    source.Set({"spike_times": [[5.0], [], []]})
+    source.add_spikes([6.0])
+    assert device.spike_times == [[5.0, 6.0], [6.0], [6.0]]
+    assert device.get_calls == 2
+    source.reset()
+    source.add_spikes([6.0])
+    assert device.spike_times == [[3.0, 6.0], [6.0], [6.0]]
+    assert device.get_calls == 3
+    try:
+        source.add_spikes([[1.0], [2.0]])
+        assert False, "Adding two spikes' times' sequences to a spike source array of three neurons did not fail!"
+    except ValueError:
+        pass
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from tvb_multiscale.tvb_nest.config import CONFIGURED, initialize_logger
+from tvb_multiscale.tvb_nest.nest_models.builders.base import NESTNetworkBuilder
+from tvb_multiscale.tests.tvb_nest.test_devices import FakeNodeCollection
+
+
+class FakePopulation(object):
+
+    def __init__(self, label, gids):
+        self.label = label
+        self._nodes = FakeNodeCollection([{"global_id": gid} for gid in gids])
+
+
+class FakeNEST(object):
+
+    """A mock of the NEST Connect calls of the builder."""
+
+    def __init__(self):
+        self.connect_calls = []
+
+    def Connect(self, pre, post, conn_spec, syn_spec):
+        self.connect_calls.append((pre, post, conn_spec, syn_spec))
+
+
+def test_connect_populations_pairs_in_bulk():
+    nest_instance = FakeNEST()
+    builder = NESTNetworkBuilder(spiking_simulator=nest_instance, config=CONFIGURED,
+                                 logger=initialize_logger(__name__, config=CONFIGURED))
+    pop_a, pop_b, pop_c = FakePopulation("A", [1, 2]), FakePopulation("B", [3, 4, 5]), FakePopulation("C", [6])
+    # All connections are created with a single array based Connect call per receptor type:
+    n_calls = builder.connect_populations_pairs([pop_a, pop_b, pop_c], None, [pop_b, pop_c, pop_a], None,
+                                                {"rule": "all_to_all"}, "static_synapse",
+                                                [1.0, 2.0, 3.0], [1.0, 1.5, 2.0], [1, [1, 2], 2])
+    assert n_calls == 2
+    assert len(nest_instance.connect_calls) == 2
+    # The expected sources, targets, weights and delays per receptor type:
+    expected = {1: ([1, 1, 1, 2, 2, 2, 3, 4, 5], [3, 4, 5, 3, 4, 5, 6, 6, 6],
+                    [1.0] * 6 + [2.0] * 3, [1.0] * 6 + [1.5] * 3),
+                2: ([3, 4, 5, 6, 6], [6, 6, 6, 1, 2], [2.0] * 3 + [3.0] * 2, [1.5] * 3 + [2.0] * 2)}
+    for pre, post, conn_spec, syn_spec in nest_instance.connect_calls:
+        receptor = syn_spec["receptor_type"][0]
+        sources, targets, weights, delays = expected[receptor]
+        assert conn_spec == {"rule": "one_to_one"}
+        assert syn_spec["synapse_model"] == "static_synapse"
+        assert np.array_equal(pre, sources)
+        assert np.array_equal(post, targets)
+        assert np.array_equal(syn_spec["weight"], weights)
+        assert np.array_equal(syn_spec["delay"], delays)
+        assert np.all(syn_spec["receptor_type"] == receptor)
+    # one_to_one connections between populations of the same size only:
+    nest_instance.connect_calls = []
+    pop_d = FakePopulation("D", [7, 8, 9])
+    assert builder.connect_populations_pairs([pop_b, pop_c], None, [pop_d, pop_c], None, {"rule": "one_to_one"},
+                                             "static_synapse", [1.0, 2.0], [1.0, 1.0], [0, 0]) == 1
+    pre, post, _, syn_spec = nest_instance.connect_calls[0]
+    assert np.array_equal(pre, [3, 4, 5, 6]) and np.array_equal(post, [7, 8, 9, 6])
+    assert np.array_equal(syn_spec["weight"], [1.0, 1.0, 1.0, 2.0])
+    try:
+        builder.connect_populations_pairs([pop_a, pop_b], None, [pop_d, pop_c], None, {"rule": "one_to_one"},
+                                          "static_synapse", [1.0, 2.0], [1.0, 1.0], [0, 0])
+        assert False, "Connecting 2 to 3 neurons one_to_one did not fail!"
+    except ValueError:
+        pass
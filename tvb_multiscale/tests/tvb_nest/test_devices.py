@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from nest import NodeCollection
+
+from tvb_multiscale.tvb_nest.nest_models.devices import NESTSpikeGenerator, NESTSpikeRecorder
+
+
+class FakeNodeCollection(NodeCollection):
+
+    """A NodeCollection of nodes' statuses' dictionaries, not created in the NEST kernel."""
+
+    def __init__(self, statuses):
+        # NodeCollection sets any other attribute to the nodes' statuses:
+        object.__setattr__(self, "_statuses", list(statuses))
+
+    def __len__(self):
+        return len(self._statuses)
+
+    def __bool__(self):
+        return len(self._statuses) > 0
+
+    def __iter__(self):
+        return iter(self._statuses)
+
+    def __getitem__(self, inds):
+        if isinstance(inds, slice):
+            return FakeNodeCollection(self._statuses[inds])
+        if np.ndim(inds) == 0:
+            return FakeNodeCollection([self._statuses[inds]])
+        return FakeNodeCollection([self._statuses[ind] for ind in inds])
+
+    def tolist(self):
+        return [status["global_id"] for status in self._statuses]
+
+    def get(self, key):
+        if len(self._statuses) == 1:
+            return self._statuses[0][key]
+        return tuple(status[key] for status in self._statuses)
+
+    def set(self, params):
+        for status in self._statuses:
+            status.update(params)
+            if params.get("n_events", None) == 0:
+                # Setting n_events to 0 deletes the recorded events:
+                status["events"] = {"times": np.array([]), "senders": np.array([], dtype="i")}
+
+    @property
+    def n_events(self):
+        return self.get("n_events")
+
+    @n_events.setter
+    def n_events(self, n_events):
+        self.set({"n_events": n_events})
+
+    def record(self, times, senders):
+        for status in self._statuses:
+            for key, val in zip(["times", "senders"], [times, senders]):
+                status["events"][key] = np.concatenate([status["events"][key], val])
+            status["n_events"] = len(status["events"]["times"])
+
+
+class FakeNEST(object):
+
+    """A mock of the NEST calls of the devices, recording the SetStatus calls."""
+
+    def __init__(self, biological_time=0.0, total_num_virtual_procs=1):
+        self.biological_time = biological_time
+        self.total_num_virtual_procs = total_num_virtual_procs
+        self.set_status_calls = []
+
+    def GetKernelStatus(self, key):
+        return {"biological_time": self.biological_time,
+                "total_num_virtual_procs": self.total_num_virtual_procs}[key]
+
+    def GetStatus(self, nodes, key):
+        return tuple(status[key] for status in nodes)
+
+    def SetStatus(self, nodes, params):
+        self.set_status_calls.append((nodes.tolist(), params))
+        for status, param in zip(nodes, params):
+            status.update(param)
+
+
+def create_spike_generators(n_devices, nest_instance, spike_times=()):
+    statuses = [{"global_id": gid + 1, "spike_times": list(spike_times)} for gid in range(n_devices)]
+    return NESTSpikeGenerator(FakeNodeCollection(statuses), nest_instance)
+
+
+def test_spike_generator_add_spikes():
+    nest_instance = FakeNEST(biological_time=1.0)
+    generator = create_spike_generators(3, nest_instance, spike_times=[0.5, 3.0, 2.0])
+    # A sequence of spikes' times is added to all devices, and the past spikes are pruned:
+    generator.add_spikes([1.5, 0.1, 2.5])
+    assert len(nest_instance.set_status_calls) == 1
+    for spike_times in nest_instance.GetStatus(generator.device, "spike_times"):
+        assert spike_times == [3.0, 2.0, 1.5, 2.5]
+    generator.add_spikes([2.2], sort=True)
+    for spike_times in nest_instance.GetStatus(generator.device, "spike_times"):
+        assert spike_times == [1.5, 2.0, 2.2, 2.5, 3.0]
+    # Only the devices which receive new spikes are set:
+    nest_instance.biological_time = 2.1
+    generator.add_spikes([[], [4.0, 3.5], [2.0]], sort=True)
+    assert nest_instance.set_status_calls[-1] == ([2], [{"spike_times": [2.2, 2.5, 3.0, 3.5, 4.0]}])
+    assert nest_instance.GetStatus(generator.device, "spike_times")[2] == [1.5, 2.0, 2.2, 2.5, 3.0]
+    # Spikes in the past, after the time shift, are not set:
+    n_calls = len(nest_instance.set_status_calls)
+    generator.add_spikes([[0.5], [0.5], [0.5]], time_shift=1.0)
+    assert len(nest_instance.set_status_calls) == n_calls
+    generator.add_spikes([[0.5], [1.5], [0.5]], time_shift=1.0)
+    assert nest_instance.set_status_calls[-1] == ([2], [{"spike_times": [2.2, 2.5, 3.0, 3.5, 4.0, 2.5]}])
+    try:
+        generator.add_spikes([[1.0], [2.0]])
+        assert False, "Adding two spikes' times' sequences to three spike generators did not fail!"
+    except ValueError:
+        pass
+
+
+def test_spike_recorder_drain():
+    for n_vps in [1, 2]:
+        nest_instance = FakeNEST(total_num_virtual_procs=n_vps)
+        status = {"global_id": 1, "record_to": "memory", "n_events": 0,
+                  "events": {"times": np.array([]), "senders": np.array([], dtype="i")}}
+        recorder = NESTSpikeRecorder(FakeNodeCollection([status]), nest_instance, drain_upon_record=True)
+        all_times = []
+        for step in range(3):
+            # Every virtual process records its spikes in time order, and NEST concatenates them:
+            times = np.concatenate([np.sort(np.random.uniform(10.0 * step, 10.0 * (step + 1), 5))
+                                    for _ in range(n_vps)])
+            recorder.device.record(times, np.random.randint(1, 10, times.shape))
+            assert recorder.number_of_new_events == times.size
+            # All the events in the memory of NEST are new, and they are deleted from it, once read:
+            assert recorder.device.n_events == 0
+            assert np.array_equal(recorder.get_new_events()["times"], times)
+            assert recorder.number_of_new_events == 0
+            assert recorder._last_spike_time == times.max()
+            all_times.append(times)
+        # The events' buffer holds the whole history:
+        assert recorder.number_of_events == 15 * n_vps
+        assert np.array_equal(recorder.events["times"], np.concatenate(all_times))
+        recorder.delete_events()
+        assert recorder.number_of_events == 0
+        assert len(recorder.events["times"]) == 0
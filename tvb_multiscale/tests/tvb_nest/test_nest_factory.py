@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+
+from tvb_multiscale.tvb_nest.nest_models.builders import nest_factory
+
+
+class ModulesConfig(object):
+
+    def __init__(self, path):
+        self.MYMODULES_DIR = os.path.join(path, "modules")
+        self.MYMODULES_BLD_DIR = os.path.join(path, "builds")
+        self.MODULE_PATH = os.path.join(path, "nest", "lib", "nest")
+        self._NEST_PATH = os.path.join(path, "nest")
+
+
+def test_compile_modules_cache(monkeypatch):
+    config = ModulesConfig(tempfile.mkdtemp())
+    source_path = os.path.join(config.MYMODULES_DIR, "my")
+    os.makedirs(source_path)
+    with open(os.path.join(source_path, "my_neuron.nestml"), "w") as file:
+        file.write("neuron my_neuron:\n")
+    builds = []
+
+    def generate_nest_module(module_bld_dir, config):
+        # Install a library, which depends on the module's sources, like NESTML would do:
+        builds.append(module_bld_dir)
+        os.makedirs(config.MODULE_PATH, exist_ok=True)
+        with open(os.path.join(module_bld_dir, "my_neuron.nestml"), "r") as source, \
+                open(os.path.join(config.MODULE_PATH, "mymodule.so"), "w") as library:
+            library.write(source.read())
+
+    monkeypatch.setattr(nest_factory, "generate_nest_module", generate_nest_module)
+    installed_lib = os.path.join(config.MODULE_PATH, "mymodule.so")
+    nest_factory.compile_modules("my", config=config)
+    assert len(builds) == 1
+    # A warm start reuses the installed build...
+    nest_factory.compile_modules("my", config=config)
+    assert len(builds) == 1
+    # ...or installs the cached one, e.g., to a new NEST installation:
+    os.remove(installed_lib)
+    nest_factory.compile_modules("my", config=config)
+    assert len(builds) == 1 and os.path.isfile(installed_lib)
+    # Different sources, or compiler flags, require a new build:
+    with open(os.path.join(source_path, "my_neuron.nestml"), "a") as file:
+        file.write("  state:\n")
+    nest_factory.compile_modules("my", config=config)
+    assert len(builds) == 2
+    with open(installed_lib, "r") as file:
+        assert file.read().endswith("state:\n")
+    monkeypatch.setenv("CXXFLAGS", "-O3")
+    nest_factory.compile_modules("my", config=config)
+    assert len(builds) == 3
+    nest_factory.compile_modules("my", recompile=True, config=config)
+    assert len(builds) == 4
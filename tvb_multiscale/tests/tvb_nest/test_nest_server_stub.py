@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+from http.client import HTTPConnection
+
+import numpy as np
+
+from tvb_multiscale.tvb_nest.nest_models.server_client.encoding import \
+    JSON_CONTENT_TYPE, NPZ_CONTENT_TYPE, NodeCollectionGIDs, encode, decode, nest_exec_script
+from tvb_multiscale.tvb_nest.nest_models.server_client.nest_server_stub import NESTServerStub
+
+
+def post(connection, path, payload, content_type):
+    connection.request("POST", path, body=encode(payload, content_type), headers={"Content-type": content_type})
+    response = connection.getresponse()
+    content = response.read()
+    assert response.status == 200, content
+    return decode(content, response.getheader("Content-Type"))
+
+
+def test_binary_encoding():
+    payload = {"args": [NodeCollectionGIDs([1, 2]), "events"],
+               "events": {"times": np.random.uniform(size=(100,)), "senders": np.arange(100)},
+               "label": "spike_recorder", "n": np.int64(3), "values": (1.0, 2.0)}
+    decoded = decode(encode(payload, NPZ_CONTENT_TYPE), NPZ_CONTENT_TYPE)
+    assert decoded["args"] == [[1, 2], "events"]
+    assert np.array_equal(decoded["events"]["times"], payload["events"]["times"])
+    assert np.array_equal(decoded["events"]["senders"], payload["events"]["senders"])
+    assert decoded["label"] == "spike_recorder" and decoded["n"] == 3 and decoded["values"] == [1.0, 2.0]
+    assert nest_exec_script([("GetStatus", (NodeCollectionGIDs([3]), "n_events"), {})]) == \
+        "response = []\nresponse.append(nest.GetStatus(nest.NodeCollection([3]), 'n_events'))"
+
+
+def test_nest_server_stub():
+    with NESTServerStub() as server:
+        # A single keep-alive connection for all requests:
+        connection = HTTPConnection(server.host, server.port)
+        neurons = post(connection, "/api/Create", {"args": ["iaf_psc_alpha", 10]}, JSON_CONTENT_TYPE)
+        recorder = post(connection, "/api/Create", {"args": ["spike_recorder"]}, JSON_CONTENT_TYPE)
+        post(connection, "/api/Connect", {"args": [neurons, recorder]}, JSON_CONTENT_TYPE)
+        post(connection, "/api/Run", {"args": [1000.0]}, JSON_CONTENT_TYPE)
+        events = post(connection, "/api/GetStatus", {"args": [recorder, "events"]}, NPZ_CONTENT_TYPE)[0]
+        assert isinstance(events["times"], np.ndarray) and len(events["times"]) > 0
+        assert np.all(np.isin(events["senders"], neurons))
+        # The same calls in a single request, as calls for binary payloads, or as a script for JSON ones:
+        calls = [("GetStatus", (NodeCollectionGIDs(recorder), "n_events"), {}),
+                 ("SetStatus", (NodeCollectionGIDs(recorder), ), {"params": {"n_events": 0}}),
+                 ("GetStatus", (NodeCollectionGIDs(recorder), "n_events"), {})]
+        outputs = post(connection, "/exec", {"calls": [[call, list(args), kwargs] for call, args, kwargs in calls]},
+                       NPZ_CONTENT_TYPE)["data"]
+        assert outputs == [[len(events["times"])], None, [0]]
+        post(connection, "/api/Run", {"args": [1000.0]}, JSON_CONTENT_TYPE)
+        outputs = post(connection, "/exec", {"source": nest_exec_script(calls), "return": "response"},
+                       JSON_CONTENT_TYPE)["data"]
+        assert outputs[0][0] > 0 and outputs[1:] == [None, [0]]
+        connection.close()
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from tvb_multiscale.tvb_netpyne.netpyne import module
+from tvb_multiscale.tvb_netpyne.netpyne.module import NetpyneModule
+
+
+class FakeParallelContext(object):
+
+    def __init__(self, sim):
+        self.sim = sim
+        self.exchanged = []
+
+    def py_allgather(self, data):
+        self.exchanged.append(data.shape[1])
+        return [data, self.sim.newRemoteSpikes()]
+
+
+class FakeSim(object):
+
+    """A mock of netpyne.sim, at a rank, where the spikes of all other ranks are recorded as remote."""
+
+    def __init__(self, nhosts, rank=0):
+        self.nhosts = nhosts
+        self.rank = rank
+        self.simData = {'spkt': [], 'spkid': []}
+        self.allSimData = {'spkt': [], 'spkid': []}
+        self.remoteSpikes = np.zeros((2, 0))
+        self.remoteCursor = 0
+        self.pc = FakeParallelContext(self)
+
+    def record(self, t, dt, numSpikes=5):
+        for rank in range(self.nhosts):
+            times = np.sort(np.random.uniform(t, t + dt, numSpikes))
+            gids = rank * numSpikes + np.random.randint(0, numSpikes, numSpikes)
+            if rank == 0:
+                self.simData['spkt'].extend(times.tolist())
+                self.simData['spkid'].extend(gids.tolist())
+            else:
+                self.remoteSpikes = np.concatenate([self.remoteSpikes, np.array([times, gids])], axis=1)
+            self.allSimData['spkt'].extend(times.tolist())
+            self.allSimData['spkid'].extend(gids.tolist())
+
+    def newRemoteSpikes(self):
+        newSpikes = self.remoteSpikes[:, self.remoteCursor:]
+        self.remoteCursor = self.remoteSpikes.shape[1]
+        return newSpikes
+
+
+class FakeSpikeRecorder(object):
+
+    def __init__(self, neurons):
+        self.neurons = neurons
+        self.latestRecordTime = 0.0
+
+
+def sorted_spikes(spktimes, spkgids):
+    order = np.lexsort((spkgids, spktimes))
+    return np.array(spktimes)[order], np.array(spkgids)[order]
+
+
+def test_gather_spikes(monkeypatch):
+    monkeypatch.setattr(NetpyneModule, "_compileOrLoadMod", lambda self: None)
+    dt = 10.0
+    for nhosts in [1, 2]:
+        sim = FakeSim(nhosts)
+        monkeypatch.setattr(module, "sim", sim)
+        netpyne = NetpyneModule()
+        recorders = [FakeSpikeRecorder([0, 1, 2, 5, 6]), FakeSpikeRecorder([3, 4, 7, 8, 9])]
+        for recorder in recorders:
+            netpyne.registerSpikeRecorder(recorder)
+        for step in range(6):
+            sim.record(step * dt, dt)
+            if nhosts > 1:
+                netpyne.gatherFromNodes()
+                # Only the new spikes of this rank are exchanged:
+                assert sim.pc.exchanged[-1] == 5
+            # The second recorder reads every other step:
+            for recorder in recorders[:1 + step % 2]:
+                spikes = netpyne.getSpikes(generatedBy=recorder.neurons, startingFrom=recorder.latestRecordTime)
+                # ...the same spikes as the ones of the full sim data, after finalization:
+                netpyne._finalized = True
+                expected = netpyne.getSpikes(generatedBy=recorder.neurons, startingFrom=recorder.latestRecordTime)
+                netpyne._finalized = False
+                for spike, expected_spike in zip(sorted_spikes(*spikes), sorted_spikes(*expected)):
+                    assert np.array_equal(spike, expected_spike)
+                recorder.latestRecordTime = (step + 1) * dt
+            # Only the chunks of spikes, which have not been read by all recorders, are kept:
+            assert len(netpyne._spikesChunks) == 1 + step % 2
+        # All the spikes of all ranks have been gathered exactly once:
+        assert netpyne._spikesCursor == len(sim.simData['spkt'])
+        assert sim.remoteCursor == sim.remoteSpikes.shape[1]
+    # A non root rank joins the spikes' exchange, but, never reading the spike recorders, it keeps no spikes:
+    sim = FakeSim(2, rank=1)
+    monkeypatch.setattr(module, "sim", sim)
+    netpyne = NetpyneModule()
+    netpyne.registerSpikeRecorder(FakeSpikeRecorder([0, 1, 2, 5, 6]))
+    for step in range(6):
+        sim.record(step * dt, dt)
+        netpyne.gatherFromNodes()
+        assert sim.pc.exchanged[-1] == 5
+        assert len(netpyne._spikesChunks) == 0
+    assert sim.remoteCursor == sim.remoteSpikes.shape[1]
@@ -15,6 +15,7 @@ from tvb.contrib.scripts.utils.data_structures_utils import \
 from tvb_multiscale.core.neotraits import HasTraits
 from tvb_multiscale.core.spiking_models.devices import InputDevice, SpikeRecorder, Multimeter, SpikeMultimeter
 from tvb_multiscale.core.utils.data_structures_utils import flatten_neurons_inds_in_DataArray
+from tvb_multiscale.core.utils.profiling_utils import profile
 from tvb_multiscale.tvb_annarchy.annarchy_models.population import _ANNarchyPopulation
 
 
@@ -244,42 +245,92 @@ class ANNarchySpikeSourceArray(ANNarchyInputDevice):
                   label="Specific ANNarchy.Population",
                   doc="""Instance of specific ANNarchyInputDevice's ANNarchy.Population""")
 
+    # The pending spikes of the device, i.e., the ones scheduled since the last pruning,
+    # in a flat representation of the neurons' indices and the spikes' times, sorted by neuron:
+    _spikes_neurons = None
+    _spikes_times = None
+
     def __init__(self, device=SpikeSourceArray([[]]), annarchy_instance=None, **kwargs):
         kwargs["model"] = kwargs.get("model", "SpikeSourceArray")
         ANNarchyInputDevice.__init__(self, device, annarchy_instance, **kwargs)
+        self._spikes_neurons = None
+        self._spikes_times = None
 
+    def Set(self, values_dict, **kwargs):
+        ANNarchyInputDevice.Set(self, values_dict, **kwargs)
+        if "spike_times" in values_dict:
+            # The pending spikes have to be read again from the device:
+            self._spikes_neurons = None
+            self._spikes_times = None
+
+    @staticmethod
+    def _flatten_spikes(spikes, n_neurons):
+        """Method to return the flat arrays of neurons' indices and spikes' times,
+           for a sequence of spikes' times' sequences, one per neuron,
+           or for a sequence of spikes' times for all neurons."""
+        if len(spikes) == n_neurons and np.ndim(spikes[0]) > 0:
+            spikes = [np.ravel(spike) for spike in spikes]
+            lengths = np.array([spike.size for spike in spikes], dtype="i")
+            times = np.concatenate(spikes).astype("f8") if lengths.sum() else np.array([], dtype="f8")
+            return np.repeat(np.arange(n_neurons), lengths), times
+        if np.any([np.ndim(spike) > 0 for spike in spikes]):
+            raise ValueError("The number of spikes' times' sequences (%d) is not equal "
+                             "to the number of the spike source array's neurons (%d)!" % (len(spikes), n_neurons))
+        times = np.ravel(np.array(spikes, dtype="f8"))
+        return np.repeat(np.arange(n_neurons), times.size), np.tile(times, n_neurons)
+
+    def _pending_spikes(self, n_neurons):
+        if self._spikes_neurons is None:
+            # Read the device's spikes only once, and maintain them locally since then:
+            self._spikes_neurons, self._spikes_times = \
+                self._flatten_spikes(self.device.get("spike_times"), n_neurons)
+        return self._spikes_neurons, self._spikes_times
+
+    @profile(category="spikeNet", nbytes="input")
     def add_spikes(self, spikes, time_shift=None, nodes=None, sort=False):
+        """Method to add spikes' times to the spike source array.
+           The pending spikes of the device are held in flat arrays of neurons' indices and spikes' times,
+           which are pruned of the past spikes and extended with the new ones in bulk,
+           and the resulting spikes' times are set to the device with a single call, only if there are new spikes.
+           Arguments:
+            - spikes: a sequence of spikes' times' sequences, one per neuron,
+                      or a sequence of spikes' times for all neurons,
+            - time_shift: a time to add to all spikes' times,
+                          in which case, only the new spikes in the future are added. Default = None,
+            - nodes: not used, kept for compatibility with the other spiking simulators' devices,
+            - sort: if True, the spikes' times of each neuron are sorted. Default = False.
+        """
         if len(spikes):
             current_time = self.annarchy_instance.get_time()
+            n_neurons = self.number_of_devices_neurons
+            new_neurons, new_times = self._flatten_spikes(spikes, n_neurons)
             if time_shift:
                 # Apply time_shift, if any
-                new_spikes = []
-                for i_sp, spike in enumerate(spikes):
-                    new_spike = np.array(spike) + time_shift
-                    if len(new_spike.shape):
-                        # if spikes is a sequence of sequences for each neuron
-                        new_spikes.append(ensure_list(new_spike[new_spike >= current_time]))
-                    else:
-                        # if spikes is a sequence of the same spikes for all neurons
-                        if new_spike > current_time:
-                            new_spikes.append(new_spike.item())
-                spikes = new_spikes
-            if len(spikes) != self.number_of_connected_neurons:
-                # Assume we have to add the same spikes to all neurons
-                spikes = ensure_list(spikes) * len(nodes)
-            old_spikes = self.device.get("spike_times")
-            new_spikes = []
-            for old_spike, new_spike in zip(old_spikes, spikes):
-                old_spike = np.array(old_spike)
-                old_spike = old_spike[old_spike >= current_time].tolist()
-                new_spike = old_spike + ensure_list(new_spike)
-                if len(new_spike) and sort:
-                    new_spike = np.sort(new_spike).tolist()
-                new_spikes.append(new_spike)
-            self.device.set({"spike_times": new_spikes})
+                new_times = new_times + time_shift
+                future = new_times >= current_time
+                new_neurons, new_times = new_neurons[future], new_times[future]
+            if new_times.size == 0:
+                return
+            old_neurons, old_times = self._pending_spikes(n_neurons)
+            pending = old_times >= current_time
+            neurons = np.concatenate([old_neurons[pending], new_neurons])
+            times = np.concatenate([old_times[pending], new_times])
+            if sort:
+                order = np.lexsort((times, neurons))
+            else:
+                # Keep the order of the old spikes, followed by the new ones, for each neuron:
+                order = np.argsort(neurons, kind="stable")
+            self._spikes_neurons = neurons[order]
+            self._spikes_times = times[order]
+            # Split a single list of all times to the neurons' lists:
+            bounds = np.searchsorted(self._spikes_neurons, np.arange(n_neurons + 1)).tolist()
+            times = self._spikes_times.tolist()
+            self.device.set({"spike_times": [times[start:end] for start, end in zip(bounds[:-1], bounds[1:])]})
 
     def reset(self):
         self._nodes.reset()
+        self._spikes_neurons = None
+        self._spikes_times = None
 
 
 class ANNarchyPoissonPopulation(ANNarchyInputDevice):
@@ -879,27 +930,22 @@ class ANNarchyMonitor(ANNarchyOutputDevice, Multimeter):
 class ANNarchySpikeMonitor(ANNarchyOutputDevice, SpikeRecorder):
 
     """ANNarchySpikeMonitor class to wrap around ANNarchy.Monitor instances,
-       acting as an output device of spike discrete events."""
-
-    _data = Attr(field_type=OrderedDict, label="Data buffer",
-                 default=None,
-                 required=True,
-                 doc="""An OrderedDict buffer holding the spikes' times and senders read from the Monitors""")
+       acting as an output device of spike discrete events.
+       The spikes' times and senders read from the Monitors are appended to the events' buffer of the device,
+       until they are returned as new events. If store_data is False, they are discarded afterwards."""
 
     _output_events_counter = Int(field_type=int, default=0, required=True, label="Index of output events",
                                  doc="""The number of recorded events that 
-                                      have been given to the output via a get_events() call.""")
+                                      have been read from the Monitors.""")
 
     def __init__(self, device=OrderedDict(), annarchy_instance=None, **kwargs):
-        # Initialize it immediately because it is required!:
-        self._data = OrderedDict({"times": [], "senders": []})
         kwargs["model"] = kwargs.get("model", "SpikeMonitor")
         ANNarchyOutputDevice.__init__(self, device, annarchy_instance, **kwargs)
         SpikeRecorder.__init__(self, device, **kwargs)
 
     def _record(self):
         """Method to get discrete spike events' data from ANNarchy.Monitor instances,
-           and merge and store them to the _data buffer."""
+           and merge and append them to the events' buffer."""
         events = OrderedDict()
         events["times"] = []
         events["senders"] = []
@@ -909,34 +955,43 @@ class ANNarchySpikeMonitor(ANNarchyOutputDevice, SpikeRecorder):
             if len(spike['spike']):
                 spike_times, spike_ranks = monitor.raster_plot(spike)
                 if spike_times.size:
-                    events["times"] += spike_times.tolist()
+                    events["times"].append(spike_times)
                     population_ind = self.annarchy_instance.Global._network[0]["populations"].index(population)
-                    spike_senders = list(zip([population_ind] * spike_times.size, spike_ranks))
-                    events["senders"] += spike_senders
-        events['times'] = np.array(events['times'])
-        events['senders'] = np.array(events['senders'])
+                    events["senders"].append(np.stack([np.full(spike_times.shape, population_ind),
+                                                       np.asarray(spike_ranks)], axis=1))
         if len(events["times"]):
-            inds = np.argsort(events["times"])
+            events["times"] = np.concatenate(events["times"])
+            events["senders"] = np.concatenate(events["senders"])
+            inds = np.argsort(events["times"], kind="stable")
             events["times"] = events["times"][inds]
             events["senders"] = events["senders"][inds]
-            if self.store_data:
-                self._data["times"] += events["times"].tolist()
-                self._data["senders"] += events["senders"].tolist()
+            self._output_events_counter += len(events["times"])
+            self.events_buffer.append(events)
+        else:
+            events["times"] = np.array([])
+            events["senders"] = np.array([])
+        return events
+
+    def _update_events_buffer(self):
+        self._record()
+        return self.events_buffer
+
+    def _get_new_buffered_events(self):
+        events = self._get_buffered_events(new=True)
+        if not self.store_data:
+            # Discard the events returned:
+            self.events_buffer.drain()
         return events
 
     def _get_events(self, data=None):
         if data is None:
-            events = self._record()
-            self._output_events_counter += len(events['times'])
             if self.store_data:
-                events = OrderedDict()
-                for key, val in self._data.items():
-                    events[key] = np.array(val)
-                self._output_events_counter = len(events['times'])
-        return events
+                return self._get_buffered_events()
+            return self._get_new_buffered_events()
+        return data
 
     def get_new_events(self):
-        return self._record()
+        return self._get_new_buffered_events()
 
     @property
     def events(self):
@@ -964,8 +1019,7 @@ class ANNarchySpikeMonitor(ANNarchyOutputDevice, SpikeRecorder):
         return self._number_of_events()
 
     def _number_of_new_events(self):
-        number_of_recorded_events = self._number_of_recorded_events
-        return self.number_of_events - number_of_recorded_events
+        return self._update_events_buffer().number_of_new_events
 
     @property
     def number_of_new_events(self):
@@ -973,9 +1027,7 @@ class ANNarchySpikeMonitor(ANNarchyOutputDevice, SpikeRecorder):
 
     def reset(self):
         self._record()
-        self._data = OrderedDict()
-        self._data["times"] = []
-        self._data["senders"] = []
+        self.events_buffer.reset()
         self._output_events_counter = 0
 
     def info_details(self, recursive=0, connectivity=False, **kwargs):
@@ -101,6 +101,10 @@ class NESTProxyNodesBuilder(SpikeNetProxyNodesBuilder):
     def _build_and_connect_output_devices(self, interface, **kwargs):
         if "meter" in interface["model"]:  # TODO: Find a better way to do this!
             interface["params"]["interval"] = interface["params"].get("interval", self.tvb_dt)
+        # NEST returns all the events held in the memory of a device at every reading,
+        # and, therefore, the interfaces' devices drain the events they read from NEST's memory, by default:
+        interface["params"] = interface.get("params", {})
+        interface["params"]["drain_upon_record"] = interface["params"].get("drain_upon_record", True)
         return self._build_and_connect_devices(interface, **kwargs)
 
     def _build_and_connect_input_devices(self, interface, **kwargs):
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import warnings
 from copy import deepcopy
+from collections import OrderedDict
 
 import numpy as np
 
@@ -278,6 +279,75 @@ class NESTNetworkBuilder(SpikingNetworkBuilder):
             self.logger.info("...%d connections to receptor %s" % (n_conns, str(receptor)))
             self.nest_instance.Connect(source_neurons, target_neurons, conn_spec, syn_spec)
 
+    def _connect_populations_pairs_in_bulk(self, sources, src_inds_fun, targets, trg_inds_fun, rule,
+                                           synapse_model, weights, delays, receptor_types):
+        # Gather the source and target neurons, weights and delays of all connections, per receptor type:
+        connections = OrderedDict()
+        for pop_src, pop_trg, weight, delay, receptor_type in zip(sources, targets, weights, delays, receptor_types):
+            source_neurons = np.array(get_populations_neurons(pop_src, src_inds_fun).tolist(), dtype="int64")
+            target_neurons = np.array(get_populations_neurons(pop_trg, trg_inds_fun).tolist(), dtype="int64")
+            if rule == "one_to_one":
+                if len(source_neurons) != len(target_neurons):
+                    raise_value_error("Connecting %d source neurons of %s to %d target neurons of %s one_to_one "
+                                      "is not possible!" % (len(source_neurons), pop_src.label,
+                                                            len(target_neurons), pop_trg.label))
+            else:
+                # all_to_all:
+                source_neurons, target_neurons = np.repeat(source_neurons, len(target_neurons)), \
+                                                 np.tile(target_neurons, len(source_neurons))
+            for receptor in ensure_list(receptor_type):
+                connections.setdefault(receptor, []).append((source_neurons, target_neurons, weight, delay))
+        # ...and create them with a single array based NEST Connect call per receptor type:
+        for receptor, conns in connections.items():
+            n_conns = [len(conn[0]) for conn in conns]
+            syn_spec = {"synapse_model": synapse_model,
+                        "weight": np.repeat([conn[2] for conn in conns], n_conns).astype("f8"),
+                        "delay": np.repeat([conn[3] for conn in conns], n_conns).astype("f8"),
+                        "receptor_type": receptor * np.ones((np.sum(n_conns), ))}
+            self.logger.info("...%d connections of %d populations' pairs to receptor %s" %
+                             (np.sum(n_conns), len(conns), str(receptor)))
+            self.nest_instance.Connect(np.concatenate([conn[0] for conn in conns]),
+                                       np.concatenate([conn[1] for conn in conns]),
+                                       {"rule": "one_to_one"}, syn_spec)
+        return len(connections)
+
+    def connect_populations_pairs(self, sources, src_inds_fun, targets, trg_inds_fun, conn_spec,
+                                  synapse_model, weights, delays, receptor_types):
+        """Method to connect pairs of NESTPopulation instances, with the same connectivity pattern and synapse model,
+           but possibly different weight, delay and receptor type per pair.
+           For the deterministic "all_to_all" and "one_to_one" rules, numeric weights and delays,
+           and spiking synapse models, all connections are created with one NEST Connect call
+           of arrays of source and target neurons, weights and delays, per receptor type.
+           Otherwise, every pair is connected with connect_two_populations.
+           Arguments:
+            sources: a sequence of the source NESTPopulation instances, one per pair
+            src_inds_fun: a function that selects a subset of the source populations' neurons
+            targets: a sequence of the target NESTPopulation instances, one per pair
+            trg_inds_fun: a function that selects a subset of the target populations' neurons
+            conn_spec: a dict of parameters of the connectivity pattern among the neurons of the two populations,
+                         excluding weight and delay ones
+            synapse_model: the name (string) of the synapse model
+            weights: a sequence of the weights of the synapses, one per pair
+            delays: a sequence of the delays of the synapses, one per pair
+            receptor_types: a sequence of the receptor types of the synapses, one per pair
+           Returns:
+            the number of NEST Connect calls
+        """
+        rule = dict(self.config.DEFAULT_CONNECTION["conn_spec"], **(conn_spec or {}))["rule"]
+        synapse_model = synapse_model or "static_synapse"
+        weights = np.array(list(weights))
+        delays = np.array(list(delays))
+        if len(sources) > 1 and rule in ["all_to_all", "one_to_one"] and synapse_model.find("rate") < 0 \
+                and weights.dtype.kind in "biuf" and delays.dtype.kind in "biuf" \
+                and np.all([np.array(receptor_type).dtype.kind in "iu" for receptor_type in receptor_types]):
+            return self._connect_populations_pairs_in_bulk(sources, src_inds_fun, targets, trg_inds_fun, rule,
+                                                           synapse_model, weights,
+                                                           np.array(self._assert_delay(delays)) * np.ones(weights.shape),
+                                                           receptor_types)
+        return super(NESTNetworkBuilder, self).connect_populations_pairs(
+            sources, src_inds_fun, targets, trg_inds_fun, conn_spec,
+            synapse_model, weights, delays, receptor_types)
+
     def build_spiking_region_node(self, label="", input_node=None, *args, **kwargs):
         """This methods builds a NESTRegionNode instance,
            which consists of all SpikingPopulation instances,
@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
 
 import os
+import sys
 import shutil
+import filecmp
+import subprocess
 
 import numpy as np
 
@@ -10,6 +13,7 @@ from tvb.contrib.scripts.utils.data_structures_utils import ensure_list
 from tvb.contrib.scripts.utils.file_utils import safe_makedirs
 
 from tvb_multiscale.core.utils.data_structures_utils import safe_deepcopy
+from tvb_multiscale.core.utils.file_utils import directory_content_hash, file_lock
 from tvb_multiscale.tvb_nest.config import CONFIGURED, initialize_logger
 
 
@@ -52,72 +56,135 @@ def configure_nest_kernel(nest_instance, config=CONFIGURED):
     return nest_instance
 
     
+# The environment variables of the compilers and of their flags, which determine a module's build, next to its sources:
+COMPILER_ENV_VARIABLES = ("CC", "CXX", "CFLAGS", "CXXFLAGS", "CPPFLAGS", "LDFLAGS", "CMAKE_ARGS")
+
+# The file, in a module's build directory, with the build key of the module's successful build:
+BUILD_KEY_FILE = ".build_key"
+
+# The folder, in a module's build directory, with copies of the module's built libraries:
+BUILD_LIBS_DIR = ".build_libs"
+
+
+def get_nest_version(config=CONFIGURED):
+    """Function to return the version (string) of NEST, either of an already imported nest module,
+       or of the nest-config of the configured NEST installation, or "", if none is found."""
+    nest = sys.modules.get("nest", None)
+    version = getattr(nest, "__version__", None)
+    if version is None:
+        nest_config = os.path.join(config._NEST_PATH, "bin", "nest-config")
+        if os.path.isfile(nest_config):
+            try:
+                version = subprocess.run([nest_config, "--version"],
+                                         capture_output=True, text=True, check=True).stdout.strip()
+            except Exception as e:
+                warning("Failed to get NEST version from %s!\n%s" % (nest_config, str(e)))
+    return str(version or "")
+
+
+def module_build_key(module, config=CONFIGURED):
+    """Function to return the build key of a NEST module,
+       i.e., a hash of its sources, and of the NEST and NESTML versions, and the compilers' flags."""
+    try:
+        from pynestml import __version__ as pynestml_version
+    except Exception:
+        pynestml_version = ""
+    return directory_content_hash(os.path.join(config.MYMODULES_DIR, module),
+                                  "NEST:%s" % get_nest_version(config), "NESTML:%s" % pynestml_version,
+                                  *["%s=%s" % (var, os.environ.get(var, "")) for var in COMPILER_ENV_VARIABLES])
+
+
+def _module_libraries_names(module):
+    modulemodule = module + "module"
+    return [modulemodule + ".so", "lib" + modulemodule + ".so", "lib" + modulemodule + ".dylib"]
+
+
+def _find_module_libraries(module, path):
+    if not path or not os.path.isdir(path):
+        return []
+    return [os.path.join(path, filename) for filename in _module_libraries_names(module)
+            if os.path.isfile(os.path.join(path, filename))]
+
+
+def _read_build_key(module_bld_dir):
+    build_key_file = os.path.join(module_bld_dir, BUILD_KEY_FILE)
+    if os.path.isfile(build_key_file):
+        with open(build_key_file, "r") as file:
+            return file.read().strip()
+    return None
+
+
+def _install_cached_module(module, module_bld_dir, config=CONFIGURED, logger=LOG):
+    """Function to install the cached libraries of a module's build, if any, to the NEST modules' path,
+       unless identical ones are installed already. Returns True if cached libraries have been found."""
+    cached_libs = _find_module_libraries(module, os.path.join(module_bld_dir, BUILD_LIBS_DIR))
+    if len(cached_libs) == 0:
+        return False
+    module_path = getattr(config, "MODULE_PATH", "")
+    for cached_lib in cached_libs:
+        installed_lib = os.path.join(module_path, os.path.basename(cached_lib))
+        if not os.path.isfile(installed_lib) or not filecmp.cmp(cached_lib, installed_lib, shallow=False):
+            logger.info("Installing cached %s to %s..." % (cached_lib, module_path))
+            safe_makedirs(module_path)
+            shutil.copyfile(cached_lib, installed_lib)
+    return True
+
+
+def _cache_module_build(module, module_bld_dir, build_key, config=CONFIGURED):
+    """Function to copy the installed libraries of a module's build to its build directory,
+       and record the build key of the build."""
+    cache_dir = os.path.join(module_bld_dir, BUILD_LIBS_DIR)
+    safe_makedirs(cache_dir)
+    for installed_lib in _find_module_libraries(module, getattr(config, "MODULE_PATH", "")):
+        shutil.copyfile(installed_lib, os.path.join(cache_dir, os.path.basename(installed_lib)))
+    with open(os.path.join(module_bld_dir, BUILD_KEY_FILE), "w") as file:
+        file.write(build_key)
+
+
 def compile_modules(modules, recompile=False, config=CONFIGURED, logger=LOG):
     """Function to compile NEST modules.
+       A module's build is cached in its build directory, together with a build key,
+       i.e., a hash of the module's sources, the NEST and NESTML versions, and the compilers' flags.
+       The module is compiled only if its build key differs from the cached one,
+       otherwise the cached build is (re)installed, if necessary.
+       A file lock per module makes concurrent jobs, sharing the build directory, safe.
        Arguments:
         modules: a sequence (list, tuple) of NEST modules' names (strings).
-        recompile: (bool) flag to recompile a module that is already compiled. Default = False.
+        recompile: (bool) flag to recompile a module, even if its cached build is valid. Default = False.
         config: configuration class instance. Default: imported default CONFIGURED object.
         logger: logger object. Default: local LOG object.
     """
     # ...unless we need to first compile it:
     logger.info("Preparing MYMODULES_BLD_DIR: %s" % config.MYMODULES_BLD_DIR)
     safe_makedirs(config.MYMODULES_BLD_DIR)
-    # TODO: find out these locations for the newest versions of NESTML and NEST!!!
-    # lib_path = os.path.join(config._NEST_PATH, "lib", "nest")
-    # include_path = os.path.join(config._NEST_PATH, "include")
     for module in ensure_list(modules):
-        modulemodule = module + "module"
         module_bld_dir = os.path.join(config.MYMODULES_BLD_DIR, module)
-        # solib_file = os.path.join(module_bld_dir, modulemodule + ".so")
-        # dylib_file = os.path.join(module_bld_dir, "lib" + modulemodule + ".dylib")
-        # include_file = os.path.join(module_bld_dir, modulemodule + ".h")
-        # installed_solib_file = os.path.join(lib_path, os.path.basename(solib_file))
-        # installed_dylib_file = os.path.join(lib_path, os.path.basename(dylib_file))
-        # module_include_path = os.path.join(include_path, modulemodule)
-        # installed_h_file = os.path.join(module_include_path, modulemodule + ".h")
-        # if self.NEST_PATH and \
-        #     (not os.path.isfile(solib_file)
-        #         or not os.path.isfile(dylib_file)
-        #             or not os.path.isfile(include_file)) \
-        #                 or recompile:
-        #     # If any of the .so, .dylib or .h files don't exist,
-        #     # or if the user requires recompilation,
-        #     # proceed with recompilation:
-        if os.path.exists(module_bld_dir):
-            # Delete any pre-compiled built files:
-            shutil.rmtree(module_bld_dir)
-        # Create a  module build directory and copy there the source files:
-        source_path = os.path.join(config.MYMODULES_DIR, module)
-        logger.info("Copying module sources from %s\ninto %s..." % (source_path, module_bld_dir))
-        shutil.copytree(source_path, module_bld_dir)
-        # Now compile:
-        logger.info("Compiling %s..." % module)
-        logger.info("in build directory %s..." % module_bld_dir)
-        success_message = "DONE compiling and installing %s!" % module
-        try:
-            from pynestml.frontend.pynestml_frontend import generate_nest_target
-            generate_nest_target(module_bld_dir, config._NEST_PATH)
-        except Exception as e:
-            raise e
-        logger.info("Compiling finished without errors...")
-        # else:
-            # logger.info("Installing precompiled module %s..." % module)
-            # success_message = "DONE installing precompiled module %s!" % module
-            # # Just copy the .h, .so, and .dylib files to the appropriate NEST build paths:
-            # shutil.copyfile(solib_file, installed_solib_file)
-            # shutil.copyfile(solib_file, installed_dylib_file)
-            # safe_makedirs(include_path)
-            # shutil.copyfile(os.path.join(module_bld_dir, modulemodule + ".h"), installed_h_file)
-        # installed_files = {}
-        # for file in [installed_solib_file, installed_dylib_file, installed_h_file]:
-        #     installed_files[file] = os.path.isfile(file)
-        # if all(installed_files.values()):
-        logger.info(success_message)
-        # else:
-        #     logger.warn("Something seems to have gone wrong with compiling and/or installing %s!"
-        #                 "\n Installed files (not) found (True (False) respectively)!:\n%s"
-        #                 % (module, str(installed_files)))
+        with file_lock(os.path.join(config.MYMODULES_BLD_DIR, module + ".lock")):
+            build_key = module_build_key(module, config)
+            if not recompile and _read_build_key(module_bld_dir) == build_key \
+                    and _install_cached_module(module, module_bld_dir, config, logger):
+                logger.info("DONE installing the cached build of module %s!" % module)
+                continue
+            if os.path.exists(module_bld_dir):
+                # Delete any pre-compiled built files:
+                shutil.rmtree(module_bld_dir)
+            # Create a  module build directory and copy there the source files:
+            source_path = os.path.join(config.MYMODULES_DIR, module)
+            logger.info("Copying module sources from %s\ninto %s..." % (source_path, module_bld_dir))
+            shutil.copytree(source_path, module_bld_dir)
+            # Now compile:
+            logger.info("Compiling %s..." % module)
+            logger.info("in build directory %s..." % module_bld_dir)
+            generate_nest_module(module_bld_dir, config)
+            logger.info("Compiling finished without errors...")
+            _cache_module_build(module, module_bld_dir, build_key, config)
+            logger.info("DONE compiling and installing %s!" % module)
+
+
+def generate_nest_module(module_bld_dir, config=CONFIGURED):
+    """Function to generate, compile and install the NEST module of the NESTML sources in module_bld_dir."""
+    from pynestml.frontend.pynestml_frontend import generate_nest_target
+    generate_nest_target(module_bld_dir, config._NEST_PATH)
 
 
 def get_populations_neurons(population, inds_fun=None):
@@ -268,6 +335,7 @@ def create_device(device_model, params=dict(), config=CONFIGURED, nest_instance=
     else:
         label = default_params.get("label", label)
         reset_upon_record = default_params.pop("reset_upon_record", False)
+        drain_upon_record = default_params.pop("drain_upon_record", False)
     # TODO: a better solution for the strange error with inhomogeneous poisson generator
     try:
         nest_device_node_collection = nest_instance.Create(nest_device_model, number_of_devices, params=default_params)
@@ -300,7 +368,8 @@ def create_device(device_model, params=dict(), config=CONFIGURED, nest_instance=
             nest_device = devices_dict[device_model](nest_device_node_collection, nest_instance, label=label)
         else:
             nest_device = devices_dict[device_model](nest_device_node_collection, nest_instance,
-                                                     label=label, reset_upon_record=reset_upon_record)
+                                                     label=label, reset_upon_record=reset_upon_record,
+                                                     drain_upon_record=drain_upon_record)
     if return_nest:
         return nest_device, nest_instance
     else:
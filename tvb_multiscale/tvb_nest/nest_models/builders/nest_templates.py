@@ -81,7 +81,8 @@ def set_between_nodes_connection_receptor_type(source_node, target_node):
 
 
 def receptor_by_source_region(source_node, target_node, start=1):
-    return int(start + source_node)
+    receptor_type = start + np.array(source_node, dtype="i")
+    return receptor_type.item() if receptor_type.ndim == 0 else receptor_type
 
 
 """
@@ -9,15 +9,16 @@ from tvb.basic.neotraits.api import Int, List, Attr
 
 from tvb.contrib.scripts.utils.log_error_utils import warning
 from tvb.contrib.scripts.utils.data_structures_utils \
-    import ensure_list, extract_integer_intervals, data_xarray_from_continuous_events
+    import extract_integer_intervals, data_xarray_from_continuous_events
 
 from nest import NodeCollection
 
 from tvb_multiscale.core.spiking_models.devices import \
     Device, InputDevice, SpikeRecorder, Multimeter, Voltmeter, SpikeMultimeter
 from tvb_multiscale.core.utils.data_structures_utils import flatten_neurons_inds_in_DataArray
+from tvb_multiscale.core.utils.profiling_utils import profile
 from tvb_multiscale.core.utils.file_utils import truncate_ascii_file_after_header, \
-    read_nest_output_device_data_from_ascii_to_dict
+    read_nest_output_device_data_from_ascii_tail, NEST_ASCII_HEADER_LINES
 from tvb_multiscale.tvb_nest.nest_models.node import _NESTNodeCollection
 from tvb_multiscale.tvb_nest.nest_models.population import NESTParrotPopulation
 
@@ -190,35 +191,68 @@ class NESTSpikeGenerator(NESTInputDevice):
             for i_dev, val in enumerate(self._assert_value_size(vals)):
                 nodes[i_dev].set({key: val})
 
+    @staticmethod
+    def _merge_spikes(old_spikes, new_spikes, sort=False):
+        """Method to merge the old spikes' times with the new ones, in sorted order if sort is True."""
+        spikes = np.concatenate([old_spikes, new_spikes])
+        if sort:
+            # The old spikes' times might have been set unsorted:
+            return np.sort(spikes, kind="stable")
+        return spikes
+
+    @staticmethod
+    def _new_spikes(spikes, n_devices, current_time, time_shift=None):
+        """Method to return a list of numpy arrays of the future spikes' times to add to each device,
+           for a sequence of spikes' times' sequences, one per device,
+           or for a sequence of spikes' times for all devices."""
+        if len(spikes) == n_devices and np.ndim(spikes[0]) > 0:
+            spikes = [np.ravel(np.array(spike, dtype="f8")) for spike in spikes]
+        elif np.any([np.ndim(spike) > 0 for spike in spikes]):
+            raise ValueError("The number of spikes' times' sequences (%d) is not equal "
+                             "to the number of spike generators (%d)!" % (len(spikes), n_devices))
+        else:
+            # The same spikes are added to all devices:
+            spikes = [np.array(spikes, dtype="f8")] * n_devices
+        new_spikes = []
+        for spike in spikes:
+            if time_shift:
+                # Apply time_shift, if any
+                spike = spike + time_shift
+            new_spikes.append(spike[spike > current_time])
+        return new_spikes
+
+    @profile(category="spikeNet", nbytes="input")
     def add_spikes(self, spikes, time_shift=None, nodes=None, sort=False):
+        """Method to add spikes' times to the spike generators.
+           The spikes' times of all devices are read with a single GetStatus call,
+           the ones in the past are pruned, and the new ones are set with a single SetStatus call,
+           only for the devices that receive new spikes.
+           Arguments:
+            - spikes: a sequence of spikes' times' sequences, one per device,
+                      or a sequence of spikes' times for all devices,
+            - time_shift: a time to add to all spikes' times. Default = None,
+            - nodes: the spike generators' nodes. Default = None, for all devices,
+            - sort: if True, the spikes' times of each device are sorted. Default = False.
+        """
         if len(spikes):
             if nodes is None:
                 nodes = self.device
-            n_neurons = len(nodes)
+            n_devices = len(nodes)
             current_time = self.nest_instance.GetKernelStatus("biological_time")
-            if time_shift:
-                # Apply time_shift, if any
-                new_spikes = []
-                for i_sp, spike in enumerate(spikes):
-                    new_spike = np.array(spike) + time_shift
-                    if len(new_spike.shape):
-                        # if spikes is a sequence of sequences for each neuron
-                        new_spikes.append(ensure_list(new_spike[new_spike > current_time]))
-                    else:
-                        # if spikes is a sequence of the same spikes for all neurons
-                        if new_spike > current_time:
-                            new_spikes.append(new_spike.item())
-                spikes = new_spikes
-            if len(spikes) != n_neurons:
-                # Assume we have to add the same spikes to all neurons
-                spikes = ensure_list(spikes) * len(nodes)
-            for neuron, new_spikes in zip(nodes, spikes):
-                old_spikes = np.array(neuron.get("spike_times"))
-                old_spikes = old_spikes[old_spikes > current_time].tolist()
-                these_spikes = old_spikes + ensure_list(new_spikes)
-                if len(these_spikes) and sort:
-                    these_spikes = np.sort(these_spikes).tolist()
-                neuron.set({"spike_times": these_spikes})
+            new_spikes = self._new_spikes(spikes, n_devices, current_time, time_shift)
+            inds = [i_dev for i_dev, spike in enumerate(new_spikes) if spike.size]
+            if len(inds) == 0:
+                return
+            if len(inds) < n_devices:
+                nodes = nodes[inds]
+            old_spikes = self.nest_instance.GetStatus(nodes, "spike_times")
+            params = []
+            for i_dev, old_spike in zip(inds, old_spikes):
+                old_spike = np.array(old_spike, dtype="f8")
+                params.append({"spike_times":
+                                   self._merge_spikes(old_spike[old_spike > current_time],
+                                                      new_spikes[i_dev], sort).tolist()})
+            self.nest_instance.SetStatus(nodes, params)
 
 
 class NESTPulsePacketGenerator(NESTInputDevice):
@@ -516,11 +550,19 @@ class NESTOutputDevice(NESTDevice):
 
     _record_to = None
     reset_upon_record = False
+    # NEST returns only all the events held in the memory of a device, and, therefore,
+    # reading new events from memory is not incremental: it costs O(all events recorded), not O(new events).
+    # If True, and the device records to memory, every reading of new events drains them from the NEST device,
+    # i.e., reads and deletes them, so that they are accumulated only in the events' buffer,
+    # and the cost of reading new events is proportional to their number.
+    # This is the default for the output devices of the TVB <-> NEST interfaces:
+    drain_upon_record = False
 
     def __init__(self, device=None, nest_instance=None, **kwargs):
         kwargs["model"] = kwargs.get("model", "nest_output_device")
         NESTDevice.__init__(self, device, nest_instance, **kwargs)
         self._total_num_virtual_procs = self.nest_instance.GetKernelStatus("total_num_virtual_procs")
+        self.drain_upon_record = kwargs.get('drain_upon_record', self.drain_upon_record)
         self._update_record_to()
         self.reset_upon_record = kwargs.get('reset_upon_record', self.reset_upon_record)
 
@@ -528,12 +570,14 @@ class NESTOutputDevice(NESTDevice):
         d = super(NESTOutputDevice, self).__getstate__()
         d["_total_num_virtual_procs"] = self._total_num_virtual_procs
         d["_record_to"] = self.record_to
+        d["drain_upon_record"] = self.drain_upon_record
         return d
 
     def __setstate__(self, d):
         super(NESTOutputDevice, self).__setstate__(d)
         self._total_num_virtual_procs = d.get("_total_num_virtual_procs", 1)
         self._record_to = d["_record_to"]
+        self.drain_upon_record = d.get("drain_upon_record", False)
         self._update_record_to()
 
     @property
@@ -549,13 +593,17 @@ class NESTOutputDevice(NESTDevice):
     def _update_record_to(self):
         if self.device:
             if self.record_to == "ascii":
-                self._get_events = self._get_events_from_ascii
                 self._number_of_events = self._number_of_events_in_ascii_files
                 self.delete_events = self._delete_events_in_ascii_files
                 self._get_new_events = self._get_new_events_from_ascii
                 self._output_events_counter = [0] * self._total_num_virtual_procs
+                self._output_events_offsets = [0] * self._total_num_virtual_procs
+            elif self.drain_upon_record:
+                self._number_of_events = self._number_of_drained_events
+                self.delete_events = self._delete_events_in_memory
+                self._get_new_events = self._drain_new_events_from_memory
+                self._output_events_counter = 0
             else:
-                self._get_events = self._get_events_from_memory
                 self._number_of_events = self._number_of_events_in_memory
                 self.delete_events = self._delete_events_in_memory
                 self._get_new_events = self._get_new_events_from_memory
@@ -566,25 +614,6 @@ class NESTOutputDevice(NESTDevice):
         keys = ["times", "senders"] + self.record_from
         return dict(zip(keys, [np.array([])]*len(keys)))
 
-    def _get_events_from_ascii(self):
-        events = self._empty_events
-        for iF, filepath in enumerate(self.Get("filenames")["filenames"]):
-            # Reading all events:
-            this_file_events = read_nest_output_device_data_from_ascii_to_dict(filepath,
-                                                                               n_lines_to_skip=0,
-                                                                               empty_file=self.reset_upon_record)
-            n_events = len(this_file_events["senders"])
-            # Compute the new number of total events for this process...
-            if n_events:
-                self._output_events_counter[iF] = np.where(self.reset_upon_record,
-                                                           self._output_events_counter[iF] + n_events,
-                                                           n_events).item()
-            if self._output_events_counter[iF]:
-                # Merge file data, if any:
-                for key in events.keys():
-                    events[key] = np.concatenate([events[key], this_file_events[key]])
-        return events
-
     def _get_events_from_memory(self):
         if self.device:
             return self.device.get("events")
@@ -601,13 +630,14 @@ class NESTOutputDevice(NESTDevice):
     def _get_new_events_from_ascii(self):
         events = self._empty_events
         for iF, filepath in enumerate(self.Get("filenames")["filenames"]):  #
-            # We read only new events from files:
-            this_file_new_events = read_nest_output_device_data_from_ascii_to_dict(
-                filepath,
-                n_lines_to_skip=np.where(self.reset_upon_record, 0, self._output_events_counter[iF]).item(),
-                empty_file=self.reset_upon_record)
+            # We read only the rows appended to the files after the byte offset of the last reading:
+            this_file_new_events, self._output_events_offsets[iF] = \
+                read_nest_output_device_data_from_ascii_tail(filepath, self._output_events_offsets[iF])
             number_of_new_events = len(this_file_new_events.get("senders", []))
             if number_of_new_events:
+                if self.reset_upon_record:
+                    truncate_ascii_file_after_header(filepath, header=NEST_ASCII_HEADER_LINES)
+                    self._output_events_offsets[iF] = 0
                 # Advance the _output_events_counter
                 self._output_events_counter[iF] += number_of_new_events
                 # Merge file data:
@@ -619,16 +649,42 @@ class NESTOutputDevice(NESTDevice):
     def _get_new_events_from_memory(self):
         pass
 
+    def _drain_new_events_from_memory(self):
+        """Method to read the events held in the memory of the NEST device, and delete them from it.
+           Since the device holds only the events recorded since the last draining, all of them are new,
+           for any number of virtual processes, and no selection over the events' history is needed."""
+        events = NESTOutputDevice._get_events_from_memory(self)
+        number_of_new_events = len(events.get("times", []))
+        if number_of_new_events:
+            self.device.n_events = 0
+            # Count all events drained so far:
+            self._output_events_counter += number_of_new_events
+        return events
+
+    def _number_of_drained_events(self):
+        return self._update_events_buffer().number_of_events
+
+    def _update_events_buffer(self):
+        """Method to read only the events recorded since its last call, and append them to the events' buffer."""
+        if self.device:
+            self.events_buffer.append(self._get_new_events())
+        return self.events_buffer
+
+    def _get_buffered_events(self, new=False):
+        events = self._empty_events
+        events.update(super(NESTOutputDevice, self)._get_buffered_events(new=new))
+        return events
+
     def get_new_events(self, variables=None, **filter_kwargs):
-        return super(NESTOutputDevice, self).get_events(events=self._get_new_events(),
+        return super(NESTOutputDevice, self).get_events(events=self._get_buffered_events(new=True),
                                                         variables=variables, **filter_kwargs)
 
     @property
     def events(self):
-        return self._get_events()
+        return self._get_buffered_events()
 
     def _number_of_events_in_ascii_files(self):
-        return len(self._get_events()["senders"])
+        return self._update_events_buffer().number_of_events
 
     def _number_of_events_in_memory(self):
         return self.device.get("n_events")
@@ -643,7 +699,7 @@ class NESTOutputDevice(NESTDevice):
     @property
     def number_of_new_events(self):
         if self.device:
-            return len(self.get_new_events()["senders"])
+            return self._update_events_buffer().number_of_new_events
         else:
             return 0
 
@@ -653,8 +709,10 @@ class NESTOutputDevice(NESTDevice):
 
     def _delete_events_in_ascii_files(self):
         for filepath in self.Get("filenames")["filenames"]:  #
-            truncate_ascii_file_after_header(filepath, header="#")
+            truncate_ascii_file_after_header(filepath, header=NEST_ASCII_HEADER_LINES)
         self._output_events_counter = [0] * self._total_num_virtual_procs
+        self._output_events_offsets = [0] * self._total_num_virtual_procs
+        self.events_buffer.reset()
 
     def _delete_events_in_memory(self):
         try:
@@ -662,6 +720,7 @@ class NESTOutputDevice(NESTDevice):
             self._output_events_counter = 0
         except Exception as e:
             warning(e)
+        self.events_buffer.reset()
 
     def reset(self):
         self.delete_events()
@@ -713,9 +772,6 @@ class NESTSpikeRecorder(NESTOutputDevice, SpikeRecorder):
             self._last_spike_time = np.max(events["times"])
         return events, number_of_new_events
 
-    def _get_events_from_memory(self):
-        return self.__get_events_from_memory()[0]
-
     def _get_new_events_from_memory(self):
         old_last_spike_time = float(self._last_spike_time)
         events, number_of_new_events = self.__get_events_from_memory()
@@ -731,6 +787,12 @@ class NESTSpikeRecorder(NESTOutputDevice, SpikeRecorder):
         else:
             return self._empty_events
 
+    def _drain_new_events_from_memory(self):
+        events = NESTOutputDevice._drain_new_events_from_memory(self)
+        if len(events["times"]):
+            self._last_spike_time = np.max(events["times"])
+        return events
+
     def info(self, recursive=0):
         return SpikeRecorder.info(self, recursive=recursive)
 
@@ -776,11 +838,6 @@ class NESTMultimeter(NESTOutputDevice, Multimeter):
         else:
             return []
 
-    def _get_events_from_memory(self):
-        events = NESTOutputDevice._get_events_from_memory(self)
-        self._output_events_counter = self.device.n_events
-        return events
-
     def _get_new_events_from_memory(self):
         events = NESTOutputDevice._get_events_from_memory(self)
         n_total_events = self.device.n_events
@@ -851,7 +908,6 @@ class NESTMultimeter(NESTOutputDevice, Multimeter):
 
     def reset(self):
         NESTOutputDevice.reset(self)
-        self._output_events_counter = [0] * self._total_num_virtual_procs
 
 
 class NESTVoltmeter(NESTMultimeter, Voltmeter):
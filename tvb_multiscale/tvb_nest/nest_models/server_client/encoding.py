@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+"""
+Encoding of the payloads of the requests to, and the responses from, a NEST server:
+- JSON, with numpy arrays and scalars converted to (nested) lists and Python scalars,
+- binary, where all numpy arrays are sent as .npy bytes, inside an uncompressed .npz (zip) container,
+  next to a JSON document of the rest of the payload, with placeholders for the arrays.
+"""
+
+import io
+import json
+
+import numpy as np
+
+
+JSON_CONTENT_TYPE = "application/json"
+NPZ_CONTENT_TYPE = "application/x-npz"
+
+_JSON_KEY = "__json__"
+_ARRAY_KEY = "__ndarray__"
+
+
+class NodeCollectionGIDs(list):
+
+    """NodeCollectionGIDs class is a list of the gids of a NEST NodeCollection,
+       which is serialized to JSON as a list, but represented as a NodeCollection in a NEST server exec script."""
+
+    def __repr__(self):
+        return "nest.NodeCollection(%s)" % list.__repr__(self)
+
+
+def to_json(obj):
+    """Function to convert recursively numpy arrays and scalars, and tuples, to lists and Python scalars,
+       so that obj can be serialized to JSON. Lists of nodes' gids retain their type."""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    elif isinstance(obj, np.generic):
+        return obj.item()
+    elif isinstance(obj, dict):
+        return dict([(str(key), to_json(val)) for key, val in obj.items()])
+    elif isinstance(obj, NodeCollectionGIDs):
+        return NodeCollectionGIDs([int(gid) for gid in obj])
+    elif isinstance(obj, (list, tuple)):
+        return [to_json(val) for val in obj]
+    return obj
+
+
+def encode_json(obj):
+    return json.dumps(to_json(obj)).encode()
+
+
+def decode_json(content):
+    return json.loads(content)
+
+
+def _extract_arrays(obj, arrays):
+    if isinstance(obj, np.ndarray) and obj.dtype.kind in "biufc":
+        arrays.append(obj)
+        return {_ARRAY_KEY: len(arrays) - 1}
+    elif isinstance(obj, dict):
+        return dict([(str(key), _extract_arrays(val, arrays)) for key, val in obj.items()])
+    elif isinstance(obj, (list, tuple)) and not isinstance(obj, NodeCollectionGIDs):
+        return [_extract_arrays(val, arrays) for val in obj]
+    return to_json(obj)
+
+
+def _insert_arrays(obj, arrays):
+    if isinstance(obj, dict):
+        if len(obj) == 1 and _ARRAY_KEY in obj:
+            return arrays[obj[_ARRAY_KEY]]
+        return dict([(key, _insert_arrays(val, arrays)) for key, val in obj.items()])
+    elif isinstance(obj, list):
+        return [_insert_arrays(val, arrays) for val in obj]
+    return obj
+
+
+def encode_binary(obj):
+    """Function to encode obj to the bytes of an uncompressed .npz container,
+       holding each numeric numpy array of obj as .npy bytes, and the rest of obj as JSON."""
+    arrays = []
+    document = json.dumps(_extract_arrays(obj, arrays)).encode()
+    npz = dict([("%d" % i_array, array) for i_array, array in enumerate(arrays)])
+    npz[_JSON_KEY] = np.frombuffer(document, dtype=np.uint8)
+    buffer = io.BytesIO()
+    np.savez(buffer, **npz)
+    return buffer.getvalue()
+
+
+def decode_binary(content):
+    """Function to decode the bytes of a .npz container, written by encode_binary."""
+    with np.load(io.BytesIO(content), allow_pickle=False) as npz:
+        arrays = dict([(int(key), npz[key]) for key in npz.files if key != _JSON_KEY])
+        document = npz[_JSON_KEY].tobytes()
+    return _insert_arrays(json.loads(document), arrays)
+
+
+def encode(obj, content_type=JSON_CONTENT_TYPE):
+    if content_type == NPZ_CONTENT_TYPE:
+        return encode_binary(obj)
+    return encode_json(obj)
+
+
+def decode(content, content_type=JSON_CONTENT_TYPE):
+    if content_type is not None and content_type.startswith(NPZ_CONTENT_TYPE):
+        return decode_binary(content)
+    return decode_json(content)
+
+
+def nest_exec_script(calls, return_var="response"):
+    """Function to generate the source of a NEST server exec script,
+       which makes a sequence of (call, args, kwargs) NEST calls, and returns the list of their outputs.
+       The arguments are written as Python literals, with nodes' gids written as NodeCollections."""
+    lines = ["%s = []" % return_var]
+    for call, args, kwargs in calls:
+        arguments = [repr(to_json(arg)) for arg in args] + \
+                    ["%s=%r" % (key, to_json(val)) for key, val in kwargs.items()]
+        lines.append("%s.append(nest.%s(%s))" % (return_var, call, ", ".join(arguments)))
+    return "\n".join(lines)
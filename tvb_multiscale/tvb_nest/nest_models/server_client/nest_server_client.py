@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 import requests
+import requests.adapters
 from werkzeug.exceptions import BadRequest
 
 import numpy as np
@@ -8,69 +9,121 @@ import numpy as np
 from nest_client import NESTClient as NESTServerClientBase
 
 from tvb_multiscale.tvb_nest.nest_models.server_client.nest_client_base import NESTClientBase  # , decode_args_kwargs
+from tvb_multiscale.tvb_nest.nest_models.server_client.encoding import \
+    JSON_CONTENT_TYPE, NPZ_CONTENT_TYPE, NodeCollectionGIDs, encode as encode_payload, decode, nest_exec_script
 
 
 def encode(response):
     if response.ok:
-        return response.json()
+        return decode(response.content, response.headers.get("Content-Type", None))
     elif response.status_code == 400:
         raise BadRequest(response.text)
 
 
-# import json
-# class NpEncoder(json.JSONEncoder):
-#     def default(self, obj):
-#         if isinstance(obj, np.integer):
-#             return int(obj)
-#         if isinstance(obj, np.floating):
-#             return float(obj)
-#         if isinstance(obj, np.ndarray):
-#             return obj.tolist()
-#         return json.JSONEncoder.default(self, obj)
+# A pool of keep-alive HTTP connections per process, shared by all requests to NEST servers:
+NEST_SERVER_SESSION = None
+
+
+def nest_server_session(pool_maxsize=10):
+    global NEST_SERVER_SESSION
+    if NEST_SERVER_SESSION is None:
+        NEST_SERVER_SESSION = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        NEST_SERVER_SESSION.mount("http://", adapter)
+        NEST_SERVER_SESSION.mount("https://", adapter)
+    return NEST_SERVER_SESSION
+
+
+def _post(url, headers, payload):
+    # The payload is encoded according to the Content-type header,
+    # i.e., either as JSON, or as a binary .npz container of .npy arrays:
+    content_type = headers.get("Content-type", JSON_CONTENT_TYPE)
+    return nest_server_session().post(url, data=encode_payload(payload, content_type), headers=headers)
 
 
 def nest_server_request(url, headers, call, *args, **kwargs):
-    # args2, kwargs2 = decode_args_kwargs(args, kwargs)
-    # kwargs2.update({'args': args2})
-    # response = requests.post(url + 'api/' + call, data=json.dumps(kwargs2.copy(), cls=NpEncoder), headers=headers)
     kwargs.update({'args': args})
-    response = requests.post(url + 'api/' + call, json=kwargs, headers=headers)
+    response = _post(url + 'api/' + call, headers, kwargs)
     if not response.ok:
         print("\nResponse NOT OK!:")
         print(kwargs)
     return encode(response)
 
 
+def nest_server_batch_request(url, headers, calls):
+    """Function to make a sequence of (call, args, kwargs) NEST calls in a single request to the exec endpoint
+       of a NEST server, and return the list of their outputs.
+       For JSON payloads, the calls are sent as an exec script,
+       whereas binary payloads send the calls themselves, for a server that supports them."""
+    calls = [(call, tuple(args), dict(kwargs)) for call, args, kwargs in calls]
+    if headers.get("Content-type", JSON_CONTENT_TYPE) == NPZ_CONTENT_TYPE:
+        payload = {"calls": [[call, list(args), kwargs] for call, args, kwargs in calls]}
+    else:
+        payload = {"source": nest_exec_script(calls, "response"), "return": "response"}
+    response = _post(url + 'exec', headers, payload)
+    if not response.ok:
+        print("\nResponse NOT OK!:")
+        print(calls)
+    output = encode(response)
+    if isinstance(output, dict) and "data" in output:
+        return output["data"]
+    return output
+
+
 class NESTServerClient(NESTServerClientBase, NESTClientBase):
 
+    """NESTServerClient class to make calls to a NEST server, via a pool of keep-alive HTTP connections.
+       Several calls can be sent in a single request via request_many or batch().
+       If binary is True, arrays are sent and received as .npy bytes, instead of JSON lists,
+       which requires a NEST server that supports binary payloads, such as NESTServerStub."""
+
     host = 'localhost'
     port = 52425
+    binary = False
 
-    def __init__(self, host='localhost', port=52425):
+    def __init__(self, host='localhost', port=52425, binary=False):
         NESTServerClientBase.__init__(self, host=host, port=port)
         NESTClientBase.__init__(self)
+        self.binary = binary
+        self._set_headers()
+
+    def _set_headers(self):
+        if self.binary:
+            self.headers = {'Content-type': NPZ_CONTENT_TYPE, 'Accept': NPZ_CONTENT_TYPE}
+        else:
+            self.headers = {'Content-type': JSON_CONTENT_TYPE, 'Accept': 'text/plain'}
 
     def __getstate__(self):
         d = {"host": self.host, "port": self.port,
-             "url": self.url, "headers": self.headers}
+             "url": self.url, "headers": self.headers, "binary": self.binary}
         d.update(NESTClientBase.__getstate__(self))
         return d
 
     def __setstate__(self, d):
         self.host = d.get("host", self.host)
-        self.port = d.get("host", self.port)
+        self.port = d.get("port", self.port)
         self.url = d.get("url", 'http://{}:{}/'.format(self.host, self.port))
-        self.headers = d.get("headers", {'Content-type': 'application/json', 'Accept': 'text/plain'})
-        NESTClientBase.__setstate__(self)
+        self.binary = d.get("binary", self.binary)
+        self._set_headers()
+        NESTClientBase.__setstate__(self, d)
 
     def _node_collection_to_gids(self, node_collection):
-        return [int(gid) for gid in NESTClientBase._node_collection_to_gids(self, node_collection)]
+        return NodeCollectionGIDs([int(gid) for gid in NESTClientBase._node_collection_to_gids(self, node_collection)])
 
     def request(self, call, *args, **kwargs):
         return nest_server_request(self.url, self.headers, call, *args, **kwargs)
 
-    def get(self, nodes, *params, **kwargs):
-        outputs = self.request("GetStatus", self._nodes(nodes), *params, **kwargs)
+    def request_many(self, calls):
+        """Method to make a sequence of (call, args, kwargs) NEST calls in a single request,
+           and return the list of their outputs."""
+        return nest_server_batch_request(self.url, self.headers, calls)
+
+    def batch(self):
+        """Method to return a NESTServerClientBatch, to queue NEST calls to be sent in a single request."""
+        return NESTServerClientBatch(self)
+
+    @staticmethod
+    def _get_output(outputs, params):
         if len(params) <= 1:
             # if len(params) == 0, tuple(dict(params, params_vals)) of all params
             # elif len(params) == 1, tuple(values) of a single param
@@ -79,5 +132,60 @@ class NESTServerClient(NESTServerClientBase, NESTClientBase):
             # if len(params) > 0, tuple of param_values per node, needs transposing to be returned as a dict
             return dict(zip(params, np.array(outputs).T))
 
+    def get(self, nodes, *params, **kwargs):
+        return self._get_output(self.request("GetStatus", self._nodes(nodes), *params, **kwargs), params)
+
     def set(self, nodes, params=None, **kwargs):
         return self.request("SetStatus", self._nodes(nodes), params=params, **kwargs)
+
+
+class NESTServerClientBatch(object):
+
+    """NESTServerClientBatch class to queue calls of a NESTServerClient,
+       and send them all in a single request, upon execute(), or upon exiting a with block:
+
+           with nest_client.batch() as batch:
+               batch.get(spike_recorder, "events")
+               batch.set(spike_recorder, {"n_events": 0})
+           events, _ = batch.results
+    """
+
+    def __init__(self, nest_client):
+        self.nest_client = nest_client
+        self.calls = []
+        self._outputs_funs = []
+        self.results = None
+
+    def request(self, call, *args, **kwargs):
+        self.calls.append((call, args, kwargs))
+        self._outputs_funs.append(None)
+        return self
+
+    def __getattr__(self, attr):
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        return lambda *args, **kwargs: self.request(attr, *args, **kwargs)
+
+    def get(self, nodes, *params, **kwargs):
+        self.request("GetStatus", self.nest_client._nodes(nodes), *params, **kwargs)
+        self._outputs_funs[-1] = lambda outputs: self.nest_client._get_output(outputs, params)
+        return self
+
+    def set(self, nodes, params=None, **kwargs):
+        return self.request("SetStatus", self.nest_client._nodes(nodes), params=params, **kwargs)
+
+    def execute(self):
+        calls, outputs_funs = self.calls, self._outputs_funs
+        self.calls, self._outputs_funs = [], []
+        self.results = []
+        if len(calls):
+            for output, output_fun in zip(self.nest_client.request_many(calls), outputs_funs):
+                self.results.append(output if output_fun is None else output_fun(output))
+        return self.results
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *args):
+        if exc_type is None:
+            self.execute()
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+
+"""
+A local stub of a NEST server, for testing and benchmarking NEST server clients without NEST.
+It serves the api/<call> and exec endpoints of a NEST server, over keep-alive HTTP connections,
+with JSON or binary (.npz) payloads, for a minimal stub of the NEST kernel, NESTKernelStub,
+whose spike recorders record Poisson spikes of their senders upon Run or Simulate.
+The exec endpoint executes the script it receives, like a NEST server with its restrictions off,
+and, therefore, the stub serves only localhost by default.
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from tvb_multiscale.tvb_nest.nest_models.server_client.encoding import \
+    JSON_CONTENT_TYPE, NPZ_CONTENT_TYPE, encode, decode
+
+
+class NESTKernelStub(object):
+
+    """NESTKernelStub class to mimic the NEST calls of a NEST server client,
+       for nodes whose status are dictionaries, and spike recorders that record Poisson spikes."""
+
+    def __init__(self, rate=10.0, seed=None):
+        self.rate = rate
+        self.biological_time = 0.0
+        self.resolution = 0.1
+        self.nodes = []
+        self._random = np.random.RandomState(seed)
+
+    def NodeCollection(self, gids):
+        return [int(gid) for gid in np.array(gids).ravel()]
+
+    def Create(self, model, n=1, params=None, positions=None):
+        gids = []
+        for _ in range(n):
+            status = {"model": model, "global_id": len(self.nodes) + 1}
+            if model == "spike_recorder":
+                status.update({"n_events": 0, "senders_ids": [],
+                               "events": {"times": np.array([]), "senders": np.array([], dtype="i")}})
+            status.update(params or {})
+            self.nodes.append(status)
+            gids.append(status["global_id"])
+        return gids
+
+    def Connect(self, pre, post, conn_spec=None, syn_spec=None, **kwargs):
+        for gid in self.NodeCollection(post):
+            status = self.nodes[gid - 1]
+            if status["model"] == "spike_recorder":
+                status["senders_ids"] = status["senders_ids"] + self.NodeCollection(pre)
+
+    def _status(self, gid):
+        status = self.nodes[gid - 1]
+        if status["model"] == "spike_recorder":
+            status["n_events"] = len(status["events"]["times"])
+        return status
+
+    def GetStatus(self, nodes, keys=None, output=''):
+        statuses = [self._status(gid) for gid in self.NodeCollection(nodes)]
+        if keys is None:
+            return [dict([(key, val) for key, val in status.items() if key != "senders_ids"])
+                    for status in statuses]
+        elif isinstance(keys, (list, tuple)):
+            return [[status[key] for key in keys] for status in statuses]
+        return [status[keys] for status in statuses]
+
+    def SetStatus(self, nodes, params, val=None):
+        if val is not None:
+            params = {params: val}
+        for gid in self.NodeCollection(nodes):
+            status = self.nodes[gid - 1]
+            status.update(params)
+            if status["model"] == "spike_recorder" and params.get("n_events", None) == 0:
+                # Setting n_events to 0 deletes the recorded events:
+                status["events"] = {"times": np.array([]), "senders": np.array([], dtype="i")}
+
+    def GetKernelStatus(self, *args):
+        status = {"biological_time": self.biological_time, "resolution": self.resolution,
+                  "total_num_virtual_procs": 1}
+        if len(args):
+            return status[args[0]]
+        return status
+
+    def Run(self, time):
+        start_time = self.biological_time
+        self.biological_time += time
+        for status in self.nodes:
+            if status["model"] == "spike_recorder" and len(status["senders_ids"]):
+                n_spikes = self._random.poisson(self.rate * time / 1000.0 * len(status["senders_ids"]))
+                times = np.sort(self._random.uniform(start_time, self.biological_time, n_spikes))
+                senders = self._random.choice(status["senders_ids"], n_spikes)
+                status["events"] = {"times": np.concatenate([status["events"]["times"], times]),
+                                    "senders": np.concatenate([status["events"]["senders"], senders])}
+
+    def Simulate(self, time):
+        self.Run(time)
+
+
+class NESTServerStubRequestHandler(BaseHTTPRequestHandler):
+
+    # HTTP/1.1 keeps connections alive:
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _respond(self, status_code, output, content_type):
+        content = encode(output, content_type)
+        self.send_response(status_code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _exec(self, payload):
+        kernel = self.server.kernel
+        if "calls" in payload:
+            return {"data": [getattr(kernel, call)(*args, **kwargs) for call, args, kwargs in payload["calls"]]}
+        namespace = {}
+        exec(payload["source"], {"nest": kernel}, namespace)
+        return {"data": namespace.get(payload.get("return", "response"), None)}
+
+    def do_POST(self):
+        content_type = self.headers.get("Content-Type", JSON_CONTENT_TYPE)
+        response_type = NPZ_CONTENT_TYPE if content_type == NPZ_CONTENT_TYPE else JSON_CONTENT_TYPE
+        try:
+            payload = decode(self.rfile.read(int(self.headers.get("Content-Length", 0))), content_type)
+            with self.server.lock:
+                if self.path.strip("/") == "exec":
+                    output = self._exec(payload)
+                else:
+                    call = self.path.strip("/").split("/")[-1]
+                    args = payload.pop("args", [])
+                    output = getattr(self.server.kernel, call)(*args, **payload)
+        except Exception as e:
+            self._respond(400, str(e), JSON_CONTENT_TYPE)
+            return
+        self._respond(200, output, response_type)
+
+
+class NESTServerStub(object):
+
+    """NESTServerStub class to serve a NESTKernelStub in a background thread:
+
+           with NESTServerStub() as server:
+               nest_client = NESTServerClient(port=server.port)
+    """
+
+    def __init__(self, host="localhost", port=0, kernel=None):
+        self.host = host
+        self.port = port
+        self.kernel = NESTKernelStub() if kernel is None else kernel
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return 'http://{}:{}/'.format(self.host, self.port)
+
+    def start(self):
+        self._server = ThreadingHTTPServer((self.host, self.port), NESTServerStubRequestHandler)
+        self._server.daemon_threads = True
+        self._server.kernel = self.kernel
+        self._server.lock = threading.Lock()
+        # If port is 0, the operating system has selected a free port:
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
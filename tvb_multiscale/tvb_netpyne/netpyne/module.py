@@ -22,6 +22,14 @@ class NetpyneModule(object):
         self._tracesToRecord = {}
         self._popsToRecordTraces = []
 
+        # Incremental spike exchange: a cursor into the spike vectors of this rank,
+        # and the chunks of (spike times, spike gids, max spike time) gathered from all ranks since, in time order.
+        # The chunks already read by all registered spike recorders are dropped, to bound the memory:
+        self._spikesCursor = 0
+        self._spikesChunks = []
+        self._spikeRecorders = []
+        self._finalized = False
+
         self._compileOrLoadMod()
 
     def _compileOrLoadMod(self):
@@ -219,8 +227,58 @@ class NetpyneModule(object):
                 existingPops = [pop]
                 trace['conds'] = {'pop': existingPops}
 
+    @staticmethod
+    def _vectorToArray(vector):
+        # zero-copy view of a NEURON Vector, where possible
+        if hasattr(vector, 'as_numpy'):
+            return vector.as_numpy()
+        return np.asarray(vector)
+
+    def _newLocalSpikes(self):
+        # spikes recorded on this rank since the last call, as a packed (2, n) array of times and gids
+        spktimes = self._vectorToArray(sim.simData['spkt'])
+        spkgids = self._vectorToArray(sim.simData['spkid'])
+        numSpikes = min(len(spktimes), len(spkgids))
+        newSpikes = np.array([spktimes[self._spikesCursor:numSpikes], spkgids[self._spikesCursor:numSpikes]],
+                             dtype='f8').reshape((2, -1))
+        self._spikesCursor = numSpikes
+        return newSpikes
+
+    def registerSpikeRecorder(self, spikeRecorder):
+        """Registers a spike recorder reading the gathered spikes, with its `latestRecordTime`,
+        so that the spikes it has already read can be dropped."""
+        self._spikeRecorders.append(spikeRecorder)
+
+    def _dropReadSpikes(self):
+        # drop the chunks the spikes of which are not later than the latest record time of every spike recorder
+        latestRecordTime = min([recorder.latestRecordTime for recorder in self._spikeRecorders], default=np.inf)
+        iChunk = 0
+        while iChunk < len(self._spikesChunks) and self._spikesChunks[iChunk][2] <= latestRecordTime:
+            iChunk += 1
+        del self._spikesChunks[:iChunk]
+
+    def gatherSpikes(self):
+        """Gathers the spikes recorded on all ranks since the last call, with a single `py_allgather` of packed
+        (times, gids) arrays of the new spikes only. In case of multi-node simulation, it has to be called
+        by all nodes. Only the root node, where the output devices are read, keeps the gathered spikes,
+        and the spikes already read by all registered spike recorders are dropped."""
+        if not 'spkid' in sim.simData:
+            return
+        self._dropReadSpikes()
+        newSpikes = self._newLocalSpikes()
+        if sim.nhosts > 1:
+            newSpikes = np.concatenate(sim.pc.py_allgather(newSpikes), axis=1)
+        if newSpikes.shape[1] and self.isRootNode():
+            self._spikesChunks.append((newSpikes[0], newSpikes[1].astype('i'), newSpikes[0].max()))
+
     def getSpikes(self, generatedBy=None, startingFrom=None):
 
+        if not self._finalized:
+            # during simulation, spikes are gathered incrementally
+            if sim.nhosts == 1:
+                self.gatherSpikes()
+            return self._getGatheredSpikes(generatedBy, startingFrom)
+
         if hasattr(sim, 'allSimData'):
             # gathered from nodes
             simData = sim.allSimData
@@ -247,6 +305,29 @@ class NetpyneModule(object):
             spkgids = spkgids[inds]
         return spktimes, spkgids
 
+    def _getGatheredSpikes(self, generatedBy=None, startingFrom=None):
+        # only the latest chunks, the spikes of which may be later than startingFrom, are searched,
+        # whereas startingFrom=None returns the spikes of all chunks not yet dropped,
+        # i.e., the whole history of spikes is available only after finalize()
+        iChunk = len(self._spikesChunks)
+        if startingFrom is None:
+            iChunk = 0
+        else:
+            while iChunk > 0 and self._spikesChunks[iChunk - 1][2] > startingFrom:
+                iChunk -= 1
+        chunks = self._spikesChunks[iChunk:]
+        if not len(chunks):
+            return np.array([]), np.array([], dtype='i')
+        spktimes = np.concatenate([chunk[0] for chunk in chunks])
+        spkgids = np.concatenate([chunk[1] for chunk in chunks])
+
+        inds = np.ones(spktimes.shape, dtype=bool)
+        if startingFrom is not None:
+            inds &= spktimes > startingFrom
+        if generatedBy is not None:
+            inds &= np.isin(spkgids, generatedBy)
+        return spktimes[inds], spkgids[inds]
+
     def getRecordedTime(self):
         return np.array(sim.allSimData['t'])
 
@@ -325,6 +406,7 @@ class NetpyneModule(object):
             stopTime = sim.cfg.duration
         sim.run.postRun(stopTime)
         sim.gatherData()
+        self._finalized = True
         sim.analyze()
 
     # parallel simulation
@@ -337,13 +419,15 @@ class NetpyneModule(object):
             return additionalData
 
         if gatherSimData:
-            orig = sim.cfg.gatherOnlySimData
-            sim.cfg.gatherOnlySimData = True
-            sim.gatherData(gatherLFP=False, gatherDipole=False)
-            sim.cfg.gatherOnlySimData = orig
-
-            # TODO: use more optimal gathering once method gets refactored in netpyne:
-            # sim.gatherData(gatherLFP=False, gatherDipole=False, gatherOnlySimData=True, simDataKeysToGather=['spkt', 'spkid'], analyze=False)
+            # only new spikes are exchanged between nodes...
+            self.gatherSpikes()
+
+            # ...and the full pass over all sim data is needed only if traces are recorded
+            if len(self._tracesToRecord):
+                orig = sim.cfg.gatherOnlySimData
+                sim.cfg.gatherOnlySimData = True
+                sim.gatherData(gatherLFP=False, gatherDipole=False)
+                sim.cfg.gatherOnlySimData = orig
 
         if additionalData:
             dataVec = h.Vector(additionalData)
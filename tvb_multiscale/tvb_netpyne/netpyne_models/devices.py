@@ -167,21 +167,11 @@ class NetpyneSpikeRecorder(NetpyneOutputDevice, SpikeRecorder):
         # kwargs["model"] = kwargs.get("model", "spike_recorder")
         NetpyneOutputDevice.__init__(self, device, netpyne_instance, **kwargs)
         SpikeRecorder.__init__(self, device, **kwargs)
+        if netpyne_instance is not None:
+            netpyne_instance.registerSpikeRecorder(self)
     
-    @property
-    def events(self):
-        spktimes, spkgids = self.netpyne_instance.getSpikes(generatedBy=self.neurons)
-        return {'senders': spkgids, 'times': spktimes}
-
-    @property
-    def number_of_events(self):
-        return self.device.numberOfSpikes(self.population_label)
-
-    def reset(self):
-        pass
-
-
-    def get_new_events(self, variables=None, **filter_kwargs):
+    def _update_events_buffer(self):
+        """Method to read only the spikes recorded after the latest record time, and append them to the events' buffer."""
         spktimes, spkgids = self.netpyne_instance.getSpikes(generatedBy=self.neurons, startingFrom=self.latestRecordTime)
 
         numSpikes = len(spktimes)
@@ -189,10 +179,25 @@ class NetpyneSpikeRecorder(NetpyneOutputDevice, SpikeRecorder):
             period = self.netpyne_instance.time - self.latestRecordTime
             rate = 1000 * numSpikes / len(self.neurons) / period
             print(f"Netpyne:: recorded {len(spktimes)} spikes from {self.population_label}. Approx. rate: {rate}. Timeframe {self.latestRecordTime} + {period}")
+            self.events_buffer.append({'senders': spkgids, 'times': spktimes})
 
         self.latestRecordTime = self.netpyne_instance.time
 
-        return {'senders': spkgids, 'times': spktimes}
+        return self.events_buffer
+
+    @property
+    def events(self):
+        return self._get_buffered_events()
+
+    @property
+    def number_of_events(self):
+        return self.device.numberOfSpikes(self.population_label)
+
+    def reset(self):
+        self.events_buffer.reset()
+
+    def get_new_events(self, variables=None, **filter_kwargs):
+        return self._get_buffered_events(new=True)
 
     @property
     def new_events(self):
@@ -201,7 +206,7 @@ class NetpyneSpikeRecorder(NetpyneOutputDevice, SpikeRecorder):
     @property
     def number_of_new_events(self):
         """This method returns the number (integer) of events"""
-        return self.device.numberOfSpikes(self.population_label)
+        return self._update_events_buffer().number_of_new_events
 
     @property
     def spiking_simulator_module(self):